@@ -0,0 +1,194 @@
+"""
+Benchmark the latency of the tenant create, update and delete routes.
+
+Every call to ACA-Py and the trust registry is replaced by a stub that sleeps for
+`--delay` milliseconds, so that the latency measured is that of the upstream calls each
+route waits for in turn. The wallet cache is cleared before each request.
+
+Also counts the wallets created by `--sign-ups` concurrent requests to create an issuer
+with the same label, of which only one can be registered.
+
+    python -m app.benchmarks.bench_tenants --delay 10 --requests 50 --sign-ups 10
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from contextlib import ExitStack, asynccontextmanager
+from typing import Awaitable, Callable, Dict, Set
+from unittest.mock import MagicMock, patch
+
+from aries_cloudcontroller import CreateWalletResponse, WalletRecordWithGroups
+
+from app.dependencies.acapy_clients import TENANT_ADMIN_AUTHED
+from app.exceptions import TrustRegistryException
+from app.models.tenants import CreateTenantRequest, OnboardResult, UpdateTenantRequest
+from app.routes.admin import tenants
+from app.util.tenants import wallet_cache
+from shared.models.trustregistry import Actor, ActorNameReservation
+
+WALLET_ID = "wallet_id"
+TIMESTAMP = "2024-01-01T00:00:00.000000Z"
+
+wallet_record = WalletRecordWithGroups(
+    wallet_id=WALLET_ID,
+    created_at=TIMESTAMP,
+    updated_at=TIMESTAMP,
+    key_management_mode="managed",
+    settings={"default_label": "label", "wallet.name": "name"},
+)
+wallet_response = CreateWalletResponse(
+    wallet_id=WALLET_ID,
+    created_at=TIMESTAMP,
+    updated_at=TIMESTAMP,
+    key_management_mode="managed",
+    token="token",
+)
+actor = Actor(id=WALLET_ID, name="label", roles=["verifier"], did="did:sov:123")
+
+
+def upstream_call(delay: float, result=None) -> Callable[..., Awaitable]:
+    async def call(*_, **__):
+        await asyncio.sleep(delay)
+        return result
+
+    return call
+
+
+class ActorNames:
+    """Actor names reserved in the stubbed trust registry, and wallets created for them."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.reserved: Set[str] = set()
+        self.wallets_created = 0
+
+    async def reserve(self, actor_name: str) -> ActorNameReservation:
+        await asyncio.sleep(self.delay)
+        if actor_name in self.reserved:
+            raise TrustRegistryException("Actor name is not available.", 409)
+        self.reserved.add(actor_name)
+        return ActorNameReservation(
+            id=actor_name, name=actor_name, expires_at=TIMESTAMP
+        )
+
+    async def create_wallet(self, *_, **__) -> CreateWalletResponse:
+        self.wallets_created += 1
+        await asyncio.sleep(self.delay)
+        return wallet_response
+
+
+def stub_upstream(stack: ExitStack, delay: float) -> ActorNames:
+    actor_names = ActorNames(delay)
+    admin_controller = MagicMock()
+    admin_controller.multitenancy.get_wallet = upstream_call(delay, wallet_record)
+    admin_controller.multitenancy.create_wallet = actor_names.create_wallet
+    admin_controller.multitenancy.update_wallet = upstream_call(delay, wallet_record)
+    admin_controller.multitenancy.delete_wallet = upstream_call(delay)
+
+    @asynccontextmanager
+    async def get_tenant_admin_controller(*_):
+        yield admin_controller
+
+    stubs = {
+        "app.routes.admin.tenants.get_tenant_admin_controller": (
+            get_tenant_admin_controller
+        ),
+        "app.routes.admin.tenants.assert_actor_name": upstream_call(delay, False),
+        "app.routes.admin.tenants.reserve_actor_name": actor_names.reserve,
+        "app.routes.admin.tenants.release_actor_name": upstream_call(delay),
+        "app.routes.admin.tenants.onboard_tenant": upstream_call(
+            delay, OnboardResult(did="did:sov:123")
+        ),
+        "app.routes.admin.tenants.register_actor": upstream_call(delay),
+        "app.routes.admin.tenants.fetch_actor_by_id": upstream_call(delay, actor),
+        "app.routes.admin.tenants.remove_actor_by_id": upstream_call(delay),
+        "app.services.onboarding.tenants.fetch_actor_by_id": upstream_call(
+            delay, actor
+        ),
+        "app.services.onboarding.tenants.update_actor": upstream_call(delay),
+    }
+    for target, stub in stubs.items():
+        stack.enter_context(patch(target, stub))
+    stack.enter_context(patch("app.routes.admin.tenants.logger"))
+    stack.enter_context(patch("app.services.onboarding.tenants.logger"))
+    return actor_names
+
+
+async def time_requests(
+    request: Callable[[], Awaitable], num_requests: int
+) -> Dict[str, float]:
+    timings = []
+    for _ in range(num_requests):
+        wallet_cache.clear()
+        start = time.perf_counter()
+        await request()
+        timings.append(time.perf_counter() - start)
+
+    quantiles = statistics.quantiles(timings, n=100)
+    return {"p50_ms": quantiles[49] * 1e3, "p99_ms": quantiles[98] * 1e3}
+
+
+async def count_contended_wallets(actor_names: ActorNames, num_sign_ups: int) -> int:
+    actor_names.reserved.clear()
+    actor_names.wallets_created = 0
+    await asyncio.gather(
+        *(
+            tenants.create_tenant(
+                body=CreateTenantRequest(wallet_label="issuer", roles=["issuer"]),
+                onboard_async=False,
+                admin_auth=TENANT_ADMIN_AUTHED,
+            )
+            for _ in range(num_sign_ups)
+        ),
+        return_exceptions=True,
+    )
+    return actor_names.wallets_created
+
+
+async def run(delay_ms: float, num_requests: int, num_sign_ups: int = 10):
+    requests = {
+        "create holder": lambda: tenants.create_tenant(
+            body=CreateTenantRequest(wallet_label="label"),
+            onboard_async=False,
+            admin_auth=TENANT_ADMIN_AUTHED,
+        ),
+        "update tenant": lambda: tenants.update_tenant(
+            wallet_id=WALLET_ID,
+            body=UpdateTenantRequest(wallet_label="new label"),
+            group_id=None,
+            admin_auth=TENANT_ADMIN_AUTHED,
+        ),
+        "delete tenant": lambda: tenants.delete_tenant_by_id(
+            wallet_id=WALLET_ID, group_id=None, admin_auth=TENANT_ADMIN_AUTHED
+        ),
+    }
+
+    print(f"Upstream calls take {delay_ms}ms each")
+    print(f"{'request':<16}{'p50 (ms)':>12}{'p99 (ms)':>12}")
+    with ExitStack() as stack:
+        actor_names = stub_upstream(stack, delay_ms / 1000)
+        for name, request in requests.items():
+            result = await time_requests(request, num_requests)
+            print(f"{name:<16}{result['p50_ms']:>12.1f}{result['p99_ms']:>12.1f}")
+
+        wallets_created = await count_contended_wallets(actor_names, num_sign_ups)
+    print(
+        f"{num_sign_ups} concurrent sign-ups of one issuer label "
+        f"created {wallets_created} wallet(s)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--delay", type=float, default=10)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--sign-ups", type=int, default=10)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.delay, args.requests, args.sign_ups))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,8 @@
+import hashlib
+import time
 from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, Optional, Tuple
 
 import jwt
 from fastapi import HTTPException
@@ -6,10 +10,22 @@ from fastapi.params import Depends
 from fastapi.security import APIKeyHeader
 
 from app.dependencies.role import Role
-from shared import ACAPY_MULTITENANT_JWT_SECRET, GOVERNANCE_LABEL
+from shared import (
+    ACAPY_MULTITENANT_JWT_SECRET,
+    GOVERNANCE_LABEL,
+    JWT_CACHE_SIZE,
+    JWT_CACHE_STATS_LOG_INTERVAL,
+)
+from shared.log_config import get_logger
+from shared.util.cache import BoundedCache
+
+logger = get_logger(__name__)
 
 x_api_key_scheme = APIKeyHeader(name="x-api-key")
 
+# Seconds of clock skew allowed when checking a tenant token's expiry
+JWT_LEEWAY = 1
+
 
 @dataclass
 class AcaPyAuth:
@@ -22,6 +38,84 @@ class AcaPyAuthVerified(AcaPyAuth):
     wallet_id: str
 
 
+class VerifiedTokenCache:
+    """
+    Least recently used tenant tokens whose signature was verified, with their wallet id
+    and expiry, so that repeated requests with the same token skip decoding it.
+
+    Tokens are keyed by their SHA-256 digest. A cached token is only used until it
+    expires, with the same leeway as decoding, after which it is verified again. The
+    cache is locked, because sync dependencies run in the threadpool. Its stats are
+    logged every `log_interval` lookups.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = JWT_CACHE_SIZE,
+        log_interval: int = JWT_CACHE_STATS_LOG_INTERVAL,
+    ) -> None:
+        self._tokens: BoundedCache[bytes, Tuple[str, Optional[float]]] = BoundedCache(
+            maxsize=maxsize
+        )
+        self._lock = Lock()
+        self._log_interval = log_interval
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[str]:
+        key = hashlib.sha256(token.encode()).digest()
+        wallet_id = None
+        with self._lock:
+            entry = self._tokens.get(key)
+            if entry:
+                cached_wallet_id, expires_at = entry
+                if expires_at is None or time.time() <= expires_at + JWT_LEEWAY:
+                    wallet_id = cached_wallet_id
+                else:
+                    self._tokens.pop(key)
+            if wallet_id:
+                self.hits += 1
+            else:
+                self.misses += 1
+            stats = None
+            if (
+                self._log_interval
+                and (self.hits + self.misses) % self._log_interval == 0
+            ):
+                stats = self._stats()
+
+        if stats:
+            logger.info("Verified token cache stats: {}", stats)
+        return wallet_id
+
+    def set(self, token: str, wallet_id: str, expires_at: Optional[float]) -> None:
+        key = hashlib.sha256(token.encode()).digest()
+        with self._lock:
+            self._tokens.set(key, (wallet_id, expires_at))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tokens.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return self._stats()
+
+    def _stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._tokens),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+verified_token_cache = VerifiedTokenCache()
+
+
 def acapy_auth_from_header(api_key: str = Depends(x_api_key_scheme)) -> AcaPyAuth:
     return get_acapy_auth(api_key)
 
@@ -53,22 +147,31 @@ def get_acapy_auth_verified(auth: AcaPyAuth) -> AcaPyAuthVerified:
 
         wallet_id = GOVERNANCE_LABEL if auth.role == Role.GOVERNANCE else "admin"
     else:
-        try:
-            # Decode JWT
-            token_body = jwt.decode(
-                auth.token, ACAPY_MULTITENANT_JWT_SECRET, algorithms=["HS256"], leeway=1
-            )
-        except jwt.InvalidTokenError:
-            raise HTTPException(403, "Unauthorized")  # pylint: disable=W0707
-
-        wallet_id = token_body.get("wallet_id")
-
+        wallet_id = verified_token_cache.get(auth.token)
         if not wallet_id:
-            raise HTTPException(403, "Unauthorized")
+            wallet_id = verify_tenant_token(auth.token)
 
     return AcaPyAuthVerified(role=auth.role, token=auth.token, wallet_id=wallet_id)
 
 
+def verify_tenant_token(token: str) -> str:
+    try:
+        # Decode JWT
+        token_body = jwt.decode(
+            token, ACAPY_MULTITENANT_JWT_SECRET, algorithms=["HS256"], leeway=JWT_LEEWAY
+        )
+    except jwt.InvalidTokenError:
+        raise HTTPException(403, "Unauthorized")  # pylint: disable=W0707
+
+    wallet_id = token_body.get("wallet_id")
+
+    if not wallet_id:
+        raise HTTPException(403, "Unauthorized")
+
+    verified_token_cache.set(token, wallet_id, token_body.get("exp"))
+    return wallet_id
+
+
 def acapy_auth_governance(
     auth: AcaPyAuth = Depends(acapy_auth_from_header),
 ) -> AcaPyAuthVerified:
@@ -1,6 +1,7 @@
 import io
 import os
 import traceback
+from contextlib import asynccontextmanager
 
 import pydantic
 import yaml
@@ -28,6 +29,8 @@ from app.routes.wallet import credentials as wallet_credentials
 from app.routes.wallet import dids as wallet_dids
 from app.routes.wallet import jws as wallet_jws
 from app.routes.wallet import sd_jws as wallet_sd_jws
+from app.services.onboarding.issuer_pool import issuer_pool
+from app.services.onboarding.jobs import onboarding_jobs
 from app.util.extract_validation_error import extract_validation_error_msg
 from shared.constants import PROJECT_VERSION
 from shared.exceptions import CloudApiValueError
@@ -94,6 +97,20 @@ def acapy_cloud_description(role: str) -> str:
         return default_docs_description
 
 
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # Only instances that create tenants need issuers ready for them
+    serves_tenant_admin = tenants in routes_for_role(ROLE)
+    if serves_tenant_admin:
+        await issuer_pool.start()
+
+    yield
+
+    if serves_tenant_admin:
+        await onboarding_jobs.stop()
+        await issuer_pool.stop()
+
+
 def create_app() -> FastAPI:
     application = FastAPI(
         root_path=ROOT_PATH,
@@ -101,6 +118,7 @@ def create_app() -> FastAPI:
         version=PROJECT_VERSION,
         description=acapy_cloud_description(ROLE),
         debug=debug,
+        lifespan=lifespan,
         redoc_url=None,
         docs_url=None,
     )
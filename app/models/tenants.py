@@ -163,3 +163,36 @@ class CreateTenantResponse(Tenant, TenantAuth):
 class OnboardResult(BaseModel):
     did: str
     didcomm_invitation: Optional[str] = None
+
+
+class OnboardingJob(BaseModel):
+    job_id: str = Field(
+        ...,
+        description="The job identifier, which is the wallet ID of the tenant being onboarded.",
+        examples=["545135a4-ecbc-4400-8594-bdb74c51c88d"],
+    )
+    status: Literal["pending", "succeeded", "failed"] = Field(
+        ...,
+        description=(
+            "`pending` while onboarding runs. If onboarding `failed`, "
+            "the wallet has been deleted."
+        ),
+    )
+    error: Optional[str] = Field(None, description="Why onboarding failed.")
+    group_id: Optional[str] = Field(None, exclude=True)
+
+
+class CreateTenantJobResponse(CreateTenantResponse):
+    onboarding_job: OnboardingJob
+
+
+class BulkCreateTenantResult(BaseModel):
+    index: int = Field(
+        ..., description="The position of the tenant in the request, starting at 0."
+    )
+    status: Literal["created", "failed"]
+    tenant: Optional[CreateTenantResponse] = None
+    status_code: Optional[int] = Field(
+        None, description="The status code the tenant creation failed with."
+    )
+    detail: Optional[str] = Field(None, description="Why the tenant creation failed.")
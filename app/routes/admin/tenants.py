@@ -1,9 +1,31 @@
+import asyncio
+from contextlib import aclosing
+from logging import Logger
 from secrets import token_urlsafe
-from typing import List, Optional
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 import base58
-from aries_cloudcontroller import CreateWalletTokenRequest
-from fastapi import APIRouter, Depends, HTTPException, Query
+import orjson
+from aries_cloudcontroller import (
+    AcaPyClient,
+    CreateWalletResponse,
+    CreateWalletTokenRequest,
+    UpdateWalletRequest,
+    WalletRecordWithGroups,
+)
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
 from uuid_utils import uuid4
 
 from app.dependencies.acapy_clients import get_tenant_admin_controller
@@ -19,18 +41,27 @@ from app.exceptions import (
     handle_model_with_validation,
 )
 from app.models.tenants import (
+    BulkCreateTenantResult,
+    CreateTenantJobResponse,
     CreateTenantRequest,
     CreateTenantResponse,
     CreateWalletRequestWithGroups,
+    OnboardingJob,
     Tenant,
     TenantAuth,
     UpdateTenantRequest,
 )
+from app.services.event_handling.sse import SSE_PING_PERIOD
+from app.services.onboarding.issuer_pool import issuer_pool
+from app.services.onboarding.jobs import onboarding_jobs
 from app.services.onboarding.tenants import handle_tenant_update, onboard_tenant
 from app.services.trust_registry.actors import (
     fetch_actor_by_id,
     register_actor,
+    register_actors,
+    release_actor_name,
     remove_actor_by_id,
+    reserve_actor_name,
 )
 from app.services.trust_registry.util.actor import assert_actor_name
 from app.util.pagination import (
@@ -40,9 +71,23 @@ from app.util.pagination import (
     order_by_query_parameter,
 )
 from app.util.tenants import (
+    TenantCursor,
+    assert_wallet_in_group,
+    cache_wallet,
+    evict_wallet,
     get_wallet_and_assert_valid_group,
+    iter_wallets,
     tenant_from_wallet_record,
 )
+from shared import (
+    BULK_TENANT_CONCURRENCY,
+    BULK_TENANT_MAX_CONCURRENCY,
+    BULK_TENANT_REGISTRATION_BATCH_SIZE,
+    BULK_TENANT_REGISTRATION_MAX_WAIT,
+    ONBOARDING_JOB_TTL,
+    TENANT_EXPORT_PAGE_SIZE,
+)
+from shared.exceptions import CloudApiValueError
 from shared.log_config import get_logger
 from shared.models.trustregistry import Actor
 
@@ -50,6 +95,12 @@ logger = get_logger(__name__)
 
 router = APIRouter(prefix="/v1/tenants", tags=["admin: tenants"])
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# Bulk creations completing the tenants in progress after their client disconnected
+_stopped_bulk_creations: Set[asyncio.Task] = set()
+# Response header with the cursor to fetch the next page of tenants
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 
 group_id_query: Optional[str] = Query(
     default=None,
@@ -58,9 +109,21 @@ group_id_query: Optional[str] = Query(
 )
 
 
-@router.post("", response_model=CreateTenantResponse, summary="Create New Tenant")
+@router.post(
+    "",
+    response_model=CreateTenantResponse,
+    responses={202: {"model": CreateTenantJobResponse}},
+    summary="Create New Tenant",
+)
 async def create_tenant(
     body: CreateTenantRequest,
+    onboard_async: bool = Query(
+        default=False,
+        description=(
+            "Respond with 202 once the wallet is created, "
+            "and onboard the issuer or verifier in a background job"
+        ),
+    ),
     admin_auth: AcaPyAuthVerified = Depends(acapy_auth_tenant_admin),
 ) -> CreateTenantResponse:
     """
@@ -91,6 +154,11 @@ async def create_tenant(
 
     `extra_settings` is an optional field intended for advanced users, which allows configuring wallet behaviour.
 
+    Onboarding an issuer can take up to a minute. With `onboard_async=true`, the Tenant is returned with status 202
+    as soon as the wallet is created, along with an `onboarding_job`. Its status can be fetched from
+    `GET /v1/tenants/jobs/{job_id}`, or awaited on `GET /v1/tenants/jobs/{job_id}/sse`. If onboarding fails, the
+    wallet is deleted.
+
     Request body:
     ---
         body: CreateTenantRequest
@@ -122,8 +190,46 @@ async def create_tenant(
 
     roles = body.roles
     wallet_label = body.wallet_label
-    wallet_name = body.wallet_name or uuid4().hex
 
+    async with get_tenant_admin_controller(admin_auth) as admin_controller:
+        wallet_response, wallet_name, reservation_id = await _create_tenant_wallet(
+            admin_controller=admin_controller, body=body, bound_logger=bound_logger
+        )
+
+        if roles and not onboard_async:
+            await _onboard_and_register_actor(
+                admin_controller=admin_controller,
+                body=body,
+                wallet_response=wallet_response,
+                bound_logger=bound_logger,
+                reservation_id=reservation_id,
+            )
+
+    response = _tenant_response(body, wallet_name, wallet_response)
+    if roles and onboard_async:
+        bound_logger.debug("Onboarding `{}` in background job", wallet_label)
+        onboarding_job = onboarding_jobs.start(
+            job_id=wallet_response.wallet_id,
+            onboarding=_onboard_in_background(
+                admin_auth=admin_auth,
+                body=body,
+                wallet_response=wallet_response,
+                bound_logger=bound_logger,
+                reservation_id=reservation_id,
+            ),
+            group_id=body.group_id,
+        )
+        job_response = CreateTenantJobResponse(
+            **response.model_dump(), onboarding_job=onboarding_job
+        )
+        bound_logger.debug("Successfully created tenant; onboarding started.")
+        return JSONResponse(status_code=202, content=job_response.model_dump())
+
+    bound_logger.debug("Successfully created tenant.")
+    return response
+
+
+async def _assert_actor_name_available(wallet_label: str, bound_logger: Logger) -> None:
     bound_logger.debug("Assert that requested label is not used in trust registry")
     try:
         actor_name_exists = await assert_actor_name(wallet_label)
@@ -141,94 +247,181 @@ async def create_tenant(
         )
     bound_logger.debug("Actor name is unique")
 
-    wallet_response = None
+
+async def _reserve_actor_name(wallet_label: str, bound_logger: Logger) -> str:
+    bound_logger.debug("Reserve requested label as actor name in trust registry")
+    try:
+        reservation = await reserve_actor_name(wallet_label)
+    except TrustRegistryException as e:
+        if e.status_code == 409:
+            bound_logger.info("Actor name is taken or reserved; can't create wallet")
+            raise HTTPException(
+                409,
+                f"Can't create Tenant. The label `{wallet_label}` may not "
+                "be re-used because it exists on the trust registry.",
+            ) from e
+        raise CloudApiException(
+            "An error occurred when trying to register actor. Please try again"
+        ) from e
+
+    bound_logger.debug("Actor name is reserved")
+    return reservation.id
+
+
+async def _try_release_actor_name(reservation_id: str, bound_logger: Logger) -> None:
+    # The reservation expires regardless, so releasing it early is best-effort
+    try:
+        await release_actor_name(reservation_id)
+    except Exception:  # pylint: disable=W0718
+        bound_logger.exception("Could not release actor name `{}`.", reservation_id)
+
+
+async def _create_tenant_wallet(
+    admin_controller: AcaPyClient,
+    body: CreateTenantRequest,
+    bound_logger: Logger,
+) -> Tuple[CreateWalletResponse, str, Optional[str]]:
+    """
+    Create or assign the tenant's wallet, once its label is known not to be used by
+    an actor. Returns the wallet, its name, and the ID of the actor name reservation.
+
+    The label of an issuer or verifier is reserved as its actor name before the wallet
+    is created, so that of concurrent requests for a label, only one creates a wallet.
+    The reservation is released if the wallet can't be created. The label of a tenant
+    without roles is only checked, concurrently with creating the wallet, which is
+    deleted again if the label is taken.
+    """
+    if body.roles:
+        reservation_id = await _reserve_actor_name(body.wallet_label, bound_logger)
+        try:
+            wallet_response, wallet_name = await _create_or_assign_wallet(
+                admin_controller=admin_controller,
+                body=body,
+                bound_logger=bound_logger,
+            )
+        except Exception:
+            await _try_release_actor_name(reservation_id, bound_logger)
+            raise
+        return wallet_response, wallet_name, reservation_id
+
+    name_check, wallet_creation = await asyncio.gather(
+        _assert_actor_name_available(body.wallet_label, bound_logger),
+        _create_or_assign_wallet(
+            admin_controller=admin_controller, body=body, bound_logger=bound_logger
+        ),
+        return_exceptions=True,
+    )
+
+    if isinstance(wallet_creation, BaseException):
+        # A taken label is reported before a failure to create the wallet
+        if isinstance(name_check, BaseException):
+            raise name_check
+        raise wallet_creation
+
+    if isinstance(name_check, BaseException):
+        wallet_response, _ = wallet_creation
+        bound_logger.info("Label can't be used; deleting created wallet")
+        await _try_delete_wallet(
+            admin_controller, wallet_response.wallet_id, bound_logger
+        )
+        raise name_check
+
+    wallet_response, wallet_name = wallet_creation
+    return wallet_response, wallet_name, None
+
+
+async def _create_or_assign_wallet(
+    admin_controller: AcaPyClient,
+    body: CreateTenantRequest,
+    bound_logger: Logger,
+) -> Tuple[CreateWalletResponse, str]:
+    """
+    Create the tenant's wallet, or assign it an onboarded issuer wallet from the issuer
+    pool if one is available. Returns the wallet and its name.
+    """
+    pooled_issuer = issuer_pool.take(body)
+    if pooled_issuer:
+        wallet_id = pooled_issuer.wallet.wallet_id
+        try:
+            bound_logger.debug("Assigning pooled issuer wallet `{}`", wallet_id)
+            wallet = await handle_acapy_call(
+                logger=bound_logger,
+                acapy_call=admin_controller.multitenancy.update_wallet,
+                wallet_id=wallet_id,
+                body=UpdateWalletRequest(
+                    label=body.wallet_label, image_url=body.image_url
+                ),
+            )
+            await issuer_pool.label_assigned(pooled_issuer, body.wallet_label)
+            wallet_response = pooled_issuer.wallet.model_copy(
+                update={"updated_at": wallet.updated_at}
+            )
+            return wallet_response, pooled_issuer.wallet_name
+        except CloudApiException as e:
+            bound_logger.warning(
+                "Could not assign pooled issuer wallet: {}. Creating a new wallet.",
+                e.detail,
+            )
+            await _try_delete_wallet(admin_controller, wallet_id, bound_logger)
+
+    wallet_name = body.wallet_name or uuid4().hex
+    wallet_response = await _create_wallet(
+        admin_controller=admin_controller,
+        body=body,
+        wallet_name=wallet_name,
+        bound_logger=bound_logger,
+    )
+    return wallet_response, wallet_name
+
+
+async def _create_wallet(
+    admin_controller: AcaPyClient,
+    body: CreateTenantRequest,
+    wallet_name: str,
+    bound_logger: Logger,
+) -> CreateWalletResponse:
     body_request = handle_model_with_validation(
         logger=bound_logger,
         model_class=CreateWalletRequestWithGroups,
         image_url=body.image_url,
         key_management_mode="managed",
-        label=wallet_label,
+        label=body.wallet_label,
         wallet_key=base58.b58encode(token_urlsafe(48)).decode(),
         wallet_name=wallet_name,
         wallet_type="askar",
         group_id=body.group_id,
         extra_settings=body.extra_settings,
     )
-    async with get_tenant_admin_controller(admin_auth) as admin_controller:
-        try:
-            bound_logger.debug("Creating wallet")
-            wallet_response = await handle_acapy_call(
-                logger=bound_logger,
-                acapy_call=admin_controller.multitenancy.create_wallet,
-                body=body_request,
-            )
-        except CloudApiException as e:
-            bound_logger.info(
-                "Error while trying to create wallet: `{}`",
-                e.detail,
-            )
-            if e.status_code == 400 and "already exists" in e.detail:
-                raise HTTPException(
-                    409,
-                    f"A wallet with name `{wallet_name}` already exists. "
-                    "The wallet name must be unique.",
-                ) from e
-            raise
+    try:
+        bound_logger.debug("Creating wallet")
+        wallet_response = await handle_acapy_call(
+            logger=bound_logger,
+            acapy_call=admin_controller.multitenancy.create_wallet,
+            body=body_request,
+        )
+    except CloudApiException as e:
+        bound_logger.info(
+            "Error while trying to create wallet: `{}`",
+            e.detail,
+        )
+        if e.status_code == 400 and "already exists" in e.detail:
+            raise HTTPException(
+                409,
+                f"A wallet with name `{wallet_name}` already exists. "
+                "The wallet name must be unique.",
+            ) from e
+        raise
 
-        bound_logger.debug("Wallet creation successful")
+    bound_logger.debug("Wallet creation successful")
+    return wallet_response
 
-        try:
-            if roles:
-                bound_logger.debug(
-                    "Onboarding `{}` with requested roles: `{}`", wallet_label, roles
-                )
-                onboard_result = await onboard_tenant(
-                    tenant_label=wallet_label,
-                    roles=roles,
-                    wallet_auth_token=wallet_response.token,
-                    wallet_id=wallet_response.wallet_id,
-                )
-                bound_logger.debug("Registering actor in the trust registry")
-                await register_actor(
-                    actor=Actor(
-                        id=wallet_response.wallet_id,
-                        name=wallet_label,
-                        roles=roles,
-                        did=onboard_result.did,
-                        didcomm_invitation=onboard_result.didcomm_invitation,
-                        image_url=body.image_url,
-                    )
-                )
-        except HTTPException as http_error:
-            bound_logger.error("Could not register actor: {}", http_error.detail)
-            if wallet_response:
-                bound_logger.info(
-                    "Stray wallet was created for unregistered actor; deleting wallet"
-                )
-                await handle_acapy_call(
-                    logger=bound_logger,
-                    acapy_call=admin_controller.multitenancy.delete_wallet,
-                    wallet_id=wallet_response.wallet_id,
-                )
-                bound_logger.info("Wallet deleted.")
-            raise
-        except Exception:
-            bound_logger.exception("An unhandled exception occurred")
-            if wallet_response:
-                bound_logger.info(
-                    "Could not register actor, but wallet was created; deleting wallet"
-                )
-                await handle_acapy_call(
-                    logger=bound_logger,
-                    acapy_call=admin_controller.multitenancy.delete_wallet,
-                    wallet_id=wallet_response.wallet_id,
-                )
-                bound_logger.info("Wallet deleted.")
-            raise
 
-    response = CreateTenantResponse(
+def _tenant_response(
+    body: CreateTenantRequest, wallet_name: str, wallet_response: CreateWalletResponse
+) -> CreateTenantResponse:
+    return CreateTenantResponse(
         wallet_id=wallet_response.wallet_id,
-        wallet_label=wallet_label,
+        wallet_label=body.wallet_label,
         wallet_name=wallet_name,
         created_at=wallet_response.created_at,
         image_url=body.image_url,
@@ -236,8 +429,591 @@ async def create_tenant(
         access_token=tenant_api_key(wallet_response.token),
         group_id=body.group_id,
     )
-    bound_logger.debug("Successfully created tenant.")
-    return response
+
+
+async def _onboard_actor(
+    body: CreateTenantRequest,
+    wallet_response: CreateWalletResponse,
+    bound_logger: Logger,
+) -> Actor:
+    """Onboard a new tenant with its requested roles, returning it as an actor."""
+    bound_logger.debug(
+        "Onboarding `{}` with requested roles: `{}`", body.wallet_label, body.roles
+    )
+    onboard_result = await onboard_tenant(
+        tenant_label=body.wallet_label,
+        roles=body.roles,
+        wallet_auth_token=wallet_response.token,
+        wallet_id=wallet_response.wallet_id,
+    )
+    return Actor(
+        id=wallet_response.wallet_id,
+        name=body.wallet_label,
+        roles=body.roles,
+        did=onboard_result.did,
+        didcomm_invitation=onboard_result.didcomm_invitation,
+        image_url=body.image_url,
+    )
+
+
+async def _delete_wallet(
+    admin_controller: AcaPyClient, wallet_id: str, bound_logger: Logger
+) -> None:
+    await handle_acapy_call(
+        logger=bound_logger,
+        acapy_call=admin_controller.multitenancy.delete_wallet,
+        wallet_id=wallet_id,
+    )
+    bound_logger.info("Wallet deleted.")
+
+
+async def _onboard_and_register_actor(
+    admin_controller: AcaPyClient,
+    body: CreateTenantRequest,
+    wallet_response: CreateWalletResponse,
+    bound_logger: Logger,
+    reservation_id: Optional[str] = None,
+) -> None:
+    """
+    Onboard a new tenant with its requested roles and register it in the trust registry,
+    which consumes the reservation of its actor name. If this fails, the actor name is
+    released and the wallet is deleted.
+    """
+    try:
+        actor = await _onboard_actor(body, wallet_response, bound_logger)
+        bound_logger.debug("Registering actor in the trust registry")
+        await register_actor(actor=actor, reservation_id=reservation_id)
+    except HTTPException as http_error:
+        bound_logger.error("Could not register actor: {}", http_error.detail)
+        bound_logger.info(
+            "Stray wallet was created for unregistered actor; deleting wallet"
+        )
+        if reservation_id:
+            await _try_release_actor_name(reservation_id, bound_logger)
+        await _delete_wallet(admin_controller, wallet_response.wallet_id, bound_logger)
+        raise
+    except Exception:
+        bound_logger.exception("An unhandled exception occurred")
+        bound_logger.info(
+            "Could not register actor, but wallet was created; deleting wallet"
+        )
+        if reservation_id:
+            await _try_release_actor_name(reservation_id, bound_logger)
+        await _delete_wallet(admin_controller, wallet_response.wallet_id, bound_logger)
+        raise
+
+
+async def _onboard_in_background(
+    admin_auth: AcaPyAuthVerified,
+    body: CreateTenantRequest,
+    wallet_response: CreateWalletResponse,
+    bound_logger: Logger,
+    reservation_id: Optional[str] = None,
+) -> None:
+    async with get_tenant_admin_controller(admin_auth) as admin_controller:
+        await _onboard_and_register_actor(
+            admin_controller=admin_controller,
+            body=body,
+            wallet_response=wallet_response,
+            bound_logger=bound_logger,
+            reservation_id=reservation_id,
+        )
+
+
+def _with_job_ttl_doc(endpoint: Callable) -> Callable:
+    """Fill in the configured onboarding job TTL in the endpoint's docs."""
+    endpoint.__doc__ = endpoint.__doc__.replace("{job_ttl}", f"{ONBOARDING_JOB_TTL:g}")
+    return endpoint
+
+
+def _get_onboarding_job(
+    job_id: str, group_id: Optional[str], bound_logger: Logger
+) -> OnboardingJob:
+    job = onboarding_jobs.get(job_id)
+    # 404 for jobs outside the group, to obscure their existence
+    if not job or (group_id and job.group_id != group_id):
+        bound_logger.info("Bad request: Onboarding job not found.")
+        raise HTTPException(404, f"Onboarding job with id `{job_id}` not found.")
+    return job
+
+
+async def _onboarding_job_events(job_id: str) -> AsyncGenerator[str, None]:
+    done = asyncio.create_task(onboarding_jobs.wait(job_id))
+    try:
+        while not done.done():
+            await asyncio.wait([done], timeout=SSE_PING_PERIOD)
+            if not done.done():
+                yield ": ping\n\n"
+        yield f"data: {done.result().model_dump_json()}\n\n"
+    finally:
+        done.cancel()
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=OnboardingJob,
+    summary="Get Tenant Onboarding Job",
+)
+@_with_job_ttl_doc
+async def get_onboarding_job(
+    job_id: str,
+    group_id: Optional[str] = group_id_query,
+    admin_auth: AcaPyAuthVerified = Depends(  # pylint: disable=unused-argument
+        acapy_auth_tenant_admin
+    ),
+) -> OnboardingJob:
+    """
+    Get Tenant Onboarding Job
+    ---
+
+    Fetch the status of an onboarding job, started by creating an issuer or verifier with `onboard_async`.
+    The job ID is the wallet ID of the new tenant.
+
+    Jobs are kept for {job_ttl} seconds after their last update, in the memory of the instance that runs them.
+    With more than one instance, requests for a job must be routed to the instance that created the tenant.
+
+    Request parameters:
+    ---
+        job_id: str
+            The ID of the onboarding job.
+
+    Response body:
+    ---
+        OnboardingJob
+            job_id: str
+            status: str
+                `pending`, `succeeded` or `failed`.
+            error: Optional[str]
+    """
+    bound_logger = logger.bind(body={"job_id": job_id})
+    bound_logger.debug("GET request received: Fetch onboarding job")
+
+    return _get_onboarding_job(job_id, group_id, bound_logger)
+
+
+@router.get(
+    "/jobs/{job_id}/sse",
+    response_class=StreamingResponse,
+    summary="Wait for Tenant Onboarding Job to Complete",
+)
+async def sse_onboarding_job(
+    job_id: str,
+    group_id: Optional[str] = group_id_query,
+    admin_auth: AcaPyAuthVerified = Depends(  # pylint: disable=unused-argument
+        acapy_auth_tenant_admin
+    ),
+) -> StreamingResponse:
+    """
+    Wait for Tenant Onboarding Job to Complete
+    ---
+
+    Server-sent event stream that emits the onboarding job once it has succeeded or failed,
+    and then closes. Until then, a ping comment is sent every 15 seconds.
+
+    Request parameters:
+    ---
+        job_id: str
+            The ID of the onboarding job.
+    """
+    bound_logger = logger.bind(body={"job_id": job_id})
+    bound_logger.debug("GET request received: Subscribe to onboarding job")
+
+    _get_onboarding_job(job_id, group_id, bound_logger)
+
+    return StreamingResponse(
+        _onboarding_job_events(job_id), media_type="text/event-stream"
+    )
+
+
+@router.post(
+    "/bulk",
+    response_class=StreamingResponse,
+    summary="Create New Tenants in Bulk",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/CreateTenantRequest"},
+                    }
+                },
+                NDJSON_MEDIA_TYPE: {
+                    "schema": {"$ref": "#/components/schemas/CreateTenantRequest"}
+                },
+            },
+        }
+    },
+)
+async def create_tenants_bulk(
+    request: Request,
+    concurrency: int = Query(
+        default=BULK_TENANT_CONCURRENCY,
+        ge=1,
+        le=BULK_TENANT_MAX_CONCURRENCY,
+        description="The number of tenants to create at the same time",
+    ),
+    admin_auth: AcaPyAuthVerified = Depends(acapy_auth_tenant_admin),
+) -> StreamingResponse:
+    """
+    Create New Tenants in Bulk
+    ---
+
+    Use this endpoint to create many tenants in one request. The request body is either a JSON list of
+    `CreateTenantRequest`, or NDJSON with one `CreateTenantRequest` per line (content type `application/x-ndjson`).
+    NDJSON is parsed line by line as it is received, and is preferred for large requests.
+
+    Each tenant is created as with `POST /v1/tenants`, with up to `concurrency` tenants being created at a time.
+    Issuers and verifiers are registered in the trust registry in batches.
+
+    The response is streamed as NDJSON, with one result per tenant as soon as it is created or has failed. Results
+    are not in request order, but their `index` is the tenant's position in the request. If a tenant fails, its
+    wallet is deleted, and the other tenants are unaffected. If the client disconnects, no more tenants are started,
+    and the tenants in progress are completed.
+
+    Request parameters:
+    ---
+        concurrency: int
+            The number of tenants to create at the same time.
+
+    Response body:
+    ---
+        BulkCreateTenantResult (one per line)
+            index: int
+            status: str
+                `created` or `failed`.
+            tenant: Optional[CreateTenantResponse]
+            status_code: Optional[int]
+            detail: Optional[str]
+    """
+    bound_logger = logger.bind(body={"concurrency": concurrency})
+    bound_logger.debug("POST request received: Starting bulk tenant creation")
+
+    bodies = await _read_bulk_tenants(request)
+    bound_logger.debug("Creating {} tenants", len(bodies))
+
+    return StreamingResponse(
+        _create_tenants(admin_auth, bodies, concurrency),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
+async def _read_bulk_tenants(
+    request: Request,
+) -> List[Union[CreateTenantRequest, HTTPException]]:
+    """
+    Read the tenants of a bulk request. NDJSON is parsed line by line while it is
+    received. A tenant that is not valid is returned as the error to report for it.
+    """
+    if request.headers.get("content-type", "").startswith(NDJSON_MEDIA_TYPE):
+        return [
+            _parse_bulk_tenant(line) async for line in _ndjson_lines(request.stream())
+        ]
+
+    try:
+        items = orjson.loads(await request.body())
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(422, f"Could not parse request body: {e}.") from e
+    if not isinstance(items, list):
+        raise HTTPException(422, "Expected a list of tenants, or NDJSON.")
+    return [_parse_bulk_tenant(item) for item in items]
+
+
+async def _ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncGenerator[bytes, None]:
+    """The non-empty lines of a stream of NDJSON."""
+    partial_line = b""
+    async for chunk in chunks:
+        *lines, partial_line = (partial_line + chunk).split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if partial_line.strip():
+        yield partial_line
+
+
+def _parse_bulk_tenant(item: Any) -> Union[CreateTenantRequest, HTTPException]:
+    try:
+        if isinstance(item, bytes):
+            return CreateTenantRequest.model_validate_json(item)
+        return CreateTenantRequest.model_validate(item)
+    except ValidationError as e:
+        return HTTPException(422, str(e))
+    except CloudApiValueError as e:
+        return HTTPException(422, e.detail)
+
+
+async def _create_tenants(
+    admin_auth: AcaPyAuthVerified,
+    bodies: List[Union[CreateTenantRequest, HTTPException]],
+    concurrency: int,
+) -> AsyncGenerator[str, None]:
+    results: asyncio.Queue[Optional[BulkCreateTenantResult]] = asyncio.Queue()
+    stopped = asyncio.Event()
+
+    creation = asyncio.create_task(
+        _create_bulk_tenants(admin_auth, bodies, concurrency, results, stopped)
+    )
+    # None marks the end of the results, also if creation fails unexpectedly
+    creation.add_done_callback(lambda _: results.put_nowait(None))
+    try:
+        while (result := await results.get()) is not None:
+            yield result.model_dump_json() + "\n"
+        await creation
+    finally:
+        if not creation.done():
+            # The client went away. Start no more tenants, but let those in progress
+            # complete, so that no wallet or name reservation is left behind.
+            logger.warning("Bulk tenant creation stopped, as the client disconnected")
+            stopped.set()
+            _stopped_bulk_creations.add(creation)
+            creation.add_done_callback(_stopped_bulk_creations.discard)
+
+
+async def _create_bulk_tenants(
+    admin_auth: AcaPyAuthVerified,
+    bodies: List[Union[CreateTenantRequest, HTTPException]],
+    concurrency: int,
+    results: "asyncio.Queue[Optional[BulkCreateTenantResult]]",
+    stopped: asyncio.Event,
+) -> None:
+    """
+    Create the tenants, putting the result of each on the queue. Onboarded actors are
+    registered in batches, which are submitted once they hold
+    `BULK_TENANT_REGISTRATION_BATCH_SIZE` actors, once no other tenant is being created,
+    or `BULK_TENANT_REGISTRATION_MAX_WAIT` seconds after their first actor was added.
+    Once stopped, no more tenants are started, and those in progress are completed and
+    registered.
+    """
+    async with get_tenant_admin_controller(admin_auth) as admin_controller:
+        semaphore = asyncio.Semaphore(concurrency)
+        registrations: List[Tuple[int, CreateTenantResponse, Actor, str]] = []
+        registering: Set[asyncio.Task] = set()
+        flush_timer: Optional[asyncio.TimerHandle] = None
+        creating = 0
+
+        async def create(index: int, body: Union[CreateTenantRequest, HTTPException]):
+            nonlocal creating, flush_timer
+            if isinstance(body, HTTPException):
+                results.put_nowait(_failed_tenant_result(index, body))
+                return
+
+            bound_logger = logger.bind(body=body)
+            async with semaphore:
+                if stopped.is_set():
+                    return
+                creating += 1
+                try:
+                    tenant, actor, reservation_id = await _create_bulk_tenant(
+                        admin_controller, body, bound_logger
+                    )
+                except Exception as e:  # pylint: disable=W0718
+                    results.put_nowait(_failed_tenant_result(index, e))
+                    return
+                finally:
+                    creating -= 1
+
+            if not actor:
+                results.put_nowait(
+                    BulkCreateTenantResult(index=index, status="created", tenant=tenant)
+                )
+                return
+
+            registrations.append((index, tenant, actor, reservation_id))
+            if (
+                len(registrations) >= BULK_TENANT_REGISTRATION_BATCH_SIZE
+                or not creating
+            ):
+                flush()
+            elif not flush_timer:
+                flush_timer = asyncio.get_running_loop().call_later(
+                    BULK_TENANT_REGISTRATION_MAX_WAIT, flush
+                )
+
+        def flush():
+            nonlocal flush_timer
+            if flush_timer:
+                flush_timer.cancel()
+                flush_timer = None
+            if registrations:
+                task = asyncio.create_task(register(registrations.copy()))
+                registrations.clear()
+                registering.add(task)
+                task.add_done_callback(registering.discard)
+
+        async def register(batch: List[Tuple[int, CreateTenantResponse, Actor, str]]):
+            actors = [actor for _, _, actor, _ in batch]
+            logger.debug("Registering batch of {} actors", len(actors))
+            try:
+                failures = await register_actors(
+                    actors,
+                    reservation_ids={
+                        actor.id: reservation_id
+                        for _, _, actor, reservation_id in batch
+                    },
+                )
+            except TrustRegistryException as e:
+                failures = {actor.id: e for actor in actors}
+            except Exception as e:  # pylint: disable=W0718
+                logger.exception("Could not register batch of actors")
+                error = TrustRegistryException(
+                    f"Error registering actors: `{e!r}`.", 500
+                )
+                failures = {actor.id: error for actor in actors}
+
+            for index, tenant, actor, reservation_id in batch:
+                error = failures.get(actor.id)
+                if error:
+                    bound_logger = logger.bind(body={"wallet_id": tenant.wallet_id})
+                    bound_logger.error("Could not register actor: {}", error.detail)
+                    await _try_release_actor_name(reservation_id, bound_logger)
+                    await _try_delete_wallet(
+                        admin_controller, tenant.wallet_id, bound_logger
+                    )
+                    results.put_nowait(_failed_tenant_result(index, error))
+                else:
+                    results.put_nowait(
+                        BulkCreateTenantResult(
+                            index=index, status="created", tenant=tenant
+                        )
+                    )
+
+        try:
+            await asyncio.gather(
+                *(create(index, body) for index, body in enumerate(bodies))
+            )
+        finally:
+            # Whatever happened, the onboarded actors are registered or cleaned up
+            flush()
+            while registering:
+                await asyncio.gather(*registering)
+
+
+async def _create_bulk_tenant(
+    admin_controller: AcaPyClient,
+    body: CreateTenantRequest,
+    bound_logger: Logger,
+) -> Tuple[CreateTenantResponse, Optional[Actor], Optional[str]]:
+    """
+    Create a tenant of a bulk request, and onboard it if it has roles. The actor to
+    register and the reservation of its name are returned for onboarded tenants. If
+    onboarding fails, the name is released and the wallet is deleted.
+    """
+    wallet_response, wallet_name, reservation_id = await _create_tenant_wallet(
+        admin_controller=admin_controller, body=body, bound_logger=bound_logger
+    )
+    tenant = _tenant_response(body, wallet_name, wallet_response)
+    if not body.roles:
+        return tenant, None, None
+
+    try:
+        actor = await _onboard_actor(body, wallet_response, bound_logger)
+    except Exception:
+        bound_logger.exception("Could not onboard tenant; deleting wallet")
+        await _try_release_actor_name(reservation_id, bound_logger)
+        await _try_delete_wallet(
+            admin_controller, wallet_response.wallet_id, bound_logger
+        )
+        raise
+    return tenant, actor, reservation_id
+
+
+async def _try_delete_wallet(
+    admin_controller: AcaPyClient, wallet_id: str, bound_logger: Logger
+) -> None:
+    # Cleaning up is best-effort, so that it does not fail the request or other tenants
+    try:
+        await _delete_wallet(admin_controller, wallet_id, bound_logger)
+    except Exception:  # pylint: disable=W0718
+        bound_logger.exception("Could not delete wallet `{}`.", wallet_id)
+
+
+def _failed_tenant_result(index: int, error: Exception) -> BulkCreateTenantResult:
+    if isinstance(error, HTTPException):
+        return BulkCreateTenantResult(
+            index=index,
+            status="failed",
+            status_code=error.status_code,
+            detail=str(error.detail),
+        )
+    return BulkCreateTenantResult(
+        index=index, status="failed", status_code=500, detail=str(error)
+    )
+
+
+@router.get("/export", summary="Export Tenants as NDJSON")
+async def export_tenants(
+    wallet_name: Optional[str] = None,
+    group_id: Optional[str] = group_id_query,
+    descending: bool = descending_query_parameter,
+    admin_auth: AcaPyAuthVerified = Depends(acapy_auth_tenant_admin),
+) -> StreamingResponse:
+    """
+    Export all Tenants as NDJSON
+    ---
+
+    Streams every tenant, or those filtered by wallet name, as one JSON object per line.
+    Tenants are fetched page by page while streaming, so any number of tenants can be
+    exported. Tenants created during the export are not repeated.
+
+    Optional Request Parameters:
+    ---
+        wallet_name: str
+            Filter by wallet name.
+        descending: bool
+            Whether to return results in descending order or not. Defaults to true (newest first).
+
+    Response body:
+    ---
+        NDJSON stream of Tenant
+            wallet_id: str
+            wallet_label: str
+            wallet_name: str
+            created_at: str
+            updated_at: Optional[str]
+            image_url: Optional[str]
+            group_id: Optional[str]
+    """
+    bound_logger = logger.bind(body={"wallet_name": wallet_name, "group_id": group_id})
+    bound_logger.debug("GET request received: Export tenants")
+
+    return StreamingResponse(
+        _export_tenants(
+            admin_auth=admin_auth,
+            wallet_name=wallet_name,
+            group_id=group_id,
+            descending=descending,
+            bound_logger=bound_logger,
+        ),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
+async def _export_tenants(
+    *,
+    admin_auth: AcaPyAuthVerified,
+    wallet_name: Optional[str],
+    group_id: Optional[str],
+    descending: bool,
+    bound_logger: Logger,
+) -> AsyncGenerator[str, None]:
+    exported = 0
+    async with get_tenant_admin_controller(admin_auth) as admin_controller:
+        async with aclosing(
+            iter_wallets(
+                admin_controller,
+                cursor=None,
+                descending=descending,
+                page_size=TENANT_EXPORT_PAGE_SIZE,
+                wallet_name=wallet_name,
+                group_id=group_id,
+                logger=bound_logger,
+            )
+        ) as wallets:
+            async for wallet, _ in wallets:
+                exported += 1
+                yield tenant_from_wallet_record(wallet).model_dump_json() + "\n"
+    bound_logger.debug("Successfully exported {} tenants.", exported)
 
 
 @router.delete("/{wallet_id}", summary="Delete a Tenant by Wallet ID", status_code=204)
@@ -267,21 +1043,31 @@ async def delete_tenant_by_id(
     bound_logger.debug("DELETE request received: Deleting tenant by id")
 
     async with get_tenant_admin_controller(admin_auth) as admin_controller:
-        await get_wallet_and_assert_valid_group(
-            admin_controller=admin_controller,
-            wallet_id=wallet_id,
-            group_id=group_id,
-            logger=bound_logger,
-        )
-
         # wallet_id is the id of the actor in the trust registry.
         # This makes it a lot easier to link a tenant to an actor
         # in the trust registry, especially if the tenant does not have
         # a public did.
-        bound_logger.debug("Retrieving tenant from trust registry")
-        actor = await fetch_actor_by_id(wallet_id)
-
-        # Remove actor if found
+        # The actor is only read while the wallet's group is asserted, so both can run
+        # at once; nothing is removed before the group is confirmed.
+        bound_logger.debug("Asserting group and retrieving tenant from trust registry")
+        group_check, actor = await asyncio.gather(
+            assert_wallet_in_group(
+                admin_controller=admin_controller,
+                wallet_id=wallet_id,
+                group_id=group_id,
+                logger=bound_logger,
+            ),
+            fetch_actor_by_id(wallet_id),
+            return_exceptions=True,
+        )
+        # A wallet outside the group is reported before a failed actor lookup
+        for result in (group_check, actor):
+            if isinstance(result, BaseException):
+                raise result
+
+        # Remove actor if found. This completes before the wallet is deleted, which can't
+        # be undone, so that a failure leaves the tenant in place rather than an actor
+        # without a wallet
         if actor:
             bound_logger.debug("Actor found, removing from trust registry")
             await remove_actor_by_id(wallet_id)
@@ -292,6 +1078,7 @@ async def delete_tenant_by_id(
             acapy_call=admin_controller.multitenancy.delete_wallet,
             wallet_id=wallet_id,
         )
+        evict_wallet(wallet_id)
         bound_logger.debug("Successfully deleted tenant.")
 
 
@@ -327,7 +1114,7 @@ async def get_wallet_auth_token(
     bound_logger.debug("GET request received: Access token for tenant")
 
     async with get_tenant_admin_controller(admin_auth) as admin_controller:
-        await get_wallet_and_assert_valid_group(
+        await assert_wallet_in_group(
             admin_controller=admin_controller,
             wallet_id=wallet_id,
             group_id=group_id,
@@ -378,7 +1165,7 @@ async def post_wallet_auth_token(
     bound_logger.debug("GET request received: Access token for tenant")
 
     async with get_tenant_admin_controller(admin_auth) as admin_controller:
-        await get_wallet_and_assert_valid_group(
+        await assert_wallet_in_group(
             admin_controller=admin_controller,
             wallet_id=wallet_id,
             group_id=group_id,
@@ -445,16 +1232,19 @@ async def update_tenant(
     bound_logger.debug("PUT request received: Update tenant")
 
     async with get_tenant_admin_controller(admin_auth) as admin_controller:
-        await get_wallet_and_assert_valid_group(
+        await assert_wallet_in_group(
             admin_controller=admin_controller,
             wallet_id=wallet_id,
             group_id=group_id,
             logger=bound_logger,
         )
 
+        # Dropped first, so a failed update cannot leave an outdated label cached
+        evict_wallet(wallet_id)
         wallet = await handle_tenant_update(
             admin_controller=admin_controller, wallet_id=wallet_id, update_request=body
         )
+        cache_wallet(wallet)
 
     response = tenant_from_wallet_record(wallet)
     bound_logger.debug("Successfully updated tenant.")
@@ -507,12 +1297,20 @@ async def get_tenant(
 
 @router.get("", response_model=List[Tenant], summary="Fetch Tenants")
 async def get_tenants(
+    response: Response,
     wallet_name: Optional[str] = None,
     group_id: Optional[str] = group_id_query,
     limit: Optional[int] = limit_query_parameter,
     offset: Optional[int] = offset_query_parameter,
     order_by: Optional[str] = order_by_query_parameter,
     descending: bool = descending_query_parameter,
+    cursor: Optional[str] = Query(
+        None,
+        description=(
+            "Cursor from the `X-Next-Cursor` header of the previous page, to fetch the "
+            "page after it. Replaces offset, and keeps the order of the first page."
+        ),
+    ),
     admin_auth: AcaPyAuthVerified = Depends(acapy_auth_tenant_admin),
 ) -> List[Tenant]:
     """
@@ -525,6 +1323,11 @@ async def get_tenants(
 
     Results are ordered by creation time (newest first), and can be controlled to be in ascending order (oldest first).
 
+    When a page is full, the `X-Next-Cursor` response header holds a cursor for the next
+    page. Unlike offsets, cursors do not repeat tenants when tenants are created while
+    paging. Pass the same filters with each cursor. To fetch all tenants, rather use
+    `GET /v1/tenants/export`.
+
     Optional Request Parameters:
     ---
         wallet_name: str
@@ -535,6 +1338,8 @@ async def get_tenants(
             Number of results to skip.
         descending: bool
             Whether to return results in descending order or not. Defaults to true (newest first).
+        cursor: str
+            Cursor for the next page, from the `X-Next-Cursor` header.
 
     Response body:
     ---
@@ -552,24 +1357,71 @@ async def get_tenants(
         "GET request received: Fetch tenants by wallet name and/or group id"
     )
 
+    next_cursor = None
     async with get_tenant_admin_controller(admin_auth) as admin_controller:
-        wallets = await handle_acapy_call(
-            logger=bound_logger,
-            acapy_call=admin_controller.multitenancy.get_wallets,
-            limit=limit,
-            offset=offset,
-            order_by=order_by,
-            descending=descending,
-            wallet_name=wallet_name,
-            group_id=group_id,
-        )
-
-    wallets_list = wallets.results
+        if cursor:
+            wallets_list, next_cursor = await _fetch_wallets_after(
+                admin_controller=admin_controller,
+                cursor=TenantCursor.decode(cursor),
+                limit=limit,
+                wallet_name=wallet_name,
+                group_id=group_id,
+                bound_logger=bound_logger,
+            )
+        else:
+            wallets = await handle_acapy_call(
+                logger=bound_logger,
+                acapy_call=admin_controller.multitenancy.get_wallets,
+                limit=limit,
+                offset=offset,
+                order_by=order_by,
+                descending=descending,
+                wallet_name=wallet_name,
+                group_id=group_id,
+            )
+            wallets_list = wallets.results
+            # Cursors follow creation order, so only continue the default ordering
+            if wallets_list and order_by == "id":
+                next_cursor = TenantCursor.after(
+                    wallets_list[-1], offset + len(wallets_list), descending
+                )
 
     if not wallets_list:
         bound_logger.debug("No wallets found.")
         return []
 
-    response = [tenant_from_wallet_record(record) for record in wallets_list]
+    if next_cursor and len(wallets_list) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor.encode()
+
+    tenants = [tenant_from_wallet_record(record) for record in wallets_list]
     bound_logger.debug("Successfully fetched wallets.")
-    return response
+    return tenants
+
+
+async def _fetch_wallets_after(
+    *,
+    admin_controller: AcaPyClient,
+    cursor: TenantCursor,
+    limit: int,
+    wallet_name: Optional[str],
+    group_id: Optional[str],
+    bound_logger: Logger,
+) -> Tuple[List[WalletRecordWithGroups], Optional[TenantCursor]]:
+    wallets_list = []
+    next_cursor = None
+    async with aclosing(
+        iter_wallets(
+            admin_controller,
+            cursor=cursor,
+            descending=cursor.descending,
+            page_size=limit,
+            wallet_name=wallet_name,
+            group_id=group_id,
+            logger=bound_logger,
+        )
+    ) as wallets:
+        async for wallet, next_cursor in wallets:
+            wallets_list.append(wallet)
+            if len(wallets_list) == limit:
+                break
+    return wallets_list, next_cursor
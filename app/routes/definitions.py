@@ -256,6 +256,7 @@ async def create_credential_definition(
             aries_controller=aries_controller,
             credential_definition=credential_definition,
             support_revocation=support_revocation,
+            wallet_id=auth.wallet_id,
         )
 
     # ACA-Py only returns the id after creating a credential definition
@@ -5,7 +5,12 @@ from aries_cloudcontroller import IssuerCredRevRecord, RevRegWalletUpdatedResult
 from fastapi import APIRouter, Depends
 
 from app.dependencies.acapy_clients import client_from_auth
-from app.dependencies.auth import AcaPyAuth, acapy_auth_from_header
+from app.dependencies.auth import (
+    AcaPyAuth,
+    AcaPyAuthVerified,
+    acapy_auth_from_header,
+    acapy_auth_verified,
+)
 from app.exceptions import CloudApiException, handle_acapy_call
 from app.models.issuer import (
     ClearPendingRevocationsRequest,
@@ -16,7 +21,7 @@ from app.models.issuer import (
     RevokedResponse,
 )
 from app.services import revocation_registry
-from app.util.retry_method import coroutine_with_retry_until_value
+from app.util.transaction_acked import wait_for_transaction_acked
 from shared import PUBLISH_REVOCATIONS_TIMEOUT
 from shared.log_config import get_logger
 
@@ -28,7 +33,7 @@ router = APIRouter(prefix="/v1/issuer/credentials", tags=["revocation"])
 @router.post("/revoke", summary="Revoke a Credential (if revocable)")
 async def revoke_credential(
     body: RevokeCredential,
-    auth: AcaPyAuth = Depends(acapy_auth_from_header),
+    auth: AcaPyAuthVerified = Depends(acapy_auth_verified),
 ) -> RevokedResponse:
     """
     Revoke a credential
@@ -65,6 +70,7 @@ async def revoke_credential(
             controller=aries_controller,
             credential_exchange_id=body.credential_exchange_id,
             auto_publish_to_ledger=body.auto_publish_on_ledger,
+            wallet_id=auth.wallet_id,
         )
 
     bound_logger.debug("Successfully revoked credential.")
@@ -144,7 +150,7 @@ async def get_credential_revocation_record(
 @router.post("/publish-revocations", summary="Publish Pending Revocations")
 async def publish_revocations(
     publish_request: PublishRevocationsRequest,
-    auth: AcaPyAuth = Depends(acapy_auth_from_header),
+    auth: AcaPyAuthVerified = Depends(acapy_auth_verified),
 ) -> RevokedResponse:
     """
     Write pending revocations to the ledger
@@ -197,27 +203,28 @@ async def publish_revocations(
             return RevokedResponse()
 
         endorser_transaction_ids = [txn.transaction_id for txn in result.txn]
-        for endorser_transaction_id in endorser_transaction_ids:
-            bound_logger.debug(
-                "Wait for publish complete on transaction id: {}",
-                endorser_transaction_id,
-            )
-            try:
-                # Wait for transaction to be acknowledged and written to the ledger
-                await coroutine_with_retry_until_value(
-                    coroutine_func=aries_controller.endorse_transaction.get_transaction,
-                    args=(endorser_transaction_id,),
-                    field_name="state",
-                    expected_value="transaction_acked",
-                    logger=bound_logger,
-                    max_attempts=PUBLISH_REVOCATIONS_TIMEOUT,
-                    retry_delay=1,
+        bound_logger.debug(
+            "Wait for publish complete on transaction ids: {}",
+            endorser_transaction_ids,
+        )
+        try:
+            # Wait for transactions to be acknowledged and written to the ledger
+            await asyncio.gather(
+                *(
+                    wait_for_transaction_acked(
+                        aries_controller=aries_controller,
+                        transaction_id=endorser_transaction_id,
+                        wallet_id=auth.wallet_id,
+                        timeout=PUBLISH_REVOCATIONS_TIMEOUT,
+                    )
+                    for endorser_transaction_id in endorser_transaction_ids
                 )
-            except asyncio.TimeoutError as e:
-                raise CloudApiException(
-                    "Timeout waiting for endorser to accept the revocations request.",
-                    504,
-                ) from e
+            )
+        except asyncio.TimeoutError as e:
+            raise CloudApiException(
+                "Timeout waiting for endorser to accept the revocations request.",
+                504,
+            ) from e
 
     bound_logger.debug("Successfully published revocations.")
     return RevokedResponse.model_validate(result.model_dump())
@@ -1,7 +1,8 @@
-from typing import Optional, Tuple
+from typing import Any, Optional, Tuple
 
 from aiocache import SimpleMemoryCache, cached
 from aries_cloudcontroller import (
+    DID,
     AcaPyClient,
     GetDIDEndpointResponse,
     SchemaGetResult,
@@ -12,10 +13,27 @@ from aries_cloudcontroller import (
 )
 
 from app.exceptions import CloudApiException, handle_acapy_call
+from app.services import acapy_wallet
+from shared import LEDGER_METADATA_CACHE_TTL
 from shared.log_config import get_logger
+from shared.util.cache import BoundedCache
 
 logger = get_logger(__name__)
 
+TAA_CACHE_KEY = "taa"
+ENDORSER_DID_CACHE_KEY = "endorser_did"
+
+# Ledger metadata that is the same for every wallet and rarely changes: the TAA with its
+# acceptance mechanism, and the endorser's public DID
+ledger_metadata_cache: BoundedCache[str, Any] = BoundedCache(
+    maxsize=2, ttl=LEDGER_METADATA_CACHE_TTL
+)
+
+
+def invalidate_ledger_metadata() -> None:
+    """Drop the cached TAA and endorser public DID, so that they are fetched again."""
+    ledger_metadata_cache.clear()
+
 
 async def get_taa(controller: AcaPyClient) -> Tuple[TAAInfo, str]:
     """
@@ -50,6 +68,49 @@ async def get_taa(controller: AcaPyClient) -> Tuple[TAAInfo, str]:
     return taa_info, mechanism
 
 
+async def get_cached_taa(controller: AcaPyClient) -> Tuple[TAAInfo, str]:
+    """
+    Obtains the TAA, from the ledger metadata cache if it was fetched recently
+
+    Parameters:
+    -----------
+    controller: AcaPyClient
+        The aries_cloudcontroller object, used if the TAA is not cached
+
+    Returns:
+    --------
+    taa: Tuple[TAAInfo, str]
+        The TAAInfo object, with the mechanism
+    """
+    taa = ledger_metadata_cache.get(TAA_CACHE_KEY)
+    if taa is None:
+        taa = await get_taa(controller)
+        ledger_metadata_cache.set(TAA_CACHE_KEY, taa)
+    return taa
+
+
+async def get_endorser_public_did(endorser_controller: AcaPyClient) -> DID:
+    """
+    Obtains the endorser's public DID, from the ledger metadata cache if it was
+    fetched recently
+
+    Parameters:
+    -----------
+    endorser_controller: AcaPyClient
+        The aries_cloudcontroller object of the endorser
+
+    Returns:
+    --------
+    DID
+        The endorser's public DID
+    """
+    endorser_did = ledger_metadata_cache.get(ENDORSER_DID_CACHE_KEY)
+    if endorser_did is None:
+        endorser_did = await acapy_wallet.get_public_did(controller=endorser_controller)
+        ledger_metadata_cache.set(ENDORSER_DID_CACHE_KEY, endorser_did)
+    return endorser_did
+
+
 async def accept_taa(
     controller: AcaPyClient, taa: TAARecord, mechanism: Optional[str] = None
 ) -> None:
@@ -144,14 +205,19 @@ async def register_nym_on_ledger(
 
 
 async def accept_taa_if_required(aries_controller: AcaPyClient) -> None:
-    taa_response, mechanism = await get_taa(aries_controller)
+    taa_response, mechanism = await get_cached_taa(aries_controller)
 
     if taa_response.taa_required:
-        await accept_taa(
-            controller=aries_controller,
-            taa=taa_response.taa_record,
-            mechanism=mechanism,
-        )
+        try:
+            await accept_taa(
+                controller=aries_controller,
+                taa=taa_response.taa_record,
+                mechanism=mechanism,
+            )
+        except CloudApiException:
+            # The TAA may have changed on the ledger, so fetch it again next time
+            ledger_metadata_cache.pop(TAA_CACHE_KEY)
+            raise
 
 
 # Grab cred_def_id from args to use as cache-key
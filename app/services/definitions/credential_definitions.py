@@ -22,6 +22,7 @@ async def create_credential_definition(
     aries_controller: AcaPyClient,
     credential_definition: CreateCredentialDefinition,
     support_revocation: bool,
+    wallet_id: Optional[str] = None,
 ) -> str:
     """
     Create a credential definition
@@ -60,8 +61,8 @@ async def create_credential_definition(
         await wait_for_transaction_ack(
             aries_controller=aries_controller,
             transaction_id=result.txn.transaction_id,
-            max_attempts=CRED_DEF_ACK_TIMEOUT,
-            retry_delay=1,
+            wallet_id=wallet_id,
+            timeout=CRED_DEF_ACK_TIMEOUT,
         )
 
     if support_revocation:
@@ -1,5 +1,7 @@
-from typing import AsyncGenerator, Optional
+import asyncio
+from typing import Any, AsyncGenerator, Dict, Optional
 
+import orjson
 from fastapi import Request
 from httpx import HTTPError, Response, Timeout
 
@@ -12,6 +14,8 @@ SSE_PING_PERIOD = 15
 # SSE sends a ping every 15 seconds, so user will get at least one message within this timeout
 default_timeout = Timeout(SSE_PING_PERIOD, read=3600.0)  # 1 hour read timeout
 event_timeout = Timeout(SSE_PING_PERIOD, read=180)  # 3 minute timeout
+# Most seconds to wait before resubscribing to a stream that closed without the event
+SSE_RESUBSCRIBE_MAX_WAIT = 8.0
 
 
 async def yield_lines_with_disconnect_check(
@@ -77,3 +81,83 @@ async def sse_subscribe_event_with_field_and_state(
     except HTTPError as e:
         bound_logger.error("Caught HTTPError while handling SSE subscription: {}.", e)
         raise e
+
+
+async def sse_wait_for_event_with_field_and_state(
+    *,
+    group_id: Optional[str],
+    wallet_id: str,
+    topic: str,
+    field: str,
+    field_id: str,
+    desired_state: str,
+    look_back: int = 60,
+) -> Optional[Dict[str, Any]]:
+    """
+    Wait for a webhook event with the desired state, for a specific wallet ID and topic.
+
+    Events from the last `look_back` seconds are included, so an event that was published
+    just before subscribing is not missed.
+
+    Returns:
+        The event, or None if waypoint closed the stream before the event occurred.
+    """
+    bound_logger = logger.bind(
+        body={
+            "group_id": group_id,
+            "wallet_id": wallet_id,
+            "topic": topic,
+            field: field_id,
+            "state": desired_state,
+        }
+    )
+
+    params = {"look_back": look_back}
+    if group_id:
+        params["group_id"] = group_id
+
+    async with RichAsyncClient(timeout=event_timeout) as client:
+        bound_logger.debug("Waiting for event from waypoint")
+        async with client.stream(
+            "GET",
+            f"{WAYPOINT_URL}/sse/{wallet_id}/{topic}/{field}/{field_id}/{desired_state}",
+            params=params,
+        ) as response:
+            async for line in response.aiter_lines():
+                if line.startswith("data:"):
+                    return orjson.loads(line[len("data:") :])
+
+    bound_logger.debug("Waypoint stream closed without event")
+    return None
+
+
+async def sse_wait_for_event_with_resubscribe(
+    *,
+    group_id: Optional[str],
+    wallet_id: str,
+    topic: str,
+    field: str,
+    field_id: str,
+    desired_state: str,
+) -> Dict[str, Any]:
+    """
+    Wait for a webhook event with the desired state, as `sse_wait_for_event_with_field_and_state`
+    does, resubscribing whenever waypoint closes the stream before the event occurred.
+
+    Resubscribing backs off from a quarter of a second, doubling up to
+    `SSE_RESUBSCRIBE_MAX_WAIT` seconds, so that waypoint is not flooded with subscriptions.
+    """
+    wait = 0.25
+    while True:
+        event = await sse_wait_for_event_with_field_and_state(
+            group_id=group_id,
+            wallet_id=wallet_id,
+            topic=topic,
+            field=field,
+            field_id=field_id,
+            desired_state=desired_state,
+        )
+        if event:
+            return event
+        await asyncio.sleep(wait)
+        wait = min(wait * 2, SSE_RESUBSCRIBE_MAX_WAIT)
@@ -2,7 +2,7 @@ from aries_cloudcontroller import DID, AcaPyClient, InvitationCreateRequest
 
 from app.exceptions import CloudApiException, handle_acapy_call
 from app.models.tenants import OnboardResult
-from app.services import acapy_wallet
+from app.services import acapy_ledger, acapy_wallet
 from app.services.onboarding.util.register_issuer_did import (
     create_connection_with_endorser,
     register_issuer_did,
@@ -101,7 +101,7 @@ async def onboard_issuer_no_public_did(
 
     try:
         bound_logger.debug("Getting public DID for endorser")
-        endorser_did = await acapy_wallet.get_public_did(controller=endorser_controller)
+        endorser_did = await acapy_ledger.get_endorser_public_did(endorser_controller)
     except Exception as e:
         bound_logger.critical("Could not get endorser's public DID: {}", e)
         raise CloudApiException("Unable to get endorser public DID.") from e
@@ -122,9 +122,12 @@ async def onboard_issuer_no_public_did(
             issuer_label=issuer_label,
             issuer_endorser_connection_id=issuer_connection_id,
             logger=bound_logger,
+            issuer_wallet_id=issuer_wallet_id,
         )
     except Exception as e:
         bound_logger.exception("Could not create connection with endorser.")
+        # The cached TAA or endorser DID may be outdated, so fetch them again next time
+        acapy_ledger.invalidate_ledger_metadata()
         raise CloudApiException(
             f"Error creating connection with endorser: {str(e)}",
         ) from e
@@ -0,0 +1,317 @@
+import asyncio
+from collections import deque
+from contextlib import aclosing
+from secrets import token_urlsafe
+from typing import Deque, Dict, Optional
+
+import base58
+from aries_cloudcontroller import (
+    AcaPyClient,
+    ConnectionMetadataSetRequest,
+    CreateWalletResponse,
+    WalletRecordWithGroups,
+)
+from pydantic import BaseModel
+from uuid_utils import uuid4
+
+from app.dependencies.acapy_clients import (
+    get_governance_controller,
+    get_tenant_admin_controller,
+    get_tenant_controller,
+)
+from app.exceptions import handle_acapy_call
+from app.models.tenants import CreateTenantRequest, CreateWalletRequestWithGroups
+from app.services.onboarding.issuer import onboard_issuer_no_public_did
+from app.util.tenants import iter_wallets
+from shared import (
+    ISSUER_POOL_LABEL,
+    ISSUER_POOL_REFILL_INTERVAL,
+    ISSUER_POOL_SIZE,
+    TENANT_EXPORT_PAGE_SIZE,
+)
+from shared.log_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def _pool_alias(wallet_name: str) -> str:
+    return f"{ISSUER_POOL_LABEL} {wallet_name}"
+
+
+def _is_pooled(wallet: WalletRecordWithGroups) -> bool:
+    """Whether the wallet is a pooled issuer wallet that was not assigned to a tenant."""
+    wallet_name = wallet.settings.get("wallet.name")
+    return (
+        bool(wallet_name)
+        and wallet.settings.get("default_label") == _pool_alias(wallet_name)
+        and not wallet.settings.get("wallet.group_id")
+    )
+
+
+class PooledIssuer(BaseModel):
+    wallet_name: str
+    wallet: CreateWalletResponse
+
+    @property
+    def alias(self) -> str:
+        """Neutral alias the wallet is onboarded under, unique to the wallet."""
+        return _pool_alias(self.wallet_name)
+
+
+class IssuerPool:
+    """
+    Keeps wallets that are onboarded as issuer, i.e. that have a connection with the
+    endorser and an endorsed public DID, ready to be assigned to new issuers.
+
+    The pool is refilled in the background, one wallet every `refill_interval` seconds,
+    and is disabled when its size is 0. Each app instance keeps its own pool, and deletes
+    the wallets it did not assign when it stops. As wallets are left behind if an instance
+    is killed instead, the pool first recovers the unassigned wallets with its alias when
+    it starts: onboarded ones are adopted, and the others are deleted. With more than one
+    instance, each must therefore have its own `ISSUER_POOL_LABEL`.
+
+    Wallets are onboarded under their neutral pool alias, as the label of the tenant they
+    will be assigned to is not known yet. The alias stays on the endorser's connection and
+    the issuer's ledger DID, as neither can be renamed; the tenant's label is recorded on
+    the endorser's connection once the wallet is assigned.
+    """
+
+    def __init__(
+        self,
+        size: int = ISSUER_POOL_SIZE,
+        refill_interval: float = ISSUER_POOL_REFILL_INTERVAL,
+    ) -> None:
+        self.size = size
+        self.refill_interval = refill_interval
+        self._ready: Deque[PooledIssuer] = deque()
+        self._task: Optional[asyncio.Task] = None
+        self._provisioned = 0
+        self._adopted = 0
+        self._assigned = 0
+        self._failed = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": self.size,
+            "ready": len(self._ready),
+            "provisioned": self._provisioned,
+            "adopted": self._adopted,
+            "assigned": self._assigned,
+            "failed": self._failed,
+        }
+
+    def take(self, body: CreateTenantRequest) -> Optional[PooledIssuer]:
+        """
+        Take a ready issuer wallet for the new tenant, if the pool has one. Tenants that
+        are not issuers, or that need a wallet name, group or settings that the wallet
+        must be created with, are not served from the pool.
+        """
+        if (
+            not self._ready
+            or "issuer" not in (body.roles or [])
+            or body.wallet_name
+            or body.group_id
+            or body.extra_settings
+        ):
+            return None
+
+        self._assigned += 1
+        return self._ready.popleft()
+
+    async def label_assigned(self, pooled_issuer: PooledIssuer, label: str) -> None:
+        """
+        Record the label of the tenant that a pooled issuer was assigned to in the metadata
+        of the endorser's connection with it. Failures are only logged.
+        """
+        bound_logger = logger.bind(
+            body={"wallet_id": pooled_issuer.wallet.wallet_id, "label": label}
+        )
+        try:
+            async with get_governance_controller() as endorser_controller:
+                connections = await handle_acapy_call(
+                    logger=bound_logger,
+                    acapy_call=endorser_controller.connection.get_connections,
+                    alias=pooled_issuer.alias,
+                )
+                for connection in connections.results or []:
+                    await handle_acapy_call(
+                        logger=bound_logger,
+                        acapy_call=endorser_controller.connection.set_metadata,
+                        conn_id=connection.connection_id,
+                        body=ConnectionMetadataSetRequest(
+                            metadata={
+                                "issuer_label": label,
+                                "issuer_wallet_id": pooled_issuer.wallet.wallet_id,
+                            }
+                        ),
+                    )
+        except Exception:  # pylint: disable=W0718
+            bound_logger.exception("Could not label endorser connection of issuer.")
+
+    async def start(self) -> None:
+        if self.enabled and not self._task:
+            logger.info("Starting issuer pool of size {}", self.size)
+            self._task = asyncio.create_task(self._run(), name="Issuer pool")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if not self._ready:
+            return
+
+        logger.info("Deleting {} unassigned pooled issuers", len(self._ready))
+        async with get_tenant_admin_controller() as admin_controller:
+            while self._ready:
+                pooled_issuer = self._ready.popleft()
+                try:
+                    await handle_acapy_call(
+                        logger=logger,
+                        acapy_call=admin_controller.multitenancy.delete_wallet,
+                        wallet_id=pooled_issuer.wallet.wallet_id,
+                    )
+                except Exception:  # pylint: disable=W0718
+                    logger.exception("Could not delete pooled issuer wallet.")
+
+    async def _run(self) -> None:
+        try:
+            await self._recover()
+        except Exception:  # pylint: disable=W0718
+            logger.exception("Failed to recover pooled issuers.")
+
+        while True:
+            if len(self._ready) < self.size:
+                try:
+                    self._ready.append(await self._provision())
+                    self._provisioned += 1
+                except Exception:  # pylint: disable=W0718
+                    self._failed += 1
+                    logger.exception("Failed to provision issuer for pool.")
+                logger.info("Issuer pool stats: {}", self.stats())
+            await asyncio.sleep(self.refill_interval)
+
+    async def _recover(self) -> None:
+        """
+        Adopt the unassigned wallets that an earlier run of the pool left behind, up to
+        the pool's size, if they were onboarded, i.e. have a public DID. Delete the others.
+        """
+        async with get_tenant_admin_controller() as admin_controller:
+            async with aclosing(
+                iter_wallets(
+                    admin_controller,
+                    cursor=None,
+                    descending=False,
+                    page_size=TENANT_EXPORT_PAGE_SIZE,
+                    wallet_name=None,
+                    group_id=None,
+                    logger=logger,
+                )
+            ) as wallets:
+                left_behind = [
+                    wallet async for wallet, _ in wallets if _is_pooled(wallet)
+                ]
+            if not left_behind:
+                return
+
+            logger.info("Recovering {} pooled issuers", len(left_behind))
+            for wallet in left_behind:
+                bound_logger = logger.bind(body={"wallet_id": wallet.wallet_id})
+                pooled_issuer = None
+                if len(self._ready) < self.size:
+                    try:
+                        pooled_issuer = await self._adopt(admin_controller, wallet)
+                    except Exception:  # pylint: disable=W0718
+                        bound_logger.exception("Could not adopt pooled issuer.")
+
+                if pooled_issuer:
+                    self._ready.append(pooled_issuer)
+                    self._adopted += 1
+                    continue
+                try:
+                    await handle_acapy_call(
+                        logger=bound_logger,
+                        acapy_call=admin_controller.multitenancy.delete_wallet,
+                        wallet_id=wallet.wallet_id,
+                    )
+                except Exception:  # pylint: disable=W0718
+                    bound_logger.exception("Could not delete pooled issuer wallet.")
+        logger.info("Issuer pool stats: {}", self.stats())
+
+    async def _adopt(
+        self, admin_controller: AcaPyClient, wallet: WalletRecordWithGroups
+    ) -> Optional[PooledIssuer]:
+        token_response = await handle_acapy_call(
+            logger=logger,
+            acapy_call=admin_controller.multitenancy.get_auth_token,
+            wallet_id=wallet.wallet_id,
+        )
+        async with get_tenant_controller(token_response.token) as issuer_controller:
+            did_response = await handle_acapy_call(
+                logger=logger, acapy_call=issuer_controller.wallet.get_public_did
+            )
+        if not did_response.result:
+            return None  # Onboarding did not complete
+
+        return PooledIssuer(
+            wallet_name=wallet.settings["wallet.name"],
+            wallet=CreateWalletResponse(
+                key_management_mode=wallet.key_management_mode,
+                wallet_id=wallet.wallet_id,
+                created_at=wallet.created_at,
+                updated_at=wallet.updated_at,
+                settings=wallet.settings,
+                state=wallet.state,
+                token=token_response.token,
+            ),
+        )
+
+    async def _provision(self) -> PooledIssuer:
+        wallet_name = uuid4().hex
+        alias = _pool_alias(wallet_name)
+        bound_logger = logger.bind(body={"wallet_name": wallet_name})
+        bound_logger.debug("Provisioning issuer for pool")
+
+        async with get_tenant_admin_controller() as admin_controller:
+            wallet = await handle_acapy_call(
+                logger=bound_logger,
+                acapy_call=admin_controller.multitenancy.create_wallet,
+                body=CreateWalletRequestWithGroups(
+                    key_management_mode="managed",
+                    label=alias,
+                    wallet_key=base58.b58encode(token_urlsafe(48)).decode(),
+                    wallet_name=wallet_name,
+                    wallet_type="askar",
+                ),
+            )
+            try:
+                async with get_governance_controller() as governance_controller, get_tenant_controller(
+                    wallet.token
+                ) as issuer_controller:
+                    await onboard_issuer_no_public_did(
+                        endorser_controller=governance_controller,
+                        issuer_controller=issuer_controller,
+                        issuer_wallet_id=wallet.wallet_id,
+                        issuer_label=alias,
+                    )
+            except (Exception, asyncio.CancelledError):
+                bound_logger.info("Could not onboard pooled issuer; deleting wallet")
+                await handle_acapy_call(
+                    logger=bound_logger,
+                    acapy_call=admin_controller.multitenancy.delete_wallet,
+                    wallet_id=wallet.wallet_id,
+                )
+                raise
+
+        bound_logger.debug("Provisioned issuer for pool")
+        return PooledIssuer(wallet_name=wallet_name, wallet=wallet)
+
+
+issuer_pool = IssuerPool()
@@ -0,0 +1,100 @@
+import asyncio
+from typing import Awaitable, Optional, Set
+
+from app.models.tenants import OnboardingJob
+from shared import (
+    ONBOARDING_JOB_CACHE_SIZE,
+    ONBOARDING_JOB_SHUTDOWN_TIMEOUT,
+    ONBOARDING_JOB_TTL,
+)
+from shared.log_config import get_logger
+from shared.util.cache import BoundedCache
+
+logger = get_logger(__name__)
+
+
+class OnboardingJobs:
+    """
+    Runs tenant onboarding in the background, and keeps the status of each job for
+    `ONBOARDING_JOB_TTL` seconds after its last update.
+
+    Jobs are held in memory, by the process that runs them. With more than one replica,
+    requests for a job must be routed to the replica that started it, e.g. with session
+    affinity on the tenant admin's requests; other replicas do not know the job.
+    """
+
+    def __init__(self) -> None:
+        self._jobs: BoundedCache[str, OnboardingJob] = BoundedCache(
+            maxsize=ONBOARDING_JOB_CACHE_SIZE, ttl=ONBOARDING_JOB_TTL
+        )
+        self._done: BoundedCache[str, asyncio.Event] = BoundedCache(
+            maxsize=ONBOARDING_JOB_CACHE_SIZE, ttl=ONBOARDING_JOB_TTL
+        )
+        self._tasks: Set[asyncio.Task] = set()  # Keep running jobs referenced
+
+    def start(
+        self, job_id: str, onboarding: Awaitable[None], group_id: Optional[str] = None
+    ) -> OnboardingJob:
+        job = OnboardingJob(job_id=job_id, status="pending", group_id=group_id)
+        self._jobs.set(job_id, job)
+        self._done.set(job_id, asyncio.Event())
+
+        task = asyncio.create_task(
+            self._run(job, onboarding), name=f"Onboard tenant {job_id}"
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get(self, job_id: str) -> Optional[OnboardingJob]:
+        return self._jobs.get(job_id)
+
+    async def wait(self, job_id: str) -> Optional[OnboardingJob]:
+        """Wait for the job to complete, returning None if the job is unknown."""
+        done = self._done.get(job_id)
+        if not done:
+            return self.get(job_id)
+        await done.wait()
+        return self.get(job_id)
+
+    async def stop(self, timeout: float = ONBOARDING_JOB_SHUTDOWN_TIMEOUT) -> None:
+        """Give running jobs `timeout` seconds to complete, then cancel the others."""
+        if not self._tasks:
+            return
+
+        logger.info("Waiting for {} onboarding jobs to complete", len(self._tasks))
+        _, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+        if pending:
+            logger.warning("Cancelling {} unfinished onboarding jobs", len(pending))
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _run(self, job: OnboardingJob, onboarding: Awaitable[None]) -> None:
+        bound_logger = logger.bind(body={"job_id": job.job_id})
+        try:
+            await onboarding
+        except asyncio.CancelledError:
+            bound_logger.warning("Onboarding job cancelled")
+            self._finish(
+                job.model_copy(update={"status": "failed", "error": "Cancelled"})
+            )
+            raise
+        except Exception as e:  # pylint: disable=W0718
+            bound_logger.warning("Onboarding job failed: {!r}", e)
+            error = getattr(e, "detail", None) or str(e)
+            result = job.model_copy(update={"status": "failed", "error": str(error)})
+        else:
+            bound_logger.info("Onboarding job succeeded")
+            result = job.model_copy(update={"status": "succeeded"})
+
+        self._finish(result)
+
+    def _finish(self, job: OnboardingJob) -> None:
+        self._jobs.set(job.job_id, job)
+        done = self._done.get(job.job_id)
+        if done:
+            done.set()
+
+
+onboarding_jobs = OnboardingJobs()
@@ -1,3 +1,5 @@
+import asyncio
+from logging import Logger
 from typing import List
 
 from aries_cloudcontroller import AcaPyClient, UpdateWalletRequest, WalletRecord
@@ -17,7 +19,7 @@ from app.services.onboarding.issuer import onboard_issuer
 from app.services.onboarding.verifier import onboard_verifier
 from app.services.trust_registry.actors import fetch_actor_by_id, update_actor
 from shared.log_config import get_logger
-from shared.models.trustregistry import TrustRegistryRole
+from shared.models.trustregistry import Actor, TrustRegistryRole
 
 logger = get_logger(__name__)
 
@@ -34,6 +36,14 @@ async def handle_tenant_update(
     new_label = update_request.wallet_label
     new_image_url = update_request.image_url
 
+    request_body = handle_model_with_validation(
+        logger=bound_logger,
+        model_class=UpdateWalletRequest,
+        label=new_label,
+        image_url=update_request.image_url,
+        extra_settings=update_request.extra_settings,
+    )
+
     # See if this wallet belongs to an actor
     actor = await fetch_actor_by_id(wallet_id)
     if not actor and new_roles:
@@ -47,6 +57,8 @@ async def handle_tenant_update(
             "Only existing issuers or verifiers can have their role updated.",
         )
 
+    updated_actor = None
+    added_roles = []
     if actor:
         existing_roles = actor.roles
         existing_image_url = actor.image_url
@@ -83,23 +95,88 @@ async def handle_tenant_update(
 
             updated_actor = actor.model_copy(update=update_dict)
 
-            await update_actor(updated_actor)
+    if not updated_actor:
+        wallet = await _update_wallet(
+            admin_controller, wallet_id, request_body, bound_logger
+        )
+    elif added_roles:
+        # Onboarding for new roles depends on the wallet's current settings, so the
+        # actor and wallet are updated in turn
+        await update_actor(updated_actor)
+        wallet = await _update_wallet(
+            admin_controller, wallet_id, request_body, bound_logger
+        )
+    else:
+        wallet = await _update_actor_and_wallet(
+            admin_controller=admin_controller,
+            actor=actor,
+            updated_actor=updated_actor,
+            request_body=request_body,
+            bound_logger=bound_logger,
+        )
+
+    bound_logger.debug("Tenant update handled successfully.")
+    return wallet
+
 
+async def _update_wallet(
+    admin_controller: AcaPyClient,
+    wallet_id: str,
+    request_body: UpdateWalletRequest,
+    bound_logger: Logger,
+) -> WalletRecord:
     bound_logger.debug("Updating wallet")
-    request_body = handle_model_with_validation(
-        logger=bound_logger,
-        model_class=UpdateWalletRequest,
-        label=new_label,
-        image_url=update_request.image_url,
-        extra_settings=update_request.extra_settings,
-    )
-    wallet = await handle_acapy_call(
+    return await handle_acapy_call(
         logger=bound_logger,
         acapy_call=admin_controller.multitenancy.update_wallet,
         wallet_id=wallet_id,
         body=request_body,
     )
-    bound_logger.debug("Tenant update handled successfully.")
+
+
+async def _update_actor_and_wallet(
+    *,
+    admin_controller: AcaPyClient,
+    actor: Actor,
+    updated_actor: Actor,
+    request_body: UpdateWalletRequest,
+    bound_logger: Logger,
+) -> WalletRecord:
+    """
+    Update the actor and the wallet concurrently. If only one of them is updated, it is
+    reverted to the actor's previous name and image, so that both stay in sync.
+    """
+    actor_update, wallet = await asyncio.gather(
+        update_actor(updated_actor),
+        _update_wallet(admin_controller, actor.id, request_body, bound_logger),
+        return_exceptions=True,
+    )
+
+    if isinstance(actor_update, BaseException) and not isinstance(
+        wallet, BaseException
+    ):
+        bound_logger.info("Actor was not updated; reverting wallet label and image")
+        try:
+            await _update_wallet(
+                admin_controller,
+                actor.id,
+                UpdateWalletRequest(label=actor.name, image_url=actor.image_url),
+                bound_logger,
+            )
+        except Exception:  # pylint: disable=W0718
+            bound_logger.exception("Could not revert wallet update.")
+    elif isinstance(wallet, BaseException) and not isinstance(
+        actor_update, BaseException
+    ):
+        bound_logger.info("Wallet was not updated; reverting actor")
+        try:
+            await update_actor(actor)
+        except Exception:  # pylint: disable=W0718
+            bound_logger.exception("Could not revert actor update.")
+
+    for result in (actor_update, wallet):
+        if isinstance(result, BaseException):
+            raise result
     return wallet
 
 
@@ -1,5 +1,6 @@
 import asyncio
 from logging import Logger
+from typing import List, Optional
 
 from aries_cloudcontroller import (
     DID,
@@ -11,12 +12,19 @@ from aries_cloudcontroller import (
 
 from app.exceptions import CloudApiException, handle_acapy_call
 from app.services import acapy_ledger, acapy_wallet
+from app.services.event_handling.sse import sse_wait_for_event_with_resubscribe
 from app.services.onboarding.util.set_endorser_metadata import (
     set_author_role,
     set_endorser_info,
     set_endorser_role,
 )
-from shared import ACAPY_ENDORSER_ALIAS, ISSUER_DID_ENDORSE_TIMEOUT
+from app.util.transaction_acked import wait_for_transaction_acked
+from shared import (
+    ACAPY_ENDORSER_ALIAS,
+    ENDORSER_CONNECTION_POLL_INTERVAL,
+    GOVERNANCE_LABEL,
+    ISSUER_DID_ENDORSE_TIMEOUT,
+)
 
 
 async def create_connection_with_endorser(
@@ -163,6 +171,7 @@ async def register_issuer_did(
     issuer_label: str,
     issuer_endorser_connection_id: str,
     logger: Logger,
+    issuer_wallet_id: Optional[str] = None,
 ) -> DID:
     logger.debug("Accepting TAA on behalf of issuer")
     await acapy_ledger.accept_taa_if_required(issuer_controller)
@@ -170,7 +179,7 @@ async def register_issuer_did(
     logger.info("Creating DID for issuer")
     issuer_did = await acapy_wallet.create_did(issuer_controller)
 
-    await acapy_ledger.register_nym_on_ledger(
+    nym_response = await acapy_ledger.register_nym_on_ledger(
         issuer_controller,
         did=issuer_did.did,
         verkey=issuer_did.verkey,
@@ -178,11 +187,15 @@ async def register_issuer_did(
         create_transaction_for_endorser=True,
     )
 
+    nym_txn = nym_response.txn if nym_response else None
+
     logger.debug("Waiting for issuer DID transaction to be endorsed")
     await wait_transactions_endorsed(  # Needs to be endorsed before setting public DID
         issuer_controller=issuer_controller,
         issuer_connection_id=issuer_endorser_connection_id,
         logger=logger,
+        issuer_wallet_id=issuer_wallet_id,
+        transaction_id=nym_txn.transaction_id if nym_txn else None,
     )
 
     logger.debug("Setting public DID for issuer")
@@ -197,6 +210,7 @@ async def register_issuer_did(
         issuer_controller=issuer_controller,
         issuer_connection_id=issuer_endorser_connection_id,
         logger=logger,
+        issuer_wallet_id=issuer_wallet_id,
     )
 
     logger.debug("Issuer DID registered.")
@@ -211,107 +225,158 @@ async def wait_endorser_connection_completed(
     max_attempts: int = 30,
     retry_delay: float = 0.5,
 ) -> ConnRecord:
-    attempt = 0
-
-    while attempt < max_attempts:
-        try:
-            invitation_connections = (
-                await endorser_controller.connection.get_connections(
-                    invitation_msg_id=invitation_msg_id
-                )
-            )
-
-            for conn_record in invitation_connections.results:
-                if conn_record.rfc23_state == "completed":
-                    return conn_record
+    """
+    Wait for the endorser's connection from the invitation to complete.
+
+    This returns as soon as the endorser's `completed` connection event arrives. In case
+    the event is missed, the connection is also polled every
+    `ENDORSER_CONNECTION_POLL_INTERVAL` seconds, or every `retry_delay` seconds once
+    waiting for the event has failed. Either way, this gives up after `max_attempts`
+    times `retry_delay` seconds, and the connection is polled one last time at the end.
+    """
+    completed_event: Optional[asyncio.Task] = asyncio.create_task(
+        _endorser_connection_completed_event(invitation_msg_id)
+    )
+    # While waiting for the event, only every so many attempts poll the connection
+    poll_every = max(1, round(ENDORSER_CONNECTION_POLL_INTERVAL / retry_delay))
 
-        except Exception as e:  # pylint: disable=W0718
-            if attempt + 1 == max_attempts:
-                logger.error(
-                    "Maximum number of retries exceeded with exception. Failing."
-                )
-                raise asyncio.TimeoutError from e  # Raise TimeoutError if max attempts exceeded
-
-            logger.warning(
-                (
-                    "Exception encountered (attempt {}). "
-                    "Reason: \n{}.\n"
-                    "Retrying in {} seconds..."
-                ),
-                attempt + 1,
-                e,
-                retry_delay,
-            )
-
-        await asyncio.sleep(retry_delay)
-        attempt += 1
+    try:
+        for attempt in range(max_attempts):
+            last_attempt = attempt + 1 == max_attempts
+            if not completed_event or attempt % poll_every == 0 or last_attempt:
+                try:
+                    invitation_connections = (
+                        await endorser_controller.connection.get_connections(
+                            invitation_msg_id=invitation_msg_id
+                        )
+                    )
+
+                    for conn_record in invitation_connections.results:
+                        if conn_record.rfc23_state == "completed":
+                            return conn_record
+
+                except Exception as e:  # pylint: disable=W0718
+                    if last_attempt:
+                        logger.error(
+                            "Maximum number of retries exceeded with exception. Failing."
+                        )
+                        raise asyncio.TimeoutError from e  # Raise TimeoutError if max attempts exceeded
+
+                    logger.warning(
+                        (
+                            "Exception encountered (attempt {}). "
+                            "Reason: \n{}.\n"
+                            "Retrying in {} seconds..."
+                        ),
+                        attempt + 1,
+                        e,
+                        retry_delay,
+                    )
+
+            if completed_event:
+                await asyncio.wait([completed_event], timeout=retry_delay)
+                if completed_event.done():
+                    if not completed_event.exception():
+                        return await handle_acapy_call(
+                            logger=logger,
+                            acapy_call=endorser_controller.connection.get_connection,
+                            conn_id=completed_event.result(),
+                        )
+                    logger.warning(
+                        "Waiting for connection completed event failed: {}. "
+                        "Continuing with polling.",
+                        completed_event.exception(),
+                    )
+                    completed_event = None
+            else:
+                await asyncio.sleep(retry_delay)
+    finally:
+        if completed_event:
+            completed_event.cancel()
 
     logger.error("Maximum number of retries exceeded without returning expected value.")
     raise asyncio.TimeoutError
 
 
+async def _endorser_connection_completed_event(invitation_msg_id: str) -> str:
+    """Wait for the endorser's connection from the invitation to complete, returning its id."""
+    event = await sse_wait_for_event_with_resubscribe(
+        group_id=None,
+        wallet_id=GOVERNANCE_LABEL,
+        topic="connections",
+        field="invitation_msg_id",
+        field_id=invitation_msg_id,
+        desired_state="completed",
+    )
+    return event["payload"]["connection_id"]
+
+
 async def wait_transactions_endorsed(
     *,
     issuer_controller: AcaPyClient,
     issuer_connection_id: str,
     logger: Logger,
-    max_attempts: int = ISSUER_DID_ENDORSE_TIMEOUT,
-    retry_delay: float = 1.0,
+    issuer_wallet_id: Optional[str] = None,
+    transaction_id: Optional[str] = None,
+    timeout: float = ISSUER_DID_ENDORSE_TIMEOUT,
 ) -> None:
-    attempt = 0
-
-    while attempt < max_attempts:
-        try:
-            transactions_response = (
-                await issuer_controller.endorse_transaction.get_records()
-            )
-
-            transactions = [
-                transaction
-                for transaction in transactions_response.results
-                if transaction.connection_id == issuer_connection_id
-            ]
+    """
+    Wait for the issuer's transactions with the endorser to be acked.
+
+    Without a `transaction_id`, the transactions on the endorser connection that are not
+    yet acked are looked up once. Each transaction is then awaited through its
+    `transaction-acked` event, see `wait_for_transaction_acked`.
+    """
+    if transaction_id:
+        transaction_ids = [transaction_id]
+    else:
+        transaction_ids = await _unacked_transaction_ids(
+            issuer_controller=issuer_controller,
+            issuer_connection_id=issuer_connection_id,
+            logger=logger,
+        )
 
-            if not transactions:
-                logger.error(
-                    "No transactions found for connection {}. Found {} transactions.",
-                    issuer_connection_id,
-                    transactions_response,
+    logger.debug("Waiting for transaction acknowledgements: {}", transaction_ids)
+    try:
+        await asyncio.gather(
+            *[
+                wait_for_transaction_acked(
+                    aries_controller=issuer_controller,
+                    transaction_id=transaction_id,
+                    wallet_id=issuer_wallet_id,
+                    timeout=timeout,
                 )
-                raise CloudApiException("No transactions found for connection", 404)
+                for transaction_id in transaction_ids
+            ]
+        )
+    except asyncio.TimeoutError as e:
+        logger.error("Timeout waiting for transaction acknowledgements")
+        raise asyncio.TimeoutError("Timeout waiting for endorsement") from e
 
-            all_acked = all(
-                transaction.state == "transaction_acked" for transaction in transactions
-            )
 
-            if all_acked:
-                return
-            else:
-                logger.debug(
-                    "Waiting for transaction acknowledgements. Current states: {}",
-                    ", ".join(f"{t.transaction_id}: {t.state}" for t in transactions),
-                )
+async def _unacked_transaction_ids(
+    *, issuer_controller: AcaPyClient, issuer_connection_id: str, logger: Logger
+) -> List[str]:
+    transactions_response = await handle_acapy_call(
+        logger=logger, acapy_call=issuer_controller.endorse_transaction.get_records
+    )
 
-        except Exception as e:  # pylint: disable=W0718
-            if attempt + 1 == max_attempts:
-                logger.error(
-                    "Maximum number of retries exceeded with exception. Failing."
-                )
-                raise asyncio.TimeoutError("Timeout waiting for endorsement") from e
-
-            logger.warning(
-                (
-                    "Exception encountered (attempt {}). "
-                    "Reason: \n{}.\n"
-                    "Retrying in {} seconds..."
-                ),
-                attempt + 1,
-                e,
-                retry_delay,
-            )
-
-        await asyncio.sleep(retry_delay)
-        attempt += 1
-
-    logger.error("Maximum number of retries exceeded while waiting for transaction ack")
-    raise asyncio.TimeoutError("Timeout waiting for endorsement")
+    transactions = [
+        transaction
+        for transaction in transactions_response.results
+        if transaction.connection_id == issuer_connection_id
+    ]
+
+    if not transactions:
+        logger.error(
+            "No transactions found for connection {}. Found {} transactions.",
+            issuer_connection_id,
+            transactions_response,
+        )
+        raise CloudApiException("No transactions found for connection", 404)
+
+    return [
+        transaction.transaction_id
+        for transaction in transactions
+        if transaction.state != "transaction_acked"
+    ]
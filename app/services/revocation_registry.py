@@ -1,4 +1,5 @@
 import asyncio
+from logging import Logger
 from typing import Dict, List, Optional
 
 from aries_cloudcontroller import (
@@ -21,6 +22,8 @@ from app.exceptions import (
 from app.models.issuer import ClearPendingRevocationsResult, RevokedResponse
 from app.util.credentials import strip_protocol_prefix
 from app.util.retry_method import coroutine_with_retry
+from app.util.transaction_acked import wait_for_transaction_acked
+from shared import PUBLISH_REVOCATIONS_TIMEOUT
 from shared.log_config import get_logger
 
 logger = get_logger(__name__)
@@ -73,6 +76,7 @@ async def revoke_credential(
     controller: AcaPyClient,
     credential_exchange_id: str,
     auto_publish_to_ledger: bool = False,
+    wallet_id: Optional[str] = None,
 ) -> RevokedResponse:
     """
         Revoke an issued credential
@@ -82,6 +86,8 @@ async def revoke_credential(
         credential_exchange_id (str): The credential exchange ID.
         auto_publish_to_ledger (bool): (True) publish revocation to ledger immediately,
             or (default, False) mark it pending
+        wallet_id (Optional[str]): The issuer's wallet ID, to wait for the published
+            revocation's `transaction-acked` event instead of polling
 
     Raises:
         Exception: When the credential could not be revoked
@@ -117,27 +123,15 @@ async def revoke_credential(
     if auto_publish_to_ledger:
         bound_logger.debug("Wait for publish complete")
 
-        revoked = False
-        max_tries = 5
-        retry_delay = 1
-        n_try = 0
-        while not revoked and n_try < max_tries:
-            n_try += 1
-            # Safely fetch revocation record and check if change reflected
-            record = await coroutine_with_retry(
-                coroutine_func=controller.revocation.get_revocation_status,
-                args=(strip_protocol_prefix(credential_exchange_id),),
-                logger=bound_logger,
-                max_attempts=5,
-                retry_delay=0.5,
+        transaction_id = ((revoke_result or {}).get("txn") or {}).get("transaction_id")
+        if transaction_id:
+            revoked = await _wait_for_revocation_transaction_acked(
+                controller, transaction_id, wallet_id
+            )
+        else:
+            revoked = await _wait_for_revocation_status_revoked(
+                controller, credential_exchange_id, bound_logger
             )
-            # Todo: this record state can be "revoked" before it's been endorsed
-            if record.result:
-                revoked = record.result.state == "revoked"
-
-            if not revoked and n_try < max_tries:
-                bound_logger.debug("Not yet revoked, waiting ...")
-                await asyncio.sleep(retry_delay)
 
         if not revoked:
             raise CloudApiException(
@@ -163,6 +157,49 @@ async def revoke_credential(
     return RevokedResponse()
 
 
+async def _wait_for_revocation_transaction_acked(
+    controller: AcaPyClient, transaction_id: str, wallet_id: Optional[str]
+) -> bool:
+    try:
+        await wait_for_transaction_acked(
+            aries_controller=controller,
+            transaction_id=transaction_id,
+            wallet_id=wallet_id,
+            timeout=PUBLISH_REVOCATIONS_TIMEOUT,
+        )
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
+async def _wait_for_revocation_status_revoked(
+    controller: AcaPyClient, credential_exchange_id: str, bound_logger: Logger
+) -> bool:
+    revoked = False
+    max_tries = 5
+    retry_delay = 1
+    n_try = 0
+    while not revoked and n_try < max_tries:
+        n_try += 1
+        # Safely fetch revocation record and check if change reflected
+        record = await coroutine_with_retry(
+            coroutine_func=controller.revocation.get_revocation_status,
+            args=(strip_protocol_prefix(credential_exchange_id),),
+            logger=bound_logger,
+            max_attempts=5,
+            retry_delay=0.5,
+        )
+        # Todo: this record state can be "revoked" before it's been endorsed
+        if record.result:
+            revoked = record.result.state == "revoked"
+
+        if not revoked and n_try < max_tries:
+            bound_logger.debug("Not yet revoked, waiting ...")
+            await asyncio.sleep(retry_delay)
+
+    return revoked
+
+
 async def publish_pending_revocations(
     controller: AcaPyClient, revocation_registry_credential_map: Dict[str, List[str]]
 ) -> TxnOrPublishRevocationsResult:
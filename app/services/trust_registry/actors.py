@@ -1,28 +1,43 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from app.exceptions import TrustRegistryException
+from app.services.trust_registry.list_cache import registry_list_cache
+from app.services.trust_registry.util.session import session_headers
 from shared.constants import TRUST_REGISTRY_URL
 from shared.log_config import get_logger
-from shared.models.trustregistry import Actor, TrustRegistryRole
+from shared.models.trustregistry import (
+    Actor,
+    ActorNameReservation,
+    ActorNameReservationRequest,
+    ActorRegistration,
+    TrustRegistryRole,
+)
 from shared.util.rich_async_client import RichAsyncClient
 
 logger = get_logger(__name__)
 
 
-async def register_actor(actor: Actor) -> None:
+async def register_actor(actor: Actor, reservation_id: Optional[str] = None) -> None:
     """Register an actor in the trust registry
 
     Args:
         actor (Actor): the actor to register
+        reservation_id (Optional[str]): the reservation of the actor's name, which
+            registering the actor consumes
 
     Raises:
         TrustRegistryException: If an error occurred while registering the schema
     """
     bound_logger = logger.bind(body={"actor": actor})
     bound_logger.debug("Registering actor on trust registry")
-    async with RichAsyncClient(raise_status_error=False) as client:
+    async with RichAsyncClient(
+        raise_status_error=False, headers=session_headers
+    ) as client:
         actor_response = await client.post(
-            f"{TRUST_REGISTRY_URL}/registry/actors", json=actor.model_dump()
+            f"{TRUST_REGISTRY_URL}/registry/actors",
+            json=ActorRegistration(
+                **actor.model_dump(), reservation_id=reservation_id
+            ).model_dump(),
         )
 
     if actor_response.status_code == 422:
@@ -48,10 +63,157 @@ async def register_actor(actor: Actor) -> None:
     bound_logger.debug("Successfully registered actor on trust registry.")
 
 
+async def register_actors(
+    actors: List[Actor], reservation_ids: Optional[Dict[str, str]] = None
+) -> Dict[str, TrustRegistryException]:
+    """Register a batch of actors in the trust registry, in one bulk request
+
+    Args:
+        actors (List[Actor]): the actors to register
+        reservation_ids (Optional[Dict[str, str]]): the reservations of the actors'
+            names, by actor id, which registering the actors consumes
+
+    Raises:
+        TrustRegistryException: If the batch could not be submitted
+
+    Returns:
+        Dict[str, TrustRegistryException]: The error for each actor that was not
+            registered, by actor id
+    """
+    logger.debug("Registering {} actors on trust registry", len(actors))
+    reservation_ids = reservation_ids or {}
+    registrations = [
+        ActorRegistration(
+            **actor.model_dump(), reservation_id=reservation_ids.get(actor.id)
+        )
+        for actor in actors
+    ]
+    async with RichAsyncClient(
+        raise_status_error=False, headers=session_headers
+    ) as client:
+        bulk_response = await client.post(
+            f"{TRUST_REGISTRY_URL}/registry/actors/bulk",
+            content=b"\n".join(
+                registration.model_dump_json().encode()
+                for registration in registrations
+            ),
+            headers={"content-type": "application/x-ndjson"},
+        )
+
+    if bulk_response.is_error:
+        logger.error(
+            "Error registering actors. Got status code {} with message `{}`.",
+            bulk_response.status_code,
+            bulk_response.text,
+        )
+        raise TrustRegistryException(
+            f"Error registering actors: `{bulk_response.text}`.",
+            bulk_response.status_code,
+        )
+
+    # Each NDJSON line is reported on, by its 1-based line number
+    results = {result["line"]: result for result in bulk_response.json()["results"]}
+    failures = {}
+    for line, actor in enumerate(actors, start=1):
+        result = results.get(line, {"status": "failed"})
+        if result["status"] != "created":
+            failures[actor.id] = TrustRegistryException(
+                f"Error registering actor: `{result.get('detail') or result['status']}`.",
+                409 if result["status"] == "conflict" else 500,
+            )
+
+    logger.debug(
+        "Registered {} of {} actors on trust registry.",
+        len(actors) - len(failures),
+        len(actors),
+    )
+    return failures
+
+
+async def reserve_actor_name(actor_name: str) -> ActorNameReservation:
+    """Reserve an actor name in the trust registry, ahead of registering the actor
+
+    Args:
+        actor_name (str): the name to reserve
+
+    Raises:
+        TrustRegistryException: With status code 409 if an actor has the name or it is
+            reserved already, or if another error occurred while reserving the name
+
+    Returns:
+        ActorNameReservation: The reservation, which registering the actor consumes
+    """
+    bound_logger = logger.bind(body={"actor_name": actor_name})
+    bound_logger.debug("Reserving actor name on trust registry")
+    async with RichAsyncClient(
+        raise_status_error=False, headers=session_headers
+    ) as client:
+        reservation_response = await client.post(
+            f"{TRUST_REGISTRY_URL}/registry/actors/reservations",
+            json=ActorNameReservationRequest(name=actor_name).model_dump(),
+        )
+
+    if reservation_response.status_code == 409:
+        bound_logger.info("Actor name is taken or reserved on trust registry.")
+        raise TrustRegistryException(
+            f"Actor name `{actor_name}` is not available.", 409
+        )
+    if reservation_response.is_error:
+        bound_logger.error(
+            "Error reserving actor name. Got status code {} with message `{}`.",
+            reservation_response.status_code,
+            reservation_response.text,
+        )
+        raise TrustRegistryException(
+            f"Error reserving actor name: `{reservation_response.text}`.",
+            reservation_response.status_code,
+        )
+
+    bound_logger.debug("Successfully reserved actor name on trust registry.")
+    return ActorNameReservation.model_validate(reservation_response.json())
+
+
+async def release_actor_name(reservation_id: str) -> None:
+    """Release a reserved actor name in the trust registry
+
+    Args:
+        reservation_id (str): identifier of the reservation to release
+
+    Raises:
+        TrustRegistryException: If an error occurred while releasing the name
+    """
+    bound_logger = logger.bind(body={"reservation_id": reservation_id})
+    bound_logger.debug("Releasing actor name on trust registry")
+    async with RichAsyncClient(
+        raise_status_error=False, headers=session_headers
+    ) as client:
+        release_response = await client.delete(
+            f"{TRUST_REGISTRY_URL}/registry/actors/reservations/{reservation_id}"
+        )
+
+    if release_response.status_code == 404:
+        bound_logger.debug("Reservation expired or was consumed already.")
+        return
+    if release_response.is_error:
+        bound_logger.error(
+            "Error releasing actor name. Got status code {} with message `{}`.",
+            release_response.status_code,
+            release_response.text,
+        )
+        raise TrustRegistryException(
+            f"Error releasing actor name: `{release_response.text}`.",
+            release_response.status_code,
+        )
+
+    bound_logger.debug("Successfully released actor name on trust registry.")
+
+
 async def update_actor(actor: Actor) -> None:
     bound_logger = logger.bind(body={"actor": actor})
     bound_logger.info("Updating actor on trust registry")
-    async with RichAsyncClient(raise_status_error=False) as client:
+    async with RichAsyncClient(
+        raise_status_error=False, headers=session_headers
+    ) as client:
         update_response = await client.put(
             f"{TRUST_REGISTRY_URL}/registry/actors/{actor.id}",
             json=actor.model_dump(),
@@ -88,21 +250,24 @@ async def fetch_all_actors() -> List[Actor]:
         List[Actor]: List of actors
     """
     logger.debug("Fetching all actors from trust registry")
-    async with RichAsyncClient(raise_status_error=False) as client:
-        actors_response = await client.get(f"{TRUST_REGISTRY_URL}/registry/actors")
-
-    if actors_response.is_error:
-        logger.error(
-            "Error fetching all actors. Got status code {} with message `{}`.",
-            actors_response.status_code,
-            actors_response.text,
-        )
-        raise TrustRegistryException(
-            f"Unable to retrieve actors from registry: `{actors_response.text}`.",
-            actors_response.status_code,
-        )
-
-    actors = [Actor.model_validate(actor) for actor in actors_response.json()]
+    url = f"{TRUST_REGISTRY_URL}/registry/actors"
+    async with RichAsyncClient(
+        raise_status_error=False, headers=session_headers
+    ) as client:
+        actors_response = await registry_list_cache.get(client, url)
+
+        if actors_response.is_error:
+            logger.error(
+                "Error fetching all actors. Got status code {} with message `{}`.",
+                actors_response.status_code,
+                actors_response.text,
+            )
+            raise TrustRegistryException(
+                f"Unable to retrieve actors from registry: `{actors_response.text}`.",
+                actors_response.status_code,
+            )
+
+        actors = registry_list_cache.read(url, actors_response, Actor.model_validate)
 
     if actors:
         logger.debug("Successfully got all actors.")
@@ -126,7 +291,9 @@ async def fetch_actor_by_did(did: str) -> Optional[Actor]:
     """
     bound_logger = logger.bind(body={"did": did})
     bound_logger.debug("Fetching actor by DID from trust registry")
-    async with RichAsyncClient(raise_status_error=False) as client:
+    async with RichAsyncClient(
+        raise_status_error=False, headers=session_headers
+    ) as client:
         actor_response = await client.get(
             f"{TRUST_REGISTRY_URL}/registry/actors/did/{did}"
         )
@@ -163,7 +330,9 @@ async def fetch_actor_by_id(actor_id: str) -> Optional[Actor]:
     """
     bound_logger = logger.bind(body={"actor_id": actor_id})
     bound_logger.debug("Fetching actor by ID from trust registry")
-    async with RichAsyncClient(raise_status_error=False) as client:
+    async with RichAsyncClient(
+        raise_status_error=False, headers=session_headers
+    ) as client:
         actor_response = await client.get(
             f"{TRUST_REGISTRY_URL}/registry/actors/{actor_id}"
         )
@@ -200,7 +369,9 @@ async def fetch_actor_by_name(actor_name: str) -> Optional[Actor]:
     """
     bound_logger = logger.bind(body={"actor_id": actor_name})
     bound_logger.debug("Fetching actor by NAME from trust registry")
-    async with RichAsyncClient(raise_status_error=False) as client:
+    async with RichAsyncClient(
+        raise_status_error=False, headers=session_headers
+    ) as client:
         actor_response = await client.get(
             f"{TRUST_REGISTRY_URL}/registry/actors/name/{actor_name}"
         )
@@ -237,21 +408,24 @@ async def fetch_actors_with_role(role: TrustRegistryRole) -> List[Actor]:
     """
     bound_logger = logger.bind(body={"role": role})
     bound_logger.debug("Fetching all actors with requested role from trust registry")
-    async with RichAsyncClient(raise_status_error=False) as client:
-        actors_response = await client.get(f"{TRUST_REGISTRY_URL}/registry/actors")
-
-    if actors_response.is_error:
-        bound_logger.error(
-            "Error fetching actors by role. Got status code {} with message `{}`.",
-            actors_response.status_code,
-            actors_response.text,
-        )
-        raise TrustRegistryException(
-            f"Unable to retrieve actors from registry: `{actors_response.text}`.",
-            actors_response.status_code,
-        )
-
-    actors = [Actor.model_validate(actor) for actor in actors_response.json()]
+    url = f"{TRUST_REGISTRY_URL}/registry/actors"
+    async with RichAsyncClient(
+        raise_status_error=False, headers=session_headers
+    ) as client:
+        actors_response = await registry_list_cache.get(client, url)
+
+        if actors_response.is_error:
+            bound_logger.error(
+                "Error fetching actors by role. Got status code {} with message `{}`.",
+                actors_response.status_code,
+                actors_response.text,
+            )
+            raise TrustRegistryException(
+                f"Unable to retrieve actors from registry: `{actors_response.text}`.",
+                actors_response.status_code,
+            )
+
+        actors = registry_list_cache.read(url, actors_response, Actor.model_validate)
     actors_with_role_list = [actor for actor in actors if role in actor.roles]
 
     if actors_with_role_list:
@@ -273,7 +447,9 @@ async def remove_actor_by_id(actor_id: str) -> None:
     """
     bound_logger = logger.bind(body={"actor_id": actor_id})
     bound_logger.info("Removing actor from trust registry")
-    async with RichAsyncClient(raise_status_error=False) as client:
+    async with RichAsyncClient(
+        raise_status_error=False, headers=session_headers
+    ) as client:
         remove_response = await client.delete(
             f"{TRUST_REGISTRY_URL}/registry/actors/{actor_id}"
         )
@@ -0,0 +1,57 @@
+from typing import Any, Callable, Dict, List, Tuple, TypeVar
+
+from httpx import AsyncClient, Response
+
+T = TypeVar("T")
+
+
+class RegistryListCache:
+    """
+    Keeps the last list returned by each trust registry list endpoint, with its `ETag`.
+
+    Requests for a cached list are sent with `If-None-Match`, so that while the registry's
+    data is unchanged it answers `304 Not Modified` and the list is neither re-sent nor
+    re-parsed. An ETag identifies one version of the registry's data, so a cached entry
+    stays valid for its ETag and is only ever replaced by a newer one.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, Tuple[str, List[Any]]] = {}
+
+    def request_headers(self, url: str) -> Dict[str, str]:
+        entry = self._entries.get(url)
+        return {"If-None-Match": entry[0]} if entry else {}
+
+    async def get(self, client: AsyncClient, url: str) -> Response:
+        """
+        Request a list, revalidating the cached list for the url if there is one.
+
+        Pass the response to `read` without awaiting anything in between, so that the
+        cached list a `304 Not Modified` refers to cannot be evicted in the meantime.
+        """
+        response = await client.get(url, headers=self.request_headers(url))
+        if response.status_code == 304 and url not in self._entries:
+            # Evicted while the request was in flight, so there is nothing to serve
+            response = await client.get(url, headers={})
+        return response
+
+    def read(self, url: str, response: Response, parse: Callable[[Any], T]) -> List[T]:
+        """
+        Return the list for a successful response from `get(client, url)`: the cached list
+        if it was not modified, else the parsed body.
+        """
+        entry = self._entries.get(url)
+        if response.status_code == 304 and entry:
+            return list(entry[1])
+
+        items = [parse(item) for item in response.json()]
+        etag = response.headers.get("ETag")
+        if etag:
+            self._entries[url] = (etag, items)
+        return list(items)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+registry_list_cache = RegistryListCache()
@@ -3,6 +3,8 @@ from typing import List, Optional
 from fastapi import HTTPException
 
 from app.exceptions import TrustRegistryException
+from app.services.trust_registry.list_cache import registry_list_cache
+from app.services.trust_registry.util.session import session_headers
 from shared.constants import TRUST_REGISTRY_URL
 from shared.log_config import get_logger
 from shared.models.trustregistry import Schema
@@ -22,9 +24,10 @@ async def register_schema(schema_id: str) -> None:
     """
     bound_logger = logger.bind(body={"schema_id": schema_id})
     bound_logger.debug("Registering schema on trust registry")
-    async with RichAsyncClient() as client:
+    async with RichAsyncClient(headers=session_headers) as client:
         try:
-            await client.post(
+            # Idempotent upsert: registering an already registered schema succeeds
+            await client.put(
                 f"{TRUST_REGISTRY_URL}/registry/schemas", json={"schema_id": schema_id}
             )
         except HTTPException as e:
@@ -51,9 +54,10 @@ async def fetch_schemas() -> List[Schema]:
         A list of schemas
     """
     logger.debug("Fetching all schemas from trust registry")
-    async with RichAsyncClient() as client:
+    url = f"{TRUST_REGISTRY_URL}/registry/schemas"
+    async with RichAsyncClient(headers=session_headers) as client:
         try:
-            schemas_res = await client.get(f"{TRUST_REGISTRY_URL}/registry/schemas")
+            schemas_res = await registry_list_cache.get(client, url)
         except HTTPException as e:
             logger.error(
                 "Error fetching schemas. Got status code {} with message `{}`.",
@@ -64,7 +68,7 @@ async def fetch_schemas() -> List[Schema]:
                 f"Unable to fetch schemas: `{e.detail}`.", e.status_code
             ) from e
 
-    result = [Schema.model_validate(schema) for schema in schemas_res.json()]
+        result = registry_list_cache.read(url, schemas_res, Schema.model_validate)
     logger.debug("Successfully fetched schemas from trust registry.")
     return result
 
@@ -81,7 +85,7 @@ async def get_schema_by_id(schema_id: str) -> Optional[Schema]:
     bound_logger = logger.bind(body={"schema_id": schema_id})
     bound_logger.debug("Fetching schema from trust registry")
 
-    async with RichAsyncClient() as client:
+    async with RichAsyncClient(headers=session_headers) as client:
         try:
             schema_response = await client.get(
                 f"{TRUST_REGISTRY_URL}/registry/schemas/{schema_id}"
@@ -117,7 +121,7 @@ async def remove_schema_by_id(schema_id: str) -> None:
     """
     bound_logger = logger.bind(body={"schema_id": schema_id})
     bound_logger.info("Removing schema from trust registry")
-    async with RichAsyncClient() as client:
+    async with RichAsyncClient(headers=session_headers) as client:
         try:
             await client.delete(f"{TRUST_REGISTRY_URL}/registry/schemas/{schema_id}")
         except HTTPException as e:
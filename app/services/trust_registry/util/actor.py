@@ -1,5 +1,6 @@
 from app.exceptions import TrustRegistryException
 from app.services.trust_registry.actors import fetch_actor_by_id
+from app.services.trust_registry.util.session import session_headers
 from shared.constants import TRUST_REGISTRY_URL
 from shared.log_config import get_logger
 from shared.models.trustregistry import TrustRegistryRole
@@ -49,7 +50,9 @@ async def assert_actor_name(actor_name: str) -> bool:
     bound_logger = logger.bind(body={"actor_name": actor_name})
     bound_logger.debug("Fetching actor by name from trust registry")
 
-    async with RichAsyncClient(raise_status_error=False) as client:
+    async with RichAsyncClient(
+        raise_status_error=False, headers=session_headers
+    ) as client:
         actor_response = await client.get(
             f"{TRUST_REGISTRY_URL}/registry/actors/name/{actor_name}"
         )
@@ -1,5 +1,6 @@
 from fastapi import HTTPException
 
+from app.services.trust_registry.util.session import session_headers
 from shared.constants import TRUST_REGISTRY_URL
 from shared.log_config import get_logger
 from shared.util.rich_async_client import RichAsyncClient
@@ -24,7 +25,7 @@ async def registry_has_schema(schema_id: str) -> bool:
         "Asserting if schema is registered. Fetching schema by ID from trust registry"
     )
     try:
-        async with RichAsyncClient() as client:
+        async with RichAsyncClient(headers=session_headers) as client:
             bound_logger.debug("Fetch schema from trust registry")
             await client.get(f"{TRUST_REGISTRY_URL}/registry/schemas/{schema_id}")
     except HTTPException as http_err:
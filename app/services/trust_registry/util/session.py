@@ -0,0 +1,4 @@
+from shared.constants import TRUST_REGISTRY_SESSION, TRUST_REGISTRY_SESSION_HEADER
+
+# Sent with every request to the trust registry, so that the app reads its own writes
+session_headers = {TRUST_REGISTRY_SESSION_HEADER: TRUST_REGISTRY_SESSION}
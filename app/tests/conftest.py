@@ -3,6 +3,8 @@
 import mockito
 import pytest
 
+from app.dependencies.auth import verified_token_cache
+from app.services.acapy_ledger import invalidate_ledger_metadata
 from app.tests.fixtures.dids import register_issuer_key_bbs, register_issuer_key_ed25519
 from app.tests.fixtures.member_acapy_clients import (
     acme_acapy_client,
@@ -38,6 +40,7 @@ from app.tests.fixtures.member_wallets import (
     faber_issuer,
     meld_co_issuer_verifier,
 )
+from app.util.tenants import wallet_cache
 from shared.util.mock_agent_controller import (
     mock_admin_auth,
     mock_agent_controller,
@@ -79,3 +82,11 @@ def unstub_mockito():
 
     # Teardown phase: After each test, unstub all stubbed methods
     mockito.unstub()
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    yield
+    invalidate_ledger_metadata()
+    wallet_cache.clear()
+    verified_token_cache.clear()
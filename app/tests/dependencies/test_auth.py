@@ -1,3 +1,4 @@
+import time
 from unittest.mock import MagicMock, patch
 
 import jwt
@@ -7,6 +8,7 @@ from fastapi import HTTPException
 from app.dependencies.auth import (
     AcaPyAuth,
     AcaPyAuthVerified,
+    VerifiedTokenCache,
     acapy_auth_from_header,
     acapy_auth_governance,
     acapy_auth_tenant_admin,
@@ -14,6 +16,7 @@ from app.dependencies.auth import (
     get_acapy_auth,
     get_acapy_auth_verified,
     tenant_api_key,
+    verified_token_cache,
     verify_wallet_access,
 )
 from app.dependencies.role import Role
@@ -119,6 +122,58 @@ def test_get_acapy_auth_verified_valid_tenant():
     )
 
 
+def test_get_acapy_auth_verified_tenant_cached():
+    tenant_jwt = jwt.encode(
+        {"wallet_id": "wallet_id", "exp": int(time.time()) + 60},
+        ACAPY_MULTITENANT_JWT_SECRET,
+        algorithm="HS256",
+    )
+    auth = AcaPyAuth(role=Role.TENANT, token=tenant_jwt)
+
+    assert get_acapy_auth_verified(auth).wallet_id == "wallet_id"
+    with patch("app.dependencies.auth.jwt.decode") as mock_decode:
+        assert get_acapy_auth_verified(auth).wallet_id == "wallet_id"
+    mock_decode.assert_not_called()
+
+    assert verified_token_cache.stats() == {
+        "size": 1,
+        "hits": 1,
+        "misses": 1,
+        "hit_rate": 0.5,
+    }
+
+
+def test_get_acapy_auth_verified_tenant_cached_expired():
+    tenant_jwt = jwt.encode(
+        {"wallet_id": "wallet_id", "exp": int(time.time()) - 10},
+        ACAPY_MULTITENANT_JWT_SECRET,
+        algorithm="HS256",
+    )
+    # Cached before it expired
+    verified_token_cache.set(tenant_jwt, "wallet_id", time.time() - 10)
+    auth = AcaPyAuth(role=Role.TENANT, token=tenant_jwt)
+
+    with pytest.raises(HTTPException) as exc:
+        get_acapy_auth_verified(auth)
+    assert exc.value.status_code == 403
+    assert verified_token_cache.stats()["size"] == 0
+
+
+def test_verified_token_cache_logs_stats():
+    cache = VerifiedTokenCache(maxsize=10, log_interval=2)
+    cache.set("token", "wallet_id", None)
+
+    with patch("app.dependencies.auth.logger") as mock_logger:
+        assert cache.get("token") == "wallet_id"
+        mock_logger.info.assert_not_called()
+
+        assert cache.get("other_token") is None
+        mock_logger.info.assert_called_once_with(
+            "Verified token cache stats: {}",
+            {"size": 1, "hits": 1, "misses": 1, "hit_rate": 0.5},
+        )
+
+
 def test_get_acapy_auth_verified_tenant_bad_token():
     auth = AcaPyAuth(role=Role.TENANT, token="bad-api-key")
 
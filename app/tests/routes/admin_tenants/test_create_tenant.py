@@ -1,9 +1,14 @@
+import json
 from secrets import token_urlsafe
 from unittest.mock import AsyncMock, patch
 
 import base58
 import pytest
-from aries_cloudcontroller import CreateWalletResponse
+from aries_cloudcontroller import (
+    CreateWalletResponse,
+    UpdateWalletRequest,
+    WalletRecord,
+)
 from fastapi import HTTPException
 
 from app.dependencies.acapy_clients import TENANT_ADMIN_AUTHED
@@ -14,7 +19,13 @@ from app.models.tenants import (
     OnboardResult,
 )
 from app.routes.admin.tenants import create_tenant
-from shared.models.trustregistry import Actor
+from app.services.onboarding.issuer_pool import IssuerPool, PooledIssuer
+from app.services.onboarding.jobs import OnboardingJobs
+from shared.models.trustregistry import Actor, ActorNameReservation
+
+# pylint: disable=redefined-outer-name
+
+MODULE = "app.routes.admin.tenants"
 
 wallet_id = "some_wallet_id"
 wallet_name = "some_wallet_name"
@@ -33,6 +44,23 @@ create_tenant_body = CreateTenantRequest(
     group_id="test_group",
     image_url="some_image_url",
 )
+reservation = ActorNameReservation(
+    id="reservation_id", name="Test Wallet", expires_at="2026-10-19T10:00:00Z"
+)
+
+
+@pytest.fixture(autouse=True)
+def mock_reserve_actor_name():
+    with patch(
+        f"{MODULE}.reserve_actor_name", AsyncMock(return_value=reservation)
+    ) as mock_reserve:
+        yield mock_reserve
+
+
+@pytest.fixture(autouse=True)
+def mock_release_actor_name():
+    with patch(f"{MODULE}.release_actor_name", AsyncMock()) as mock_release:
+        yield mock_release
 
 
 @pytest.mark.anyio
@@ -40,7 +68,9 @@ create_tenant_body = CreateTenantRequest(
     "roles",
     [[], ["issuer"], ["verifier"], ["issuer", "verifier"]],
 )
-async def test_create_tenant_success(roles):
+async def test_create_tenant_success(
+    roles, mock_reserve_actor_name, mock_release_actor_name
+):
     # Create tenant request body
     body = create_tenant_body.model_copy(update={"roles": roles})
     wallet_label = create_tenant_body.wallet_label
@@ -90,6 +120,7 @@ async def test_create_tenant_success(roles):
 
         response = await create_tenant(
             body=body,
+            onboard_async=False,
             admin_auth=TENANT_ADMIN_AUTHED,
         )
 
@@ -101,6 +132,8 @@ async def test_create_tenant_success(roles):
         )
 
         if roles:
+            # The label is reserved as actor name, which registration consumes
+            mock_reserve_actor_name.assert_awaited_once_with(wallet_label)
             mock_onboard_tenant.assert_awaited_once_with(
                 tenant_label=wallet_label,
                 roles=roles,
@@ -115,8 +148,12 @@ async def test_create_tenant_success(roles):
                     did=did,
                     didcomm_invitation=didcomm_invitation,
                     image_url=create_tenant_body.image_url,
-                )
+                ),
+                reservation_id=mock_reserve_actor_name.return_value.id,
             )
+        else:
+            mock_reserve_actor_name.assert_not_awaited()
+        mock_release_actor_name.assert_not_awaited()
 
 
 @pytest.mark.anyio
@@ -124,19 +161,33 @@ async def test_create_tenant_success(roles):
     "roles",
     [[], ["issuer"], ["verifier"], ["issuer", "verifier"]],
 )
-async def test_create_tenant_fail_trust_registry_error(roles):
+async def test_create_tenant_fail_trust_registry_error(roles, mock_reserve_actor_name):
+    mock_admin_controller = AsyncMock()
+    mock_admin_controller.multitenancy.create_wallet = AsyncMock(
+        return_value=create_wallet_response
+    )
+    mock_admin_controller.multitenancy.delete_wallet = AsyncMock()
+    mock_reserve_actor_name.side_effect = TrustRegistryException("Error")
+
     with patch(
+        "app.routes.admin.tenants.get_tenant_admin_controller"
+    ) as mock_get_admin_controller, patch(
         "app.routes.admin.tenants.assert_actor_name",
         side_effect=TrustRegistryException("Error"),
     ), pytest.raises(
         CloudApiException,
         match="An error occurred when trying to register actor. Please try again",
     ) as exc:
+        mock_get_admin_controller.return_value.__aenter__.return_value = (
+            mock_admin_controller
+        )
         await create_tenant(
             body=create_tenant_body.model_copy(update={"roles": roles}),
+            onboard_async=False,
             admin_auth=TENANT_ADMIN_AUTHED,
         )
     assert exc.value.status_code == 500
+    _assert_wallet_not_kept(mock_admin_controller, roles)
 
 
 @pytest.mark.anyio
@@ -144,9 +195,18 @@ async def test_create_tenant_fail_trust_registry_error(roles):
     "roles",
     [[], ["issuer"], ["verifier"], ["issuer", "verifier"]],
 )
-async def test_create_tenant_fail_actor_exists(roles):
+async def test_create_tenant_fail_actor_exists(roles, mock_reserve_actor_name):
     wallet_label = "abc"
+    mock_admin_controller = AsyncMock()
+    mock_admin_controller.multitenancy.create_wallet = AsyncMock(
+        return_value=create_wallet_response
+    )
+    mock_admin_controller.multitenancy.delete_wallet = AsyncMock()
+    mock_reserve_actor_name.side_effect = TrustRegistryException("Conflict", 409)
+
     with patch(
+        "app.routes.admin.tenants.get_tenant_admin_controller"
+    ) as mock_get_admin_controller, patch(
         "app.routes.admin.tenants.assert_actor_name",
         return_value=True,
     ), pytest.raises(
@@ -156,12 +216,56 @@ async def test_create_tenant_fail_actor_exists(roles):
             "be re-used because it exists on the trust registry."
         ),
     ) as exc:
+        mock_get_admin_controller.return_value.__aenter__.return_value = (
+            mock_admin_controller
+        )
         await create_tenant(
             body=create_tenant_body.model_copy(
                 update={"roles": roles, "wallet_label": wallet_label}
             ),
+            onboard_async=False,
+            admin_auth=TENANT_ADMIN_AUTHED,
+        )
+    assert exc.value.status_code == 409
+    _assert_wallet_not_kept(mock_admin_controller, roles)
+
+
+def _assert_wallet_not_kept(mock_admin_controller: AsyncMock, roles) -> None:
+    if roles:
+        # The actor name could not be reserved, so no wallet is created
+        mock_admin_controller.multitenancy.create_wallet.assert_not_awaited()
+    else:
+        # The wallet, created while the label was checked, is deleted again
+        mock_admin_controller.multitenancy.delete_wallet.assert_awaited_once_with(
+            wallet_id=wallet_id
+        )
+
+
+@pytest.mark.anyio
+async def test_create_tenant_actor_exists_and_wallet_creation_fails():
+    mock_admin_controller = AsyncMock()
+    mock_admin_controller.multitenancy.create_wallet = AsyncMock(
+        side_effect=CloudApiException("Error", 500)
+    )
+
+    with patch(
+        "app.routes.admin.tenants.get_tenant_admin_controller"
+    ) as mock_get_admin_controller, patch(
+        "app.routes.admin.tenants.assert_actor_name",
+        return_value=True,
+    ), pytest.raises(
+        HTTPException
+    ) as exc:
+        mock_get_admin_controller.return_value.__aenter__.return_value = (
+            mock_admin_controller
+        )
+        await create_tenant(
+            body=create_tenant_body.model_copy(update={"roles": []}),
+            onboard_async=False,
             admin_auth=TENANT_ADMIN_AUTHED,
         )
+
+    # The taken label is reported rather than the failed wallet creation
     assert exc.value.status_code == 409
 
 
@@ -170,7 +274,7 @@ async def test_create_tenant_fail_actor_exists(roles):
     "roles",
     [[], ["issuer"], ["verifier"], ["issuer", "verifier"]],
 )
-async def test_create_tenant_fail_wallet_name_exists(roles):
+async def test_create_tenant_fail_wallet_name_exists(roles, mock_release_actor_name):
     with patch(
         "app.routes.admin.tenants.handle_acapy_call",
         side_effect=CloudApiException(status_code=400, detail="already exists"),
@@ -186,9 +290,15 @@ async def test_create_tenant_fail_wallet_name_exists(roles):
     ) as exc:
         await create_tenant(
             body=create_tenant_body.model_copy(update={"roles": roles}),
+            onboard_async=False,
             admin_auth=TENANT_ADMIN_AUTHED,
         )
     assert exc.value.status_code == 409
+    # The reserved actor name is released again
+    if roles:
+        mock_release_actor_name.assert_awaited_once_with(reservation.id)
+    else:
+        mock_release_actor_name.assert_not_awaited()
 
 
 @pytest.mark.anyio
@@ -210,6 +320,7 @@ async def test_create_tenant_fail_wallet_creation(status_code, error_msg, roles)
     ) as exc:
         await create_tenant(
             body=create_tenant_body.model_copy(update={"roles": roles}),
+            onboard_async=False,
             admin_auth=TENANT_ADMIN_AUTHED,
         )
     assert exc.value.status_code == status_code
@@ -224,7 +335,9 @@ async def test_create_tenant_fail_wallet_creation(status_code, error_msg, roles)
     "roles",
     [["issuer"], ["verifier"], ["issuer", "verifier"]],
 )
-async def test_create_tenant_fail_onboard_exception(exception, roles):
+async def test_create_tenant_fail_onboard_exception(
+    exception, roles, mock_release_actor_name
+):
     mock_admin_controller = AsyncMock()
     mock_admin_controller.multitenancy.create_wallet = AsyncMock(
         return_value=create_wallet_response
@@ -247,11 +360,134 @@ async def test_create_tenant_fail_onboard_exception(exception, roles):
         )
         await create_tenant(
             body=create_tenant_body.model_copy(update={"roles": roles}),
+            onboard_async=False,
             admin_auth=TENANT_ADMIN_AUTHED,
         )
 
-    # Assert created wallet is deleted if something went wrong in onboarding
+    # Assert created wallet is deleted, and the actor name released, if something went
+    # wrong in onboarding
     mock_onboard.assert_awaited_once()
     mock_admin_controller.multitenancy.delete_wallet.assert_awaited_once_with(
         wallet_id=wallet_id
     )
+    mock_release_actor_name.assert_awaited_once_with(reservation.id)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("onboarding_fails", [False, True])
+async def test_create_tenant_onboard_async(onboarding_fails, mock_release_actor_name):
+    mock_admin_controller = AsyncMock()
+    mock_admin_controller.multitenancy.create_wallet = AsyncMock(
+        return_value=create_wallet_response
+    )
+    mock_admin_controller.multitenancy.delete_wallet = AsyncMock()
+
+    mock_onboard_tenant = AsyncMock(
+        return_value=OnboardResult(did="did:example:123"),
+        side_effect=Exception("Error") if onboarding_fails else None,
+    )
+
+    with patch(
+        "app.routes.admin.tenants.get_tenant_admin_controller"
+    ) as mock_get_admin_controller, patch(
+        "app.routes.admin.tenants.onboard_tenant", mock_onboard_tenant
+    ), patch(
+        "app.routes.admin.tenants.register_actor", AsyncMock()
+    ) as mock_register_actor, patch(
+        "app.routes.admin.tenants.assert_actor_name", return_value=False
+    ), patch(
+        "app.routes.admin.tenants.onboarding_jobs", OnboardingJobs()
+    ) as jobs:
+        mock_get_admin_controller.return_value.__aenter__.return_value = (
+            mock_admin_controller
+        )
+
+        response = await create_tenant(
+            body=create_tenant_body,
+            onboard_async=True,
+            admin_auth=TENANT_ADMIN_AUTHED,
+        )
+
+        assert response.status_code == 202
+        content = json.loads(response.body)
+        assert content["wallet_id"] == wallet_id
+        assert content["onboarding_job"] == {
+            "job_id": wallet_id,
+            "status": "pending",
+            "error": None,
+        }
+
+        job = await jobs.wait(wallet_id)
+
+    mock_onboard_tenant.assert_awaited_once()
+    if onboarding_fails:
+        assert job.status == "failed"
+        assert job.error == "Error"
+        mock_register_actor.assert_not_awaited()
+        mock_admin_controller.multitenancy.delete_wallet.assert_awaited_once_with(
+            wallet_id=wallet_id
+        )
+        mock_release_actor_name.assert_awaited_once_with(reservation.id)
+    else:
+        assert job.status == "succeeded"
+        mock_register_actor.assert_awaited_once()
+        mock_admin_controller.multitenancy.delete_wallet.assert_not_awaited()
+        mock_release_actor_name.assert_not_awaited()
+
+
+@pytest.mark.anyio
+async def test_create_tenant_from_issuer_pool():
+    body = create_tenant_body.model_copy(update={"wallet_name": None, "group_id": None})
+    pool = IssuerPool(size=1)
+    pool._ready.append(
+        PooledIssuer(wallet_name="pooled_wallet_name", wallet=create_wallet_response)
+    )
+
+    mock_admin_controller = AsyncMock()
+    mock_admin_controller.multitenancy.create_wallet = AsyncMock()
+    mock_admin_controller.multitenancy.update_wallet = AsyncMock(
+        return_value=WalletRecord(
+            key_management_mode="managed",
+            wallet_id=wallet_id,
+            created_at="2024-02-27T09:48:39.508826Z",
+            updated_at="2024-02-28T09:48:39.508826Z",
+        )
+    )
+    mock_onboard_tenant = AsyncMock(return_value=OnboardResult(did="did:sov:123"))
+    mock_label_assigned = AsyncMock()
+
+    with patch(
+        "app.routes.admin.tenants.get_tenant_admin_controller"
+    ) as mock_get_admin_controller, patch(
+        "app.routes.admin.tenants.onboard_tenant", mock_onboard_tenant
+    ), patch(
+        "app.routes.admin.tenants.register_actor", AsyncMock()
+    ), patch(
+        "app.routes.admin.tenants.assert_actor_name", return_value=False
+    ), patch(
+        "app.routes.admin.tenants.issuer_pool", pool
+    ), patch.object(
+        pool, "label_assigned", mock_label_assigned
+    ):
+        mock_get_admin_controller.return_value.__aenter__.return_value = (
+            mock_admin_controller
+        )
+
+        response = await create_tenant(
+            body=body,
+            onboard_async=False,
+            admin_auth=TENANT_ADMIN_AUTHED,
+        )
+
+    assert response.wallet_id == wallet_id
+    assert response.wallet_name == "pooled_wallet_name"
+    assert response.updated_at == "2024-02-28T09:48:39.508826Z"
+    mock_admin_controller.multitenancy.create_wallet.assert_not_awaited()
+    mock_admin_controller.multitenancy.update_wallet.assert_awaited_once_with(
+        wallet_id=wallet_id,
+        body=UpdateWalletRequest(label=body.wallet_label, image_url=body.image_url),
+    )
+    mock_label_assigned.assert_awaited_once()
+    assert mock_label_assigned.await_args.args[1] == body.wallet_label
+    # Onboarding only has to create the trust registry invitation for the pooled wallet
+    mock_onboard_tenant.assert_awaited_once()
@@ -0,0 +1,355 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from aries_cloudcontroller import CreateWalletResponse
+from fastapi import HTTPException
+
+from app.dependencies.acapy_clients import TENANT_ADMIN_AUTHED
+from app.exceptions import TrustRegistryException
+from app.models.tenants import CreateTenantRequest, OnboardResult
+from app.routes.admin.tenants import _read_bulk_tenants, create_tenants_bulk
+from shared.models.trustregistry import ActorNameReservation
+
+MODULE = "app.routes.admin.tenants"
+
+
+def wallet_response(body) -> CreateWalletResponse:
+    return CreateWalletResponse(
+        key_management_mode="managed",
+        wallet_id=f"{body.label}_id",
+        created_at="2024-02-27T09:48:39.508826Z",
+        updated_at="2024-02-27T09:48:39.508826Z",
+        token="abc",
+    )
+
+
+def bulk_request(content: bytes, content_type: str) -> MagicMock:
+    async def stream():
+        # Deliver the body in chunks that do not align with its lines
+        for start in range(0, len(content), 7):
+            yield content[start : start + 7]
+
+    request = MagicMock()
+    request.body = AsyncMock(return_value=content)
+    request.stream = stream
+    request.headers = {"content-type": content_type}
+    return request
+
+
+async def create_tenants(tenants, content_type="application/json", concurrency=10):
+    request = bulk_request(tenants, content_type)
+
+    response = await create_tenants_bulk(
+        request=request, concurrency=concurrency, admin_auth=TENANT_ADMIN_AUTHED
+    )
+    assert response.media_type == "application/x-ndjson"
+
+    results = [json.loads(line) async for line in response.body_iterator]
+    return sorted(results, key=lambda result: result["index"])
+
+
+@pytest.fixture
+def mock_admin_controller():
+    admin_controller = AsyncMock()
+    admin_controller.multitenancy.create_wallet = AsyncMock(
+        side_effect=lambda body: wallet_response(body)
+    )
+    admin_controller.multitenancy.delete_wallet = AsyncMock()
+
+    with patch(f"{MODULE}.get_tenant_admin_controller") as mock_get_controller:
+        mock_get_controller.return_value.__aenter__.return_value = admin_controller
+        yield admin_controller
+
+
+@pytest.fixture(autouse=True)
+def mock_reserve_actor_name():
+    def reserve(actor_name):
+        return ActorNameReservation(
+            id=f"{actor_name}_reservation",
+            name=actor_name,
+            expires_at="2026-10-19T10:00:00Z",
+        )
+
+    with patch(
+        f"{MODULE}.reserve_actor_name", AsyncMock(side_effect=reserve)
+    ) as mock_reserve:
+        yield mock_reserve
+
+
+@pytest.fixture(autouse=True)
+def mock_release_actor_name():
+    with patch(f"{MODULE}.release_actor_name", AsyncMock()) as mock_release:
+        yield mock_release
+
+
+@pytest.mark.anyio
+async def test_create_tenants_bulk(
+    mock_admin_controller,  # pylint: disable=redefined-outer-name
+    mock_release_actor_name,  # pylint: disable=redefined-outer-name
+):
+    tenants = json.dumps(
+        [
+            {"wallet_label": "holder"},
+            {"wallet_label": "issuer", "roles": ["issuer"]},
+            {"wallet_label": "verifier", "roles": ["verifier"]},
+            {"wallet_label": "bad_role", "roles": ["admin"]},
+            {"wallet_label": "taken"},
+        ]
+    ).encode()
+
+    mock_register_actors = AsyncMock(
+        return_value={"verifier_id": TrustRegistryException("Conflict", 409)}
+    )
+    with patch(
+        f"{MODULE}.assert_actor_name",
+        AsyncMock(side_effect=lambda label: label == "taken"),
+    ), patch(
+        f"{MODULE}.onboard_tenant",
+        AsyncMock(return_value=OnboardResult(did="did:sov:123")),
+    ), patch(
+        f"{MODULE}.register_actors", mock_register_actors
+    ):
+        results = await create_tenants(tenants)
+
+    assert [(result["index"], result["status"]) for result in results] == [
+        (0, "created"),
+        (1, "created"),
+        (2, "failed"),
+        (3, "failed"),
+        (4, "failed"),
+    ]
+    assert results[0]["tenant"]["wallet_id"] == "holder_id"
+    assert results[1]["tenant"]["wallet_id"] == "issuer_id"
+    assert results[2]["status_code"] == 409
+    assert results[3]["status_code"] == 422
+    assert results[4]["status_code"] == 409
+
+    # Both actors are registered in one batch, and the rejected one is cleaned up, as is
+    # the wallet created while its label was found to be taken
+    mock_register_actors.assert_awaited_once()
+    (actors,) = mock_register_actors.await_args.args
+    assert [actor.id for actor in actors] == ["issuer_id", "verifier_id"]
+    deleted = mock_admin_controller.multitenancy.delete_wallet.await_args_list
+    assert sorted(call.kwargs["wallet_id"] for call in deleted) == [
+        "taken_id",
+        "verifier_id",
+    ]
+    # The name reserved for the rejected actor is released again
+    mock_release_actor_name.assert_awaited_once_with("verifier_reservation")
+
+
+@pytest.mark.anyio
+async def test_create_tenants_bulk_onboarding_failure(
+    mock_admin_controller,  # pylint: disable=redefined-outer-name
+    mock_release_actor_name,  # pylint: disable=redefined-outer-name
+):
+    tenants = b'{"wallet_label": "issuer", "roles": ["issuer"]}\n\n'
+
+    with patch(f"{MODULE}.assert_actor_name", AsyncMock(return_value=False)), patch(
+        f"{MODULE}.onboard_tenant",
+        AsyncMock(side_effect=HTTPException(500, "Onboarding failed")),
+    ), patch(f"{MODULE}.register_actors", AsyncMock()) as mock_register_actors:
+        results = await create_tenants(tenants, content_type="application/x-ndjson")
+
+    assert results == [
+        {
+            "index": 0,
+            "status": "failed",
+            "tenant": None,
+            "status_code": 500,
+            "detail": "Onboarding failed",
+        }
+    ]
+    mock_register_actors.assert_not_awaited()
+    mock_admin_controller.multitenancy.delete_wallet.assert_awaited_once_with(
+        wallet_id="issuer_id"
+    )
+    mock_release_actor_name.assert_awaited_once_with("issuer_reservation")
+
+
+async def onboard_later(**_):
+    await asyncio.sleep(0.01)
+    return OnboardResult(did="did:sov:123")
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "error,status_code",
+    [
+        (TrustRegistryException("Unavailable", 503), 503),
+        (httpx.ReadTimeout("Timed out"), 500),
+        (AttributeError("'NoneType' object has no attribute 'is_error'"), 500),
+    ],
+)
+async def test_create_tenants_bulk_registration_error(
+    mock_admin_controller,  # pylint: disable=redefined-outer-name
+    mock_release_actor_name,  # pylint: disable=redefined-outer-name
+    error,
+    status_code,
+):
+    tenants = json.dumps(
+        [{"wallet_label": f"issuer{i}", "roles": ["issuer"]} for i in range(5)]
+    ).encode()
+
+    with patch(f"{MODULE}.assert_actor_name", AsyncMock(return_value=False)), patch(
+        f"{MODULE}.onboard_tenant", AsyncMock(side_effect=onboard_later)
+    ), patch(
+        f"{MODULE}.register_actors", AsyncMock(side_effect=error)
+    ) as mock_register_actors, patch(
+        f"{MODULE}.BULK_TENANT_REGISTRATION_BATCH_SIZE", 2
+    ):
+        results = await create_tenants(tenants)
+
+    assert [result["status_code"] for result in results] == [status_code] * 5
+    assert mock_register_actors.await_count == 3
+    assert mock_admin_controller.multitenancy.delete_wallet.await_count == 5
+    assert mock_release_actor_name.await_count == 5
+
+
+@pytest.mark.anyio
+async def test_create_tenants_bulk_registers_without_full_batch(
+    mock_admin_controller,  # pylint: disable=redefined-outer-name
+):
+    tenants = json.dumps(
+        [{"wallet_label": f"issuer{i}", "roles": ["issuer"]} for i in range(2)]
+    ).encode()
+    onboarded = asyncio.Event()
+
+    async def onboard_tenant(*, tenant_label, **_):
+        if tenant_label == "issuer0":
+            await asyncio.sleep(0.01)
+        else:
+            # Still being created, so the first actor is registered by the timer
+            await onboarded.wait()
+        return OnboardResult(did="did:sov:123")
+
+    with patch(f"{MODULE}.assert_actor_name", AsyncMock(return_value=False)), patch(
+        f"{MODULE}.onboard_tenant", AsyncMock(side_effect=onboard_tenant)
+    ), patch(
+        f"{MODULE}.register_actors", AsyncMock(return_value={})
+    ) as mock_register_actors, patch(
+        f"{MODULE}.BULK_TENANT_REGISTRATION_MAX_WAIT", 0.01
+    ):
+        response = await create_tenants_bulk(
+            request=bulk_request(tenants, "application/json"),
+            concurrency=2,
+            admin_auth=TENANT_ADMIN_AUTHED,
+        )
+        results = response.body_iterator
+        first = json.loads(await asyncio.wait_for(anext(results), 1))
+        onboarded.set()
+        second = json.loads(await anext(results))
+
+    # Each actor is registered once onboarded, without waiting for a full batch
+    assert (first["index"], second["index"]) == (0, 1)
+    assert first["status"] == second["status"] == "created"
+    assert mock_register_actors.await_count == 2
+    mock_admin_controller.multitenancy.delete_wallet.assert_not_awaited()
+
+
+@pytest.mark.anyio
+async def test_create_tenants_bulk_concurrency(
+    mock_admin_controller,  # pylint: disable=redefined-outer-name
+):
+    tenants = json.dumps([{"wallet_label": f"holder{i}"} for i in range(20)]).encode()
+    running = 0
+    max_running = 0
+
+    async def create_wallet(body):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return wallet_response(body)
+
+    mock_admin_controller.multitenancy.create_wallet = AsyncMock(
+        side_effect=create_wallet
+    )
+    with patch(f"{MODULE}.assert_actor_name", AsyncMock(return_value=False)):
+        results = await create_tenants(tenants, concurrency=4)
+
+    assert [result["status"] for result in results] == ["created"] * 20
+    assert max_running == 4
+
+
+@pytest.mark.anyio
+async def test_create_tenants_bulk_client_disconnects(
+    mock_admin_controller,  # pylint: disable=redefined-outer-name
+    mock_release_actor_name,  # pylint: disable=redefined-outer-name
+):
+    tenants = json.dumps(
+        [{"wallet_label": f"issuer{i}", "roles": ["issuer"]} for i in range(4)]
+    ).encode()
+    onboarding = asyncio.Event()
+
+    async def onboard_tenant(**_):
+        await onboarding.wait()
+        return OnboardResult(did="did:sov:123")
+
+    with patch(f"{MODULE}.assert_actor_name", AsyncMock(return_value=False)), patch(
+        f"{MODULE}.onboard_tenant", AsyncMock(side_effect=onboard_tenant)
+    ), patch(
+        f"{MODULE}.register_actors", AsyncMock(return_value={})
+    ) as mock_register_actors, patch(
+        f"{MODULE}._stopped_bulk_creations", set()
+    ) as stopped_creations:
+        response = await create_tenants_bulk(
+            request=bulk_request(tenants, "application/json"),
+            concurrency=2,
+            admin_auth=TENANT_ADMIN_AUTHED,
+        )
+        results = response.body_iterator
+        reading = asyncio.create_task(anext(results))
+        await asyncio.sleep(0.01)
+
+        # The client disconnects while the first two tenants are being onboarded
+        reading.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await reading
+        await results.aclose()
+        (creation,) = stopped_creations
+
+        onboarding.set()
+        await creation
+
+    # The tenants in progress are completed and registered, and no others are started
+    assert mock_admin_controller.multitenancy.create_wallet.await_count == 2
+    mock_register_actors.assert_awaited_once()
+    (actors,) = mock_register_actors.await_args.args
+    assert [actor.id for actor in actors] == ["issuer0_id", "issuer1_id"]
+    assert mock_register_actors.await_args.kwargs["reservation_ids"] == {
+        "issuer0_id": "issuer0_reservation",
+        "issuer1_id": "issuer1_reservation",
+    }
+    mock_admin_controller.multitenancy.delete_wallet.assert_not_awaited()
+    mock_release_actor_name.assert_not_awaited()
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "content,content_type",
+    [
+        (b'[{"wallet_label": "a"}, {"roles": ["issuer"]}]', "application/json"),
+        (b'{"wallet_label": "a"}\n{"roles": ["issuer"]}\n', "application/x-ndjson"),
+        (b'{"wallet_label": "a"}\n\nnot json', "application/x-ndjson"),
+    ],
+)
+async def test_read_bulk_tenants(content, content_type):
+    first, second = await _read_bulk_tenants(bulk_request(content, content_type))
+
+    assert first == CreateTenantRequest(wallet_label="a")
+    assert isinstance(second, HTTPException)
+    assert second.status_code == 422
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("content", [b"not json", b'{"wallet_label": "a"}'])
+async def test_read_bulk_tenants_invalid_body(content):
+    with pytest.raises(HTTPException) as exc:
+        await _read_bulk_tenants(bulk_request(content, "application/json"))
+
+    assert exc.value.status_code == 422
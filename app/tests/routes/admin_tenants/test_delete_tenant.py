@@ -4,7 +4,9 @@ import pytest
 from fastapi import HTTPException
 
 from app.dependencies.acapy_clients import TENANT_ADMIN_AUTHED
+from app.exceptions import TrustRegistryException
 from app.routes.admin.tenants import delete_tenant_by_id
+from app.util.tenants import CachedWallet, wallet_cache
 
 wallet_id = "some_wallet_id"
 wallet_name = "some_wallet_name"
@@ -16,9 +18,12 @@ async def test_delete_tenant_by_id_success(group_id):
     # Mock the structure of admin_controller -> multitenancy -> delete_wallet
     multitenancy_mock = AsyncMock(delete_wallet=AsyncMock())
     admin_controller_mock = AsyncMock(multitenancy=multitenancy_mock)
+    wallet_cache.set(
+        wallet_id, CachedWallet(group_id=group_id, label="label", image_url=None)
+    )
 
     with patch(
-        "app.routes.admin.tenants.get_wallet_and_assert_valid_group",
+        "app.routes.admin.tenants.assert_wallet_in_group",
         return_value=AsyncMock(),
     ) as mock_assert_valid_group, patch(
         "app.routes.admin.tenants.fetch_actor_by_id", return_value=None
@@ -49,6 +54,7 @@ async def test_delete_tenant_by_id_success(group_id):
         admin_controller_mock.multitenancy.delete_wallet.assert_awaited_once_with(
             wallet_id=wallet_id
         )
+        assert wallet_cache.get(wallet_id) is None
 
 
 @pytest.mark.anyio
@@ -59,7 +65,7 @@ async def test_delete_tenant_by_id_success_actor(group_id):
     admin_controller_mock = AsyncMock(multitenancy=multitenancy_mock)
 
     with patch(
-        "app.routes.admin.tenants.get_wallet_and_assert_valid_group",
+        "app.routes.admin.tenants.assert_wallet_in_group",
         return_value=AsyncMock(),
     ) as mock_assert_valid_group, patch(
         "app.routes.admin.tenants.fetch_actor_by_id", return_value=AsyncMock()
@@ -107,13 +113,19 @@ async def test_delete_tenant_by_id_fail_wrong_group():
 
     with patch(
         "app.routes.admin.tenants.get_tenant_admin_controller"
-    ) as mock_get_admin_controller:
+    ) as mock_get_admin_controller, patch(
+        "app.routes.admin.tenants.fetch_actor_by_id",
+        side_effect=TrustRegistryException("Error"),
+    ), patch(
+        "app.routes.admin.tenants.remove_actor_by_id"
+    ) as mock_delete_actor:
 
         mock_get_admin_controller.return_value.__aenter__.return_value = (
             admin_controller_mock
         )
 
-        # Expect an HTTPException due to group mismatch
+        # Expect an HTTPException due to group mismatch, rather than the failed actor
+        # lookup that runs at the same time
         with pytest.raises(HTTPException) as exc_info:
             await delete_tenant_by_id(
                 wallet_id=wallet_id,
@@ -126,3 +138,5 @@ async def test_delete_tenant_by_id_fail_wrong_group():
         admin_controller_mock.multitenancy.get_wallet.assert_awaited_with(
             wallet_id=wallet_id
         )
+        mock_delete_actor.assert_not_called()
+        admin_controller_mock.multitenancy.delete_wallet.assert_not_called()
@@ -0,0 +1,53 @@
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.dependencies.acapy_clients import TENANT_ADMIN_AUTHED
+from app.routes.admin.tenants import export_tenants
+from app.tests.util.tenants import FakeWallets
+
+MODULE = "app.routes.admin.tenants"
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("descending", [True, False])
+async def test_export_tenants(descending):
+    fake_wallets = FakeWallets(5)
+    admin_controller_mock = AsyncMock()
+    admin_controller_mock.multitenancy.get_wallets = AsyncMock(
+        side_effect=fake_wallets.get_wallets
+    )
+
+    with patch(
+        f"{MODULE}.get_tenant_admin_controller"
+    ) as mock_get_admin_controller, patch(f"{MODULE}.TENANT_EXPORT_PAGE_SIZE", 2):
+        mock_get_admin_controller.return_value.__aenter__.return_value = (
+            admin_controller_mock
+        )
+        response = await export_tenants(
+            wallet_name=None,
+            group_id=None,
+            descending=descending,
+            admin_auth=TENANT_ADMIN_AUTHED,
+        )
+        assert response.media_type == "application/x-ndjson"
+
+        wallet_ids = []
+        async for line in response.body_iterator:
+            wallet_ids.append(json.loads(line)["wallet_id"])
+            if len(wallet_ids) == 1:
+                # Wallets created during the export are not repeated
+                fake_wallets.create(2)
+
+    expected = [f"wallet-{i}" for i in range(5)]
+    if descending:
+        assert wallet_ids == expected[::-1]
+    else:
+        assert wallet_ids == expected + ["wallet-5", "wallet-6"]
+    # Fetched page by page
+    assert admin_controller_mock.multitenancy.get_wallets.await_count > 2
+    assert all(
+        call.kwargs["limit"] == 2
+        for call in admin_controller_mock.multitenancy.get_wallets.await_args_list
+    )
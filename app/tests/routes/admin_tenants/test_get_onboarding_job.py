@@ -0,0 +1,90 @@
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+from app.dependencies.acapy_clients import TENANT_ADMIN_AUTHED
+from app.routes.admin.tenants import get_onboarding_job, sse_onboarding_job
+from app.services.onboarding.jobs import OnboardingJobs
+
+job_id = "some_wallet_id"
+group_id = "some_group"
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("request_group_id", [None, group_id])
+async def test_get_onboarding_job(request_group_id):
+    jobs = OnboardingJobs()
+    jobs.start(job_id=job_id, onboarding=asyncio.sleep(0), group_id=group_id)
+
+    with patch("app.routes.admin.tenants.onboarding_jobs", jobs):
+        await jobs.wait(job_id)
+        job = await get_onboarding_job(
+            job_id=job_id, group_id=request_group_id, admin_auth=TENANT_ADMIN_AUTHED
+        )
+
+    assert job.job_id == job_id
+    assert job.status == "succeeded"
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "request_job_id,request_group_id",
+    [("unknown_job", None), (job_id, "other_group")],
+)
+async def test_get_onboarding_job_not_found(request_job_id, request_group_id):
+    jobs = OnboardingJobs()
+    jobs.start(job_id=job_id, onboarding=asyncio.sleep(0), group_id=group_id)
+
+    with patch("app.routes.admin.tenants.onboarding_jobs", jobs), pytest.raises(
+        HTTPException
+    ) as exc:
+        await get_onboarding_job(
+            job_id=request_job_id,
+            group_id=request_group_id,
+            admin_auth=TENANT_ADMIN_AUTHED,
+        )
+
+    assert exc.value.status_code == 404
+    await jobs.wait(job_id)
+
+
+@pytest.mark.anyio
+async def test_sse_onboarding_job():
+    jobs = OnboardingJobs()
+    onboarded = asyncio.Event()
+    jobs.start(job_id=job_id, onboarding=onboarded.wait(), group_id=group_id)
+
+    with patch("app.routes.admin.tenants.onboarding_jobs", jobs), patch(
+        "app.routes.admin.tenants.SSE_PING_PERIOD", 0.01
+    ):
+        response = await sse_onboarding_job(
+            job_id=job_id, group_id=group_id, admin_auth=TENANT_ADMIN_AUTHED
+        )
+        events = response.body_iterator
+
+        assert await anext(events) == ": ping\n\n"
+        onboarded.set()
+        async for event in events:
+            if event.startswith("data: "):
+                break
+
+    assert json.loads(event[len("data: ") :]) == {
+        "job_id": job_id,
+        "status": "succeeded",
+        "error": None,
+    }
+
+
+@pytest.mark.anyio
+async def test_sse_onboarding_job_not_found():
+    with patch(
+        "app.routes.admin.tenants.onboarding_jobs", OnboardingJobs()
+    ), pytest.raises(HTTPException) as exc:
+        await sse_onboarding_job(
+            job_id=job_id, group_id=None, admin_auth=TENANT_ADMIN_AUTHED
+        )
+
+    assert exc.value.status_code == 404
@@ -1,9 +1,11 @@
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
+from fastapi import HTTPException, Response
 
 from app.dependencies.acapy_clients import TENANT_ADMIN_AUTHED
-from app.routes.admin.tenants import get_tenants
+from app.routes.admin.tenants import NEXT_CURSOR_HEADER, get_tenants
+from app.tests.util.tenants import FakeWallets
 
 wallet_id = "some_wallet_id"
 wallet_name = "some_wallet_name"
@@ -37,8 +39,10 @@ async def test_get_tenants_success(group_id):
 
         # Execute the function under test
         await get_tenants(
+            response=Response(),
             wallet_name=wallet_name,
             group_id=group_id,
+            cursor=None,
             admin_auth=TENANT_ADMIN_AUTHED,
         )
         assert mock_tenant_from_wallet_record.call_count == len(
@@ -74,8 +78,89 @@ async def test_get_tenants_success_no_wallets(group_id):
 
         # Execute the function under test
         await get_tenants(
+            response=Response(),
             wallet_name=wallet_name,
             group_id=group_id,
+            cursor=None,
             admin_auth=TENANT_ADMIN_AUTHED,
         )
         mock_tenant_from_wallet_record.assert_not_called()
+
+
+async def fetch_tenants(fake_wallets: FakeWallets, **kwargs):
+    admin_controller_mock = AsyncMock()
+    admin_controller_mock.multitenancy.get_wallets = AsyncMock(
+        side_effect=fake_wallets.get_wallets
+    )
+    response = Response()
+
+    with patch(
+        "app.routes.admin.tenants.get_tenant_admin_controller"
+    ) as mock_get_admin_controller:
+        mock_get_admin_controller.return_value.__aenter__.return_value = (
+            admin_controller_mock
+        )
+        tenants = await get_tenants(
+            response=response,
+            wallet_name=None,
+            group_id=None,
+            admin_auth=TENANT_ADMIN_AUTHED,
+            **{
+                "limit": 2,
+                "offset": 0,
+                "order_by": "id",
+                "descending": True,
+                "cursor": None,
+                **kwargs,
+            },
+        )
+
+    return [tenant.wallet_id for tenant in tenants], response.headers.get(
+        NEXT_CURSOR_HEADER
+    )
+
+
+@pytest.mark.anyio
+async def test_get_tenants_cursor():
+    fake_wallets = FakeWallets(5)
+
+    first_page, cursor = await fetch_tenants(fake_wallets)
+    assert first_page == ["wallet-4", "wallet-3"]
+
+    # Wallets created while paging do not repeat wallets on the next page
+    fake_wallets.create(3)
+    second_page, cursor = await fetch_tenants(fake_wallets, cursor=cursor)
+    assert second_page == ["wallet-2", "wallet-1"]
+
+    # Wallets deleted while paging do not cause wallets to be skipped
+    fake_wallets.delete("wallet-7", "wallet-6", "wallet-3")
+    last_page, cursor = await fetch_tenants(fake_wallets, cursor=cursor)
+    assert last_page == ["wallet-0"]
+    assert cursor is None
+
+
+@pytest.mark.anyio
+async def test_get_tenants_cursor_ascending():
+    fake_wallets = FakeWallets(3)
+
+    first_page, cursor = await fetch_tenants(fake_wallets, descending=False)
+    # The cursor keeps the order of the first page
+    second_page, cursor = await fetch_tenants(fake_wallets, cursor=cursor)
+
+    assert first_page + second_page == ["wallet-0", "wallet-1", "wallet-2"]
+    assert cursor is None
+
+
+@pytest.mark.anyio
+async def test_get_tenants_no_cursor_for_other_order():
+    _, cursor = await fetch_tenants(FakeWallets(3), order_by="wallet_name")
+
+    assert cursor is None
+
+
+@pytest.mark.anyio
+async def test_get_tenants_invalid_cursor():
+    with pytest.raises(HTTPException) as exc:
+        await fetch_tenants(FakeWallets(3), cursor="not a cursor")
+
+    assert exc.value.status_code == 400
@@ -19,7 +19,7 @@ async def test_get_wallet_auth_token_success(group_id):
     admin_controller_mock = AsyncMock(multitenancy=multitenancy_mock)
 
     with patch(
-        "app.routes.admin.tenants.get_wallet_and_assert_valid_group",
+        "app.routes.admin.tenants.assert_wallet_in_group",
         return_value=AsyncMock(),
     ) as mock_assert_valid_group, patch(
         "app.routes.admin.tenants.fetch_actor_by_id", return_value=None
@@ -93,7 +93,7 @@ async def test_post_wallet_auth_token_success(group_id):
     admin_controller_mock = AsyncMock(multitenancy=multitenancy_mock)
 
     with patch(
-        "app.routes.admin.tenants.get_wallet_and_assert_valid_group",
+        "app.routes.admin.tenants.assert_wallet_in_group",
         return_value=AsyncMock(),
     ) as mock_assert_valid_group, patch(
         "app.routes.admin.tenants.fetch_actor_by_id", return_value=None
@@ -19,7 +19,7 @@ async def test_update_tenant_success(group_id):
 
     # Patch the dependencies
     with patch(
-        "app.routes.admin.tenants.get_wallet_and_assert_valid_group",
+        "app.routes.admin.tenants.assert_wallet_in_group",
         return_value=AsyncMock(),
     ) as mock_assert_valid_group, patch(
         "app.routes.admin.tenants.handle_tenant_update",
@@ -29,7 +29,9 @@ async def test_update_tenant_success(group_id):
     ) as mock_get_admin_controller, patch(
         "app.routes.admin.tenants.tenant_from_wallet_record",
         return_value=Mock(),
-    ):
+    ), patch(
+        "app.routes.admin.tenants.cache_wallet"
+    ) as mock_cache_wallet:
 
         # Configure get_tenant_admin_controller to return our mocked admin_controller on enter
         mock_get_admin_controller.return_value.__aenter__.return_value = (
@@ -56,6 +58,9 @@ async def test_update_tenant_success(group_id):
             wallet_id=wallet_id,
             update_request=body,
         )
+        mock_cache_wallet.assert_called_once_with(
+            mock_handle_tenant_update.return_value
+        )
 
 
 @pytest.mark.anyio
@@ -2,10 +2,16 @@ from unittest.mock import AsyncMock, patch
 
 import pytest
 
+from app.dependencies.auth import AcaPyAuthVerified
+from app.dependencies.role import Role
 from app.exceptions import CloudApiException
 from app.models.definitions import CreateCredentialDefinition, CredentialDefinition
 from app.routes.definitions import create_credential_definition
 
+mock_auth = AcaPyAuthVerified(
+    role=Role.TENANT, token="mocked_token", wallet_id="mocked_wallet_id"
+)
+
 create_cred_def_body = CreateCredentialDefinition(
     schema_id="mock_schema_id",
     tag="mock_tag",
@@ -36,7 +42,7 @@ async def test_create_credential_definition_success():
         mock_coroutine_with_retry.return_value = cred_def_response
 
         response = await create_credential_definition(
-            auth="mocked_auth",
+            auth=mock_auth,
             credential_definition=create_cred_def_body,
         )
 
@@ -44,6 +50,7 @@ async def test_create_credential_definition_success():
             aries_controller=mock_aries_controller,
             credential_definition=create_cred_def_body,
             support_revocation=False,
+            wallet_id="mocked_wallet_id",
         )
 
         mock_coroutine_with_retry.assert_awaited()
@@ -82,7 +89,7 @@ async def test_create_credential_definition_fail_acapy_error(
 
         with pytest.raises(CloudApiException) as exc:
             await create_credential_definition(
-                auth="mocked_auth",
+                auth=mock_auth,
                 credential_definition=create_cred_def_body,
             )
 
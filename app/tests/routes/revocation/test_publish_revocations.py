@@ -4,10 +4,17 @@ from unittest.mock import AsyncMock, patch
 import pytest
 from aries_cloudcontroller import TxnOrPublishRevocationsResult
 
+from app.dependencies.auth import AcaPyAuthVerified
+from app.dependencies.role import Role
 from app.exceptions.cloudapi_exception import CloudApiException
 from app.models.issuer import PublishRevocationsRequest
 from app.routes.revocation import publish_revocations
 from app.tests.util.models.dummy_txn_record_publish import txn_record
+from shared import PUBLISH_REVOCATIONS_TIMEOUT
+
+mock_auth = AcaPyAuthVerified(
+    role=Role.TENANT, token="mocked_token", wallet_id="mocked_wallet_id"
+)
 
 
 @pytest.mark.anyio
@@ -19,7 +26,7 @@ async def test_publish_revocations_success(publish_revocation_response):
     mock_aries_controller = AsyncMock()
     mock_publish_revocations = AsyncMock(return_value=publish_revocation_response)
 
-    mock_get_transaction = AsyncMock()
+    mock_wait_for_transaction_acked = AsyncMock()
 
     with patch(
         "app.routes.revocation.client_from_auth"
@@ -27,7 +34,8 @@ async def test_publish_revocations_success(publish_revocation_response):
         "app.services.revocation_registry.publish_pending_revocations",
         mock_publish_revocations,
     ), patch(
-        "app.routes.revocation.coroutine_with_retry_until_value", mock_get_transaction
+        "app.routes.revocation.wait_for_transaction_acked",
+        mock_wait_for_transaction_acked,
     ):
         mock_client_from_auth.return_value.__aenter__.return_value = (
             mock_aries_controller
@@ -37,13 +45,18 @@ async def test_publish_revocations_success(publish_revocation_response):
             revocation_registry_credential_map={}
         )
 
-        await publish_revocations(publish_request=publish_request, auth="mocked_auth")
+        await publish_revocations(publish_request=publish_request, auth=mock_auth)
 
         mock_publish_revocations.assert_awaited_once_with(
             controller=mock_aries_controller, revocation_registry_credential_map={}
         )
         if publish_revocation_response:
-            mock_get_transaction.assert_awaited_once()
+            mock_wait_for_transaction_acked.assert_awaited_once_with(
+                aries_controller=mock_aries_controller,
+                transaction_id=txn_record["transaction_id"],
+                wallet_id="mocked_wallet_id",
+                timeout=PUBLISH_REVOCATIONS_TIMEOUT,
+            )
 
 
 @pytest.mark.anyio
@@ -81,7 +94,7 @@ async def test_publish_revocations_fail_acapy_error(
             revocation_registry_credential_map={}
         )
 
-        await publish_revocations(publish_request=publish_request, auth="mocked_auth")
+        await publish_revocations(publish_request=publish_request, auth=mock_auth)
 
     assert exc.value.status_code == expected_status_code
 
@@ -102,7 +115,7 @@ async def test_publish_revocations_fail_timeout():
         "app.services.revocation_registry.publish_pending_revocations",
         mock_publish_revocations,
     ), patch(
-        "app.routes.revocation.coroutine_with_retry_until_value",
+        "app.routes.revocation.wait_for_transaction_acked",
         AsyncMock(side_effect=asyncio.TimeoutError()),
     ):
         mock_client_from_auth.return_value.__aenter__.return_value = (
@@ -113,6 +126,6 @@ async def test_publish_revocations_fail_timeout():
             revocation_registry_credential_map={}
         )
 
-        await publish_revocations(publish_request=publish_request, auth="mocked_auth")
+        await publish_revocations(publish_request=publish_request, auth=mock_auth)
 
     assert exc.value.status_code == 504
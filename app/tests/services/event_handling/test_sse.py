@@ -7,6 +7,8 @@ from httpx import HTTPError, Response
 
 from app.services.event_handling.sse import (
     sse_subscribe_event_with_field_and_state,
+    sse_wait_for_event_with_field_and_state,
+    sse_wait_for_event_with_resubscribe,
     yield_lines_with_disconnect_check,
 )
 from shared.constants import WAYPOINT_URL
@@ -192,3 +194,93 @@ async def test_sse_subscribe_event_with_field_and_state_success(
             f"{WAYPOINT_URL}/sse/{wallet_id}/{topic}/{field}/{field_id}/{state}",
             params=expected_params,
         )
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("group_id", [None, "some_group"])
+async def test_sse_wait_for_event_with_field_and_state(
+    response_mock,  # pylint: disable=redefined-outer-name
+    configured_async_context_manager_mock,  # pylint: disable=redefined-outer-name
+    group_id: Optional[str],
+):
+    async def event_lines():
+        yield ": ping"
+        yield 'data: {"wallet_id": "some_wallet", "payload": {"state": "some_state"}}'
+
+    response_mock.aiter_lines.return_value = event_lines()
+    expected_params = {"look_back": 60}
+    if group_id:  # Optional param
+        expected_params["group_id"] = group_id
+
+    with patch.object(
+        RichAsyncClient,
+        "stream",
+        return_value=configured_async_context_manager_mock,
+    ) as mock_stream:
+        event = await sse_wait_for_event_with_field_and_state(
+            group_id=group_id,
+            wallet_id=wallet_id,
+            topic=topic,
+            field=field,
+            field_id=field_id,
+            desired_state=state,
+        )
+
+    assert event == {"wallet_id": "some_wallet", "payload": {"state": "some_state"}}
+    mock_stream.assert_called_with(
+        "GET",
+        f"{WAYPOINT_URL}/sse/{wallet_id}/{topic}/{field}/{field_id}/{state}",
+        params=expected_params,
+    )
+
+
+@pytest.mark.anyio
+async def test_sse_wait_for_event_with_field_and_state_no_event(
+    response_mock,  # pylint: disable=redefined-outer-name
+    configured_async_context_manager_mock,  # pylint: disable=redefined-outer-name
+):
+    async def ping_lines():
+        yield ": ping"
+
+    response_mock.aiter_lines.return_value = ping_lines()
+
+    with patch.object(
+        RichAsyncClient,
+        "stream",
+        return_value=configured_async_context_manager_mock,
+    ):
+        event = await sse_wait_for_event_with_field_and_state(
+            group_id=None,
+            wallet_id=wallet_id,
+            topic=topic,
+            field=field,
+            field_id=field_id,
+            desired_state=state,
+        )
+
+    assert event is None
+
+
+@pytest.mark.anyio
+async def test_sse_wait_for_event_with_resubscribe_backs_off():
+    event = {"payload": {"state": state}}
+    mock_wait_for_event = AsyncMock(side_effect=[None] * 7 + [event])
+    mock_sleep = AsyncMock()
+
+    with patch(
+        "app.services.event_handling.sse.sse_wait_for_event_with_field_and_state",
+        mock_wait_for_event,
+    ), patch("app.services.event_handling.sse.asyncio.sleep", mock_sleep):
+        result = await sse_wait_for_event_with_resubscribe(
+            group_id=None,
+            wallet_id=wallet_id,
+            topic=topic,
+            field=field,
+            field_id=field_id,
+            desired_state=state,
+        )
+
+    assert result == event
+    assert mock_wait_for_event.await_count == 8
+    waits = [call.args[0] for call in mock_sleep.await_args_list]
+    assert waits == [0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 8.0]
@@ -0,0 +1,266 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from aries_cloudcontroller import (
+    DID,
+    ConnectionList,
+    ConnectionMetadataSetRequest,
+    ConnRecord,
+    CreateWalletResponse,
+    DIDResult,
+    WalletRecordWithGroups,
+)
+
+from app.models.tenants import CreateTenantRequest
+from app.services.onboarding.issuer_pool import IssuerPool, PooledIssuer
+
+MODULE = "app.services.onboarding.issuer_pool"
+
+issuer_body = CreateTenantRequest(wallet_label="issuer", roles=["issuer"])
+
+
+def pooled_issuer(wallet_id: str = "wallet_id") -> PooledIssuer:
+    return PooledIssuer(
+        wallet_name=f"{wallet_id}_name",
+        wallet=CreateWalletResponse(
+            key_management_mode="managed",
+            wallet_id=wallet_id,
+            created_at="2024-02-27T09:48:39.508826Z",
+            updated_at="2024-02-27T09:48:39.508826Z",
+            token="abc",
+        ),
+    )
+
+
+@pytest.fixture
+def mock_admin_controller():
+    admin_controller = AsyncMock()
+    with patch(f"{MODULE}.get_tenant_admin_controller") as mock_get_controller:
+        mock_get_controller.return_value.__aenter__.return_value = admin_controller
+        yield admin_controller
+
+
+def test_take():
+    pool = IssuerPool(size=2)
+    assert pool.take(issuer_body) is None
+
+    pool._ready.extend([pooled_issuer("first"), pooled_issuer("second")])
+
+    assert pool.take(issuer_body).wallet.wallet_id == "first"
+    assert pool.stats() == {
+        "size": 2,
+        "ready": 1,
+        "provisioned": 0,
+        "adopted": 0,
+        "assigned": 1,
+        "failed": 0,
+    }
+
+
+@pytest.mark.parametrize(
+    "update",
+    [
+        {"roles": ["verifier"]},
+        {"roles": None},
+        {"wallet_name": "name"},
+        {"group_id": "group"},
+        {"extra_settings": {"ACAPY_AUTO_ACCEPT_INVITES": False}},
+    ],
+)
+def test_take_not_eligible(update):
+    pool = IssuerPool(size=1)
+    pool._ready.append(pooled_issuer())
+
+    assert pool.take(issuer_body.model_copy(update=update)) is None
+    assert pool.stats()["ready"] == 1
+
+
+@pytest.mark.anyio
+async def test_run_refills_pool():
+    pool = IssuerPool(size=2, refill_interval=0)
+    provisioned = [pooled_issuer("first"), pooled_issuer("second")]
+
+    with patch.object(
+        pool,
+        "_provision",
+        AsyncMock(side_effect=[Exception("Ledger unavailable"), *provisioned]),
+    ), patch.object(pool, "_recover", AsyncMock()):
+        await pool.start()
+        task = pool._task
+        while pool.stats()["ready"] < 2:
+            await asyncio.sleep(0.01)
+        await pool.stop()
+
+    assert task.cancelled()
+
+    assert list(pool._ready) == []
+    assert pool.stats()["provisioned"] == 2
+    assert pool.stats()["failed"] == 1
+
+
+def wallet_record(wallet_id: str, label: str, **settings) -> WalletRecordWithGroups:
+    return WalletRecordWithGroups(
+        wallet_id=wallet_id,
+        key_management_mode="managed",
+        created_at="2024-02-27T09:48:39.508826Z",
+        updated_at="2024-02-27T09:48:39.508826Z",
+        settings={
+            "wallet.name": f"{wallet_id}_name",
+            "default_label": label,
+            **settings,
+        },
+    )
+
+
+@pytest.mark.anyio
+async def test_recover(
+    mock_admin_controller,  # pylint: disable=redefined-outer-name
+):
+    pool = IssuerPool(size=1)
+    wallets = [
+        wallet_record("tenant", "Tenant"),
+        wallet_record("assigned", "New issuer"),
+        wallet_record("grouped", "Issuer grouped_name", **{"wallet.group_id": "g"}),
+        wallet_record("not_onboarded", "Issuer not_onboarded_name"),
+        wallet_record("onboarded", "Issuer onboarded_name"),
+        wallet_record("surplus", "Issuer surplus_name"),
+    ]
+
+    async def iter_wallets(*_, **__):
+        for wallet in wallets:
+            yield wallet, None
+
+    mock_admin_controller.multitenancy.get_auth_token = AsyncMock(
+        side_effect=lambda wallet_id: MagicMock(token=f"{wallet_id}_token")
+    )
+    issuer_controller = AsyncMock()
+    issuer_controller.wallet.get_public_did = AsyncMock(
+        side_effect=[
+            DIDResult(result=None),
+            DIDResult(
+                result=DID(
+                    did="WgWxqztrNooG92RXvxSTWv",
+                    verkey="WgWxqztrNooG92RXvxSTWvWgWxqztrNooG92RXvxSTWv",
+                    posture="posted",
+                    key_type="ed25519",
+                    method="sov",
+                )
+            ),
+        ]
+    )
+    with patch(f"{MODULE}.iter_wallets", iter_wallets), patch(
+        f"{MODULE}.get_tenant_controller"
+    ) as mock_get_tenant_controller:
+        mock_get_tenant_controller.return_value.__aenter__.return_value = (
+            issuer_controller
+        )
+        await pool._recover()
+
+    # Only unassigned pooled wallets are recovered: onboarded ones are adopted up to the
+    # pool's size, and the others are deleted
+    (adopted,) = pool._ready
+    assert adopted.wallet_name == "onboarded_name"
+    assert adopted.wallet.wallet_id == "onboarded"
+    assert adopted.wallet.token == "onboarded_token"
+    assert pool.stats()["adopted"] == 1
+    deleted = [
+        call.kwargs["wallet_id"]
+        for call in mock_admin_controller.multitenancy.delete_wallet.await_args_list
+    ]
+    assert deleted == ["not_onboarded", "surplus"]
+
+
+@pytest.mark.anyio
+async def test_start_disabled():
+    pool = IssuerPool(size=0)
+
+    await pool.start()
+
+    assert pool._task is None
+
+
+@pytest.mark.anyio
+async def test_stop_deletes_unassigned_wallets(
+    mock_admin_controller,  # pylint: disable=redefined-outer-name
+):
+    pool = IssuerPool(size=2)
+    pool._ready.extend([pooled_issuer("first"), pooled_issuer("second")])
+    mock_admin_controller.multitenancy.delete_wallet = AsyncMock(
+        side_effect=[Exception("Error"), None]
+    )
+
+    await pool.stop()
+
+    assert not pool._ready
+    assert mock_admin_controller.multitenancy.delete_wallet.await_count == 2
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("onboarding_fails", [False, True])
+async def test_provision(
+    mock_admin_controller, onboarding_fails  # pylint: disable=redefined-outer-name
+):
+    pool = IssuerPool(size=1)
+    wallet = pooled_issuer().wallet
+    mock_admin_controller.multitenancy.create_wallet = AsyncMock(return_value=wallet)
+    mock_admin_controller.multitenancy.delete_wallet = AsyncMock()
+    mock_onboard = AsyncMock(
+        side_effect=Exception("Error") if onboarding_fails else None
+    )
+
+    with patch(f"{MODULE}.get_governance_controller", MagicMock()), patch(
+        f"{MODULE}.get_tenant_controller", MagicMock()
+    ), patch(f"{MODULE}.onboard_issuer_no_public_did", mock_onboard):
+        if onboarding_fails:
+            with pytest.raises(Exception, match="Error"):
+                await pool._provision()
+        else:
+            result = await pool._provision()
+
+    mock_onboard.assert_awaited_once()
+    assert mock_onboard.await_args.kwargs["issuer_wallet_id"] == "wallet_id"
+    (create_body,) = (
+        mock_admin_controller.multitenancy.create_wallet.await_args.kwargs.values()
+    )
+    # Onboarded under an alias unique to the wallet, rather than a shared label
+    alias = f"Issuer {create_body.wallet_name}"
+    assert create_body.label == alias
+    assert mock_onboard.await_args.kwargs["issuer_label"] == alias
+    if onboarding_fails:
+        mock_admin_controller.multitenancy.delete_wallet.assert_awaited_once_with(
+            wallet_id="wallet_id"
+        )
+    else:
+        assert result.wallet == wallet
+        assert result.wallet_name == create_body.wallet_name
+        mock_admin_controller.multitenancy.delete_wallet.assert_not_awaited()
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("fails", [False, True])
+async def test_label_assigned(fails):
+    pool = IssuerPool(size=1)
+    endorser_controller = AsyncMock()
+    endorser_controller.connection.get_connections = AsyncMock(
+        return_value=ConnectionList(
+            results=[ConnRecord(connection_id="conn_id", alias="Issuer first_name")]
+        )
+    )
+    endorser_controller.connection.set_metadata = AsyncMock(
+        side_effect=Exception("Error") if fails else None
+    )
+
+    with patch(f"{MODULE}.get_governance_controller") as mock_get_controller:
+        mock_get_controller.return_value.__aenter__.return_value = endorser_controller
+        await pool.label_assigned(pooled_issuer("first"), "Tenant")
+
+    endorser_controller.connection.get_connections.assert_awaited_once_with(
+        alias="Issuer first_name"
+    )
+    endorser_controller.connection.set_metadata.assert_awaited_once_with(
+        conn_id="conn_id",
+        body=ConnectionMetadataSetRequest(
+            metadata={"issuer_label": "Tenant", "issuer_wallet_id": "first"}
+        ),
+    )
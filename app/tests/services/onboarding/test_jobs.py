@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.onboarding.jobs import OnboardingJobs
+
+
+@pytest.mark.anyio
+async def test_onboarding_job_succeeds():
+    jobs = OnboardingJobs()
+    onboarded = asyncio.Event()
+
+    job = jobs.start(job_id="job", onboarding=onboarded.wait(), group_id="group")
+
+    assert job.status == "pending"
+    assert jobs.get("job").status == "pending"
+
+    onboarded.set()
+    job = await jobs.wait("job")
+
+    assert job.status == "succeeded"
+    assert job.error is None
+    assert job.group_id == "group"
+    assert jobs.get("job") == job
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "exception,error",
+    [
+        (
+            HTTPException(status_code=500, detail="Onboarding failed"),
+            "Onboarding failed",
+        ),
+        (ValueError("Bad value"), "Bad value"),
+    ],
+)
+async def test_onboarding_job_fails(exception, error):
+    jobs = OnboardingJobs()
+
+    async def onboarding():
+        raise exception
+
+    jobs.start(job_id="job", onboarding=onboarding())
+    job = await jobs.wait("job")
+
+    assert job.status == "failed"
+    assert job.error == error
+
+
+@pytest.mark.anyio
+async def test_onboarding_job_unknown():
+    jobs = OnboardingJobs()
+
+    assert jobs.get("unknown") is None
+    assert await jobs.wait("unknown") is None
+
+
+@pytest.mark.anyio
+async def test_onboarding_jobs_stop():
+    jobs = OnboardingJobs()
+    completes = asyncio.Event()
+
+    async def onboarding():
+        await completes.wait()
+
+    jobs.start(job_id="quick", onboarding=onboarding())
+    jobs.start(job_id="stuck", onboarding=asyncio.Event().wait())
+    asyncio.get_running_loop().call_later(0.01, completes.set)
+
+    await jobs.stop(timeout=0.1)
+
+    assert jobs.get("quick").status == "succeeded"
+    assert jobs.get("stuck").status == "failed"
+    assert jobs.get("stuck").error == "Cancelled"
+    assert not jobs._tasks  # pylint: disable=protected-access
@@ -1,14 +1,30 @@
 import asyncio
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import pytest
 from aries_cloudcontroller import ConnRecord, TransactionRecord
 
+from app.exceptions import CloudApiException
 from app.services.onboarding.util.register_issuer_did import (
     wait_endorser_connection_completed,
     wait_transactions_endorsed,
 )
 
+MODULE = "app.services.onboarding.util.register_issuer_did"
+
+
+@pytest.fixture(autouse=True)
+def mock_sse_wait_for_event():
+    async def never_completed(**_):
+        await asyncio.Event().wait()
+
+    # By default, the connection completed event never arrives
+    with patch(
+        f"{MODULE}.sse_wait_for_event_with_resubscribe",
+        AsyncMock(side_effect=never_completed),
+    ) as mock_wait:
+        yield mock_wait
+
 
 @pytest.mark.anyio
 async def test_wait_endorser_connection_completed_happy_path():
@@ -81,7 +97,8 @@ async def test_wait_endorser_connection_completed_max_retries_with_exception():
             retry_delay=0.01,
         )
 
-    assert endorser_controller.connection.get_connections.call_count == 15
+    # While waiting for the event, the connection is only polled first and last
+    assert endorser_controller.connection.get_connections.call_count == 2
     logger.warning.assert_called()
     logger.error.assert_called_with(
         "Maximum number of retries exceeded with exception. Failing."
@@ -89,10 +106,15 @@ async def test_wait_endorser_connection_completed_max_retries_with_exception():
 
 
 @pytest.mark.anyio
-async def test_wait_endorser_connection_completed_max_retries_no_completion():
+async def test_wait_endorser_connection_completed_max_retries_no_completion(
+    mock_sse_wait_for_event,
+):
     logger = MagicMock()
     endorser_controller = MagicMock()
 
+    # Without the event, the connection is polled on every attempt
+    mock_sse_wait_for_event.side_effect = Exception("Waypoint unavailable")
+
     # Always return a non-completed state
     conn_record = ConnRecord(connection_id="abc", rfc23_state="not-completed")
     endorser_controller.connection.get_connections = AsyncMock(
@@ -115,102 +137,193 @@ async def test_wait_endorser_connection_completed_max_retries_no_completion():
 
 
 @pytest.mark.anyio
-async def test_wait_issuer_did_transaction_endorsed_happy_path():
+async def test_wait_endorser_connection_completed_polls_slowly_while_waiting_for_event():
     logger = MagicMock()
-    issuer_controller = MagicMock()
-    transaction_record = TransactionRecord(
-        connection_id="test_id", state="transaction_acked"
+    endorser_controller = MagicMock()
+    endorser_controller.connection.get_connections = AsyncMock(
+        return_value=MagicMock(results=[])
     )
 
-    issuer_controller.endorse_transaction.get_records = AsyncMock(
-        return_value=MagicMock(results=[transaction_record])
+    with patch(f"{MODULE}.ENDORSER_CONNECTION_POLL_INTERVAL", 0.03), pytest.raises(
+        asyncio.TimeoutError
+    ):
+        await wait_endorser_connection_completed(
+            endorser_controller=endorser_controller,
+            invitation_msg_id="test_id",
+            logger=logger,
+            max_attempts=10,
+            retry_delay=0.01,
+        )
+
+    # Polled every third attempt, and on the last one
+    assert endorser_controller.connection.get_connections.call_count == 4
+
+
+@pytest.mark.anyio
+async def test_wait_endorser_connection_completed_event(mock_sse_wait_for_event):
+    logger = MagicMock()
+    endorser_controller = MagicMock()
+    conn_record = ConnRecord(connection_id="abc", rfc23_state="completed")
+
+    mock_sse_wait_for_event.side_effect = None
+    mock_sse_wait_for_event.return_value = {"payload": {"connection_id": "abc"}}
+    endorser_controller.connection.get_connections = AsyncMock(
+        return_value=MagicMock(results=[])
     )
+    endorser_controller.connection.get_connection = AsyncMock(return_value=conn_record)
 
-    # Invocation
-    await wait_transactions_endorsed(
-        issuer_controller=issuer_controller,
-        issuer_connection_id="test_id",
+    result = await wait_endorser_connection_completed(
+        endorser_controller=endorser_controller,
+        invitation_msg_id="test_id",
         logger=logger,
+        retry_delay=10,
     )
 
-    issuer_controller.endorse_transaction.get_records.assert_called()
-    logger.warning.assert_not_called()
-    logger.error.assert_not_called()
+    assert result == conn_record
+    endorser_controller.connection.get_connections.assert_awaited_once()
+    endorser_controller.connection.get_connection.assert_awaited_once_with(
+        conn_id="abc"
+    )
+    mock_sse_wait_for_event.assert_awaited_once_with(
+        group_id=None,
+        wallet_id="Governance",
+        topic="connections",
+        field="invitation_msg_id",
+        field_id="test_id",
+        desired_state="completed",
+    )
 
 
 @pytest.mark.anyio
-async def test_wait_issuer_did_transaction_endorsed_retry_logic():
+async def test_wait_endorser_connection_completed_event_failure_falls_back_to_polling(
+    mock_sse_wait_for_event,
+):
     logger = MagicMock()
-    issuer_controller = MagicMock()
-    transaction_record = TransactionRecord(
-        connection_id="test_id", state="transaction_acked"
-    )
+    endorser_controller = MagicMock()
+    conn_record = ConnRecord(connection_id="abc", rfc23_state="completed")
 
-    issuer_controller.endorse_transaction.get_records = AsyncMock(
-        side_effect=[
-            Exception("Temporary failure"),
-            MagicMock(results=[transaction_record]),
-        ]
+    mock_sse_wait_for_event.side_effect = Exception("Waypoint unavailable")
+    endorser_controller.connection.get_connections = AsyncMock(
+        side_effect=[MagicMock(results=[]), MagicMock(results=[conn_record])]
     )
 
-    await wait_transactions_endorsed(
-        issuer_controller=issuer_controller,
-        issuer_connection_id="test_id",
+    result = await wait_endorser_connection_completed(
+        endorser_controller=endorser_controller,
+        invitation_msg_id="test_id",
         logger=logger,
         retry_delay=0.01,
     )
 
-    assert issuer_controller.endorse_transaction.get_records.call_count == 2
+    assert result == conn_record
+    assert endorser_controller.connection.get_connections.call_count == 2
     logger.warning.assert_called_once()
-    logger.error.assert_not_called()
 
 
 @pytest.mark.anyio
-async def test_wait_issuer_did_transaction_endorsed_max_retries_with_exception():
+async def test_wait_transactions_endorsed_with_transaction_id():
     logger = MagicMock()
     issuer_controller = MagicMock()
+    issuer_controller.endorse_transaction.get_records = AsyncMock()
+
+    with patch(f"{MODULE}.wait_for_transaction_acked", AsyncMock()) as mock_wait:
+        await wait_transactions_endorsed(
+            issuer_controller=issuer_controller,
+            issuer_connection_id="test_id",
+            logger=logger,
+            issuer_wallet_id="wallet_id",
+            transaction_id="txn_id",
+            timeout=5,
+        )
+
+    mock_wait.assert_awaited_once_with(
+        aries_controller=issuer_controller,
+        transaction_id="txn_id",
+        wallet_id="wallet_id",
+        timeout=5,
+    )
+    issuer_controller.endorse_transaction.get_records.assert_not_called()
+
 
+@pytest.mark.anyio
+async def test_wait_transactions_endorsed_looks_up_unacked_transactions():
+    logger = MagicMock()
+    issuer_controller = MagicMock()
     issuer_controller.endorse_transaction.get_records = AsyncMock(
-        side_effect=Exception("Persistent failure")
+        return_value=MagicMock(
+            results=[
+                TransactionRecord(
+                    transaction_id="acked",
+                    connection_id="test_id",
+                    state="transaction_acked",
+                ),
+                TransactionRecord(
+                    transaction_id="pending",
+                    connection_id="test_id",
+                    state="request_sent",
+                ),
+                TransactionRecord(
+                    transaction_id="other",
+                    connection_id="other_id",
+                    state="request_sent",
+                ),
+            ]
+        )
     )
 
-    with pytest.raises(asyncio.TimeoutError):
+    with patch(f"{MODULE}.wait_for_transaction_acked", AsyncMock()) as mock_wait:
         await wait_transactions_endorsed(
             issuer_controller=issuer_controller,
             issuer_connection_id="test_id",
             logger=logger,
-            max_attempts=15,
-            retry_delay=0.01,
+            issuer_wallet_id="wallet_id",
+            timeout=5,
         )
 
-    assert issuer_controller.endorse_transaction.get_records.call_count == 15
-    logger.warning.assert_called()
-    logger.error.assert_called_with(
-        "Maximum number of retries exceeded with exception. Failing."
-    )
+    issuer_controller.endorse_transaction.get_records.assert_awaited_once()
+    assert mock_wait.await_args_list == [
+        call(
+            aries_controller=issuer_controller,
+            transaction_id="pending",
+            wallet_id="wallet_id",
+            timeout=5,
+        )
+    ]
 
 
 @pytest.mark.anyio
-async def test_wait_issuer_did_transaction_endorsed_max_retries_no_ack():
+async def test_wait_transactions_endorsed_no_transactions():
     logger = MagicMock()
     issuer_controller = MagicMock()
-
-    # Always return transactions not in the desired state
-    transaction_record = TransactionRecord(connection_id="test_id", state="not_acked")
     issuer_controller.endorse_transaction.get_records = AsyncMock(
-        return_value=MagicMock(results=[transaction_record])
+        return_value=MagicMock(
+            results=[TransactionRecord(connection_id="other_id", state="request_sent")]
+        )
     )
 
-    with pytest.raises(asyncio.TimeoutError):
+    with pytest.raises(CloudApiException) as exc:
         await wait_transactions_endorsed(
             issuer_controller=issuer_controller,
             issuer_connection_id="test_id",
             logger=logger,
-            max_attempts=15,
-            retry_delay=0.01,
         )
 
-    assert issuer_controller.endorse_transaction.get_records.call_count == 15
-    logger.error.assert_called_with(
-        "Maximum number of retries exceeded while waiting for transaction ack"
-    )
+    assert exc.value.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_wait_transactions_endorsed_timeout():
+    logger = MagicMock()
+    issuer_controller = MagicMock()
+
+    with patch(
+        f"{MODULE}.wait_for_transaction_acked",
+        AsyncMock(side_effect=asyncio.TimeoutError),
+    ), pytest.raises(asyncio.TimeoutError, match="Timeout waiting for endorsement"):
+        await wait_transactions_endorsed(
+            issuer_controller=issuer_controller,
+            issuer_connection_id="test_id",
+            logger=logger,
+            transaction_id="txn_id",
+        )
+
+    logger.error.assert_called_with("Timeout waiting for transaction acknowledgements")
@@ -0,0 +1,148 @@
+from unittest.mock import AsyncMock, MagicMock, call, patch
+
+import pytest
+from aries_cloudcontroller import UpdateWalletRequest
+from fastapi import HTTPException
+
+from app.exceptions import CloudApiException
+from app.models.tenants import OnboardResult, UpdateTenantRequest
+from app.services.onboarding.tenants import handle_tenant_update
+from shared.models.trustregistry import Actor
+
+MODULE = "app.services.onboarding.tenants"
+
+wallet_id = "wallet_id"
+actor = Actor(
+    id=wallet_id,
+    name="old label",
+    roles=["verifier"],
+    did="did:sov:123",
+    image_url="https://old.png",
+)
+update_request = UpdateTenantRequest(wallet_label="new label")
+
+
+@pytest.fixture
+def admin_controller():
+    controller = MagicMock()
+    controller.multitenancy.update_wallet = AsyncMock(return_value="wallet")
+    controller.multitenancy.get_auth_token = AsyncMock(
+        return_value=MagicMock(token="token")
+    )
+    return controller
+
+
+@pytest.mark.anyio
+async def test_handle_tenant_update_holder(
+    admin_controller,  # pylint: disable=redefined-outer-name
+):
+    with patch(f"{MODULE}.fetch_actor_by_id", AsyncMock(return_value=None)), patch(
+        f"{MODULE}.update_actor", AsyncMock()
+    ) as mock_update_actor:
+        wallet = await handle_tenant_update(admin_controller, wallet_id, update_request)
+
+    assert wallet == "wallet"
+    mock_update_actor.assert_not_awaited()
+    admin_controller.multitenancy.update_wallet.assert_awaited_once_with(
+        wallet_id=wallet_id,
+        body=UpdateWalletRequest(label="new label"),
+    )
+
+
+@pytest.mark.anyio
+async def test_handle_tenant_update_holder_new_roles(
+    admin_controller,  # pylint: disable=redefined-outer-name
+):
+    with patch(f"{MODULE}.fetch_actor_by_id", AsyncMock(return_value=None)):
+        with pytest.raises(HTTPException) as exc:
+            await handle_tenant_update(
+                admin_controller,
+                wallet_id,
+                UpdateTenantRequest(roles=["issuer"]),
+            )
+
+    assert exc.value.status_code == 409
+    admin_controller.multitenancy.update_wallet.assert_not_awaited()
+
+
+@pytest.mark.anyio
+async def test_handle_tenant_update_actor(
+    admin_controller,  # pylint: disable=redefined-outer-name
+):
+    with patch(f"{MODULE}.fetch_actor_by_id", AsyncMock(return_value=actor)), patch(
+        f"{MODULE}.update_actor", AsyncMock()
+    ) as mock_update_actor:
+        wallet = await handle_tenant_update(admin_controller, wallet_id, update_request)
+
+    assert wallet == "wallet"
+    mock_update_actor.assert_awaited_once_with(
+        actor.model_copy(update={"name": "new label"})
+    )
+    admin_controller.multitenancy.update_wallet.assert_awaited_once()
+
+
+@pytest.mark.anyio
+async def test_handle_tenant_update_wallet_fails_reverts_actor(
+    admin_controller,  # pylint: disable=redefined-outer-name
+):
+    admin_controller.multitenancy.update_wallet = AsyncMock(
+        side_effect=CloudApiException("Error", 500)
+    )
+
+    with patch(f"{MODULE}.fetch_actor_by_id", AsyncMock(return_value=actor)), patch(
+        f"{MODULE}.update_actor", AsyncMock()
+    ) as mock_update_actor:
+        with pytest.raises(CloudApiException):
+            await handle_tenant_update(admin_controller, wallet_id, update_request)
+
+    assert mock_update_actor.await_args_list == [
+        call(actor.model_copy(update={"name": "new label"})),
+        call(actor),
+    ]
+
+
+@pytest.mark.anyio
+async def test_handle_tenant_update_actor_fails_reverts_wallet(
+    admin_controller,  # pylint: disable=redefined-outer-name
+):
+    with patch(f"{MODULE}.fetch_actor_by_id", AsyncMock(return_value=actor)), patch(
+        f"{MODULE}.update_actor",
+        AsyncMock(side_effect=HTTPException(500, "Error")),
+    ):
+        with pytest.raises(HTTPException):
+            await handle_tenant_update(admin_controller, wallet_id, update_request)
+
+    assert admin_controller.multitenancy.update_wallet.await_args_list == [
+        call(wallet_id=wallet_id, body=UpdateWalletRequest(label="new label")),
+        call(
+            wallet_id=wallet_id,
+            body=UpdateWalletRequest(label="old label", image_url="https://old.png"),
+        ),
+    ]
+
+
+@pytest.mark.anyio
+async def test_handle_tenant_update_new_roles_in_turn(
+    admin_controller,  # pylint: disable=redefined-outer-name
+):
+    order = []
+    admin_controller.multitenancy.update_wallet = AsyncMock(
+        side_effect=lambda **_: order.append("wallet")
+    )
+
+    with patch(f"{MODULE}.fetch_actor_by_id", AsyncMock(return_value=actor)), patch(
+        f"{MODULE}.onboard_tenant",
+        AsyncMock(return_value=OnboardResult(did="did:sov:456")),
+    ), patch(
+        f"{MODULE}.update_actor",
+        AsyncMock(side_effect=lambda _: order.append("actor")),
+    ) as mock_update_actor:
+        await handle_tenant_update(
+            admin_controller,
+            wallet_id,
+            UpdateTenantRequest(roles=["issuer"]),
+        )
+
+    assert order == ["actor", "wallet"]
+    (updated_actor,) = mock_update_actor.await_args.args
+    assert sorted(updated_actor.roles) == ["issuer", "verifier"]
@@ -1,5 +1,6 @@
 import pytest
 from aries_cloudcontroller import (
+    DID,
     AcaPyClient,
     ApiException,
     ModelSchema,
@@ -14,10 +15,14 @@ from fastapi import HTTPException
 from mockito import verify, when
 
 from app.exceptions import CloudApiException
+from app.services import acapy_wallet
 from app.services.acapy_ledger import (
     accept_taa,
+    accept_taa_if_required,
     get_did_endpoint,
+    get_endorser_public_did,
     get_taa,
+    invalidate_ledger_metadata,
     schema_id_from_credential_definition_id,
 )
 from app.tests.util.mock import to_async
@@ -49,6 +54,74 @@ async def test_error_on_accept_taa(mock_agent_controller: AcaPyClient):
     assert "An unexpected error occurred while trying to accept TAA" in exc.value.detail
 
 
+@pytest.mark.anyio
+async def test_accept_taa_if_required_caches_taa(mock_agent_controller: AcaPyClient):
+    taa_record = TAARecord(digest="digest", text="text", version="1.0")
+    taa_result = TAAResult(result=TAAInfo(taa_required=True, taa_record=taa_record))
+    when(mock_agent_controller.ledger).fetch_taa().thenReturn(
+        to_async(taa_result), to_async(taa_result)
+    )
+    when(mock_agent_controller.ledger).accept_taa(...).thenReturn(
+        to_async(), to_async(), to_async()
+    )
+
+    await accept_taa_if_required(mock_agent_controller)
+    await accept_taa_if_required(mock_agent_controller)
+
+    verify(mock_agent_controller.ledger, times=1).fetch_taa()
+    verify(mock_agent_controller.ledger, times=2).accept_taa(
+        body=TAAAccept(
+            digest="digest",
+            text="text",
+            version="1.0",
+            mechanism="service_agreement",
+        )
+    )
+
+    invalidate_ledger_metadata()
+    await accept_taa_if_required(mock_agent_controller)
+    verify(mock_agent_controller.ledger, times=2).fetch_taa()
+
+
+@pytest.mark.anyio
+async def test_accept_taa_if_required_error_drops_cached_taa(
+    mock_agent_controller: AcaPyClient,
+):
+    taa_record = TAARecord(digest="digest", text="text", version="1.0")
+    taa_result = TAAResult(result=TAAInfo(taa_required=True, taa_record=taa_record))
+    when(mock_agent_controller.ledger).fetch_taa().thenReturn(
+        to_async(taa_result), to_async(taa_result)
+    )
+    when(mock_agent_controller.ledger).accept_taa(...).thenRaise(
+        ApiException(status=400)
+    )
+
+    for _ in range(2):
+        with pytest.raises(CloudApiException):
+            await accept_taa_if_required(mock_agent_controller)
+
+    verify(mock_agent_controller.ledger, times=2).fetch_taa()
+
+
+@pytest.mark.anyio
+async def test_get_endorser_public_did_cached(mock_agent_controller: AcaPyClient):
+    endorser_did = DID(
+        did="WgWxqztrNooG92RXvxSTWv",
+        verkey="WgWxqztrNooG92RXvxSTWvWgWxqztrNooG92RXvxSTWv",
+        posture="posted",
+        key_type="ed25519",
+        method="sov",
+    )
+    when(acapy_wallet).get_public_did(controller=mock_agent_controller).thenReturn(
+        to_async(endorser_did)
+    )
+
+    assert await get_endorser_public_did(mock_agent_controller) == endorser_did
+    assert await get_endorser_public_did(mock_agent_controller) == endorser_did
+
+    verify(acapy_wallet, times=1).get_public_did(controller=mock_agent_controller)
+
+
 @pytest.mark.anyio
 async def test_error_on_get_did_endpoint(mock_agent_controller: AcaPyClient):
     when(mock_agent_controller.ledger).get_did_endpoint(did="data").thenReturn(
@@ -1,4 +1,5 @@
-from unittest.mock import ANY
+import asyncio
+from unittest.mock import ANY, patch
 
 import pytest
 from aries_cloudcontroller import (
@@ -22,6 +23,7 @@ import app.services.revocation_registry as rg
 from app.exceptions import CloudApiException
 from app.models.issuer import ClearPendingRevocationsResult
 from app.tests.util.mock import to_async
+from shared import PUBLISH_REVOCATIONS_TIMEOUT
 
 cred_def_id = "VagGATdBsVdBeFKeoYPe7H:3:CL:141:5d211963-3478-4de4-b8b6-9072759a71c8"
 cred_ex_id = "5mJRavkcQFrqgKqKKZua3z:3:CL:30:tag"
@@ -105,6 +107,56 @@ async def test_revoke_credential(mock_agent_controller: AcaPyClient):
         assert exc.value.status_code == 500
 
 
+@pytest.mark.anyio
+async def test_revoke_credential_auto_publish(mock_agent_controller: AcaPyClient):
+    operation = {"revocRegDefId": revocation_registry_id, "value": {"revoked": [1]}}
+    txn = {
+        "transaction_id": transaction_id,
+        "messages_attach": [{"data": {"json": {"operation": operation}}}],
+    }
+    when(mock_agent_controller.revocation).revoke_credential(
+        body=RevokeRequest(cred_ex_id=cred_id, publish=True)
+    ).thenReturn(to_async({"txn": txn}))
+
+    with patch(
+        "app.services.revocation_registry.wait_for_transaction_acked"
+    ) as mock_wait_for_transaction_acked:
+        revoke_credential_result = await rg.revoke_credential(
+            controller=mock_agent_controller,
+            credential_exchange_id=cred_id,
+            auto_publish_to_ledger=True,
+            wallet_id="wallet_id",
+        )
+
+    mock_wait_for_transaction_acked.assert_awaited_once_with(
+        aries_controller=mock_agent_controller,
+        transaction_id=transaction_id,
+        wallet_id="wallet_id",
+        timeout=PUBLISH_REVOCATIONS_TIMEOUT,
+    )
+    assert revoke_credential_result.cred_rev_ids_published == {
+        revocation_registry_id: [1]
+    }
+
+    # Not acked within timeout
+    when(mock_agent_controller.revocation).revoke_credential(
+        body=RevokeRequest(cred_ex_id=cred_id, publish=True)
+    ).thenReturn(to_async({"txn": txn}))
+    with patch(
+        "app.services.revocation_registry.wait_for_transaction_acked",
+        side_effect=asyncio.TimeoutError(),
+    ), pytest.raises(
+        CloudApiException,
+        match="Could not assert that revocation was published within timeout.",
+    ):
+        await rg.revoke_credential(
+            controller=mock_agent_controller,
+            credential_exchange_id=cred_id,
+            auto_publish_to_ledger=True,
+            wallet_id="wallet_id",
+        )
+
+
 @pytest.mark.anyio
 async def test_publish_pending_revocations_success(mock_agent_controller: AcaPyClient):
     # Simulate successful validation
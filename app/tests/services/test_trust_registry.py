@@ -18,15 +18,28 @@ from app.services.trust_registry.actors import (
     fetch_actor_by_did,
     fetch_actors_with_role,
     register_actor,
+    register_actors,
+    release_actor_name,
     remove_actor_by_id,
+    reserve_actor_name,
     update_actor,
 )
-from app.services.trust_registry.schemas import register_schema, remove_schema_by_id
+from app.services.trust_registry.list_cache import registry_list_cache
+from app.services.trust_registry.schemas import (
+    fetch_schemas,
+    register_schema,
+    remove_schema_by_id,
+)
 from app.services.trust_registry.util.actor import actor_has_role, assert_actor_name
 from app.services.trust_registry.util.issuer import assert_valid_issuer
 from app.services.trust_registry.util.schema import registry_has_schema
-from shared.constants import TRUST_REGISTRY_URL
-from shared.models.trustregistry import Actor
+from shared.constants import (
+    ACTOR_NAME_RESERVATION_TTL,
+    TRUST_REGISTRY_SESSION,
+    TRUST_REGISTRY_SESSION_HEADER,
+    TRUST_REGISTRY_URL,
+)
+from shared.models.trustregistry import Actor, ActorRegistration
 
 
 @pytest.mark.anyio
@@ -243,14 +256,14 @@ async def test_register_schema(
     mock_async_client: Mock,  # pylint: disable=redefined-outer-name
 ):
     schema_id = "WgWxqztrNooG92RXvxSTWv:2:schema_name:1.0"
-    mock_async_client.post = AsyncMock(return_value=Response(200))
+    mock_async_client.put = AsyncMock(return_value=Response(200))
     await register_schema(schema_id=schema_id)
-    mock_async_client.post.assert_called_once_with(
+    mock_async_client.put.assert_called_once_with(
         TRUST_REGISTRY_URL + "/registry/schemas",
         json={"schema_id": schema_id},
     )
 
-    mock_async_client.post = AsyncMock(side_effect=HTTPException(500))
+    mock_async_client.put = AsyncMock(side_effect=HTTPException(500))
     with pytest.raises(TrustRegistryException):
         await register_schema(schema_id=schema_id)
 
@@ -270,9 +283,10 @@ async def test_register_actor(
         didcomm_invitation="actor-didcomm-invitation",
     )
     mock_async_client.post = AsyncMock(return_value=Response(200))
-    await register_actor(actor=actor)
+    await register_actor(actor=actor, reservation_id="reservation-id")
     mock_async_client.post.assert_called_once_with(
-        TRUST_REGISTRY_URL + "/registry/actors", json=actor.model_dump()
+        TRUST_REGISTRY_URL + "/registry/actors",
+        json={**actor.model_dump(), "reservation_id": "reservation-id"},
     )
 
     mock_async_client.post = AsyncMock(return_value=Response(500))
@@ -286,6 +300,132 @@ async def test_register_actor(
         await register_actor(actor=actor)
 
 
+@pytest.mark.anyio
+async def test_register_actor_sends_session(mocker: MockerFixture):
+    patch_client = mocker.patch("app.services.trust_registry.actors.RichAsyncClient")
+    mocked_client = Mock()
+    mocked_client.post = AsyncMock(return_value=Response(200))
+    patch_client.return_value.__aenter__.return_value = mocked_client
+
+    await register_actor(
+        actor=Actor(id="actor-id", name="actor-name", roles=["verifier"], did="did:x")
+    )
+
+    patch_client.assert_called_once_with(
+        raise_status_error=False,
+        headers={TRUST_REGISTRY_SESSION_HEADER: TRUST_REGISTRY_SESSION},
+    )
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "mock_async_client", ["app.services.trust_registry.actors"], indirect=True
+)
+async def test_register_actors(
+    mock_async_client: Mock,  # pylint: disable=redefined-outer-name
+):
+    actors = [
+        Actor(id=f"actor-{i}", name=f"actor-{i}", roles=["issuer"], did=f"did:{i}")
+        for i in range(3)
+    ]
+    mock_async_client.post = AsyncMock(
+        return_value=Response(
+            200,
+            json={
+                "created": 1,
+                "failed": 2,
+                "results": [
+                    {"line": 1, "id": "actor-0", "status": "created"},
+                    {
+                        "line": 2,
+                        "id": "actor-1",
+                        "status": "conflict",
+                        "detail": "Record already exists.",
+                    },
+                    {"line": 3, "id": "actor-2", "status": "failed"},
+                ],
+            },
+        )
+    )
+
+    failures = await register_actors(actors, reservation_ids={"actor-0": "reserved"})
+
+    assert failures.keys() == {"actor-1", "actor-2"}
+    assert failures["actor-1"].status_code == 409
+    assert failures["actor-1"].detail == (
+        "Error registering actor: `Record already exists.`."
+    )
+    assert failures["actor-2"].status_code == 500
+    mock_async_client.post.assert_called_once_with(
+        TRUST_REGISTRY_URL + "/registry/actors/bulk",
+        content=b"\n".join(
+            ActorRegistration(
+                **actor.model_dump(),
+                reservation_id="reserved" if actor.id == "actor-0" else None,
+            )
+            .model_dump_json()
+            .encode()
+            for actor in actors
+        ),
+        headers={"content-type": "application/x-ndjson"},
+    )
+
+    mock_async_client.post = AsyncMock(return_value=Response(500))
+    with pytest.raises(TrustRegistryException):
+        await register_actors(actors)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "mock_async_client", ["app.services.trust_registry.actors"], indirect=True
+)
+async def test_reserve_actor_name(
+    mock_async_client: Mock,  # pylint: disable=redefined-outer-name
+):
+    reservation = {
+        "id": "reservation-id",
+        "name": "actor-name",
+        "expires_at": "2026-10-19T10:00:00Z",
+    }
+    mock_async_client.post = AsyncMock(return_value=Response(201, json=reservation))
+
+    result = await reserve_actor_name("actor-name")
+
+    assert result.id == "reservation-id"
+    mock_async_client.post.assert_called_once_with(
+        TRUST_REGISTRY_URL + "/registry/actors/reservations",
+        json={"name": "actor-name", "ttl": ACTOR_NAME_RESERVATION_TTL},
+    )
+
+    for status_code in (409, 500):
+        mock_async_client.post = AsyncMock(return_value=Response(status_code))
+        with pytest.raises(TrustRegistryException) as exc:
+            await reserve_actor_name("actor-name")
+        assert exc.value.status_code == status_code
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "mock_async_client", ["app.services.trust_registry.actors"], indirect=True
+)
+async def test_release_actor_name(
+    mock_async_client: Mock,  # pylint: disable=redefined-outer-name
+):
+    mock_async_client.delete = AsyncMock(return_value=Response(204))
+    await release_actor_name("reservation-id")
+    mock_async_client.delete.assert_called_once_with(
+        TRUST_REGISTRY_URL + "/registry/actors/reservations/reservation-id"
+    )
+
+    # Expired or consumed reservations are released already
+    mock_async_client.delete = AsyncMock(return_value=Response(404))
+    await release_actor_name("reservation-id")
+
+    mock_async_client.delete = AsyncMock(return_value=Response(500))
+    with pytest.raises(TrustRegistryException):
+        await release_actor_name("reservation-id")
+
+
 @pytest.mark.anyio
 @pytest.mark.parametrize(
     "mock_async_client", ["app.services.trust_registry.actors"], indirect=True
@@ -430,7 +570,7 @@ async def test_get_schemas(
     await get_schemas()
 
     mock_async_client.get.assert_called_once_with(
-        f"{TRUST_REGISTRY_URL}/registry/schemas"
+        f"{TRUST_REGISTRY_URL}/registry/schemas", headers={}
     )
 
 
@@ -485,7 +625,9 @@ async def test_get_actor(
     mock_async_client.get = AsyncMock(return_value=Response(200, json=[actor]))
 
     await get_actors()
-    mock_async_client.get.assert_called_with(f"{TRUST_REGISTRY_URL}/registry/actors")
+    mock_async_client.get.assert_called_with(
+        f"{TRUST_REGISTRY_URL}/registry/actors", headers={}
+    )
 
     # Following methods get 1 actor
     mock_async_client.get = AsyncMock(return_value=Response(200, json=actor))
@@ -541,7 +683,7 @@ async def test_get_issuers(
     await get_issuers()
 
     mock_async_client.get.assert_called_once_with(
-        f"{TRUST_REGISTRY_URL}/registry/actors"
+        f"{TRUST_REGISTRY_URL}/registry/actors", headers={}
     )
 
 
@@ -566,5 +708,80 @@ async def test_get_verifiers(
 
     await get_verifiers()
     mock_async_client.get.assert_called_once_with(
-        f"{TRUST_REGISTRY_URL}/registry/actors"
+        f"{TRUST_REGISTRY_URL}/registry/actors", headers={}
+    )
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "mock_async_client", ["app.services.trust_registry.schemas"], indirect=True
+)
+async def test_fetch_schemas_revalidates(
+    mock_async_client: Mock,  # pylint: disable=redefined-outer-name
+):
+    url = f"{TRUST_REGISTRY_URL}/registry/schemas"
+    schema = {
+        "did": "CW2GEk5zZ7DcF818i3gLUs",
+        "name": "test_schema",
+        "version": "1.0",
+        "id": "CW2GEk5zZ7DcF818i3gLUs:2:test_schema:1.0",
+    }
+    registry_list_cache.clear()
+
+    mock_async_client.get = AsyncMock(
+        return_value=Response(200, json=[schema], headers={"ETag": '"7"'})
+    )
+    first = await fetch_schemas()
+    mock_async_client.get.assert_called_once_with(url, headers={})
+
+    # Unchanged registry data: the cached list is served from a 304 without a body
+    mock_async_client.get = AsyncMock(return_value=Response(304))
+    second = await fetch_schemas()
+    mock_async_client.get.assert_called_once_with(url, headers={"If-None-Match": '"7"'})
+    assert second == first
+    assert second[0].id == schema["id"]
+
+    # Changed registry data replaces the cached list
+    mock_async_client.get = AsyncMock(
+        return_value=Response(200, json=[], headers={"ETag": '"8"'})
     )
+    assert await fetch_schemas() == []
+    assert registry_list_cache.request_headers(url) == {"If-None-Match": '"8"'}
+    registry_list_cache.clear()
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "mock_async_client", ["app.services.trust_registry.schemas"], indirect=True
+)
+async def test_fetch_schemas_not_modified_after_eviction(
+    mock_async_client: Mock,  # pylint: disable=redefined-outer-name
+):
+    url = f"{TRUST_REGISTRY_URL}/registry/schemas"
+    registry_list_cache.clear()
+
+    schema = {
+        "did": "CW2GEk5zZ7DcF818i3gLUs",
+        "name": "test_schema",
+        "version": "1.0",
+        "id": "CW2GEk5zZ7DcF818i3gLUs:2:test_schema:1.0",
+    }
+    mock_async_client.get = AsyncMock(
+        return_value=Response(200, json=[schema], headers={"ETag": '"7"'})
+    )
+    await fetch_schemas()
+
+    async def evicted_in_flight(_url, headers):
+        if headers:
+            registry_list_cache.clear()
+            return Response(304)
+        return Response(200, json=[schema], headers={"ETag": '"7"'})
+
+    # The 304 cannot be served from the evicted list, so the request is re-issued
+    mock_async_client.get = AsyncMock(side_effect=evicted_in_flight)
+    result = await fetch_schemas()
+
+    assert [s.id for s in result] == [schema["id"]]
+    mock_async_client.get.assert_called_with(url, headers={})
+    assert mock_async_client.get.call_count == 2
+    registry_list_cache.clear()
@@ -0,0 +1,26 @@
+import pytest
+
+from app.benchmarks import bench_auth, bench_tenants
+
+
+def test_bench_auth(capsys):
+    bench_auth.run(num_tokens=5, num_requests=50)
+
+    rows = capsys.readouterr().out.splitlines()[1:]
+    assert [row.split()[0] for row in rows] == ["disabled", "enabled"]
+    # Only the first request with each token misses the cache
+    assert float(rows[1].split()[-1]) >= 0.9
+
+
+@pytest.mark.anyio
+async def test_bench_tenants(capsys):
+    await bench_tenants.run(delay_ms=1, num_requests=5, num_sign_ups=5)
+
+    *rows, sign_ups = capsys.readouterr().out.splitlines()[2:]
+    assert [row[:16].strip() for row in rows] == [
+        "create holder",
+        "update tenant",
+        "delete tenant",
+    ]
+    # Only the sign-up that reserved the label creates a wallet
+    assert sign_ups.endswith("created 1 wallet(s)")
@@ -0,0 +1,152 @@
+import base64
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from aries_cloudcontroller import WalletRecordWithGroups
+from fastapi import HTTPException
+
+from app.exceptions import CloudApiException
+from app.tests.util.tenants import FakeWallets
+from app.util.tenants import (
+    CachedWallet,
+    TenantCursor,
+    assert_wallet_in_group,
+    evict_wallet,
+    get_wallet_label_from_controller,
+    iter_wallets,
+    wallet_cache,
+)
+
+wallet_id = "wallet_id"
+group_id = "group"
+
+wallet_record = WalletRecordWithGroups(
+    wallet_id=wallet_id,
+    created_at="2024-02-27T09:48:39.508826Z",
+    updated_at="2024-02-27T09:48:39.508826Z",
+    key_management_mode="managed",
+    settings={
+        "default_label": "label",
+        "wallet.group_id": group_id,
+        "image_url": "https://image.png",
+    },
+)
+
+
+@pytest.mark.anyio
+async def test_assert_wallet_in_group_caches_wallet():
+    admin_controller = AsyncMock()
+    admin_controller.multitenancy.get_wallet = AsyncMock(return_value=wallet_record)
+
+    for _ in range(2):
+        await assert_wallet_in_group(
+            admin_controller=admin_controller,
+            wallet_id=wallet_id,
+            group_id=group_id,
+            logger=MagicMock(),
+        )
+
+    admin_controller.multitenancy.get_wallet.assert_awaited_once_with(
+        wallet_id=wallet_id
+    )
+    assert wallet_cache.get(wallet_id) == CachedWallet(
+        group_id=group_id, label="label", image_url="https://image.png"
+    )
+
+    evict_wallet(wallet_id)
+    await assert_wallet_in_group(
+        admin_controller=admin_controller,
+        wallet_id=wallet_id,
+        group_id=None,
+        logger=MagicMock(),
+    )
+    assert admin_controller.multitenancy.get_wallet.await_count == 2
+
+
+@pytest.mark.anyio
+async def test_assert_wallet_in_group_cached_wrong_group():
+    admin_controller = AsyncMock()
+    wallet_cache.set(
+        wallet_id, CachedWallet(group_id=group_id, label="label", image_url=None)
+    )
+
+    with pytest.raises(HTTPException) as exc:
+        await assert_wallet_in_group(
+            admin_controller=admin_controller,
+            wallet_id=wallet_id,
+            group_id="other_group",
+            logger=MagicMock(),
+        )
+
+    assert exc.value.status_code == 404
+    admin_controller.multitenancy.get_wallet.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_get_wallet_label_from_controller_cached():
+    payload = base64.b64encode(json.dumps({"wallet_id": wallet_id}).encode())
+    aries_controller = MagicMock(tenant_jwt=f"header.{payload.decode()}.signature")
+    admin_controller = AsyncMock()
+    admin_controller.multitenancy.get_wallet = AsyncMock(return_value=wallet_record)
+
+    with patch(
+        "app.util.tenants.get_tenant_admin_controller"
+    ) as mock_get_admin_controller:
+        mock_get_admin_controller.return_value.__aenter__.return_value = (
+            admin_controller
+        )
+
+        assert await get_wallet_label_from_controller(aries_controller) == "label"
+        assert await get_wallet_label_from_controller(aries_controller) == "label"
+
+    admin_controller.multitenancy.get_wallet.assert_awaited_once_with(
+        wallet_id=wallet_id
+    )
+
+
+@pytest.mark.parametrize("descending", [True, False])
+def test_tenant_cursor_encode(descending):
+    cursor = TenantCursor(
+        created_at="2024-01-01T00:00:00.000000Z",
+        wallet_id=wallet_id,
+        offset=10,
+        descending=descending,
+    )
+
+    assert TenantCursor.decode(cursor.encode()) == cursor
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "e30="])
+def test_tenant_cursor_decode_invalid(cursor):
+    with pytest.raises(CloudApiException) as exc:
+        TenantCursor.decode(cursor)
+
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_iter_wallets_steps_back_after_removed_wallets():
+    fake_wallets = FakeWallets(10)
+    admin_controller = AsyncMock()
+    admin_controller.multitenancy.get_wallets = AsyncMock(
+        side_effect=fake_wallets.get_wallets
+    )
+    cursor = TenantCursor.after(fake_wallets.wallets[2], offset=3, descending=False)
+    # More wallets than a page were removed before the cursor
+    fake_wallets.delete("wallet-0", "wallet-1", "wallet-2", "wallet-3", "wallet-4")
+
+    wallets = [
+        wallet.wallet_id
+        async for wallet, _ in iter_wallets(
+            admin_controller,
+            cursor=cursor,
+            descending=True,
+            page_size=2,
+            wallet_name=None,
+            group_id=None,
+            logger=MagicMock(),
+        )
+    ]
+
+    assert wallets == ["wallet-5", "wallet-6", "wallet-7", "wallet-8", "wallet-9"]
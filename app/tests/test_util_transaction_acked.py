@@ -0,0 +1,126 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import HTTPError
+
+from app.exceptions import CloudApiException
+from app.util.transaction_acked import (
+    wait_for_transaction_ack,
+    wait_for_transaction_acked,
+)
+
+transaction_id = "some_transaction_id"
+wallet_id = "some_wallet_id"
+
+
+def controller_with_states(*states: str) -> AsyncMock:
+    aries_controller = AsyncMock()
+    aries_controller.endorse_transaction.get_transaction.side_effect = [
+        MagicMock(state=state) for state in states
+    ]
+    return aries_controller
+
+
+async def never_acked_event(**_):
+    await asyncio.sleep(10)
+
+
+@pytest.mark.anyio
+async def test_wait_for_transaction_acked_event():
+    aries_controller = controller_with_states("transaction_endorsed")
+    mock_wait_for_event = AsyncMock(return_value={"payload": {}})
+
+    with patch(
+        "app.services.event_handling.sse.sse_wait_for_event_with_field_and_state",
+        mock_wait_for_event,
+    ):
+        await wait_for_transaction_acked(
+            aries_controller, transaction_id, wallet_id, timeout=1
+        )
+
+    mock_wait_for_event.assert_awaited_once_with(
+        group_id=None,
+        wallet_id=wallet_id,
+        topic="endorsements",
+        field="transaction_id",
+        field_id=transaction_id,
+        desired_state="transaction-acked",
+    )
+
+
+@pytest.mark.anyio
+async def test_wait_for_transaction_acked_resubscribes():
+    aries_controller = controller_with_states("transaction_endorsed")
+    mock_wait_for_event = AsyncMock(side_effect=[None, {"payload": {}}])
+
+    with patch(
+        "app.services.event_handling.sse.sse_wait_for_event_with_field_and_state",
+        mock_wait_for_event,
+    ):
+        await wait_for_transaction_acked(
+            aries_controller, transaction_id, wallet_id, timeout=1
+        )
+
+    assert mock_wait_for_event.await_count == 2
+
+
+@pytest.mark.anyio
+async def test_wait_for_transaction_acked_polls_if_event_fails():
+    aries_controller = controller_with_states(
+        "transaction_endorsed", "transaction_acked"
+    )
+
+    with patch(
+        "app.services.event_handling.sse.sse_wait_for_event_with_field_and_state",
+        AsyncMock(side_effect=HTTPError("Waypoint unavailable")),
+    ), patch("app.util.transaction_acked.TRANSACTION_ACK_POLL_INTERVAL", 0.01):
+        await wait_for_transaction_acked(
+            aries_controller, transaction_id, wallet_id, timeout=1
+        )
+
+    assert aries_controller.endorse_transaction.get_transaction.await_count == 2
+
+
+@pytest.mark.anyio
+async def test_wait_for_transaction_acked_without_wallet_id():
+    aries_controller = controller_with_states("transaction_acked")
+
+    with patch(
+        "app.services.event_handling.sse.sse_wait_for_event_with_field_and_state"
+    ) as mock_wait_for_event:
+        await wait_for_transaction_acked(
+            aries_controller, transaction_id, wallet_id=None, timeout=1
+        )
+
+    mock_wait_for_event.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_wait_for_transaction_acked_timeout():
+    aries_controller = AsyncMock()
+    aries_controller.endorse_transaction.get_transaction.return_value = MagicMock(
+        state="transaction_endorsed"
+    )
+
+    with patch(
+        "app.services.event_handling.sse.sse_wait_for_event_with_field_and_state",
+        never_acked_event,
+    ), pytest.raises(asyncio.TimeoutError):
+        await wait_for_transaction_acked(
+            aries_controller, transaction_id, wallet_id, timeout=0.05
+        )
+
+
+@pytest.mark.anyio
+async def test_wait_for_transaction_ack_timeout():
+    with patch(
+        "app.util.transaction_acked.wait_for_transaction_acked",
+        AsyncMock(side_effect=asyncio.TimeoutError()),
+    ), pytest.raises(
+        CloudApiException,
+        match="Timeout waiting for endorser to accept the endorsement request.",
+    ) as exc:
+        await wait_for_transaction_ack(AsyncMock(), transaction_id, wallet_id)
+
+    assert exc.value.status_code == 504
@@ -1,3 +1,5 @@
+from aries_cloudcontroller import WalletListWithGroups, WalletRecordWithGroups
+
 from app.models.tenants import CreateTenantRequest, CreateTenantResponse
 from app.routes.admin.tenants import router
 from app.util.string import random_string
@@ -55,3 +57,30 @@ async def create_tenant(admin_client: RichAsyncClient, name: str):
 
 async def delete_tenant(admin_client: RichAsyncClient, wallet_id: str):
     await admin_client.delete(f"{TENANT_BASE_PATH}/{wallet_id}")
+
+
+class FakeWallets:
+    """In-memory stand-in for paging wallets with ACA-Py's `get_wallets`."""
+
+    def __init__(self, count: int) -> None:
+        self.wallets = []
+        self.create(count)
+
+    def create(self, count: int) -> None:
+        for _ in range(count):
+            i = len(self.wallets)
+            self.wallets.append(
+                WalletRecordWithGroups(
+                    wallet_id=f"wallet-{i}",
+                    created_at=f"2024-01-01T00:00:{i:02d}.000000Z",
+                    key_management_mode="managed",
+                    settings={"default_label": f"label-{i}", "wallet.name": str(i)},
+                )
+            )
+
+    def delete(self, *wallet_ids: str) -> None:
+        self.wallets = [w for w in self.wallets if w.wallet_id not in wallet_ids]
+
+    async def get_wallets(self, limit, offset, descending, **_):
+        wallets = list(reversed(self.wallets)) if descending else self.wallets
+        return WalletListWithGroups(results=wallets[offset : offset + limit])
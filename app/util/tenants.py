@@ -1,14 +1,31 @@
 import base64
 import json
 from logging import Logger
-from typing import Optional
+from typing import AsyncGenerator, NamedTuple, Optional, Tuple
 
 from aries_cloudcontroller import AcaPyClient, WalletRecordWithGroups
 from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
 
 from app.dependencies.acapy_clients import get_tenant_admin_controller
-from app.exceptions import handle_acapy_call
+from app.exceptions import CloudApiException, handle_acapy_call
 from app.models.tenants import Tenant
+from shared import WALLET_CACHE_SIZE, WALLET_CACHE_TTL
+from shared.util.cache import BoundedCache
+
+
+class CachedWallet(NamedTuple):
+    group_id: Optional[str]
+    label: str
+    image_url: Optional[str]
+
+
+# Group, label and image of recently fetched wallets, so that group checks and label
+# lookups need no call to ACA-Py. Entries are replaced when a wallet is updated, and
+# dropped when it is deleted, by this instance; the ttl bounds staleness across instances
+wallet_cache: BoundedCache[str, CachedWallet] = BoundedCache(
+    maxsize=WALLET_CACHE_SIZE, ttl=WALLET_CACHE_TTL
+)
 
 
 class WalletNotFoundException(HTTPException):
@@ -37,6 +54,20 @@ def tenant_from_wallet_record(wallet_record: WalletRecordWithGroups) -> Tenant:
     )
 
 
+def cache_wallet(wallet_record: WalletRecordWithGroups) -> CachedWallet:
+    cached_wallet = CachedWallet(
+        group_id=wallet_record.settings.get("wallet.group_id"),
+        label=wallet_record.settings.get("default_label") or "",
+        image_url=wallet_record.settings.get("image_url"),
+    )
+    wallet_cache.set(wallet_record.wallet_id, cached_wallet)
+    return cached_wallet
+
+
+def evict_wallet(wallet_id: str) -> None:
+    wallet_cache.pop(wallet_id)
+
+
 def get_wallet_id_from_b64encoded_jwt(jwt: str) -> str:
     # Add padding if required
     # b64 needs lengths divisible by 4
@@ -51,11 +82,17 @@ def get_wallet_id_from_b64encoded_jwt(jwt: str) -> str:
 async def get_wallet_label_from_controller(aries_controller: AcaPyClient) -> str:
     controller_token = aries_controller.tenant_jwt.split(".")[1]
     controller_wallet_id = get_wallet_id_from_b64encoded_jwt(controller_token)
+
+    cached_wallet = wallet_cache.get(controller_wallet_id)
+    if cached_wallet:
+        return cached_wallet.label
+
     async with get_tenant_admin_controller() as admin_controller:
         controller_wallet_record = await admin_controller.multitenancy.get_wallet(
             wallet_id=controller_wallet_id
         )
     controller_label = controller_wallet_record.settings["default_label"]
+    cache_wallet(controller_wallet_record)
     return controller_label
 
 
@@ -90,6 +127,7 @@ async def get_wallet_and_assert_valid_group(
         logger.info("Bad request: Wallet not found.")
         raise WalletNotFoundException(wallet_id=wallet_id)
 
+    cache_wallet(wallet)
     assert_valid_group(
         wallet=wallet, wallet_id=wallet_id, group_id=group_id, logger=logger
     )
@@ -97,6 +135,44 @@ async def get_wallet_and_assert_valid_group(
     return wallet
 
 
+async def assert_wallet_in_group(
+    admin_controller: AcaPyClient,
+    wallet_id: str,
+    group_id: Optional[str],
+    logger: Logger,
+) -> None:
+    """Assert that the wallet exists and belongs to group, using the wallet cache.
+
+    The wallet record is only fetched if the wallet is not cached.
+
+    Args:
+        admin_controller (AcaPyClient): Admin AcaPyClient instance.
+        wallet_id (str): The wallet_id to assert.
+        group_id (Optional[str]): The group_id to assert against.
+        logger (Logger): A logger object.
+
+    Raises:
+        HTTPException: If the wallet does not exist or does not belong to group
+    """
+    cached_wallet = wallet_cache.get(wallet_id)
+    if not cached_wallet:
+        await get_wallet_and_assert_valid_group(
+            admin_controller=admin_controller,
+            wallet_id=wallet_id,
+            group_id=group_id,
+            logger=logger,
+        )
+        return
+
+    if group_id and cached_wallet.group_id != group_id:
+        logger.info("Bad request: wallet_id does not belong to group_id.")
+
+        # 404 instead of 403, obscure existence of wallet_id outside group
+        raise WalletNotFoundException(wallet_id=wallet_id)
+
+    logger.debug("Cached wallet {} belongs to group {}.", wallet_id, group_id)
+
+
 def assert_valid_group(
     wallet: WalletRecordWithGroups,
     wallet_id: str,
@@ -122,3 +198,111 @@ def assert_valid_group(
         raise WalletNotFoundException(wallet_id=wallet_id)
 
     logger.debug("Wallet {} belongs to group {}.", wallet_id, group_id)
+
+
+class TenantCursor(BaseModel):
+    """Position after a wallet in the wallet listing, to continue listing from."""
+
+    created_at: str
+    wallet_id: str
+    offset: int
+    descending: bool
+
+    def encode(self) -> str:
+        return base64.urlsafe_b64encode(self.model_dump_json().encode()).decode()
+
+    @classmethod
+    def decode(cls, cursor: str) -> "TenantCursor":
+        try:
+            return cls.model_validate_json(base64.urlsafe_b64decode(cursor))
+        except (ValueError, ValidationError) as e:
+            raise CloudApiException("Invalid cursor.", 400) from e
+
+    @classmethod
+    def after(
+        cls, wallet: WalletRecordWithGroups, offset: int, descending: bool
+    ) -> "TenantCursor":
+        return cls(
+            created_at=wallet.created_at,
+            wallet_id=wallet.wallet_id,
+            offset=offset,
+            descending=descending,
+        )
+
+    def precedes(self, wallet: WalletRecordWithGroups) -> bool:
+        key = (wallet.created_at, wallet.wallet_id)
+        cursor_key = (self.created_at, self.wallet_id)
+        return key < cursor_key if self.descending else key > cursor_key
+
+
+async def iter_wallets(
+    admin_controller: AcaPyClient,
+    *,
+    cursor: Optional[TenantCursor],
+    descending: bool,
+    page_size: int,
+    wallet_name: Optional[str],
+    group_id: Optional[str],
+    logger: Logger,
+) -> AsyncGenerator[Tuple[WalletRecordWithGroups, TenantCursor], None]:
+    """Yield the wallets after cursor in creation order, fetching page_size at a time.
+
+    ACA-Py only pages wallets by offset, so fetching resumes at the cursor's offset, from
+    the wallet at the cursor, and wallets up to the cursor's (created_at, wallet_id) are
+    skipped. Wallets created in the meantime therefore do not repeat wallets that were
+    already listed. If wallets were deleted, so that the wallet at the cursor's offset is
+    already past the cursor, fetching steps back a page at a time, so that none are skipped.
+
+    Args:
+        admin_controller (AcaPyClient): Admin AcaPyClient instance.
+        cursor (Optional[TenantCursor]): The cursor to continue from, or None to start.
+        descending (bool): Whether to list the newest wallets first, if not continuing.
+        page_size (int): Number of wallets fetched per call to ACA-Py.
+        wallet_name (Optional[str]): Filter by wallet name.
+        group_id (Optional[str]): Filter by group.
+        logger (Logger): A logger object.
+
+    Yields:
+        Each wallet record, with the cursor to continue after it.
+    """
+    if cursor:
+        descending = cursor.descending
+        # Resume from the wallet at the cursor, to detect wallets removed before it
+        offset = cursor.offset - 1
+        limit = page_size + 1
+    else:
+        offset = 0
+        limit = page_size
+    resuming = cursor is not None
+
+    while True:
+        logger.debug("Fetching {} wallets from offset {}", limit, offset)
+        wallets = await handle_acapy_call(
+            logger=logger,
+            acapy_call=admin_controller.multitenancy.get_wallets,
+            limit=limit,
+            offset=offset,
+            order_by="id",
+            descending=descending,
+            wallet_name=wallet_name,
+            group_id=group_id,
+        )
+        results = wallets.results or []
+
+        if resuming:
+            if offset > 0 and (not results or cursor.precedes(results[0])):
+                logger.debug("Wallets were removed before cursor; fetching page before")
+                offset = max(0, offset - page_size)
+                continue
+            resuming = False
+
+        for index, wallet in enumerate(results):
+            if cursor and not cursor.precedes(wallet):
+                continue
+            cursor = TenantCursor.after(wallet, offset + index + 1, descending)
+            yield wallet, cursor
+
+        if len(results) < limit:
+            return
+        offset += len(results)
+        limit = page_size
@@ -1,9 +1,11 @@
 import asyncio
+from typing import List, Optional
 
 from aries_cloudcontroller import AcaPyClient
 
 from app.exceptions import CloudApiException
-from app.util.retry_method import coroutine_with_retry_until_value
+from app.services.event_handling.sse import sse_wait_for_event_with_resubscribe
+from shared import TRANSACTION_ACK_POLL_INTERVAL
 from shared.log_config import get_logger
 
 logger = get_logger(__name__)
@@ -12,28 +14,107 @@ logger = get_logger(__name__)
 async def wait_for_transaction_ack(
     aries_controller: AcaPyClient,
     transaction_id: str,
-    max_attempts: int = 15,
-    retry_delay: int = 1,
+    wallet_id: Optional[str] = None,
+    timeout: float = 15,
 ) -> None:
     """
     Wait for the transaction to be acknowledged by the endorser.
     """
-    bound_logger = logger.bind(transaction_id=transaction_id)
-    bound_logger.debug("Waiting for transaction to be acknowledged by the endorser")
     try:
-        # Wait for transaction to be acknowledged and written to the ledger
-        await coroutine_with_retry_until_value(
-            coroutine_func=aries_controller.endorse_transaction.get_transaction,
-            args=(transaction_id,),
-            field_name="state",
-            expected_value="transaction_acked",
-            logger=bound_logger,
-            max_attempts=max_attempts,
-            retry_delay=retry_delay,
+        await wait_for_transaction_acked(
+            aries_controller=aries_controller,
+            transaction_id=transaction_id,
+            wallet_id=wallet_id,
+            timeout=timeout,
         )
     except asyncio.TimeoutError as e:
         raise CloudApiException(
             "Timeout waiting for endorser to accept the endorsement request.",
             504,
         ) from e
-    bound_logger.debug("Transaction has been acknowledged by the endorser")
+
+
+async def wait_for_transaction_acked(
+    aries_controller: AcaPyClient,
+    transaction_id: str,
+    wallet_id: Optional[str],
+    timeout: float,
+) -> None:
+    """
+    Wait until the transaction has been acknowledged, i.e. endorsed and written to the
+    ledger.
+
+    With a `wallet_id`, this resolves as soon as the wallet's `transaction-acked` event
+    arrives from waypoint, and the transaction is only polled every
+    `TRANSACTION_ACK_POLL_INTERVAL` seconds in case the event is missed. Without a
+    `wallet_id`, the transaction is polled every second.
+
+    Raises:
+        asyncio.TimeoutError: If the transaction is not acknowledged within `timeout` seconds.
+    """
+    bound_logger = logger.bind(
+        body={"wallet_id": wallet_id, "transaction_id": transaction_id}
+    )
+    bound_logger.debug("Waiting for transaction to be acknowledged by the endorser")
+
+    poll_interval = TRANSACTION_ACK_POLL_INTERVAL if wallet_id else 1
+    waiters: List[asyncio.Task] = [
+        asyncio.create_task(
+            _poll_transaction_acked(aries_controller, transaction_id, poll_interval)
+        )
+    ]
+    if wallet_id:
+        waiters.append(
+            asyncio.create_task(_transaction_acked_event(wallet_id, transaction_id))
+        )
+
+    try:
+        async with asyncio.timeout(timeout):
+            pending = set(waiters)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for waiter in done:
+                    if not waiter.exception():
+                        bound_logger.debug(
+                            "Transaction has been acknowledged by the endorser"
+                        )
+                        return
+                    bound_logger.warning(
+                        "Waiting for transaction acked event failed: {}. "
+                        "Continuing with polling.",
+                        waiter.exception(),
+                    )
+    except asyncio.TimeoutError:
+        bound_logger.error("Transaction was not acknowledged within {}s.", timeout)
+        raise
+    finally:
+        for waiter in waiters:
+            waiter.cancel()
+
+
+async def _poll_transaction_acked(
+    aries_controller: AcaPyClient, transaction_id: str, poll_interval: float
+) -> None:
+    while True:
+        try:
+            transaction = await aries_controller.endorse_transaction.get_transaction(
+                transaction_id
+            )
+            if transaction.state == "transaction_acked":
+                return
+        except Exception as e:  # pylint: disable=W0718
+            logger.warning("Failed to get transaction `{}`: {}", transaction_id, e)
+        await asyncio.sleep(poll_interval)
+
+
+async def _transaction_acked_event(wallet_id: str, transaction_id: str) -> None:
+    await sse_wait_for_event_with_resubscribe(
+        group_id=None,
+        wallet_id=wallet_id,
+        topic="endorsements",
+        field="transaction_id",
+        field_id=transaction_id,
+        desired_state="transaction-acked",
+    )
@@ -1,15 +1,18 @@
 import asyncio
 import os
 from contextlib import asynccontextmanager
+from typing import Optional
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import Depends, FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Query
 from scalar_fastapi import get_scalar_api_reference
 
 from endorser.services.dependency_injection.container import Container
 from endorser.services.endorsement_processor import EndorsementProcessor
+from endorser.util.trust_registry import evict_valid_issuers
 from shared.constants import PROJECT_VERSION
 from shared.log_config import get_logger
+from shared.services.health_sampler import HealthSampler
 from shared.util.set_event_loop_policy import set_event_loop_policy
 
 set_event_loop_policy()
@@ -26,8 +29,15 @@ async def app_lifespan(_: FastAPI):
     await container.init_resources()
     container.wire(modules=[__name__])
 
+    trust_registry_events = await container.trust_registry_events()
+    trust_registry_events.add_handler(evict_valid_issuers, evict_valid_issuers)
+
     endorsement_processor = await container.endorsement_processor()
     endorsement_processor.start()
+
+    # Sample now that the tasks are running, rather than at the next interval
+    health_sampler = await container.health_sampler()
+    await health_sampler.sample()
     yield
 
     logger.info("Shutting down Endorser services ...")
@@ -65,11 +75,12 @@ async def scalar_html():
 @app.get("/health/live")
 @inject
 async def health_check(
-    endorsement_processor: EndorsementProcessor = Depends(
-        Provide[Container.endorsement_processor]
-    ),
+    health_sampler: HealthSampler = Depends(Provide[Container.health_sampler]),
 ):
-    if endorsement_processor.are_tasks_running():
+    sample = health_sampler.get("tasks")
+    if sample and health_sampler.is_stale(sample):
+        raise HTTPException(status_code=503, detail="Health check is stale.")
+    if sample and sample.status and sample.status["is_working"]:
         return {"status": "healthy"}
     else:
         raise HTTPException(
@@ -80,28 +91,50 @@ async def health_check(
 @app.get("/health/ready")
 @inject
 async def health_ready(
-    endorsement_processor: EndorsementProcessor = Depends(
-        Provide[Container.endorsement_processor]
-    ),
+    health_sampler: HealthSampler = Depends(Provide[Container.health_sampler]),
 ):
-    try:
-        jetstream_status = await asyncio.wait_for(
-            endorsement_processor.check_jetstream(), timeout=5.0
+    sample = health_sampler.get("jetstream")
+    if sample is None:
+        raise HTTPException(
+            status_code=503,
+            detail={"status": "not ready", "error": "JetStream health not yet checked"},
         )
-    except asyncio.TimeoutError:
+    if health_sampler.is_stale(sample):
+        raise HTTPException(
+            status_code=503,
+            detail={"status": "not ready", "error": "JetStream health check is stale"},
+        )
+    if isinstance(sample.error, asyncio.TimeoutError):
         raise HTTPException(
             status_code=503,
             detail={"status": "not ready", "error": "JetStream health check timed out"},
         )
-    except Exception as e:  # pylint: disable=W0718
+    if sample.error:
         raise HTTPException(
-            status_code=500, detail={"status": "error", "error": str(e)}
+            status_code=500, detail={"status": "error", "error": str(sample.error)}
         )
 
-    if jetstream_status["is_working"]:
-        return {"status": "ready", "jetstream": jetstream_status}
+    if sample.status["is_working"]:
+        return {"status": "ready", "jetstream": sample.status}
     else:
         raise HTTPException(
             status_code=503,
             detail={"status": "not ready", "jetstream": "JetStream not ready"},
         )
+
+
+@app.post("/dead-letters/reprocess")
+@inject
+async def reprocess_dead_letters(
+    limit: Optional[int] = Query(
+        default=None, ge=1, description="Maximum number of events to reprocess"
+    ),
+    endorsement_processor: EndorsementProcessor = Depends(
+        Provide[Container.endorsement_processor]
+    ),
+):
+    """
+    Replay endorsement events from the dead-letter stream, for them to be processed again.
+    """
+    reprocessed = await endorsement_processor.reprocess_dead_letters(limit=limit)
+    return {"reprocessed": reprocessed}
@@ -1,7 +1,11 @@
 from dependency_injector import containers, providers
 
+from endorser.services.endorsed_transactions import init_endorsed_transactions
 from endorser.services.endorsement_processor import EndorsementProcessor
+from endorser.services.governance_client import init_governance_client
+from shared.services.health_sampler import init_health_sampler
 from shared.services.nats_jetstream import init_nats_client
+from shared.services.trust_registry_events import init_trust_registry_event_subscriber
 
 
 class Container(containers.DeclarativeContainer):
@@ -9,13 +13,31 @@ class Container(containers.DeclarativeContainer):
     Dependency injection container for the Endorser service.
 
     This container is responsible for creating and managing the lifecycle of
-    the NATS Jetstream and EndorsementProcessor services
+    the NATS Jetstream, governance agent client and EndorsementProcessor services
     """
 
     jetstream = providers.Resource(init_nats_client)
+    governance_client = providers.Resource(init_governance_client)
+    endorsed_transactions = providers.Resource(
+        init_endorsed_transactions, jetstream=jetstream
+    )
+
+    # Trust registry change feed, for evicting cached registry lookups
+    trust_registry_events = providers.Resource(init_trust_registry_event_subscriber)
 
     # Singleton provider for the ACA-Py Nats events processor
     endorsement_processor = providers.Singleton(
         EndorsementProcessor,
         jetstream=jetstream,
+        governance_client=governance_client,
+        endorsed_transactions=endorsed_transactions,
+    )
+
+    # Samples JetStream status and task liveness in the background, for health probes
+    health_sampler = providers.Resource(
+        init_health_sampler,
+        checks=providers.Dict(
+            jetstream=endorsement_processor.provided.check_jetstream,
+            tasks=endorsement_processor.provided.check_tasks,
+        ),
     )
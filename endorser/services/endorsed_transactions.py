@@ -0,0 +1,166 @@
+import time
+from typing import Optional
+
+from nats.js.client import JetStreamContext
+from nats.js.errors import (
+    BucketNotFoundError,
+    KeyDeletedError,
+    KeyNotFoundError,
+    KeyWrongLastSequenceError,
+)
+from nats.js.kv import KeyValue
+
+from shared.constants import (
+    ENDORSER_CLAIM_TIMEOUT,
+    ENDORSER_DEDUP_CACHE_SIZE,
+    ENDORSER_DEDUP_KV_BUCKET,
+    ENDORSER_DEDUP_TTL,
+)
+from shared.log_config import get_logger
+from shared.util.cache import BoundedCache
+
+logger = get_logger(__name__)
+
+CLAIMED = b"claimed"
+ENDORSED = b"endorsed"
+
+
+class EndorsedTransactions:
+    """
+    Record of the transactions that have been endorsed, so that a redelivered or duplicate
+    endorsement event never results in a second `endorse_transaction`.
+
+    Transactions are kept in a local cache and, when a NATS KV bucket is given, in that
+    bucket, which is shared by all endorser replicas. A transaction is claimed right before
+    it is endorsed, and marked as endorsed once that completed. Creating a key is atomic,
+    so only one replica can claim a transaction. A claim that is not marked as endorsed
+    within `claim_timeout` seconds is considered abandoned, and may be taken over.
+    """
+
+    def __init__(
+        self,
+        kv: Optional[KeyValue] = None,
+        claim_timeout: float = ENDORSER_CLAIM_TIMEOUT,
+    ) -> None:
+        self.kv = kv
+        self.claim_timeout = claim_timeout
+        # Transactions claimed by this replica (CLAIMED), or known to be endorsed (ENDORSED)
+        self._local: BoundedCache[str, bytes] = BoundedCache(
+            maxsize=ENDORSER_DEDUP_CACHE_SIZE, ttl=ENDORSER_DEDUP_TTL
+        )
+
+    async def contains(self, transaction_id: str) -> bool:
+        """
+        Whether the transaction has been endorsed. Claimed transactions, of which the
+        endorsement is in progress or was abandoned, are not.
+        """
+        status = self._local.get(transaction_id)
+        if status is not None:
+            return status == ENDORSED
+        if not self.kv:
+            return False
+
+        try:
+            entry = await self.kv.get(transaction_id)
+        except (KeyNotFoundError, KeyDeletedError):
+            return False
+        if entry.value != ENDORSED:
+            return False
+        self._local.set(transaction_id, ENDORSED)
+        return True
+
+    async def claim(self, transaction_id: str) -> bool:
+        """
+        Claims a transaction for endorsement.
+
+        Returns:
+            True if claimed, False if the transaction was endorsed or is being endorsed.
+        """
+        if self._local.get(transaction_id) is not None:
+            return False
+        self._local.set(transaction_id, CLAIMED)
+        if not self.kv:
+            return True
+
+        claimed = False
+        try:
+            claimed = await self._claim_shared(transaction_id)
+        finally:
+            if not claimed:
+                self._local.pop(transaction_id)
+        return claimed
+
+    async def _claim_shared(self, transaction_id: str) -> bool:
+        claim = CLAIMED + f":{time.time()}".encode()
+        try:
+            await self.kv.create(transaction_id, claim)
+            return True
+        except KeyWrongLastSequenceError:
+            pass
+
+        try:
+            entry = await self.kv.get(transaction_id)
+        except (KeyNotFoundError, KeyDeletedError):
+            return False  # Released meanwhile; the redelivery will claim it
+        if not self._is_abandoned(entry.value):
+            return False  # Claimed by another replica
+
+        logger.warning(
+            "Taking over abandoned claim on transaction `{}`", transaction_id
+        )
+        try:
+            await self.kv.update(transaction_id, claim, last=entry.revision)
+        except KeyWrongLastSequenceError:
+            return False  # Taken over by another replica
+        return True
+
+    def _is_abandoned(self, value: bytes) -> bool:
+        if not value.startswith(CLAIMED + b":"):
+            return False
+        claimed_at = float(value[len(CLAIMED) + 1 :])
+        return time.time() - claimed_at > self.claim_timeout
+
+    async def complete(self, transaction_id: str) -> None:
+        """
+        Marks a claimed transaction as endorsed. A failure to do so is only logged, as the
+        transaction state prevents a second endorsement once the claim is taken over.
+        """
+        self._local.set(transaction_id, ENDORSED)
+        if not self.kv:
+            return
+
+        try:
+            await self.kv.put(transaction_id, ENDORSED)
+        except Exception:  # pylint: disable=W0718
+            logger.exception(
+                "Could not mark transaction `{}` as endorsed.", transaction_id
+            )
+
+    async def release(self, transaction_id: str) -> None:
+        """
+        Releases the claim on a transaction that could not be endorsed, so that the
+        endorsement can be retried.
+        """
+        self._local.pop(transaction_id)
+        if self.kv:
+            await self.kv.delete(transaction_id)
+
+
+async def init_endorsed_transactions(
+    jetstream: JetStreamContext,
+) -> EndorsedTransactions:
+    """
+    Resource provider for `EndorsedTransactions`, shared between replicas through the
+    `ENDORSER_DEDUP_KV_BUCKET` bucket if one is configured.
+    """
+    if not ENDORSER_DEDUP_KV_BUCKET:
+        return EndorsedTransactions()
+
+    try:
+        kv = await jetstream.key_value(ENDORSER_DEDUP_KV_BUCKET)
+    except BucketNotFoundError:
+        logger.info("Creating KV bucket `{}`", ENDORSER_DEDUP_KV_BUCKET)
+        kv = await jetstream.create_key_value(
+            bucket=ENDORSER_DEDUP_KV_BUCKET, ttl=ENDORSER_DEDUP_TTL
+        )
+    return EndorsedTransactions(kv)
@@ -1,10 +1,16 @@
 import asyncio
-from typing import List, NoReturn
+import json
+from dataclasses import dataclass
+from functools import partial
+from typing import Dict, List, NoReturn, Optional, Set, Tuple
 
 from aries_cloudcontroller import AcaPyClient
+from nats.aio.msg import Msg
 from nats.errors import BadSubscriptionError, Error, TimeoutError
+from nats.js.api import ConsumerConfig
 from nats.js.client import JetStreamContext
-from nats.js.errors import FetchTimeoutError
+from nats.js.errors import FetchTimeoutError, NotFoundError
+from pydantic import ValidationError
 from tenacity import (
     RetryCallState,
     retry,
@@ -13,11 +19,22 @@ from tenacity import (
     wait_fixed,
 )
 
+from endorser.services.endorsed_transactions import EndorsedTransactions
 from endorser.util.endorsement import accept_endorsement, should_accept_endorsement
+from endorser.util.weighted_semaphore import WeightedSemaphore
 from shared.constants import (
+    ENDORSER_BACKLOG_LOG_INTERVAL,
+    ENDORSER_CONCURRENCY,
+    ENDORSER_DEAD_LETTER_STREAM,
+    ENDORSER_DEFAULT_LANE_WEIGHT,
     ENDORSER_DURABLE_CONSUMER,
-    GOVERNANCE_AGENT_API_KEY,
-    GOVERNANCE_AGENT_URL,
+    ENDORSER_FETCH_BATCH_SIZE,
+    ENDORSER_IN_PROGRESS_INTERVAL,
+    ENDORSER_MAX_DELIVER,
+    ENDORSER_MAX_PENDING,
+    ENDORSER_RETRY_BASE_DELAY,
+    ENDORSER_RETRY_MAX_DELAY,
+    ENDORSER_REVOCATION_LANE_WEIGHT,
     GOVERNANCE_LABEL,
     NATS_STREAM,
     NATS_SUBJECT,
@@ -29,27 +46,101 @@ from shared.util.rich_parsing import parse_json_with_error_handling
 
 logger = get_logger(__name__)
 
+# Seconds that in-flight endorsements are given to complete when stopping
+SHUTDOWN_GRACE_PERIOD = 10.0
+
+# Dead-lettered events are kept under their original subject with this prefix
+DEAD_LETTER_PREFIX = "unprocessable."
+
+
+@dataclass(frozen=True)
+class Lane:
+    """A priority lane: endorsement events on their own subject and durable consumer."""
+
+    name: str
+    subject: str
+    durable: str
+    weight: int
+
+
+DEFAULT_LANE = Lane(
+    name="default",
+    subject=f"{NATS_SUBJECT}.endorser.*",
+    durable=ENDORSER_DURABLE_CONSUMER,
+    weight=ENDORSER_DEFAULT_LANE_WEIGHT,
+)
+# Revocation registry entries, which issuers publish in bulk, are routed to their own
+# subject by the events processor, so that they don't hold up onboarding endorsements
+REVOCATION_LANE = Lane(
+    name="revocation",
+    subject=f"{NATS_SUBJECT}.endorser_revocation.*",
+    durable=f"{ENDORSER_DURABLE_CONSUMER}_revocation",
+    weight=ENDORSER_REVOCATION_LANE_WEIGHT,
+)
+LANES = [DEFAULT_LANE, REVOCATION_LANE]
+
+
+def retry_delay(num_delivered: int) -> float:
+    """Seconds to wait before redelivering a message that failed `num_delivered` times."""
+    return min(
+        ENDORSER_RETRY_BASE_DELAY * 2 ** (num_delivered - 1), ENDORSER_RETRY_MAX_DELAY
+    )
+
 
 class EndorsementProcessor:
     """
-    Class to process endorsement webhook events that Benthos acapy-events-processor writes to `endorser_nats_subject`
+    Class to process endorsement webhook events that Benthos acapy-events-processor writes to the `LANES` subjects
+
+    Each lane has its own consumer, from which messages are fetched in batches. Messages are
+    processed concurrently, up to `ENDORSER_CONCURRENCY` at a time across lanes, with slots
+    shared between busy lanes according to their weights. Messages are partitioned by the connection they were requested over, and
+    each partition is processed in order, so one author's transactions are endorsed in the
+    order they were requested. A message is acked once it has been processed. A message
+    that fails is redelivered with exponential backoff, and moved to the dead-letter stream
+    once it has been delivered `ENDORSER_MAX_DELIVER` times.
+
+    Several replicas can run side by side: pulls from a shared durable consumer are
+    distributed between its subscribers, and `endorsed_transactions` keeps a transaction
+    that is delivered more than once from being endorsed twice.
     """
 
-    def __init__(self, jetstream: JetStreamContext) -> None:
+    def __init__(
+        self,
+        jetstream: JetStreamContext,
+        governance_client: AcaPyClient,
+        endorsed_transactions: Optional[EndorsedTransactions] = None,
+    ) -> None:
         self.jetstream: JetStreamContext = jetstream
+        self.governance_client: AcaPyClient = governance_client
+        self.endorsed_transactions = endorsed_transactions or EndorsedTransactions()
 
-        self.endorser_nats_subject = f"{NATS_SUBJECT}.endorser.*"
+        self.lanes = LANES
 
         self._tasks: List[asyncio.Task] = []  # To keep track of running tasks
 
+        self._semaphore = WeightedSemaphore(
+            ENDORSER_CONCURRENCY, {lane.name: lane.weight for lane in self.lanes}
+        )
+        self._in_flight: Set[asyncio.Task] = set()  # Fetched messages not yet acked
+        self._lane_in_flight: Dict[str, Set[asyncio.Task]] = {
+            lane.name: set() for lane in self.lanes
+        }
+        # Last task for each (lane, partition)
+        self._partitions: Dict[Tuple[str, str], asyncio.Task] = {}
+
     def start(self) -> None:
         """
         Starts the background tasks for processing endorsement events.
         """
-        self._tasks.append(
-            asyncio.create_task(
-                self._process_endorsement_requests(), name="Process endorsements"
+        for lane in self.lanes:
+            self._tasks.append(
+                asyncio.create_task(
+                    self._process_endorsement_requests(lane),
+                    name=f"Process {lane.name} endorsements",
+                )
             )
+        self._tasks.append(
+            asyncio.create_task(self._log_backlog(), name="Log endorsement backlog")
         )
 
         logger.info("Endorsement processing started.")
@@ -66,6 +157,11 @@ class EndorsementProcessor:
                 pass  # Expected error upon cancellation, can be ignored
         self._tasks.clear()  # Clear the list of tasks
 
+        await self._wait_for_in_flight(timeout=SHUTDOWN_GRACE_PERIOD)
+        for task in list(self._in_flight):
+            task.cancel()  # Not acked, so the message will be redelivered
+        await self._wait_for_in_flight()
+
         logger.info("Endorsement processing stopped.")
 
     def are_tasks_running(self) -> bool:
@@ -89,43 +185,151 @@ class EndorsementProcessor:
         logger.trace("All tasks running: {}", all_running)
         return all_running
 
-    async def _process_endorsement_requests(self) -> NoReturn:
-        subscription = await self._subscribe()
+    async def _process_endorsement_requests(
+        self, lane: Lane = DEFAULT_LANE
+    ) -> NoReturn:
+        subscription = await self._subscribe(lane)
+        in_flight = self._lane_in_flight[lane.name]
         while True:
             try:
-                logger.trace(
-                    "Fetching messages from NATS subject: {}",
-                    self.endorser_nats_subject,
+                logger.trace("Fetching messages from NATS subject: {}", lane.subject)
+                capacity = ENDORSER_MAX_PENDING - len(in_flight)
+                if capacity <= 0:
+                    logger.trace("Max pending {} endorsements reached.", lane.name)
+                    await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+
+                messages = await subscription.fetch(
+                    batch=min(ENDORSER_FETCH_BATCH_SIZE, capacity),
+                    timeout=0.5,
+                    heartbeat=0.2,
                 )
-                messages = await subscription.fetch(batch=1, timeout=0.5, heartbeat=0.2)
                 for message in messages:
-                    message_subject = message.subject
-                    message_data = message.data.decode()
-                    logger.debug(
-                        "Received message: {}, with subject {}",
-                        message_data,
-                        message_subject,
-                    )
-                    try:
-                        await self._process_endorsement_event(message_data)
-                    except Exception as e:  # pylint: disable=W0703
-                        logger.error("Error processing endorsement event: {}", e)
-                        await self._handle_unprocessable_endorse_event(
-                            message_subject, message_data, e
-                        )
-                    finally:
-                        await message.ack()
+                    self._dispatch(message, lane)
             except FetchTimeoutError:
                 logger.trace("Encountered FetchTimeoutError. Continuing ...")
                 await asyncio.sleep(0.1)
             except TimeoutError as e:
                 logger.warning("Timeout fetching messages: {}. Re-subscribing.", e)
                 await subscription.unsubscribe()
-                subscription = await self._subscribe()
+                subscription = await self._subscribe(lane)
             except Exception:  # pylint: disable=W0718
                 logger.exception("Unexpected error in endorsement processing loop")
                 await asyncio.sleep(2)
 
+    def _dispatch(self, message: Msg, lane: Lane = DEFAULT_LANE) -> None:
+        """
+        Schedules a message for processing after the earlier messages of its partition
+        in the lane.
+        """
+        key = (lane.name, self._partition_key(message))
+        previous = self._partitions.get(key)
+        task = asyncio.create_task(
+            self._process_in_order(message, previous, lane),
+            name=f"Process endorsement {message.subject}",
+        )
+        self._partitions[key] = task
+        self._in_flight.add(task)
+        self._lane_in_flight[lane.name].add(task)
+        task.add_done_callback(partial(self._on_task_done, key))
+
+    def _on_task_done(self, key: Tuple[str, str], task: asyncio.Task) -> None:
+        self._in_flight.discard(task)
+        self._lane_in_flight[key[0]].discard(task)
+        if self._partitions.get(key) is task:
+            del self._partitions[key]
+
+    @staticmethod
+    def _partition_key(message: Msg) -> str:
+        """
+        Returns the connection the endorsement was requested over, which identifies its
+        author, falling back to the message subject (which is unique per transaction).
+        """
+        try:
+            connection_id = json.loads(message.data)["payload"].get("connection_id")
+        except (ValueError, KeyError, TypeError, AttributeError):
+            connection_id = None
+        return connection_id or message.subject
+
+    async def _process_in_order(
+        self,
+        message: Msg,
+        previous: Optional[asyncio.Task],
+        lane: Lane = DEFAULT_LANE,
+    ) -> None:
+        heartbeat = asyncio.create_task(self._keep_in_progress(message))
+        try:
+            if previous:
+                await asyncio.wait([previous])  # Regardless of how it completed
+
+            async with self._semaphore.slot(lane.name):
+                message_data = message.data.decode()
+                logger.debug(
+                    "Received message: {}, with subject {}",
+                    message_data,
+                    message.subject,
+                )
+                try:
+                    await self._process_endorsement_event(message_data)
+                except Exception as e:  # pylint: disable=W0703
+                    heartbeat.cancel()
+                    await self._handle_failed_endorse_event(message, e)
+                else:
+                    heartbeat.cancel()
+                    await message.ack()
+        except Exception:  # pylint: disable=W0718
+            # Not acked, so the message will be redelivered after the ack wait
+            logger.exception("Failed to settle message on `{}`", message.subject)
+        finally:
+            heartbeat.cancel()
+
+    async def _keep_in_progress(self, message: Msg) -> NoReturn:
+        """
+        Periodically tells NATS that the message is still being worked on, so that it is
+        not redelivered while waiting on its partition or on a slow endorsement.
+        """
+        while True:
+            await asyncio.sleep(ENDORSER_IN_PROGRESS_INTERVAL)
+            try:
+                await message.in_progress()
+            except Exception:  # pylint: disable=W0718
+                logger.warning("Failed to mark `{}` as in progress", message.subject)
+
+    async def _handle_failed_endorse_event(
+        self, message: Msg, error: Exception
+    ) -> None:
+        """
+        Redelivers a message that failed processing after a backoff delay, until it has
+        been delivered `ENDORSER_MAX_DELIVER` times. Then, or straight away if the event
+        is malformed, the message is moved to the dead-letter stream.
+        """
+        num_delivered = message.metadata.num_delivered
+        bound_logger = logger.bind(
+            body={"subject": message.subject, "num_delivered": num_delivered}
+        )
+
+        if not isinstance(error, ValidationError) and (
+            num_delivered < ENDORSER_MAX_DELIVER
+        ):
+            delay = retry_delay(num_delivered)
+            bound_logger.warning(
+                "Error processing endorsement event: {}. Retrying in {}s ...",
+                error,
+                delay,
+            )
+            await message.nak(delay=delay)
+            return
+
+        bound_logger.error("Error processing endorsement event: {}", error)
+        await self._handle_unprocessable_endorse_event(
+            message.subject, message.data, error, num_delivered
+        )
+        await message.ack()
+
+    async def _wait_for_in_flight(self, timeout: Optional[float] = None) -> None:
+        if self._in_flight:
+            await asyncio.wait(list(self._in_flight), timeout=timeout)
+
     async def _process_endorsement_event(self, event_json: str) -> None:
         """
         Processes an individual endorsement event, evaluating if it should be accepted and then endorsing as governance
@@ -146,57 +350,125 @@ class EndorsementProcessor:
         endorsement = Endorsement(**event.payload)
         transaction_id = endorsement.transaction_id
 
-        async with AcaPyClient(
-            base_url=GOVERNANCE_AGENT_URL, api_key=GOVERNANCE_AGENT_API_KEY
-        ) as client:
-            # Check if endorsement request is indeed applicable
-            transaction = await should_accept_endorsement(client, transaction_id)
-            if not transaction:
-                logger.info(  # The check has already logged the reason as warning
-                    "Endorsement request with transaction id `{}` is not applicable for endorsement.",
-                    transaction_id,
-                )
-                return
+        if await self.endorsed_transactions.contains(transaction_id):
+            logger.info("Transaction `{}` was already endorsed.", transaction_id)
+            return
 
-            logger.info(
-                "Endorsement request is applicable for endorsement: {}",
-                transaction.model_dump(exclude={"messages_attach"}),
+        # Check if endorsement request is indeed applicable
+        transaction = await should_accept_endorsement(
+            self.governance_client, transaction_id
+        )
+        if not transaction:
+            logger.info(  # The check has already logged the reason as warning
+                "Endorsement request with transaction id `{}` is not applicable for endorsement.",
+                transaction_id,
             )
-            await accept_endorsement(client, transaction_id)
+            return
+
+        logger.info(
+            "Endorsement request is applicable for endorsement: {}",
+            transaction.model_dump(exclude={"messages_attach"}),
+        )
+        if not await self.endorsed_transactions.claim(transaction_id):
+            logger.info("Transaction `{}` is already being endorsed.", transaction_id)
+            return
+
+        endorsed = False
+        try:
+            await accept_endorsement(self.governance_client, transaction_id)
+            endorsed = True
+        finally:
+            # Also when cancelled on shutdown, so that the redelivery can be endorsed
+            if not endorsed:
+                await self.endorsed_transactions.release(transaction_id)
+        await self.endorsed_transactions.complete(transaction_id)
 
     async def _handle_unprocessable_endorse_event(
-        self, key: str, event_json: str, error: Exception
+        self, key: str, event_data: bytes, error: Exception, num_delivered: int
     ) -> None:
         """
         Handles an event that could not be processed successfully. The unprocessable event is persisted
-        to a separate key for further investigation.
+        to the dead-letter stream, under a key derived from its subject, to be reprocessed with
+        `reprocess_dead_letters`.
 
         Args:
             key: The Nats subject key where the problematic event was found.
+            event_data: The event as received.
             error: The exception that occurred during event processing.
+            num_delivered: The number of times the event was delivered.
         """
         bound_logger = logger.bind(body={"key": key})
         bound_logger.warning("Handling problematic endorsement event")
 
-        unprocessable_key = f"unprocessable.{key}"
-        error_message = f"Could not process: {event_json}. Error: {error}"
+        unprocessable_key = f"{DEAD_LETTER_PREFIX}{key}"
+        error_message = " ".join(str(error).split())  # Headers are single line
 
         bound_logger.info(
             "Saving record of problematic event at key: {}. Error: `{}`",
             unprocessable_key,
             error_message,
         )
-        await self.jetstream.publish(unprocessable_key, error_message.encode())
+        await self.jetstream.publish(
+            unprocessable_key,
+            event_data,
+            headers={
+                "Endorser-Error": error_message,
+                "Endorser-Num-Delivered": str(num_delivered),
+            },
+        )
         bound_logger.info("Successfully handled unprocessable event.")
 
-    async def _subscribe(self) -> JetStreamContext.PullSubscription:
+    async def reprocess_dead_letters(self, limit: Optional[int] = None) -> int:
         """
-        Subscribes to the NATS subject for endorsement events.
+        Republishes dead-lettered endorsement events to the subjects they were received
+        on, for them to be processed again, and removes them from the dead-letter stream.
+
+        Args:
+            limit: The maximum number of events to reprocess; all if None.
+
+        Returns:
+            The number of reprocessed events.
+        """
+        stream_info = await self.jetstream.stream_info(ENDORSER_DEAD_LETTER_STREAM)
+        first_seq, last_seq = stream_info.state.first_seq, stream_info.state.last_seq
+        logger.info(
+            "Reprocessing dead-lettered endorsement events {} to {}",
+            first_seq,
+            last_seq,
+        )
+
+        reprocessed = 0
+        for seq in range(first_seq, last_seq + 1):
+            if limit is not None and reprocessed >= limit:
+                break
+
+            try:
+                dead_letter = await self.jetstream.get_msg(
+                    ENDORSER_DEAD_LETTER_STREAM, seq
+                )
+            except NotFoundError:
+                continue  # Deleted from the stream
+
+            subject = dead_letter.subject.removeprefix(DEAD_LETTER_PREFIX)
+            await self.jetstream.publish(subject, dead_letter.data)
+            await self.jetstream.delete_msg(ENDORSER_DEAD_LETTER_STREAM, seq)
+            reprocessed += 1
+
+        logger.info("Reprocessed {} dead-lettered endorsement events.", reprocessed)
+        return reprocessed
+
+    async def _subscribe(
+        self, lane: Lane = DEFAULT_LANE
+    ) -> JetStreamContext.PullSubscription:
+        """
+        Subscribes to the NATS subject for the lane's endorsement events.
         """
         subscribe_kwargs = {
-            "subject": self.endorser_nats_subject,
-            "durable": ENDORSER_DURABLE_CONSUMER,
+            "subject": lane.subject,
+            "durable": lane.durable,
             "stream": NATS_STREAM,
+            # Applies when the durable consumer is created
+            "config": ConsumerConfig(max_deliver=ENDORSER_MAX_DELIVER),
         }
 
         logger.info("Subscribing to NATS: {}", subscribe_kwargs)
@@ -236,6 +508,35 @@ class EndorsementProcessor:
                 exception,
             )
 
+    async def _log_backlog(self) -> NoReturn:
+        """
+        Periodically logs the backlog of each lane: the messages not yet delivered by its
+        consumer, and the delivered messages waiting for a processing slot.
+        """
+        while True:
+            await asyncio.sleep(ENDORSER_BACKLOG_LOG_INTERVAL)
+            for lane in self.lanes:
+                try:
+                    consumer_info = await self.jetstream.consumer_info(
+                        NATS_STREAM, lane.durable
+                    )
+                except Exception as e:  # pylint: disable=W0718
+                    logger.warning("Could not get {} lane backlog: {}", lane.name, e)
+                    continue
+
+                logger.bind(
+                    body={
+                        "lane": lane.name,
+                        "num_pending": consumer_info.num_pending,
+                        "num_ack_pending": consumer_info.num_ack_pending,
+                        "num_in_flight": len(self._lane_in_flight[lane.name]),
+                        "num_waiting": self._semaphore.waiting(lane.name),
+                    }
+                ).info("Endorsement lane backlog")
+
+    async def check_tasks(self):
+        return {"is_working": bool(self.are_tasks_running())}
+
     async def check_jetstream(self):
         try:
             account_info = await self.jetstream.account_info()
@@ -0,0 +1,25 @@
+from typing import Any, AsyncGenerator
+
+from aries_cloudcontroller import AcaPyClient
+
+from shared.constants import GOVERNANCE_AGENT_API_KEY, GOVERNANCE_AGENT_URL
+from shared.log_config import get_logger
+
+logger = get_logger(__name__)
+
+
+async def init_governance_client() -> AsyncGenerator[AcaPyClient, Any]:
+    """
+    Resource provider for the governance agent client, shared for the lifetime of the
+    endorser so that its connection pool is reused across endorsements.
+    """
+    client = AcaPyClient(
+        base_url=GOVERNANCE_AGENT_URL, api_key=GOVERNANCE_AGENT_API_KEY
+    )
+    logger.debug("Yielding governance agent client ...")
+
+    try:
+        yield client
+    finally:
+        logger.debug("Closing governance agent client ...")
+        await client.close()
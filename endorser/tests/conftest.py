@@ -3,6 +3,9 @@ from unittest.mock import AsyncMock, MagicMock
 import pytest
 from aries_cloudcontroller import AcaPyClient, EndorseTransactionApi, SchemaApi
 
+from endorser.util.transaction_record import schema_id_cache
+from endorser.util.trust_registry import valid_issuer_cache
+
 
 @pytest.fixture(scope="session")
 def anyio_backend():
@@ -18,3 +21,10 @@ def mock_acapy_client():
     client.endorse_transaction.endorse_transaction = AsyncMock()
     client.schema.get_schema = AsyncMock()
     return client
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    yield
+    schema_id_cache.clear()
+    valid_issuer_cache.clear()
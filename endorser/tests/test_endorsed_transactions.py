@@ -0,0 +1,176 @@
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from nats.js.errors import (
+    BucketNotFoundError,
+    KeyNotFoundError,
+    KeyWrongLastSequenceError,
+)
+
+from endorser.services.endorsed_transactions import (
+    EndorsedTransactions,
+    init_endorsed_transactions,
+)
+
+
+class FakeKeyValue:
+    """In-memory stand-in for a NATS KV bucket"""
+
+    def __init__(self):
+        self.entries = {}
+        self.revision = 0
+
+    async def create(self, key, value):
+        if key in self.entries:
+            raise KeyWrongLastSequenceError(description="wrong last sequence")
+        return await self.put(key, value)
+
+    async def update(self, key, value, last):
+        if key not in self.entries or self.entries[key].revision != last:
+            raise KeyWrongLastSequenceError(description="wrong last sequence")
+        return await self.put(key, value)
+
+    async def put(self, key, value):
+        self.revision += 1
+        self.entries[key] = SimpleNamespace(value=value, revision=self.revision)
+        return self.revision
+
+    async def get(self, key):
+        if key not in self.entries:
+            raise KeyNotFoundError()
+        return self.entries[key]
+
+    async def delete(self, key):
+        self.entries.pop(key, None)
+        return True
+
+
+@pytest.mark.anyio
+async def test_claim_local():
+    endorsed_transactions = EndorsedTransactions()
+
+    assert not await endorsed_transactions.contains("txn")
+    assert await endorsed_transactions.claim("txn")
+    assert not await endorsed_transactions.contains("txn")  # Not endorsed yet
+    assert not await endorsed_transactions.claim("txn")
+
+    await endorsed_transactions.complete("txn")
+    assert await endorsed_transactions.contains("txn")
+    assert not await endorsed_transactions.claim("txn")
+
+
+@pytest.mark.anyio
+async def test_claim_shared_between_replicas():
+    kv = FakeKeyValue()
+    replica_1 = EndorsedTransactions(kv)
+    replica_2 = EndorsedTransactions(kv)
+
+    assert await replica_1.claim("txn")
+    assert not await replica_2.contains("txn")
+    assert not await replica_2.claim("txn")
+
+    await replica_1.complete("txn")
+    assert await replica_2.contains("txn")
+    assert not await replica_2.claim("txn")
+
+    assert await replica_2.claim("other_txn")
+    assert not await replica_1.claim("other_txn")
+
+
+@pytest.mark.anyio
+async def test_lost_claim_not_remembered():
+    kv = FakeKeyValue()
+    replica_1 = EndorsedTransactions(kv)
+    replica_2 = EndorsedTransactions(kv)
+
+    assert await replica_1.claim("txn")
+    assert not await replica_2.claim("txn")
+
+    # The winning replica fails to endorse, so the redelivery is claimed by the other
+    await replica_1.release("txn")
+    assert await replica_2.claim("txn")
+
+
+@pytest.mark.anyio
+async def test_claim_abandoned():
+    kv = FakeKeyValue()
+    replica_1 = EndorsedTransactions(kv, claim_timeout=60)
+    replica_2 = EndorsedTransactions(kv, claim_timeout=60)
+
+    assert await replica_1.claim("txn")
+    claim_timed_out = time.time() + 61
+    with patch("endorser.services.endorsed_transactions.time.time") as mock_time:
+        mock_time.return_value = claim_timed_out
+        assert await replica_2.claim("txn")
+        assert not await EndorsedTransactions(kv, claim_timeout=60).claim("txn")
+
+        # An endorsed transaction is never taken over
+        await replica_2.complete("txn")
+        mock_time.return_value += 61
+        assert not await EndorsedTransactions(kv, claim_timeout=60).claim("txn")
+
+
+@pytest.mark.anyio
+async def test_release():
+    kv = FakeKeyValue()
+    replica_1 = EndorsedTransactions(kv)
+    replica_2 = EndorsedTransactions(kv)
+
+    assert await replica_1.claim("txn")
+    await replica_1.release("txn")
+
+    assert not await replica_1.contains("txn")
+    assert await replica_2.claim("txn")
+
+
+@pytest.mark.anyio
+async def test_claim_kv_error():
+    kv = AsyncMock()
+    kv.create.side_effect = Exception("KV unavailable")
+    endorsed_transactions = EndorsedTransactions(kv)
+
+    with pytest.raises(Exception, match="KV unavailable"):
+        await endorsed_transactions.claim("txn")
+
+    # The failed claim is not remembered
+    kv.create.side_effect = None
+    assert await endorsed_transactions.claim("txn")
+
+
+@pytest.mark.anyio
+async def test_complete_kv_error():
+    kv = AsyncMock()
+    kv.put.side_effect = Exception("KV unavailable")
+    endorsed_transactions = EndorsedTransactions(kv)
+
+    await endorsed_transactions.complete("txn")
+
+    assert await endorsed_transactions.contains("txn")
+
+
+@pytest.mark.anyio
+async def test_init_endorsed_transactions_local():
+    jetstream = AsyncMock()
+    with patch("endorser.services.endorsed_transactions.ENDORSER_DEDUP_KV_BUCKET", ""):
+        endorsed_transactions = await init_endorsed_transactions(jetstream)
+
+    assert endorsed_transactions.kv is None
+    jetstream.key_value.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_init_endorsed_transactions_creates_bucket():
+    jetstream = AsyncMock()
+    jetstream.key_value.side_effect = BucketNotFoundError()
+    with patch(
+        "endorser.services.endorsed_transactions.ENDORSER_DEDUP_KV_BUCKET",
+        "endorsed_transactions",
+    ), patch("endorser.services.endorsed_transactions.ENDORSER_DEDUP_TTL", 60):
+        endorsed_transactions = await init_endorsed_transactions(jetstream)
+
+    jetstream.create_key_value.assert_awaited_once_with(
+        bucket="endorsed_transactions", ttl=60
+    )
+    assert endorsed_transactions.kv is jetstream.create_key_value.return_value
@@ -1,17 +1,26 @@
 import asyncio
 import json
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import pytest
+from fastapi import HTTPException
 from nats.aio.client import Client as NATS
 from nats.errors import BadSubscriptionError, Error, TimeoutError
+from nats.js.api import ConsumerConfig
 from nats.js.client import JetStreamContext
-from nats.js.errors import FetchTimeoutError
+from nats.js.errors import FetchTimeoutError, NotFoundError
 from tenacity import RetryCallState
 
-from endorser.services.endorsement_processor import EndorsementProcessor
+from endorser.services.endorsement_processor import (
+    DEFAULT_LANE,
+    REVOCATION_LANE,
+    EndorsementProcessor,
+    retry_delay,
+)
 from shared.constants import (
+    ENDORSER_DEAD_LETTER_STREAM,
     ENDORSER_DURABLE_CONSUMER,
+    ENDORSER_MAX_DELIVER,
     GOVERNANCE_LABEL,
     NATS_STREAM,
     NATS_SUBJECT,
@@ -34,8 +43,10 @@ async def mock_nats_client():
 
 
 @pytest.fixture
-def endorsement_processor_mock(mock_nats_client):
-    processor = EndorsementProcessor(jetstream=mock_nats_client)
+def endorsement_processor_mock(mock_nats_client, mock_acapy_client):
+    processor = EndorsementProcessor(
+        jetstream=mock_nats_client, governance_client=mock_acapy_client
+    )
 
     return processor
 
@@ -49,6 +60,14 @@ async def test_start_and_tasks_are_running(endorsement_processor_mock):
     assert len(endorsement_processor_mock._tasks) > 0
     assert endorsement_processor_mock.are_tasks_running()
 
+    # A processing task is started for each lane
+    assert [
+        call.args
+        for call in endorsement_processor_mock._process_endorsement_requests.call_args_list
+    ] == [(DEFAULT_LANE,), (REVOCATION_LANE,)]
+
+    await endorsement_processor_mock.stop()
+
 
 @pytest.mark.anyio
 async def test_stop(endorsement_processor_mock):
@@ -115,6 +134,7 @@ async def test_process_endorsement_requests_success(
     ) as mock_process_event:
         with pytest.raises(asyncio.CancelledError):
             await endorsement_processor_mock._process_endorsement_requests()
+        await endorsement_processor_mock._wait_for_in_flight()
 
     # Assertions
     mock_process_event.assert_called_once_with(mock_message.data.decode())
@@ -162,6 +182,7 @@ async def test_process_endorsement_requests_error(
     ) as mock_handle_error:
         with pytest.raises(asyncio.CancelledError):
             await endorsement_processor_mock._process_endorsement_requests()
+        await endorsement_processor_mock._wait_for_in_flight()
 
     # Assertions
     mock_handle_error.assert_called_once()
@@ -200,6 +221,7 @@ async def test_process_endorsement_requests_multiple_messages(
     ) as mock_process_event:
         with pytest.raises(asyncio.CancelledError):
             await endorsement_processor_mock._process_endorsement_requests()
+        await endorsement_processor_mock._wait_for_in_flight()
 
     # Assertions
     assert mock_process_event.call_count == 3
@@ -226,6 +248,7 @@ async def test_process_endorsement_requests_loop_exit(
     # Test
     with pytest.raises(asyncio.CancelledError):
         await endorsement_processor_mock._process_endorsement_requests()
+    await endorsement_processor_mock._wait_for_in_flight()
 
     # Assertions
     assert mock_subscription.fetch.call_count == 3
@@ -254,6 +277,279 @@ async def test_process_endorsement_requests_unexpected_error(
     mock_sleep.assert_awaited_once_with(2)
 
 
+def endorsement_message(transaction_id: str, connection_id: str) -> AsyncMock:
+    message = AsyncMock()
+    message.data = json.dumps(
+        {
+            "wallet_id": "governance",
+            "topic": "endorsements",
+            "origin": "governance",
+            "payload": {
+                "state": "request-received",
+                "transaction_id": transaction_id,
+                "connection_id": connection_id,
+            },
+        }
+    ).encode()
+    message.subject = f"{NATS_SUBJECT}.endorser.{transaction_id}"
+    return message
+
+
+@pytest.mark.anyio
+async def test_process_endorsement_requests_ordered_per_connection(
+    endorsement_processor_mock, mock_nats_client
+):
+    mock_subscription = AsyncMock()
+    mock_nats_client.pull_subscribe.return_value = mock_subscription
+
+    messages = [
+        endorsement_message("txn-a1", "conn-a"),
+        endorsement_message("txn-b1", "conn-b"),
+        endorsement_message("txn-a2", "conn-a"),
+        endorsement_message("txn-b2", "conn-b"),
+    ]
+    mock_subscription.fetch.side_effect = [messages, asyncio.CancelledError]
+
+    events = []
+    running = 0
+    max_running = 0
+
+    async def process_event(event_json):
+        nonlocal running, max_running
+        transaction_id = json.loads(event_json)["payload"]["transaction_id"]
+        running += 1
+        max_running = max(max_running, running)
+        events.append(f"start {transaction_id}")
+        # The first transaction of each connection is the slowest
+        await asyncio.sleep(0.05 if transaction_id.endswith("1") else 0)
+        events.append(f"end {transaction_id}")
+        running -= 1
+
+    with patch.object(
+        endorsement_processor_mock,
+        "_process_endorsement_event",
+        side_effect=process_event,
+    ):
+        with pytest.raises(asyncio.CancelledError):
+            await endorsement_processor_mock._process_endorsement_requests()
+        await endorsement_processor_mock._wait_for_in_flight()
+
+    # Different connections are processed concurrently
+    assert max_running == 2
+    # Transactions of the same connection are processed in order
+    for first, second in [("txn-a1", "txn-a2"), ("txn-b1", "txn-b2")]:
+        assert events.index(f"end {first}") < events.index(f"start {second}")
+    for message in messages:
+        message.ack.assert_awaited_once()
+    assert not endorsement_processor_mock._in_flight
+    assert not endorsement_processor_mock._partitions
+
+
+@pytest.mark.anyio
+async def test_process_endorsement_requests_waits_for_capacity(
+    endorsement_processor_mock, mock_nats_client
+):
+    mock_subscription = AsyncMock()
+    mock_nats_client.pull_subscribe.return_value = mock_subscription
+
+    messages = [endorsement_message(f"txn-{i}", f"conn-{i}") for i in range(2)]
+    mock_subscription.fetch.side_effect = [messages, asyncio.CancelledError]
+
+    with patch(
+        "endorser.services.endorsement_processor.ENDORSER_MAX_PENDING", 2
+    ), patch.object(endorsement_processor_mock, "_process_endorsement_event"):
+        with pytest.raises(asyncio.CancelledError):
+            await endorsement_processor_mock._process_endorsement_requests()
+
+    # The second fetch only happened once capacity was available again
+    assert mock_subscription.fetch.call_count == 2
+    assert mock_subscription.fetch.call_args_list[0].kwargs["batch"] == 2
+    for message in messages:
+        message.ack.assert_awaited_once()
+
+
+@pytest.mark.anyio
+async def test_process_in_order_marks_in_progress(endorsement_processor_mock):
+    message = endorsement_message("txn", "conn")
+
+    async def slow_process_event(_):
+        await asyncio.sleep(0.05)
+
+    with patch(
+        "endorser.services.endorsement_processor.ENDORSER_IN_PROGRESS_INTERVAL", 0.01
+    ), patch.object(
+        endorsement_processor_mock,
+        "_process_endorsement_event",
+        side_effect=slow_process_event,
+    ):
+        await endorsement_processor_mock._process_in_order(message, None)
+
+    assert message.in_progress.await_count >= 2
+    message.ack.assert_awaited_once()
+
+
+@pytest.mark.anyio
+async def test_stop_cancels_unfinished_endorsements(endorsement_processor_mock):
+    message = endorsement_message("txn", "conn")
+    never_set = asyncio.Event()
+
+    async def hanging_process_event(_):
+        await never_set.wait()
+
+    with patch(
+        "endorser.services.endorsement_processor.SHUTDOWN_GRACE_PERIOD", 0.01
+    ), patch.object(
+        endorsement_processor_mock,
+        "_process_endorsement_event",
+        side_effect=hanging_process_event,
+    ):
+        endorsement_processor_mock._dispatch(message)
+        await endorsement_processor_mock.stop()
+
+    # Left unacked, to be redelivered
+    message.ack.assert_not_awaited()
+    assert not endorsement_processor_mock._in_flight
+
+
+@pytest.mark.anyio
+async def test_failed_endorsement_is_retried_with_backoff(endorsement_processor_mock):
+    message = endorsement_message("txn", "conn")
+    message.metadata.num_delivered = 2
+
+    with patch.object(
+        endorsement_processor_mock,
+        "_process_endorsement_event",
+        side_effect=HTTPException(status_code=503),
+    ), patch.object(
+        endorsement_processor_mock, "_handle_unprocessable_endorse_event"
+    ) as mock_handle_unprocessable:
+        await endorsement_processor_mock._process_in_order(message, None)
+
+    message.nak.assert_awaited_once_with(delay=retry_delay(2))
+    message.ack.assert_not_awaited()
+    mock_handle_unprocessable.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_failed_endorsement_is_dead_lettered_after_max_deliver(
+    endorsement_processor_mock, mock_nats_client
+):
+    message = endorsement_message("txn", "conn")
+    message.metadata.num_delivered = ENDORSER_MAX_DELIVER
+
+    with patch.object(
+        endorsement_processor_mock,
+        "_process_endorsement_event",
+        side_effect=HTTPException(status_code=503, detail="Service\nUnavailable"),
+    ):
+        await endorsement_processor_mock._process_in_order(message, None)
+
+    mock_nats_client.publish.assert_awaited_once_with(
+        f"unprocessable.{message.subject}",
+        message.data,
+        headers={
+            "Endorser-Error": "503: Service Unavailable",
+            "Endorser-Num-Delivered": str(ENDORSER_MAX_DELIVER),
+        },
+    )
+    message.ack.assert_awaited_once()
+    message.nak.assert_not_awaited()
+
+
+@pytest.mark.anyio
+async def test_malformed_endorsement_is_dead_lettered(
+    endorsement_processor_mock, mock_nats_client
+):
+    message = AsyncMock(data=b"invalid data", subject="test.subject")
+    message.metadata.num_delivered = 1
+
+    await endorsement_processor_mock._process_in_order(message, None)
+
+    # Not retried, as redelivering a malformed event cannot succeed
+    mock_nats_client.publish.assert_awaited_once()
+    assert mock_nats_client.publish.call_args.args[0] == "unprocessable.test.subject"
+    message.ack.assert_awaited_once()
+    message.nak.assert_not_awaited()
+
+
+@pytest.mark.anyio
+async def test_endorsement_not_settled_when_dead_lettering_fails(
+    endorsement_processor_mock, mock_nats_client
+):
+    message = AsyncMock(data=b"invalid data", subject="test.subject")
+    mock_nats_client.publish.side_effect = Exception("NATS unavailable")
+
+    await endorsement_processor_mock._process_in_order(message, None)
+
+    # Left unacked, to be redelivered after the ack wait
+    message.ack.assert_not_awaited()
+
+
+def test_retry_delay():
+    with patch(
+        "endorser.services.endorsement_processor.ENDORSER_RETRY_BASE_DELAY", 2
+    ), patch("endorser.services.endorsement_processor.ENDORSER_RETRY_MAX_DELAY", 60):
+        assert [retry_delay(n) for n in range(1, 7)] == [2, 4, 8, 16, 32, 60]
+
+
+@pytest.mark.anyio
+async def test_reprocess_dead_letters(endorsement_processor_mock, mock_nats_client):
+    mock_nats_client.stream_info.return_value = MagicMock(
+        state=MagicMock(first_seq=1, last_seq=3)
+    )
+    mock_nats_client.get_msg.side_effect = [
+        MagicMock(subject=f"unprocessable.{NATS_SUBJECT}.endorser.txn1", data=b"1"),
+        NotFoundError,  # Already deleted
+        MagicMock(subject=f"unprocessable.{NATS_SUBJECT}.endorser.txn3", data=b"3"),
+    ]
+
+    reprocessed = await endorsement_processor_mock.reprocess_dead_letters()
+
+    assert reprocessed == 2
+    mock_nats_client.stream_info.assert_awaited_once_with(ENDORSER_DEAD_LETTER_STREAM)
+    assert mock_nats_client.publish.await_args_list == [
+        call(f"{NATS_SUBJECT}.endorser.txn1", b"1"),
+        call(f"{NATS_SUBJECT}.endorser.txn3", b"3"),
+    ]
+    assert mock_nats_client.delete_msg.await_args_list == [
+        call(ENDORSER_DEAD_LETTER_STREAM, 1),
+        call(ENDORSER_DEAD_LETTER_STREAM, 3),
+    ]
+
+
+@pytest.mark.anyio
+async def test_reprocess_dead_letters_limit(
+    endorsement_processor_mock, mock_nats_client
+):
+    mock_nats_client.stream_info.return_value = MagicMock(
+        state=MagicMock(first_seq=5, last_seq=10)
+    )
+    mock_nats_client.get_msg.return_value = MagicMock(
+        subject=f"unprocessable.{NATS_SUBJECT}.endorser.txn", data=b"{}"
+    )
+
+    reprocessed = await endorsement_processor_mock.reprocess_dead_letters(limit=2)
+
+    assert reprocessed == 2
+    assert mock_nats_client.get_msg.await_args_list == [
+        call(ENDORSER_DEAD_LETTER_STREAM, 5),
+        call(ENDORSER_DEAD_LETTER_STREAM, 6),
+    ]
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        (b'{"payload": {"connection_id": "conn"}}', "conn"),
+        (b'{"payload": {"transaction_id": "txn"}}', "subject"),
+        (b"invalid data", "subject"),
+    ],
+)
+def test_partition_key(data, expected):
+    message = MagicMock(data=data, subject="subject")
+    assert EndorsementProcessor._partition_key(message) == expected
+
+
 @pytest.mark.anyio
 async def test_process_endorsement_event_governance(endorsement_processor_mock):
     governance = GOVERNANCE_LABEL
@@ -275,8 +571,43 @@ async def test_process_endorsement_event_governance(endorsement_processor_mock):
         mock_accept_endorsement.return_value = AsyncMock()
         await endorsement_processor_mock._process_endorsement_event(event_json)
 
-        mock_should_accept_endorsement.assert_called_once()
-        mock_accept_endorsement.assert_called_once()
+        # The processor's long-lived governance client is used
+        mock_should_accept_endorsement.assert_called_once_with(
+            endorsement_processor_mock.governance_client, "txn1"
+        )
+        mock_accept_endorsement.assert_called_once_with(
+            endorsement_processor_mock.governance_client, "txn1"
+        )
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("error", [asyncio.CancelledError, Exception])
+async def test_process_endorsement_event_interrupted(endorsement_processor_mock, error):
+    event_json = json.dumps(
+        {
+            "origin": GOVERNANCE_LABEL,
+            "wallet_id": GOVERNANCE_LABEL,
+            "topic": "endorsements",
+            "payload": {"state": "request-received", "transaction_id": "txn1"},
+        }
+    )
+
+    with patch(
+        "endorser.services.endorsement_processor.should_accept_endorsement",
+        AsyncMock(return_value=MagicMock()),
+    ), patch(
+        "endorser.services.endorsement_processor.accept_endorsement",
+        AsyncMock(side_effect=[error(), None]),
+    ) as mock_accept_endorsement:
+        with pytest.raises(error):
+            await endorsement_processor_mock._process_endorsement_event(event_json)
+
+        # The claim is released, so that the redelivered event is endorsed
+        await endorsement_processor_mock._process_endorsement_event(event_json)
+        await endorsement_processor_mock._process_endorsement_event(event_json)
+
+    assert mock_accept_endorsement.await_count == 2
+    assert await endorsement_processor_mock.endorsed_transactions.contains("txn1")
 
 
 @pytest.mark.anyio
@@ -332,10 +663,10 @@ async def test_process_endorsement_event_not_governance(endorsement_processor_mo
 
 
 @pytest.mark.anyio
-async def test_endorsement_processor_subscribe(
-    mock_nats_client,
-):
-    processor = EndorsementProcessor(jetstream=mock_nats_client)
+async def test_endorsement_processor_subscribe(mock_nats_client, mock_acapy_client):
+    processor = EndorsementProcessor(
+        jetstream=mock_nats_client, governance_client=mock_acapy_client
+    )
     mock_nats_client.pull_subscribe.return_value = AsyncMock(
         spec=JetStreamContext.PullSubscription
     )
@@ -345,22 +676,118 @@ async def test_endorsement_processor_subscribe(
         durable=ENDORSER_DURABLE_CONSUMER,
         subject=f"{NATS_SUBJECT}.endorser.*",
         stream=NATS_STREAM,
+        config=ConsumerConfig(max_deliver=ENDORSER_MAX_DELIVER),
     )
     assert isinstance(subscription, JetStreamContext.PullSubscription)
 
 
+@pytest.mark.anyio
+async def test_endorsement_processor_subscribe_revocation_lane(
+    endorsement_processor_mock, mock_nats_client
+):
+    await endorsement_processor_mock._subscribe(REVOCATION_LANE)
+
+    mock_nats_client.pull_subscribe.assert_called_once_with(
+        durable=f"{ENDORSER_DURABLE_CONSUMER}_revocation",
+        subject=f"{NATS_SUBJECT}.endorser_revocation.*",
+        stream=NATS_STREAM,
+        config=ConsumerConfig(max_deliver=ENDORSER_MAX_DELIVER),
+    )
+
+
+@pytest.mark.anyio
+async def test_lanes_are_not_ordered_with_each_other(endorsement_processor_mock):
+    release_revocation = asyncio.Event()
+    processed = []
+
+    async def process_event(event_json):
+        transaction_id = json.loads(event_json)["payload"]["transaction_id"]
+        if transaction_id == "txn-revocation":
+            await release_revocation.wait()
+        processed.append(transaction_id)
+
+    with patch.object(
+        endorsement_processor_mock,
+        "_process_endorsement_event",
+        side_effect=process_event,
+    ):
+        # Same connection, but on different lanes
+        endorsement_processor_mock._dispatch(
+            endorsement_message("txn-revocation", "conn"), REVOCATION_LANE
+        )
+        endorsement_processor_mock._dispatch(
+            endorsement_message("txn-cred-def", "conn"), DEFAULT_LANE
+        )
+        lane_in_flight = endorsement_processor_mock._lane_in_flight
+        assert len(lane_in_flight["default"]) == len(lane_in_flight["revocation"]) == 1
+
+        # The default lane's endorsement does not wait for the revocation lane
+        await asyncio.wait_for(
+            asyncio.gather(
+                *endorsement_processor_mock._lane_in_flight[DEFAULT_LANE.name]
+            ),
+            timeout=1,
+        )
+        assert processed == ["txn-cred-def"]
+
+        release_revocation.set()
+        await endorsement_processor_mock._wait_for_in_flight()
+
+    assert processed == ["txn-cred-def", "txn-revocation"]
+    assert not endorsement_processor_mock._partitions
+
+
+@pytest.mark.anyio
+async def test_log_backlog(endorsement_processor_mock, mock_nats_client):
+    mock_nats_client.consumer_info.side_effect = [
+        MagicMock(num_pending=5, num_ack_pending=2),
+        Exception("Consumer not found"),
+        asyncio.CancelledError,
+    ]
+
+    with patch("asyncio.sleep", new_callable=AsyncMock), patch(
+        "endorser.services.endorsement_processor.logger"
+    ) as mock_logger:
+        with pytest.raises(asyncio.CancelledError):
+            await endorsement_processor_mock._log_backlog()
+
+    mock_nats_client.consumer_info.assert_any_await(NATS_STREAM, DEFAULT_LANE.durable)
+    mock_nats_client.consumer_info.assert_any_await(
+        NATS_STREAM, REVOCATION_LANE.durable
+    )
+    mock_logger.bind.assert_called_once_with(
+        body={
+            "lane": "default",
+            "num_pending": 5,
+            "num_ack_pending": 2,
+            "num_in_flight": 0,
+            "num_waiting": 0,
+        }
+    )
+    mock_logger.warning.assert_called_once()
+
+
 @pytest.mark.anyio
 @pytest.mark.parametrize("exception", [BadSubscriptionError, Error, Exception])
 async def test_endorsement_processor_subscribe_error(
-    mock_nats_client, exception  # pylint: disable=redefined-outer-name
+    mock_nats_client, mock_acapy_client, exception
 ):
-    processor = EndorsementProcessor(mock_nats_client)
+    processor = EndorsementProcessor(mock_nats_client, mock_acapy_client)
     mock_nats_client.pull_subscribe.side_effect = exception
 
     with pytest.raises(exception):
         await processor._subscribe()
 
 
+@pytest.mark.anyio
+async def test_check_tasks(endorsement_processor_mock):
+    endorsement_processor_mock._tasks = [MagicMock(done=MagicMock(return_value=False))]
+    assert await endorsement_processor_mock.check_tasks() == {"is_working": True}
+
+    endorsement_processor_mock._tasks = []
+    assert await endorsement_processor_mock.check_tasks() == {"is_working": False}
+
+
 @pytest.mark.anyio
 async def test_check_jetstream_success(endorsement_processor_mock):
     # Setup
@@ -0,0 +1,169 @@
+import asyncio
+import json
+from collections import Counter, deque
+from types import SimpleNamespace
+from typing import List
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from nats.js.errors import FetchTimeoutError
+
+from endorser.services.endorsed_transactions import EndorsedTransactions
+from endorser.services.endorsement_processor import EndorsementProcessor
+from endorser.tests.test_endorsed_transactions import FakeKeyValue
+from shared.constants import GOVERNANCE_LABEL, NATS_SUBJECT
+
+# pylint: disable=redefined-outer-name
+# because re-using fixtures in same module
+
+ENDORSE_DURATION = 0.05
+
+
+class FakeMessage:
+    def __init__(self, stream: "FakeStream", transaction_id: str, connection_id: str):
+        self.stream = stream
+        self.subject = f"{NATS_SUBJECT}.endorser.{transaction_id}"
+        self.data = json.dumps(
+            {
+                "wallet_id": GOVERNANCE_LABEL,
+                "topic": "endorsements",
+                "origin": GOVERNANCE_LABEL,
+                "payload": {
+                    "state": "request-received",
+                    "transaction_id": transaction_id,
+                    "connection_id": connection_id,
+                },
+            }
+        ).encode()
+        self.metadata = SimpleNamespace(num_delivered=1)
+
+    async def ack(self):
+        self.stream.acked.append(self)
+
+    async def nak(self, delay=None):  # pylint: disable=unused-argument
+        self.metadata.num_delivered += 1
+        self.stream.pending.append(self)
+
+    async def in_progress(self):
+        pass
+
+
+class FakeStream:
+    """
+    In-memory stand-in for a durable pull consumer: every subscriber to the consumer
+    fetches from the same pending messages, so each message is delivered once.
+    """
+
+    def __init__(self):
+        self.pending = deque()
+        self.acked: List[FakeMessage] = []
+
+    def publish(self, transaction_id: str, connection_id: str) -> None:
+        self.pending.append(FakeMessage(self, transaction_id, connection_id))
+
+    async def fetch(self, batch, timeout, heartbeat):  # pylint: disable=unused-argument
+        await asyncio.sleep(0)
+        if not self.pending:
+            await asyncio.sleep(0.01)
+            raise FetchTimeoutError()
+        return [self.pending.popleft() for _ in range(min(batch, len(self.pending)))]
+
+    async def unsubscribe(self):
+        pass
+
+    async def wait_until_acked(self, count: int) -> None:
+        while len(self.acked) < count:
+            await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def stream():
+    return FakeStream()
+
+
+@pytest.fixture
+def endorsed():
+    """Endorsements accepted, per transaction, and the most ever in flight at once."""
+    endorsements = SimpleNamespace(calls=Counter(), in_flight=0, peak_in_flight=0)
+
+    async def accept_endorsement(_, transaction_id):
+        endorsements.calls[transaction_id] += 1
+        endorsements.in_flight += 1
+        endorsements.peak_in_flight = max(
+            endorsements.peak_in_flight, endorsements.in_flight
+        )
+        try:
+            await asyncio.sleep(ENDORSE_DURATION)
+        finally:
+            endorsements.in_flight -= 1
+
+    with patch(
+        "endorser.services.endorsement_processor.should_accept_endorsement",
+        AsyncMock(return_value=MagicMock()),
+    ), patch(
+        "endorser.services.endorsement_processor.accept_endorsement",
+        accept_endorsement,
+    ), patch(
+        "endorser.services.endorsement_processor.ENDORSER_CONCURRENCY", 2
+    ), patch(
+        "endorser.services.endorsement_processor.ENDORSER_MAX_PENDING", 2
+    ):
+        yield endorsements
+
+
+def start_replicas(stream: FakeStream, count: int, kv=None):
+    jetstream = AsyncMock()
+    jetstream.pull_subscribe.return_value = stream
+    replicas = [
+        EndorsementProcessor(
+            jetstream=jetstream,
+            governance_client=AsyncMock(),
+            endorsed_transactions=EndorsedTransactions(kv),
+        )
+        for _ in range(count)
+    ]
+    for replica in replicas:
+        replica.start()
+    return replicas
+
+
+async def peak_in_flight(endorsed, count: int, num_messages: int) -> int:
+    stream = FakeStream()
+    for i in range(num_messages):
+        stream.publish(f"txn_{count}_{i}", f"conn_{i}")
+
+    endorsed.peak_in_flight = 0
+    replicas = start_replicas(stream, count)
+    await asyncio.wait_for(stream.wait_until_acked(num_messages), timeout=10)
+
+    for replica in replicas:
+        await replica.stop()
+    return endorsed.peak_in_flight
+
+
+@pytest.mark.anyio
+async def test_throughput_scales_with_replicas(endorsed):
+    num_messages = 32
+
+    # Each replica endorses at most ENDORSER_CONCURRENCY (2) transactions at once
+    assert await peak_in_flight(endorsed, 1, num_messages) == 2
+    assert await peak_in_flight(endorsed, 4, num_messages) == 4 * 2
+    assert len(endorsed.calls) == 2 * num_messages
+    assert set(endorsed.calls.values()) == {1}
+
+
+@pytest.mark.anyio
+async def test_duplicates_endorsed_once_across_replicas(stream, endorsed):
+    kv = FakeKeyValue()
+    for _ in range(3):  # Duplicate deliveries of the same events
+        for i in range(4):
+            stream.publish(f"txn_{i}", f"conn_{i}")
+    stream.publish("txn_0", "other_conn")  # Same transaction, another partition
+
+    replicas = start_replicas(stream, 3, kv)
+    await asyncio.wait_for(stream.wait_until_acked(13), timeout=10)
+    for replica in replicas:
+        await replica.stop()
+
+    assert endorsed.calls == {f"txn_{i}": 1 for i in range(4)}
+    assert set(kv.entries) == {f"txn_{i}" for i in range(4)}
@@ -5,8 +5,15 @@ import pytest
 from fastapi import FastAPI, HTTPException
 from fastapi.testclient import TestClient
 
-from endorser.main import app, app_lifespan, health_check, health_ready
-from endorser.services.endorsement_processor import EndorsementProcessor
+from endorser.main import (
+    app,
+    app_lifespan,
+    health_check,
+    health_ready,
+    reprocess_dead_letters,
+)
+from endorser.util.trust_registry import evict_valid_issuers
+from shared.services.health_sampler import HealthSampler
 
 
 def test_create_app():
@@ -17,7 +24,12 @@ def test_create_app():
     # Get all routes in app
     routes = [route.path for route in app.routes]
 
-    expected_routes = ["/health/live", "/health/ready", "/docs"]
+    expected_routes = [
+        "/health/live",
+        "/health/ready",
+        "/docs",
+        "/dead-letters/reprocess",
+    ]
     for route in expected_routes:
         assert route in routes
 
@@ -26,8 +38,10 @@ def test_create_app():
 async def test_app_lifespan():
     # Mocks for services and container
     endorsement_processor_mock = MagicMock(start=Mock(), stop=AsyncMock())
+    trust_registry_events_mock = MagicMock()
     container_mock = AsyncMock(
         endorsement_processor=AsyncMock(return_value=endorsement_processor_mock),
+        trust_registry_events=AsyncMock(return_value=trust_registry_events_mock),
         wire=MagicMock(),
         shutdown_resources=AsyncMock(),
     )
@@ -41,45 +55,70 @@ async def test_app_lifespan():
         # Assert the container was wired with the correct modules
         container_mock.wire.assert_called_once()
 
+        # Assert cached issuers are evicted on trust registry changes
+        trust_registry_events_mock.add_handler.assert_called_once_with(
+            evict_valid_issuers, evict_valid_issuers
+        )
+
         # Assert the endorsement_processor's start method was called
         endorsement_processor_mock.start.assert_called_once()
 
+        # Assert health is sampled once the processor has started
+        container_mock.health_sampler.return_value.sample.assert_awaited_once()
+
         # Assert the shutdown logic was called correctly
         endorsement_processor_mock.stop.assert_awaited_once()
         container_mock.shutdown_resources.assert_awaited_once()
 
 
+async def sampled(**checks) -> HealthSampler:
+    health_sampler = HealthSampler(checks)
+    await health_sampler.sample()
+    return health_sampler
+
+
 @pytest.mark.anyio
 async def test_health_check_healthy():
-    endorsement_processor_mock = MagicMock(start=Mock(), stop=AsyncMock())
-    endorsement_processor_mock.are_tasks_running.return_value = True
+    health_sampler = await sampled(tasks=AsyncMock(return_value={"is_working": True}))
 
-    response = await health_check(endorsement_processor=endorsement_processor_mock)
+    response = await health_check(health_sampler=health_sampler)
     assert response == {"status": "healthy"}
 
 
 @pytest.mark.anyio
 async def test_health_check_unhealthy():
-    endorsement_processor_mock = MagicMock(start=Mock(), stop=AsyncMock())
-    endorsement_processor_mock.are_tasks_running.return_value = False
+    health_sampler = await sampled(tasks=AsyncMock(return_value={"is_working": False}))
 
     with pytest.raises(HTTPException) as exc_info:
-        await health_check(endorsement_processor=endorsement_processor_mock)
+        await health_check(health_sampler=health_sampler)
     assert exc_info.value.status_code == 503
     assert exc_info.value.detail == "One or more background tasks are not running."
 
 
 @pytest.mark.anyio
-async def test_health_ready_success():
-    endorsement_processor_mock = AsyncMock(spec=EndorsementProcessor)
+async def test_health_check_stale():
+    health_sampler = await sampled(tasks=AsyncMock(return_value={"is_working": True}))
+    health_sampler.max_age = 0
 
-    endorsement_processor_mock.check_jetstream.return_value = {
-        "is_working": True,
-        "streams_count": 1,
-        "consumers_count": 1,
-    }
+    with pytest.raises(HTTPException) as exc_info:
+        await health_check(health_sampler=health_sampler)
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.detail == "Health check is stale."
 
-    response = await health_ready(endorsement_processor=endorsement_processor_mock)
+
+@pytest.mark.anyio
+async def test_health_ready_success():
+    health_sampler = await sampled(
+        jetstream=AsyncMock(
+            return_value={
+                "is_working": True,
+                "streams_count": 1,
+                "consumers_count": 1,
+            }
+        )
+    )
+
+    response = await health_ready(health_sampler=health_sampler)
 
     assert response == {
         "status": "ready",
@@ -89,15 +128,14 @@ async def test_health_ready_success():
 
 @pytest.mark.anyio
 async def test_health_ready_jetstream_not_working():
-    endorsement_processor_mock = AsyncMock(spec=EndorsementProcessor)
-
-    endorsement_processor_mock.check_jetstream.return_value = {
-        "is_working": False,
-        "error": "No streams available",
-    }
+    health_sampler = await sampled(
+        jetstream=AsyncMock(
+            return_value={"is_working": False, "error": "No streams available"}
+        )
+    )
 
     with pytest.raises(HTTPException) as exc_info:
-        await health_ready(endorsement_processor=endorsement_processor_mock)
+        await health_ready(health_sampler=health_sampler)
 
     assert exc_info.value.status_code == 503
     assert exc_info.value.detail == {
@@ -108,12 +146,12 @@ async def test_health_ready_jetstream_not_working():
 
 @pytest.mark.anyio
 async def test_health_ready_timeout():
-    endorsement_processor_mock = AsyncMock(spec=EndorsementProcessor)
-
-    endorsement_processor_mock.check_jetstream.side_effect = asyncio.TimeoutError()
+    health_sampler = await sampled(
+        jetstream=AsyncMock(side_effect=asyncio.TimeoutError())
+    )
 
     with pytest.raises(HTTPException) as exc_info:
-        await health_ready(endorsement_processor=endorsement_processor_mock)
+        await health_ready(health_sampler=health_sampler)
 
     assert exc_info.value.status_code == 503
     assert exc_info.value.detail == {
@@ -124,34 +162,45 @@ async def test_health_ready_timeout():
 
 @pytest.mark.anyio
 async def test_health_ready_unexpected_error():
-    endorsement_processor_mock = AsyncMock(spec=EndorsementProcessor)
-
-    endorsement_processor_mock.check_jetstream.side_effect = Exception(
-        "Unexpected error"
+    health_sampler = await sampled(
+        jetstream=AsyncMock(side_effect=Exception("Unexpected error"))
     )
 
     with pytest.raises(HTTPException) as exc_info:
-        await health_ready(endorsement_processor=endorsement_processor_mock)
+        await health_ready(health_sampler=health_sampler)
 
     assert exc_info.value.status_code == 500
     assert exc_info.value.detail == {"status": "error", "error": "Unexpected error"}
 
 
 @pytest.mark.anyio
-async def test_health_ready_with_timeout():
-    endorsement_processor_mock = AsyncMock(spec=EndorsementProcessor)
+async def test_health_ready_not_sampled():
+    health_sampler = HealthSampler({"jetstream": AsyncMock()})
+
+    with pytest.raises(HTTPException) as exc_info:
+        await health_ready(health_sampler=health_sampler)
+
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.detail == {
+        "status": "not ready",
+        "error": "JetStream health not yet checked",
+    }
 
-    endorsement_processor_mock.check_jetstream.side_effect = (
-        asyncio.TimeoutError
-    )  # Simulate a slow response
+
+@pytest.mark.anyio
+async def test_health_ready_stale():
+    health_sampler = await sampled(
+        jetstream=AsyncMock(return_value={"is_working": True})
+    )
+    health_sampler.max_age = 0
 
     with pytest.raises(HTTPException) as exc_info:
-        await health_ready(endorsement_processor=endorsement_processor_mock)
+        await health_ready(health_sampler=health_sampler)
 
     assert exc_info.value.status_code == 503
     assert exc_info.value.detail == {
         "status": "not ready",
-        "error": "JetStream health check timed out",
+        "error": "JetStream health check is stale",
     }
 
 
@@ -160,3 +209,17 @@ def test_scalar_html():
     # Simulate a request to the /docs endpoint
     response = client.get("/docs")
     assert response.status_code == 200
+
+
+@pytest.mark.anyio
+async def test_reprocess_dead_letters():
+    endorsement_processor_mock = MagicMock(
+        reprocess_dead_letters=AsyncMock(return_value=3)
+    )
+
+    response = await reprocess_dead_letters(
+        limit=10, endorsement_processor=endorsement_processor_mock
+    )
+
+    assert response == {"reprocessed": 3}
+    endorsement_processor_mock.reprocess_dead_letters.assert_awaited_once_with(limit=10)
@@ -1,12 +1,10 @@
-import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock
 
 import pytest
 from fastapi import HTTPException
 
 from endorser.util.endorsement import (
     accept_endorsement,
-    retry_is_valid_issuer,
     should_accept_endorsement,
 )
 from shared.models.endorsement import Endorsement
@@ -245,7 +243,7 @@ async def test_should_accept_endorsement_fail_not_valid_issuer(
 
 
 @pytest.mark.anyio
-async def test_should_accept_endorsement_retries_on_http_exception(
+async def test_should_accept_endorsement_raises_on_http_exception(
     mock_acapy_client, mocker
 ):
     # Mock valid flow
@@ -272,156 +270,16 @@ async def test_should_accept_endorsement_retries_on_http_exception(
         transaction_mock
     )
 
-    # Mock is_valid_issuer function behaviour - first exception, then True
-    mock_is_valid_issuer = mocker.patch(
-        "endorser.util.endorsement.is_valid_issuer",
-        side_effect=[HTTPException(status_code=500), True],
-    )
-
-    # Mock retry_is_valid_issuer to use a shorter retry delay
-    async def mock_retry_is_valid_issuer(
-        did, schema_id, _, max_retries=5, retry_delay=0.01
-    ):
-        for attempt in range(max_retries):
-            try:
-                valid_issuer = await mock_is_valid_issuer(did, schema_id)
-                if valid_issuer:
-                    return True
-                return False
-            except HTTPException:
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(retry_delay)
-                else:
-                    return False
-
-    mocker.patch(
-        "endorser.util.endorsement.retry_is_valid_issuer",
-        side_effect=mock_retry_is_valid_issuer,
-    )
-
-    result = await should_accept_endorsement(mock_acapy_client, valid_endorsement)
-
-    # Assertions
-    assert (
-        result
-    ), "The endorsement should be accepted due to is_valid_issuer true after retry."
-    assert (
-        mock_is_valid_issuer.call_count == 2
-    ), "is_valid_issuer should have been called exactly twice."
-
-
-@pytest.mark.anyio
-async def test_should_accept_endorsement_fails_after_max_retries(
-    mock_acapy_client, mocker
-):
-    # Mock valid flow
-    mocker.patch(
-        "endorser.util.endorsement.get_endorsement_request_attachment",
-        return_value={
-            "identifier": "test-identifier",
-            "operation": {"ref": "test-ref", "type": "102"},
-        },
-    )
-    mocker.patch(
-        "endorser.util.endorsement.is_credential_definition_transaction",
-        return_value=True,
-    )
-    mocker.patch(
-        "endorser.util.endorsement.get_did_and_schema_id_from_cred_def_attachment",
-        return_value=("did:sov:test-did", "test-schema-id"),
-    )
-
-    # Mock transaction response
-    transaction_mock = MagicMock()
-    transaction_mock.state = "request_received"
-    mock_acapy_client.endorse_transaction.get_transaction.return_value = (
-        transaction_mock
-    )
-
-    # Mock is_valid_issuer function behaviour - always exception
-    mock_is_valid_issuer = mocker.patch(
-        "endorser.util.endorsement.is_valid_issuer",
-        side_effect=HTTPException(status_code=500),
-    )
-
-    # Mock retry_is_valid_issuer to use a shorter retry delay
-    async def mock_retry_is_valid_issuer(
-        did, schema_id, _, max_retries=5, retry_delay=0.01
-    ):
-        for attempt in range(max_retries):
-            try:
-                valid_issuer = await mock_is_valid_issuer(did, schema_id)
-                if valid_issuer:
-                    return True
-                return False
-            except HTTPException:
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(retry_delay)
-                else:
-                    return False
-
-    mocker.patch(
-        "endorser.util.endorsement.retry_is_valid_issuer",
-        side_effect=mock_retry_is_valid_issuer,
-    )
-
-    result = await should_accept_endorsement(mock_acapy_client, valid_endorsement)
-
-    # Assertions
-    assert (
-        result is None
-    ), "The endorsement should not be accepted due to is_valid_issuer failing repeatedly"
-    assert (
-        mock_is_valid_issuer.call_count == 5
-    ), "is_valid_issuer should have been called exactly `max_retries` times."
-
-
-@pytest.mark.anyio
-async def test_retry_is_valid_issuer_success_after_retries(mocker):
-    # Setup
-    did = "did:sov:test-did"
-    schema_id = "test-schema-id"
-    transaction_id = "test-transaction"
-
-    # Mock is_valid_issuer to raise HTTPException first, then return True
-    mock_is_valid_issuer = mocker.patch(
-        "endorser.util.endorsement.is_valid_issuer",
-        side_effect=[HTTPException(status_code=500), True],
-    )
-
-    # Test
-    result = await retry_is_valid_issuer(
-        did, schema_id, transaction_id, max_retries=2, retry_delay=0.01
-    )
-
-    # Assertions
-    assert result is True
-    assert mock_is_valid_issuer.call_count == 2
-
-
-@pytest.mark.anyio
-async def test_retry_is_valid_issuer_fails_after_max_retries(mocker):
-    # Setup
-    did = "did:sov:test-did"
-    schema_id = "test-schema-id"
-    transaction_id = "test-transaction"
-
-    # Mock is_valid_issuer to always raise HTTPException
     mock_is_valid_issuer = mocker.patch(
         "endorser.util.endorsement.is_valid_issuer",
         side_effect=HTTPException(status_code=500),
     )
 
-    # Test
-    with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
-        result = await retry_is_valid_issuer(
-            did, schema_id, transaction_id, max_retries=3, retry_delay=0.01
-        )
+    # Raised without retrying in place, for the event to be redelivered with backoff
+    with pytest.raises(HTTPException):
+        await should_accept_endorsement(mock_acapy_client, valid_endorsement)
 
-    # Assertions
-    assert result is False
-    assert mock_is_valid_issuer.call_count == 3
-    assert mock_sleep.await_count == 2  # Retries should happen max_retries - 1 times
+    mock_is_valid_issuer.assert_awaited_once_with("did:sov:test-did", "test-schema-id")
 
 
 @pytest.mark.anyio
@@ -121,6 +121,26 @@ async def test_get_did_and_schema_id_from_cred_def_attachment(mock_acapy_client)
     mock_acapy_client.schema.get_schema.assert_awaited_once_with(schema_id="ref_value")
 
 
+@pytest.mark.anyio
+async def test_get_did_and_schema_id_from_cred_def_attachment_memoised(
+    mock_acapy_client,
+):
+    mock_acapy_client.schema.get_schema.return_value = MagicMock(
+        var_schema=MagicMock(id="schema_id")
+    )
+
+    for identifier in ["first_identifier", "second_identifier"]:
+        did, schema_id = await get_did_and_schema_id_from_cred_def_attachment(
+            mock_acapy_client,
+            {"identifier": identifier, "operation": {"ref": 123}},
+        )
+        assert did == f"did:sov:{identifier}"
+        assert schema_id == "schema_id"
+
+    # The schema for a sequence number is only fetched once
+    mock_acapy_client.schema.get_schema.assert_awaited_once_with(schema_id="123")
+
+
 @pytest.mark.anyio
 async def test_is_credential_definition_transaction_fail_no_identifier():
     assert (
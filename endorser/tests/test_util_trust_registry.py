@@ -4,7 +4,7 @@ import pytest
 from fastapi import HTTPException
 from httpx import Response
 
-from endorser.util.trust_registry import is_valid_issuer
+from endorser.util.trust_registry import evict_valid_issuers, is_valid_issuer
 
 
 @pytest.mark.anyio
@@ -102,3 +102,47 @@ async def test_is_valid_issuer_http_error_on_schema():
             await is_valid_issuer("did:sov:xxxx", "test-schema-id")
 
         assert mock_get.call_count == 2
+
+
+@pytest.mark.anyio
+async def test_is_valid_issuer_cached():
+    with patch(
+        "endorser.util.trust_registry.RichAsyncClient.get", new_callable=AsyncMock
+    ) as mock_get:
+        mock_get.side_effect = [
+            Response(200, json={"roles": ["issuer"]}),
+            Response(200, json={"id": "test-schema-id"}),
+        ]
+
+        assert await is_valid_issuer("did:sov:xxxx", "test-schema-id") is True
+        assert await is_valid_issuer("did:sov:xxxx", "test-schema-id") is True
+
+        # The second validation is served from the cache
+        assert mock_get.call_count == 2
+
+
+@pytest.mark.anyio
+async def test_is_valid_issuer_not_cached_when_invalid():
+    with patch(
+        "endorser.util.trust_registry.RichAsyncClient.get",
+        side_effect=HTTPException(status_code=404, detail="Not Found"),
+    ) as mock_get:
+        assert await is_valid_issuer("did:sov:xxxx", "test-schema-id") is False
+        assert await is_valid_issuer("did:sov:xxxx", "test-schema-id") is False
+
+        assert mock_get.call_count == 2
+
+
+@pytest.mark.anyio
+async def test_evict_valid_issuers():
+    with patch(
+        "endorser.util.trust_registry.RichAsyncClient.get", new_callable=AsyncMock
+    ) as mock_get:
+        mock_get.return_value = Response(200, json={"roles": ["issuer"]})
+
+        await is_valid_issuer("did:sov:xxxx", "test-schema-id")
+        evict_valid_issuers()
+        await is_valid_issuer("did:sov:xxxx", "test-schema-id")
+
+        # Validated against the registry again after eviction
+        assert mock_get.call_count == 4
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from endorser.util.weighted_semaphore import WeightedSemaphore
+
+
+@pytest.mark.anyio
+async def test_acquire_within_limit():
+    semaphore = WeightedSemaphore(2, {"a": 1, "b": 1})
+
+    await semaphore.acquire("a")
+    await semaphore.acquire("b")
+
+    # No slots left
+    waiter = asyncio.create_task(semaphore.acquire("a"))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    assert semaphore.waiting("a") == 1
+
+    semaphore.release()
+    await waiter
+    assert semaphore.waiting("a") == 0
+
+
+@pytest.mark.anyio
+async def test_slots_shared_by_weight():
+    semaphore = WeightedSemaphore(1, {"priority": 3, "bulk": 1})
+    acquired = []
+
+    async def hold(lane):
+        async with semaphore.slot(lane):
+            acquired.append(lane)
+            await asyncio.sleep(0)
+
+    await semaphore.acquire("bulk")
+    tasks = [
+        asyncio.create_task(hold(lane)) for lane in ["bulk"] * 4 + ["priority"] * 4
+    ]
+    await asyncio.sleep(0)
+    semaphore.release()
+    await asyncio.gather(*tasks)
+
+    # While both lanes wait, slots go 3:1 to the priority lane; then the rest of bulk
+    assert acquired[:4].count("priority") == 3
+    assert acquired[4:] == ["priority", "bulk", "bulk", "bulk"]
+
+
+@pytest.mark.anyio
+async def test_idle_lane_does_not_reserve_slots():
+    semaphore = WeightedSemaphore(2, {"priority": 3, "bulk": 1})
+
+    await asyncio.wait_for(semaphore.acquire("bulk"), timeout=1)
+    await asyncio.wait_for(semaphore.acquire("bulk"), timeout=1)
+
+
+@pytest.mark.anyio
+async def test_cancelled_waiter_is_skipped():
+    semaphore = WeightedSemaphore(1, {"a": 1, "b": 1})
+    await semaphore.acquire("a")
+
+    cancelled = asyncio.create_task(semaphore.acquire("a"))
+    waiting = asyncio.create_task(semaphore.acquire("b"))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await asyncio.sleep(0)
+
+    semaphore.release()
+    await asyncio.wait_for(waiting, timeout=1)
+    assert cancelled.cancelled()
@@ -1,8 +1,6 @@
-import asyncio
 from typing import Any, Dict, Optional
 
 from aries_cloudcontroller import AcaPyClient, TransactionRecord
-from fastapi import HTTPException
 
 from endorser.util.transaction_record import (
     get_did_and_schema_id_from_cred_def_attachment,
@@ -135,44 +133,15 @@ async def check_applicable_operation_type(
         client, attachment
     )
 
-    return await retry_is_valid_issuer(did, schema_id, transaction_id)
-
-
-async def retry_is_valid_issuer(
-    did: str,
-    schema_id: str,
-    transaction_id: str,
-    max_retries: int = 5,
-    retry_delay: float = 1.0,
-) -> bool:
-    bound_logger = logger.bind(body={"transaction_id": transaction_id})
-    for attempt in range(max_retries):
-        try:
-            valid_issuer = await is_valid_issuer(did, schema_id)
-
-            if not valid_issuer:
-                bound_logger.warning(
-                    "Endorsement request with transaction id `{}` is not for did "
-                    "and schema registered in the trust registry.",
-                    transaction_id,
-                )
-                return False
-
-            return True
-
-        except HTTPException as e:
-            bound_logger.error(
-                "Attempt {}: Exception caught when asserting valid issuer: {}",
-                attempt + 1,
-                e,
-            )
-
-            if attempt < max_retries - 1:
-                bound_logger.warning("Retrying in {}s ...", retry_delay)
-                await asyncio.sleep(retry_delay)
-            else:
-                bound_logger.error("Max retries reached. Giving up.")
-                return False
+    # Errors reaching the trust registry are raised, for the event to be redelivered
+    valid_issuer = await is_valid_issuer(did, schema_id)
+    if not valid_issuer:
+        bound_logger.warning(
+            "Endorsement request with transaction id `{}` is not for did "
+            "and schema registered in the trust registry.",
+            transaction_id,
+        )
+    return valid_issuer
 
 
 async def accept_endorsement(client: AcaPyClient, transaction_id: str) -> None:
@@ -3,11 +3,18 @@ from typing import Any, Dict, Optional
 import orjson
 from aries_cloudcontroller import AcaPyClient, TransactionRecord
 
+from shared.constants import ENDORSER_SCHEMA_ID_CACHE_SIZE
 from shared.log_config import get_logger
 from shared.models.endorsement import TransactionTypes
+from shared.util.cache import BoundedCache
 
 logger = get_logger(__name__)
 
+# Schema ids by ledger sequence number. Ledger records are immutable, so never expire
+schema_id_cache: BoundedCache[str, str] = BoundedCache(
+    maxsize=ENDORSER_SCHEMA_ID_CACHE_SIZE
+)
+
 
 def get_endorsement_request_attachment(
     transaction: TransactionRecord,
@@ -67,10 +74,14 @@ async def get_did_and_schema_id_from_cred_def_attachment(
     client: AcaPyClient, attachment: Dict[str, Any]
 ):
     did = "did:sov:" + attachment["identifier"]
-    schema_seq_id = attachment["operation"]["ref"]
+    schema_seq_id = str(attachment["operation"]["ref"])
+
+    schema_id = schema_id_cache.get(schema_seq_id)
+    if schema_id:
+        return (did, schema_id)
 
     logger.debug("Fetching schema with seq id: `{}`", schema_seq_id)
-    schema = await client.schema.get_schema(schema_id=str(schema_seq_id))
+    schema = await client.schema.get_schema(schema_id=schema_seq_id)
 
     if not schema.var_schema or not schema.var_schema.id:
         raise Exception(  # pylint: disable=W0719
@@ -78,6 +89,7 @@ async def get_did_and_schema_id_from_cred_def_attachment(
         )
 
     schema_id = schema.var_schema.id
+    schema_id_cache.set(schema_seq_id, schema_id)
 
     return (did, schema_id)
 
@@ -1,11 +1,33 @@
+from typing import Optional, Tuple
+
 from fastapi import HTTPException
 
 from shared import TRUST_REGISTRY_URL
+from shared.constants import (
+    ENDORSER_VALID_ISSUER_CACHE_SIZE,
+    ENDORSER_VALID_ISSUER_CACHE_TTL,
+)
 from shared.log_config import get_logger
+from shared.models.trustregistry import TrustRegistryEvent
+from shared.util.cache import BoundedCache
 from shared.util.rich_async_client import RichAsyncClient
 
 logger = get_logger(__name__)
 
+# (did, schema_id) pairs recently validated against the trust registry. Only valid
+# issuers are cached, so that a newly registered issuer or schema is never rejected
+valid_issuer_cache: BoundedCache[Tuple[str, str], bool] = BoundedCache(
+    maxsize=ENDORSER_VALID_ISSUER_CACHE_SIZE, ttl=ENDORSER_VALID_ISSUER_CACHE_TTL
+)
+
+
+def evict_valid_issuers(_: Optional[TrustRegistryEvent] = None) -> None:
+    """
+    Trust registry event and reset handler: drops the cached issuers, as an actor or
+    schema they were validated against may have changed.
+    """
+    valid_issuer_cache.clear()
+
 
 async def is_valid_issuer(did: str, schema_id: str) -> bool:
     """Assert that an actor with the specified did is registered as issuer.
@@ -27,6 +49,10 @@ async def is_valid_issuer(did: str, schema_id: str) -> bool:
             or the schema is not registered in the registry.
     """
     bound_logger = logger.bind(body={"did": did, "schema_id": schema_id})
+    if valid_issuer_cache.get((did, schema_id)):
+        bound_logger.debug("DID was recently validated as issuer of schema")
+        return True
+
     bound_logger.debug("Assert that did is registered as issuer")
     try:
         async with RichAsyncClient() as client:
@@ -67,4 +93,5 @@ async def is_valid_issuer(did: str, schema_id: str) -> bool:
             raise http_err
 
     bound_logger.info("Validated that DID and schema are on trust registry.")
+    valid_issuer_cache.set((did, schema_id), True)
     return True
@@ -0,0 +1,78 @@
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional
+
+
+class WeightedSemaphore:
+    """
+    Limits the number of concurrent holders across several lanes.
+
+    When a slot frees up and several lanes are waiting, it is handed to a lane chosen by
+    smooth weighted round-robin: while busy, each lane gets slots in proportion to its
+    weight. A lane can use every slot while the other lanes are idle.
+
+    Args:
+        limit (int): The maximum number of concurrent holders.
+        weights (Dict[str, int]): The weight of each lane.
+    """
+
+    def __init__(self, limit: int, weights: Dict[str, int]) -> None:
+        self._available = limit
+        self._weights = weights
+        self._current_weights = {lane: 0 for lane in weights}
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {
+            lane: deque() for lane in weights
+        }
+
+    def waiting(self, lane: str) -> int:
+        """Returns the number of holders waiting for a slot on the lane."""
+        return sum(not waiter.done() for waiter in self._waiters[lane])
+
+    @asynccontextmanager
+    async def slot(self, lane: str) -> AsyncIterator[None]:
+        await self.acquire(lane)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, lane: str) -> None:
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[lane].append(waiter)
+        self._wake()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # Handed a slot while being cancelled; pass it on
+            raise
+
+    def release(self) -> None:
+        self._available += 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._available > 0:
+            lane = self._next_lane()
+            if lane is None:
+                return
+            self._available -= 1
+            self._waiters[lane].popleft().set_result(None)
+
+    def _next_lane(self) -> Optional[str]:
+        for waiters in self._waiters.values():
+            while waiters and waiters[0].done():  # Cancelled while waiting
+                waiters.popleft()
+
+        waiting = [lane for lane, waiters in self._waiters.items() if waiters]
+        if not waiting:
+            return None
+
+        total_weight = 0
+        for lane in waiting:
+            self._current_weights[lane] += self._weights[lane]
+            total_weight += self._weights[lane]
+        lane = max(waiting, key=self._current_weights.__getitem__)
+        self._current_weights[lane] -= total_weight
+        return lane
@@ -31,6 +31,10 @@ TENANT_AGENT_URL = os.getenv("ACAPY_TENANT_AGENT_URL", f"{url}:4021")
 TENANT_AGENT_API_KEY = os.getenv("ACAPY_TENANT_AGENT_API_KEY", adminApiKey)
 
 TRUST_REGISTRY_URL = os.getenv("TRUST_REGISTRY_URL", f"{url}:8001")
+# Read-your-writes session the app sends to the trust registry. All app replicas share
+# it, so that a write through one replica is seen by reads through the others
+TRUST_REGISTRY_SESSION_HEADER = "x-trust-registry-session"
+TRUST_REGISTRY_SESSION = os.getenv("TRUST_REGISTRY_SESSION", "cloudapi")
 TRUST_REGISTRY_FASTAPI_ENDPOINT = os.getenv(
     "TRUST_REGISTRY_FASTAPI_ENDPOINT", f"{url}:8400"
 )  # governance-trust-registry
@@ -38,6 +42,10 @@ TRUST_REGISTRY_FASTAPI_ENDPOINT = os.getenv(
 WAYPOINT_URL = os.getenv("WAYPOINT_URL", f"{url}:3011")
 
 ACAPY_MULTITENANT_JWT_SECRET = os.getenv("ACAPY_MULTITENANT_JWT_SECRET", "jwtSecret")
+# Verified tenant tokens remembered, to skip decoding them on every request
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "1000"))
+# Lookups of the verified token cache between logging its stats (0 to disable)
+JWT_CACHE_STATS_LOG_INTERVAL = int(os.getenv("JWT_CACHE_STATS_LOG_INTERVAL", "10000"))
 ACAPY_ENDORSER_ALIAS = os.getenv("ACAPY_ENDORSER_ALIAS", "endorser")
 
 ACAPY_TAILS_SERVER_BASE_URL = os.getenv("ACAPY_TAILS_SERVER_BASE_URL", f"{url}:6543")
@@ -66,6 +74,46 @@ PUBLISH_REVOCATIONS_TIMEOUT = int(os.getenv("PUBLISH_REVOCATIONS_TIMEOUT", "60")
 REGISTRY_CREATION_TIMEOUT = int(os.getenv("REGISTRY_CREATION_TIMEOUT", "60"))
 REGISTRY_SIZE = int(os.getenv("REGISTRY_SIZE", "32767"))
 ISSUER_DID_ENDORSE_TIMEOUT = int(os.getenv("ISSUER_DID_ENDORSE_TIMEOUT", "60"))
+# Issuer wallets kept onboarded and ready for new issuers (0 disables the pool),
+# and the seconds between provisioning each one. Pooled wallets are onboarded under the
+# alias "<ISSUER_POOL_LABEL> <wallet name>", by which an instance recovers its pooled
+# wallets on start, so each instance with a pool needs its own label
+ISSUER_POOL_SIZE = int(os.getenv("ISSUER_POOL_SIZE", "0"))
+ISSUER_POOL_REFILL_INTERVAL = float(os.getenv("ISSUER_POOL_REFILL_INTERVAL", "5"))
+ISSUER_POOL_LABEL = os.getenv("ISSUER_POOL_LABEL", "Issuer")
+# Tenants created at once by a bulk request, by default and at most
+BULK_TENANT_CONCURRENCY = int(os.getenv("BULK_TENANT_CONCURRENCY", "10"))
+BULK_TENANT_MAX_CONCURRENCY = int(os.getenv("BULK_TENANT_MAX_CONCURRENCY", "50"))
+# Onboarded actors registered per bulk request to the trust registry
+BULK_TENANT_REGISTRATION_BATCH_SIZE = int(
+    os.getenv("BULK_TENANT_REGISTRATION_BATCH_SIZE", "100")
+)
+# Seconds that an onboarded actor waits for its batch to fill up before it is registered
+BULK_TENANT_REGISTRATION_MAX_WAIT = float(
+    os.getenv("BULK_TENANT_REGISTRATION_MAX_WAIT", "2")
+)
+# Wallets fetched from ACA-Py per page while exporting tenants
+TENANT_EXPORT_PAGE_SIZE = int(os.getenv("TENANT_EXPORT_PAGE_SIZE", "1000"))
+# Asynchronous tenant onboarding jobs kept for status requests, and for how many seconds.
+# Jobs are held in memory by the instance that runs them, so with more than one replica,
+# job requests must be routed to the instance that created the tenant
+ONBOARDING_JOB_CACHE_SIZE = int(os.getenv("ONBOARDING_JOB_CACHE_SIZE", "10000"))
+ONBOARDING_JOB_TTL = float(os.getenv("ONBOARDING_JOB_TTL", "3600"))
+# Seconds running onboarding jobs are given to complete on shutdown, before being cancelled
+ONBOARDING_JOB_SHUTDOWN_TIMEOUT = float(
+    os.getenv("ONBOARDING_JOB_SHUTDOWN_TIMEOUT", "10")
+)
+# Wallets whose group, label and image are cached, and for how many seconds
+WALLET_CACHE_SIZE = int(os.getenv("WALLET_CACHE_SIZE", "10000"))
+WALLET_CACHE_TTL = float(os.getenv("WALLET_CACHE_TTL", "60"))
+# Seconds the TAA and endorser public DID are cached for onboarding
+LEDGER_METADATA_CACHE_TTL = float(os.getenv("LEDGER_METADATA_CACHE_TTL", "300"))
+# Seconds between polls of a transaction's state while also waiting for its acked event
+TRANSACTION_ACK_POLL_INTERVAL = float(os.getenv("TRANSACTION_ACK_POLL_INTERVAL", "5"))
+# Seconds between polls of the endorser connection while also waiting for its completed event
+ENDORSER_CONNECTION_POLL_INTERVAL = float(
+    os.getenv("ENDORSER_CONNECTION_POLL_INTERVAL", "5")
+)
 
 # NATS
 NATS_SERVER = os.getenv("NATS_SERVER", "nats://nats:4222")
@@ -75,3 +123,61 @@ NATS_STATE_STREAM = os.getenv("NATS_STATE_STREAM", "cloudapi_aries_state_monitor
 NATS_STATE_SUBJECT = os.getenv("NATS_STATE_SUBJECT", "cloudapi.aries.state_monitoring")
 NATS_CREDS_FILE = os.getenv("NATS_CREDS_FILE", "")
 ENDORSER_DURABLE_CONSUMER = os.getenv("ENDORSER_DURABLE_CONSUMER", "endorser")
+
+# Endorsement processing: endorsements handled concurrently, messages fetched per pull,
+# and the maximum fetched but not yet acked messages
+ENDORSER_CONCURRENCY = int(os.getenv("ENDORSER_CONCURRENCY", "8"))
+ENDORSER_FETCH_BATCH_SIZE = int(os.getenv("ENDORSER_FETCH_BATCH_SIZE", "16"))
+ENDORSER_MAX_PENDING = int(os.getenv("ENDORSER_MAX_PENDING", "64"))
+# Seconds between in-progress acks for an endorsement still being processed; must be
+# shorter than the consumer's ack wait
+ENDORSER_IN_PROGRESS_INTERVAL = float(os.getenv("ENDORSER_IN_PROGRESS_INTERVAL", "10"))
+# Relative share of processing slots for each endorsement lane while both are busy, and
+# seconds between logs of each lane's backlog
+ENDORSER_DEFAULT_LANE_WEIGHT = int(os.getenv("ENDORSER_DEFAULT_LANE_WEIGHT", "4"))
+ENDORSER_REVOCATION_LANE_WEIGHT = int(os.getenv("ENDORSER_REVOCATION_LANE_WEIGHT", "1"))
+ENDORSER_BACKLOG_LOG_INTERVAL = float(os.getenv("ENDORSER_BACKLOG_LOG_INTERVAL", "30"))
+# Deliveries of a failing endorsement event before it is dead-lettered, and the
+# exponential backoff between them, in seconds
+ENDORSER_MAX_DELIVER = int(os.getenv("ENDORSER_MAX_DELIVER", "5"))
+ENDORSER_RETRY_BASE_DELAY = float(os.getenv("ENDORSER_RETRY_BASE_DELAY", "2"))
+ENDORSER_RETRY_MAX_DELAY = float(os.getenv("ENDORSER_RETRY_MAX_DELAY", "60"))
+ENDORSER_DEAD_LETTER_STREAM = os.getenv(
+    "ENDORSER_DEAD_LETTER_STREAM", "unprocessable_endorsements"
+)
+# Endorsed transactions are remembered for ENDORSER_DEDUP_TTL seconds, to skip duplicate
+# deliveries. Set ENDORSER_DEDUP_KV_BUCKET to share them between replicas in a NATS KV bucket
+ENDORSER_DEDUP_TTL = float(os.getenv("ENDORSER_DEDUP_TTL", "3600"))
+ENDORSER_DEDUP_CACHE_SIZE = int(os.getenv("ENDORSER_DEDUP_CACHE_SIZE", "10000"))
+ENDORSER_DEDUP_KV_BUCKET = os.getenv("ENDORSER_DEDUP_KV_BUCKET", "")
+# Seconds after which a claim on a transaction that was never endorsed is considered
+# abandoned, e.g. by a replica that crashed, and may be taken over
+ENDORSER_CLAIM_TIMEOUT = float(os.getenv("ENDORSER_CLAIM_TIMEOUT", "300"))
+# Schema ids memoised by ledger sequence number, and seconds a validated issuer is cached
+ENDORSER_SCHEMA_ID_CACHE_SIZE = int(os.getenv("ENDORSER_SCHEMA_ID_CACHE_SIZE", "1000"))
+ENDORSER_VALID_ISSUER_CACHE_SIZE = int(
+    os.getenv("ENDORSER_VALID_ISSUER_CACHE_SIZE", "1000")
+)
+ENDORSER_VALID_ISSUER_CACHE_TTL = float(
+    os.getenv("ENDORSER_VALID_ISSUER_CACHE_TTL", "30")
+)
+
+# Health probes are served from checks sampled every HEALTH_CHECK_INTERVAL seconds. A check
+# times out after HEALTH_CHECK_TIMEOUT, and a sample older than HEALTH_CHECK_MAX_AGE is stale
+HEALTH_CHECK_INTERVAL = float(os.getenv("HEALTH_CHECK_INTERVAL", "5"))
+HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", "5"))
+HEALTH_CHECK_MAX_AGE = float(os.getenv("HEALTH_CHECK_MAX_AGE", "30"))
+
+# Trust registry change feed, used for cross-replica cache invalidation
+TRUST_REGISTRY_EVENTS_SUBJECT = os.getenv(
+    "TRUST_REGISTRY_EVENTS_SUBJECT", "cloudapi.trustregistry.events"
+)
+PUBLISH_TRUST_REGISTRY_EVENTS = (
+    os.getenv("PUBLISH_TRUST_REGISTRY_EVENTS", "false").upper() == "TRUE"
+)
+# Seconds that an actor name stays reserved for an actor being onboarded, by default and
+# at most. Registering the actor consumes the reservation
+ACTOR_NAME_RESERVATION_TTL = int(os.getenv("ACTOR_NAME_RESERVATION_TTL", "300"))
+ACTOR_NAME_RESERVATION_MAX_TTL = int(
+    os.getenv("ACTOR_NAME_RESERVATION_MAX_TTL", "3600")
+)
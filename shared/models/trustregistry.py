@@ -1,7 +1,9 @@
-from typing import List, Literal, Optional, Union
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional, Union
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
+from shared.constants import ACTOR_NAME_RESERVATION_MAX_TTL, ACTOR_NAME_RESERVATION_TTL
 from shared.exceptions import CloudApiValueError
 
 TrustRegistryRole = Literal["issuer", "verifier"]
@@ -26,6 +28,38 @@ class Actor(BaseModel):
     model_config = ConfigDict(validate_assignment=True, from_attributes=True)
 
 
+class ActorRegistration(Actor):
+    """An actor to register, with the reservation of its name that registering it consumes."""
+
+    reservation_id: Optional[str] = Field(
+        default=None,
+        description="The reservation of the actor's name, if it was reserved",
+    )
+
+    def to_actor(self) -> Actor:
+        return Actor.model_validate(self.model_dump(exclude={"reservation_id"}))
+
+
+class ActorNameReservationRequest(BaseModel):
+    name: str
+    ttl: int = Field(
+        default=ACTOR_NAME_RESERVATION_TTL,
+        gt=0,
+        le=ACTOR_NAME_RESERVATION_MAX_TTL,
+        description="Seconds to reserve the name for",
+    )
+
+
+class ActorNameReservation(BaseModel):
+    """An actor name held for an actor that is yet to be registered, until it expires."""
+
+    id: str
+    name: str
+    expires_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 def calc_schema_id(did: str, name: str, version: str) -> str:
     return f"{did}:2:{name}:{version}"
 
@@ -91,3 +125,13 @@ class Schema(BaseModel):
         return values
 
     model_config = ConfigDict(validate_assignment=True, from_attributes=True)
+
+
+class TrustRegistryEvent(BaseModel):
+    """A change to the trust registry, published after the write has been committed."""
+
+    entity: Literal["actor", "schema"]
+    action: Literal["created", "updated", "deleted"]
+    id: str
+    previous_id: Optional[str] = None  # Set when an update changed the record's id
+    data: Optional[Dict[str, Any]] = None  # The record as committed (or as deleted)
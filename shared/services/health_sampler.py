@@ -0,0 +1,113 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, NoReturn, Optional
+
+from shared.constants import (
+    HEALTH_CHECK_INTERVAL,
+    HEALTH_CHECK_MAX_AGE,
+    HEALTH_CHECK_TIMEOUT,
+)
+from shared.log_config import get_logger
+
+logger = get_logger(__name__)
+
+HealthCheck = Callable[[], Awaitable[Dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class HealthSample:
+    status: Optional[Dict[str, Any]]  # Result of the check, if it completed
+    error: Optional[Exception]  # Raised by the check, or the timeout
+    sampled_at: float  # time.monotonic() of the sample
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.sampled_at
+
+
+class HealthSampler:
+    """
+    Runs health checks in the background every `interval` seconds, so that health probes
+    are served from the latest sample instead of each probe calling out to NATS.
+
+    A sample older than `max_age` seconds is stale: the checks are hanging or the sampler
+    stopped, and probes should fail rather than report an outdated status.
+
+    Args:
+        checks (Dict[str, HealthCheck]): The checks to run, by name.
+        interval (float): Seconds between samples.
+        timeout (float): Seconds a check may take before it is recorded as timed out.
+        max_age (float): Seconds after which a sample is stale.
+    """
+
+    def __init__(
+        self,
+        checks: Dict[str, HealthCheck],
+        interval: float = HEALTH_CHECK_INTERVAL,
+        timeout: float = HEALTH_CHECK_TIMEOUT,
+        max_age: float = HEALTH_CHECK_MAX_AGE,
+    ) -> None:
+        self.checks = checks
+        self.interval = interval
+        self.timeout = timeout
+        self.max_age = max_age
+
+        self._samples: Dict[str, HealthSample] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def get(self, name: str) -> Optional[HealthSample]:
+        """Returns the latest sample of the check, or None if not yet sampled."""
+        return self._samples.get(name)
+
+    def is_stale(self, sample: HealthSample) -> bool:
+        return sample.age > self.max_age
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="Sample health checks")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def sample(self) -> None:
+        """Runs all checks concurrently and records their results."""
+        names = list(self.checks)
+        results = await asyncio.gather(
+            *(asyncio.wait_for(self.checks[name](), self.timeout) for name in names),
+            return_exceptions=True,
+        )
+        sampled_at = time.monotonic()
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                logger.warning("Health check `{}` failed: {!r}", name, result)
+                self._samples[name] = HealthSample(None, result, sampled_at)
+            else:
+                self._samples[name] = HealthSample(result, None, sampled_at)
+
+    async def _run(self) -> NoReturn:
+        while True:
+            try:
+                await self.sample()
+            except Exception:  # pylint: disable=W0718
+                logger.exception("Unexpected error sampling health checks")
+            await asyncio.sleep(self.interval)
+
+
+async def init_health_sampler(
+    checks: Dict[str, HealthCheck],
+) -> AsyncGenerator[HealthSampler, Any]:
+    """
+    Resource provider for a started `HealthSampler`, stopped on shutdown.
+    """
+    sampler = HealthSampler(checks)
+    sampler.start()
+    try:
+        yield sampler
+    finally:
+        await sampler.stop()
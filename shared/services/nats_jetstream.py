@@ -11,9 +11,13 @@ from shared.log_config import get_logger
 logger = get_logger(__name__)
 
 
-async def init_nats_client() -> AsyncGenerator[JetStreamContext, Any]:
+async def connect_nats(**overrides) -> NATS:
     """
-    Initialize a connection to the NATS server with automatic reconnection handling.
+    Connect to the NATS server with automatic reconnection handling.
+
+    Args:
+        overrides: Optional keyword arguments that replace the default connect kwargs,
+            e.g. a custom `reconnected_cb`.
     """
     logger.debug("Initialise NATS server ...")
 
@@ -25,6 +29,7 @@ async def init_nats_client() -> AsyncGenerator[JetStreamContext, Any]:
         "disconnected_cb": disconnected_callback,
         "reconnected_cb": reconnected_callback,
         "closed_cb": closed_callback,
+        **overrides,
     }
 
     if NATS_CREDS_FILE:
@@ -41,6 +46,15 @@ async def init_nats_client() -> AsyncGenerator[JetStreamContext, Any]:
         raise e
 
     logger.debug("Connected to NATS server")
+    return nats_client
+
+
+async def init_nats_client() -> AsyncGenerator[JetStreamContext, Any]:
+    """
+    Initialize a connection to the NATS server with automatic reconnection handling.
+    """
+    nats_client = await connect_nats()
+
     jetstream: JetStreamContext = nats_client.jetstream()
     logger.debug("Yielding JetStream context ...")
 
@@ -0,0 +1,114 @@
+import inspect
+from typing import Any, AsyncGenerator, Awaitable, Callable, List, Optional, Union
+
+from nats.aio.client import Client as NATS
+from nats.aio.msg import Msg
+from nats.aio.subscription import Subscription
+from pydantic import ValidationError
+
+from shared.constants import TRUST_REGISTRY_EVENTS_SUBJECT
+from shared.log_config import get_logger
+from shared.models.trustregistry import TrustRegistryEvent
+from shared.services.nats_jetstream import connect_nats, reconnected_callback
+
+logger = get_logger(__name__)
+
+EventHandler = Callable[[TrustRegistryEvent], Union[None, Awaitable[None]]]
+ResetHandler = Callable[[], Union[None, Awaitable[None]]]
+
+
+class TrustRegistryEventSubscriber:
+    """
+    Subscribes to the trust registry change feed and dispatches each event to the
+    registered handlers, so that processes can evict or refresh cached registry data.
+
+    The feed is plain NATS pub/sub: every subscribed replica receives every event.
+    Events published while disconnected are missed, so reset handlers are called
+    after a reconnect, and caches should drop everything they hold at that point.
+
+    Only the endorser subscribes, to evict its valid issuers. The app's registry lists
+    are revalidated by ETag on every read, and its tenant caches hold no registry data.
+    """
+
+    def __init__(self, subject: str = TRUST_REGISTRY_EVENTS_SUBJECT) -> None:
+        self.subject = subject
+
+        self._event_handlers: List[EventHandler] = []
+        self._reset_handlers: List[ResetHandler] = []
+
+        self._nats_client: Optional[NATS] = None
+        self._subscription: Optional[Subscription] = None
+
+    def add_handler(
+        self, on_event: EventHandler, on_reset: Optional[ResetHandler] = None
+    ) -> None:
+        """
+        Register a cache to keep in sync with the trust registry.
+
+        Args:
+            on_event: Called with every received `TrustRegistryEvent`.
+            on_reset: Called when events may have been missed.
+        """
+        self._event_handlers.append(on_event)
+        if on_reset:
+            self._reset_handlers.append(on_reset)
+
+    async def start(self) -> None:
+        self._nats_client = await connect_nats(reconnected_cb=self._on_reconnected)
+        self._subscription = await self._nats_client.subscribe(
+            f"{self.subject}.>", cb=self._on_message
+        )
+        logger.info("Subscribed to trust registry events on `{}.>`", self.subject)
+
+    async def stop(self) -> None:
+        if self._subscription:
+            await self._subscription.unsubscribe()
+            self._subscription = None
+        if self._nats_client:
+            await self._nats_client.close()
+            self._nats_client = None
+        logger.info("Unsubscribed from trust registry events.")
+
+    async def _on_message(self, message: Msg) -> None:
+        try:
+            event = TrustRegistryEvent.model_validate_json(message.data)
+        except ValidationError:
+            logger.warning(
+                "Ignoring malformed trust registry event on `{}`: {}",
+                message.subject,
+                message.data,
+            )
+            return
+
+        logger.debug("Received trust registry event: {}", event)
+        for handler in self._event_handlers:
+            await _call_handler(handler, event)
+
+    async def _on_reconnected(self) -> None:
+        await reconnected_callback()
+        logger.info("Trust registry events may have been missed; resetting caches")
+        for handler in self._reset_handlers:
+            await _call_handler(handler)
+
+
+async def _call_handler(handler: Callable, *args: Any) -> None:
+    try:
+        result = handler(*args)
+        if inspect.isawaitable(result):
+            await result
+    except Exception:  # pylint: disable=W0718
+        logger.exception("Trust registry event handler `{}` failed", handler)
+
+
+async def init_trust_registry_event_subscriber() -> (
+    AsyncGenerator[TrustRegistryEventSubscriber, Any]
+):
+    """
+    Resource provider for a started `TrustRegistryEventSubscriber`.
+    """
+    subscriber = TrustRegistryEventSubscriber()
+    await subscriber.start()
+    try:
+        yield subscriber
+    finally:
+        await subscriber.stop()
@@ -0,0 +1,49 @@
+from unittest.mock import patch
+
+from shared.util.cache import BoundedCache
+
+
+def test_bounded_cache_get_set():
+    cache = BoundedCache(maxsize=2)
+
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert len(cache) == 1
+
+
+def test_bounded_cache_evicts_least_recently_used():
+    cache = BoundedCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now the least recently used
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_bounded_cache_ttl():
+    cache = BoundedCache(maxsize=2, ttl=10)
+
+    with patch("shared.util.cache.time.monotonic", return_value=100):
+        cache.set("a", 1)
+    with patch("shared.util.cache.time.monotonic", return_value=109):
+        assert cache.get("a") == 1
+    with patch("shared.util.cache.time.monotonic", return_value=111):
+        assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_bounded_cache_pop_and_clear():
+    cache = BoundedCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.pop("a")
+    cache.pop("missing")
+    assert cache.get("a") is None
+
+    cache.clear()
+    assert len(cache) == 0
@@ -0,0 +1,72 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from shared.services.health_sampler import HealthSampler, init_health_sampler
+
+
+@pytest.mark.anyio
+async def test_sample():
+    health_sampler = HealthSampler(
+        {
+            "working": AsyncMock(return_value={"is_working": True}),
+            "failing": AsyncMock(side_effect=Exception("Failed")),
+        }
+    )
+    assert health_sampler.get("working") is None
+
+    await health_sampler.sample()
+
+    working = health_sampler.get("working")
+    assert working.status == {"is_working": True}
+    assert working.error is None
+    assert not health_sampler.is_stale(working)
+
+    failing = health_sampler.get("failing")
+    assert failing.status is None
+    assert str(failing.error) == "Failed"
+
+
+@pytest.mark.anyio
+async def test_sample_timeout():
+    async def hanging_check():
+        await asyncio.sleep(10)
+
+    health_sampler = HealthSampler({"hanging": hanging_check}, timeout=0.01)
+
+    await health_sampler.sample()
+
+    assert isinstance(health_sampler.get("hanging").error, asyncio.TimeoutError)
+
+
+@pytest.mark.anyio
+async def test_is_stale():
+    health_sampler = HealthSampler(
+        {"check": AsyncMock(return_value={"is_working": True})}, max_age=0.01
+    )
+    await health_sampler.sample()
+    sample = health_sampler.get("check")
+
+    await asyncio.sleep(0.02)
+
+    assert health_sampler.is_stale(sample)
+
+
+@pytest.mark.anyio
+async def test_samples_on_interval():
+    check = AsyncMock(return_value={"is_working": True})
+
+    resource = init_health_sampler({"check": check})
+    health_sampler = await resource.__anext__()
+    health_sampler.interval = 0.01
+    await asyncio.sleep(0.05)
+    await resource.aclose()
+
+    assert check.await_count > 1
+    assert health_sampler.get("check").status == {"is_working": True}
+
+    # Stopped on shutdown
+    await_count = check.await_count
+    await asyncio.sleep(0.03)
+    assert check.await_count == await_count
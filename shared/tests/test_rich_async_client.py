@@ -130,3 +130,15 @@ def mock_response(monkeypatch):
         return Response(200, request=Request("GET", test_url), text="Success")
 
     monkeypatch.setattr(RichAsyncClient, "_request_with_retries", mock_send)
+
+
+@pytest.mark.anyio
+async def test_rich_async_client_not_modified(monkeypatch):
+    async def mock_get(_, __, **___):
+        return Response(304, request=Request("GET", test_url))
+
+    monkeypatch.setattr(AsyncClient, "get", mock_get)
+
+    async with RichAsyncClient() as client:
+        response = await client.get(test_url, headers={"If-None-Match": '"1"'})
+        assert response.status_code == 304
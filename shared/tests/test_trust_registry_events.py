@@ -0,0 +1,111 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from nats.aio.client import Client as NATS
+
+from shared.models.trustregistry import TrustRegistryEvent
+from shared.services.trust_registry_events import (
+    TrustRegistryEventSubscriber,
+    init_trust_registry_event_subscriber,
+)
+
+event = TrustRegistryEvent(
+    entity="actor",
+    action="updated",
+    id="actor-id",
+    data={"id": "actor-id", "name": "Alice"},
+)
+
+
+def _message(data: bytes) -> MagicMock:
+    message = MagicMock()
+    message.subject = "cloudapi.trustregistry.events.actor.updated"
+    message.data = data
+    return message
+
+
+@pytest.mark.anyio
+async def test_start_and_stop():
+    mock_nats = AsyncMock(spec=NATS)
+    subscriber = TrustRegistryEventSubscriber(subject="registry")
+
+    with patch(
+        "shared.services.trust_registry_events.connect_nats", return_value=mock_nats
+    ) as mock_connect:
+        await subscriber.start()
+        await subscriber.stop()
+
+    mock_connect.assert_awaited_once()
+    mock_nats.subscribe.assert_awaited_once()
+    assert mock_nats.subscribe.call_args.args == ("registry.>",)
+    mock_nats.subscribe.return_value.unsubscribe.assert_awaited_once()
+    mock_nats.close.assert_awaited_once()
+
+
+@pytest.mark.anyio
+async def test_on_message_dispatches_to_sync_and_async_handlers():
+    subscriber = TrustRegistryEventSubscriber()
+    sync_handler = MagicMock()
+    async_handler = AsyncMock()
+    subscriber.add_handler(sync_handler)
+    subscriber.add_handler(async_handler)
+
+    await subscriber._on_message(  # pylint: disable=protected-access
+        _message(event.model_dump_json().encode())
+    )
+
+    sync_handler.assert_called_once_with(event)
+    async_handler.assert_awaited_once_with(event)
+
+
+@pytest.mark.anyio
+async def test_on_message_handler_error_does_not_stop_dispatch():
+    subscriber = TrustRegistryEventSubscriber()
+    failing_handler = MagicMock(side_effect=Exception("boom"))
+    handler = MagicMock()
+    subscriber.add_handler(failing_handler)
+    subscriber.add_handler(handler)
+
+    await subscriber._on_message(  # pylint: disable=protected-access
+        _message(event.model_dump_json().encode())
+    )
+
+    handler.assert_called_once_with(event)
+
+
+@pytest.mark.anyio
+async def test_on_message_malformed():
+    subscriber = TrustRegistryEventSubscriber()
+    handler = MagicMock()
+    subscriber.add_handler(handler)
+
+    await subscriber._on_message(  # pylint: disable=protected-access
+        _message(b'{"entity": "unknown"}')
+    )
+
+    handler.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_on_reconnected_resets_caches():
+    subscriber = TrustRegistryEventSubscriber()
+    on_event = MagicMock()
+    on_reset = MagicMock()
+    subscriber.add_handler(on_event, on_reset)
+
+    await subscriber._on_reconnected()  # pylint: disable=protected-access
+
+    on_reset.assert_called_once_with()
+    on_event.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_init_trust_registry_event_subscriber():
+    with patch.object(
+        TrustRegistryEventSubscriber, "start"
+    ) as mock_start, patch.object(TrustRegistryEventSubscriber, "stop") as mock_stop:
+        async for subscriber in init_trust_registry_event_subscriber():
+            assert isinstance(subscriber, TrustRegistryEventSubscriber)
+            mock_start.assert_awaited_once()
+
+        mock_stop.assert_awaited_once()
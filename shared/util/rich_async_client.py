@@ -46,7 +46,8 @@ class RichAsyncClient(AsyncClient):
         self.retry_wait_seconds = retry_wait_seconds
 
     async def _handle_response(self, response: Response) -> Response:
-        if self.raise_status_error:
+        # 304 Not Modified is the expected answer to a conditional request
+        if self.raise_status_error and response.status_code != 304:
             response.raise_for_status()  # Raise exception for 4xx and 5xx status codes
         return response
 
@@ -0,0 +1,183 @@
+"""
+Load benchmark of the trust registry HTTP API.
+
+Seeds actors and schemas into a database (an in-memory SQLite stand-in by default, or
+the database at `--database-url`), then drives the FastAPI app in-process over httpx's
+ASGI transport. Reports p50/p99 latency and requests per second for lookups by id, DID
+and name, the list endpoints (in full and revalidated with `If-None-Match`), and
+concurrent actor registrations.
+
+    python -m trustregistry.benchmarks.bench_api --actors 100000 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from contextlib import ExitStack
+from typing import Any, Dict, List, Tuple
+from unittest.mock import patch
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.orm import sessionmaker
+
+from trustregistry.benchmarks.seed import (
+    actor_did,
+    actor_id,
+    actor_name,
+    create_database,
+    schema_id,
+    seed,
+)
+from trustregistry.db import get_db, get_read_db
+from trustregistry.main import app
+
+# (method, url, request kwargs)
+Request = Tuple[str, str, Dict[str, Any]]
+
+QUIET_LOGGERS = [
+    "trustregistry.crud.logger",
+    "trustregistry.main.logger",
+    "trustregistry.registry.registry_actors.logger",
+    "trustregistry.registry.registry_schemas.logger",
+]
+
+
+async def time_requests(
+    client: AsyncClient, requests: List[Request], concurrency: int
+) -> Dict[str, float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    timings: List[float] = []
+    errors = 0
+
+    async def send(method: str, url: str, kwargs: Dict[str, Any]) -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            timings.append(time.perf_counter() - start)
+            if response.is_error:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(send(*request) for request in requests))
+    elapsed = time.perf_counter() - start
+
+    quantiles = statistics.quantiles(timings, n=100)
+    return {
+        "p50_ms": quantiles[49] * 1e3,
+        "p99_ms": quantiles[98] * 1e3,
+        "requests_per_s": len(timings) / elapsed,
+        "errors": errors,
+    }
+
+
+async def run(
+    database_url: str,
+    num_actors: int,
+    num_schemas: int,
+    num_requests: int,
+    concurrency: int,
+) -> None:
+    engine = create_database(database_url)
+    print(f"Seeding {num_actors} actors and {num_schemas} schemas ...")
+    seed(engine, num_actors, num_schemas)
+
+    session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+
+    def get_benchmark_db():
+        with session_factory() as db_session:
+            yield db_session
+
+    app.dependency_overrides[get_db] = get_benchmark_db
+    app.dependency_overrides[get_read_db] = get_benchmark_db
+
+    picks = [random.randrange(num_actors) for _ in range(num_requests)]
+    schema_picks = [random.randrange(num_schemas) for _ in range(num_requests)]
+    num_list_requests = max(num_requests // 100, 10)
+    scenarios: Dict[str, List[Request]] = {
+        "actor by id": [("GET", f"/registry/actors/{actor_id(i)}", {}) for i in picks],
+        "actor by did": [
+            ("GET", f"/registry/actors/did/{actor_did(i)}", {}) for i in picks
+        ],
+        "actor by name": [
+            ("GET", f"/registry/actors/name/{actor_name(i)}", {}) for i in picks
+        ],
+        "schema by id": [
+            ("GET", f"/registry/schemas/{schema_id(i)}", {}) for i in schema_picks
+        ],
+        "list actors": [("GET", "/registry/actors", {})] * num_list_requests,
+        "list schemas": [("GET", "/registry/schemas", {})] * num_list_requests,
+        "registry": [("GET", "/registry", {})] * num_list_requests,
+    }
+
+    print(
+        f"{'scenario':<22}{'p50 (ms)':>10}{'p99 (ms)':>10}"
+        f"{'req/s':>10}{'errors':>8}"
+    )
+    with ExitStack() as stack:
+        for quiet_logger in QUIET_LOGGERS:
+            stack.enter_context(patch(quiet_logger))
+
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://trustregistry"
+        ) as client:
+            # Revalidating the lists with their current ETags, before any writes
+            for name, url in [
+                ("list actors (304)", "/registry/actors"),
+                ("list schemas (304)", "/registry/schemas"),
+            ]:
+                etag = (await client.get(url)).headers.get("ETag", "")
+                scenarios[name] = [
+                    ("GET", url, {"headers": {"If-None-Match": etag}})
+                ] * num_list_requests
+            scenarios["register actor"] = [
+                (
+                    "POST",
+                    "/registry/actors",
+                    {
+                        "json": {
+                            "id": actor_id(num_actors + i),
+                            "name": actor_name(num_actors + i),
+                            "roles": ["issuer"],
+                            "did": actor_did(num_actors + i),
+                        }
+                    },
+                )
+                for i in range(num_requests)
+            ]
+
+            for name, requests in scenarios.items():
+                result = await time_requests(client, requests, concurrency)
+                print(
+                    f"{name:<22}{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+                    f"{result['requests_per_s']:>10.0f}{result['errors']:>8}"
+                )
+
+    app.dependency_overrides.clear()
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--actors", type=int, default=10000)
+    parser.add_argument("--schemas", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    asyncio.run(
+        run(
+            args.database_url,
+            args.actors,
+            args.schemas,
+            args.requests,
+            args.concurrency,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark registry lookups served from the in-memory snapshot against the database.
+
+Seeds actors and schemas into a database (an in-memory SQLite stand-in by default, or
+the database at `--database-url`), then times the snapshot load and lookups by id, DID
+and name, and schema-by-id, through the crud functions with and without the snapshot.
+
+    python -m trustregistry.benchmarks.bench_snapshot --actors 100000
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import Callable, Dict, List
+from unittest.mock import patch
+
+from sqlalchemy.orm import Session
+
+from trustregistry import crud
+from trustregistry.benchmarks.seed import (
+    actor_did,
+    actor_id,
+    actor_name,
+    create_database,
+    schema_id,
+    seed,
+)
+from trustregistry.snapshot import RegistrySnapshot
+
+
+def time_lookups(lookup: Callable[[str], object], keys: List[str]) -> Dict[str, float]:
+    timings = []
+    for key in keys:
+        start = time.perf_counter()
+        lookup(key)
+        timings.append(time.perf_counter() - start)
+
+    quantiles = statistics.quantiles(timings, n=100)
+    return {
+        "p50_us": quantiles[49] * 1e6,
+        "p99_us": quantiles[98] * 1e6,
+        "ops_per_s": len(timings) / sum(timings),
+    }
+
+
+def run(database_url: str, num_actors: int, num_schemas: int, num_lookups: int):
+    engine = create_database(database_url)
+    print(f"Seeding {num_actors} actors and {num_schemas} schemas ...")
+    seed(engine, num_actors, num_schemas)
+
+    snapshot = RegistrySnapshot()
+    snapshot._db_engine = engine  # pylint: disable=protected-access
+    start = time.perf_counter()
+    asyncio.run(snapshot.reload())
+    snapshot.is_ready = True
+    print(f"Snapshot load: {time.perf_counter() - start:.2f}s")
+
+    picks = [random.randrange(num_actors) for _ in range(num_lookups)]
+    schema_picks = [random.randrange(num_schemas) for _ in range(num_lookups)]
+    lookups = {
+        "actor by id": (crud.get_actor_by_id, [actor_id(i) for i in picks]),
+        "actor by did": (crud.get_actor_by_did, [actor_did(i) for i in picks]),
+        "actor by name": (crud.get_actor_by_name, [actor_name(i) for i in picks]),
+        "schema by id": (crud.get_schema_by_id, [schema_id(i) for i in schema_picks]),
+    }
+
+    print(f"{'lookup':<16}{'source':<10}{'p50 (us)':>12}{'p99 (us)':>12}{'ops/s':>12}")
+    with Session(engine) as db_session, patch("trustregistry.crud.logger"):
+        for name, (crud_lookup, keys) in lookups.items():
+            for source, registry_snapshot in (
+                ("database", RegistrySnapshot()),
+                ("snapshot", snapshot),
+            ):
+                with patch("trustregistry.crud.registry_snapshot", registry_snapshot):
+                    result = time_lookups(
+                        lambda key, lookup=crud_lookup: lookup(db_session, key), keys
+                    )
+                print(
+                    f"{name:<16}{source:<10}{result['p50_us']:>12.1f}"
+                    f"{result['p99_us']:>12.1f}{result['ops_per_s']:>12.0f}"
+                )
+
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--actors", type=int, default=100000)
+    parser.add_argument("--schemas", type=int, default=10000)
+    parser.add_argument("--lookups", type=int, default=5000)
+    args = parser.parse_args()
+
+    run(args.database_url, args.actors, args.schemas, args.lookups)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Local database stand-in and seed data shared by the benchmarks."""
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import StaticPool
+
+from trustregistry import db
+from trustregistry.database import Base
+
+SEED_BATCH_SIZE = 10000
+
+
+def actor_id(i: int) -> str:
+    return f"actor-{i}"
+
+
+def actor_did(i: int) -> str:
+    return f"did:sov:{i:022d}"
+
+
+def actor_name(i: int) -> str:
+    return f"Actor {i}"
+
+
+def schema_id(i: int) -> str:
+    return f"{i:022d}:2:schema:{i}.0"
+
+
+def create_database(database_url: str) -> Engine:
+    if database_url.startswith("sqlite"):
+        engine = create_engine(
+            database_url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    else:
+        engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def seed(engine: Engine, num_actors: int, num_schemas: int) -> None:
+    actors = [
+        {
+            "id": actor_id(i),
+            "name": actor_name(i),
+            "roles": "issuer,verifier" if i % 2 else "verifier",
+            "did": actor_did(i),
+            "didcomm_invitation": None,
+            "image_url": None,
+        }
+        for i in range(num_actors)
+    ]
+    schemas = [
+        {
+            "id": schema_id(i),
+            "did": f"{i:022d}",
+            "name": "schema",
+            "version": f"{i}.0",
+        }
+        for i in range(num_schemas)
+    ]
+    with engine.begin() as connection:
+        for offset in range(0, num_actors, SEED_BATCH_SIZE):
+            connection.execute(
+                insert(db.Actor), actors[offset : offset + SEED_BATCH_SIZE]
+            )
+        for offset in range(0, num_schemas, SEED_BATCH_SIZE):
+            connection.execute(
+                insert(db.Schema), schemas[offset : offset + SEED_BATCH_SIZE]
+            )
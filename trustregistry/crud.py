@@ -1,17 +1,29 @@
-from typing import List
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Literal, Optional, Set, Type, Union
+from uuid import uuid4
 
-from sqlalchemy import ScalarResult, delete, select, update
+from sqlalchemy import delete, exists, literal, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from shared.log_config import get_logger
 from shared.models.trustregistry import Actor, Schema
 from trustregistry import db
+from trustregistry.events import registry_event_publisher
+from trustregistry.snapshot import registry_snapshot
 
 logger = get_logger(__name__)
 
 
 def get_actors(db_session: Session, skip: int = 0, limit: int = 1000) -> List[db.Actor]:
+    if registry_snapshot.is_ready:
+        snapshot_actors = registry_snapshot.get_actors(skip=skip, limit=limit)
+        if snapshot_actors is not None:
+            logger.debug("Serving all actors from snapshot (limit = {})", limit)
+            return snapshot_actors
+
     logger.info("Querying all actors from database (limit = {})", limit)
 
     query = select(db.Actor).offset(skip).limit(limit)
@@ -30,10 +42,29 @@ def get_actors(db_session: Session, skip: int = 0, limit: int = 1000) -> List[db
     return result
 
 
+def get_data_version(db_session: Session) -> int:
+    """
+    Return the registry's data version, which increases with every committed write.
+    """
+    if registry_snapshot.is_ready:
+        version = registry_snapshot.get_version()
+        if version is not None:
+            return version
+
+    query = select(db.RegistryVersion.version).where(db.RegistryVersion.id == 1)
+    return db_session.scalar(query) or 0
+
+
 def get_actor_by_did(db_session: Session, actor_did: str) -> db.Actor:
     bound_logger = logger.bind(body={"actor_did": actor_did})
     bound_logger.info("Querying actor by DID")
 
+    if registry_snapshot.is_ready:
+        snapshot_actor = registry_snapshot.get_actor_by_did(actor_did)
+        if snapshot_actor:
+            bound_logger.debug("Successfully retrieved actor from snapshot.")
+            return snapshot_actor
+
     query = select(db.Actor).where(db.Actor.did == actor_did)
     result = db_session.scalars(query).first()
 
@@ -50,6 +81,12 @@ def get_actor_by_id(db_session: Session, actor_id: str) -> db.Actor:
     bound_logger = logger.bind(body={"actor_id": actor_id})
     bound_logger.info("Querying actor by ID")
 
+    if registry_snapshot.is_ready:
+        snapshot_actor = registry_snapshot.get_actor_by_id(actor_id)
+        if snapshot_actor:
+            bound_logger.debug("Successfully retrieved actor from snapshot.")
+            return snapshot_actor
+
     query = select(db.Actor).where(db.Actor.id == actor_id)
     result = db_session.scalars(query).first()
 
@@ -66,6 +103,12 @@ def get_actor_by_name(db_session: Session, actor_name: str) -> db.Actor:
     bound_logger = logger.bind(body={"actor_name": actor_name})
     bound_logger.info("Query actor by name")
 
+    if registry_snapshot.is_ready:
+        snapshot_actor = registry_snapshot.get_actor_by_name(actor_name)
+        if snapshot_actor:
+            bound_logger.debug("Successfully retrieved actor from snapshot")
+            return snapshot_actor
+
     query = select(db.Actor).where(db.Actor.name == actor_name)
     result = db_session.scalars(query).one_or_none()
 
@@ -78,18 +121,33 @@ def get_actor_by_name(db_session: Session, actor_name: str) -> db.Actor:
     return result
 
 
-def create_actor(db_session: Session, actor: Actor) -> db.Actor:
-    bound_logger = logger.bind(body={"actor": actor})
+def create_actor(
+    db_session: Session, actor: Actor, reservation_id: Optional[str] = None
+) -> db.Actor:
+    """
+    Create an actor, consuming the reservation of its name with `reservation_id`. A name
+    that is reserved under another ID can't be registered until the reservation expires.
+    """
+    bound_logger = logger.bind(body={"actor": actor, "reservation_id": reservation_id})
     bound_logger.info("Try to create actor in database")
 
     try:
+        if _reserved_names(db_session, {actor.name: reservation_id}):
+            db_session.rollback()
+            bound_logger.info("Bad request: Actor name is reserved already.")
+            raise ActorNameReservedException(
+                f"Bad request: The actor name `{actor.name}` is reserved already."
+            )
+
         bound_logger.debug("Adding actor to database")
         db_actor = db.Actor(**actor.model_dump())
         db_session.add(db_actor)
+        db_session.execute(_consume_reservations_query({actor.name: reservation_id}))
         db_session.commit()
         db_session.refresh(db_actor)
 
         bound_logger.debug("Successfully added actor to database.")
+        _on_committed("actor", "created", db_actor)
         return db_actor
 
     except IntegrityError as e:
@@ -136,6 +194,9 @@ def create_actor(db_session: Session, actor: Actor) -> db.Actor:
                 f"Bad request: Unique constraint violated - {constraint_violation}"
             ) from e
 
+    except ActorNameReservedException:
+        raise
+
     except Exception as e:
         bound_logger.exception("Something went wrong during actor creation.")
         raise e
@@ -143,61 +204,161 @@ def create_actor(db_session: Session, actor: Actor) -> db.Actor:
 
 def delete_actor(db_session: Session, actor_id: str) -> db.Actor:
     bound_logger = logger.bind(body={"actor_id": actor_id})
-    bound_logger.info("Delete actor from database. First assert actor ID exists")
+    bound_logger.info("Delete actor from database")
 
-    query = select(db.Actor).where(db.Actor.id == actor_id)
-    db_actor = db_session.scalars(query).one_or_none()
+    query_delete = delete(db.Actor).where(db.Actor.id == actor_id).returning(db.Actor)
+    db_actor = db_session.scalars(query_delete).first()
 
     if not db_actor:
+        db_session.rollback()
         bound_logger.info("Requested actor ID to delete does not exist in database.")
         raise ActorDoesNotExistException
 
-    bound_logger.debug("Deleting actor")
-    query_delete = delete(db.Actor).where(db.Actor.id == actor_id)
-    db_session.execute(query_delete)
     db_session.commit()
 
     bound_logger.debug("Successfully deleted actor ID.")
+    _on_committed("actor", "deleted", db_actor)
     return db_actor
 
 
 def update_actor(db_session: Session, actor: Actor) -> db.Actor:
+    """
+    Update an actor. It can't be renamed to a name that is reserved, as the reservation
+    is held for another actor.
+    """
     bound_logger = logger.bind(body={"actor": actor})
-    bound_logger.info("Update actor in database. First assert actor ID exists")
-
-    query = select(db.Actor).where(db.Actor.id == actor.id)
-    db_actor = db_session.scalars(query).one_or_none()
-
-    if not db_actor:
-        bound_logger.info("Requested actor ID to update does not exist in database.")
-        raise ActorDoesNotExistException
-
-    bound_logger.debug("Updating actor")
+    bound_logger.info("Update actor in database")
+
+    values = {
+        "name": actor.name,
+        "roles": actor.roles,
+        "didcomm_invitation": actor.didcomm_invitation,
+        "did": actor.did,
+    }
+    if actor.image_url:  # Otherwise, keep the existing image_url
+        values["image_url"] = actor.image_url
+
+    name_reserved = exists().where(
+        db.ActorNameReservation.name == actor.name,
+        db.ActorNameReservation.expires_at > datetime.now(timezone.utc),
+    )
     update_query = (
         update(db.Actor)
-        .where(db.Actor.id == actor.id)
-        .values(
-            name=actor.name,
-            roles=actor.roles,
-            didcomm_invitation=actor.didcomm_invitation,
-            did=actor.did,
-            image_url=actor.image_url if actor.image_url else db_actor.image_url,
+        .where(
+            db.Actor.id == actor.id, or_(db.Actor.name == actor.name, ~name_reserved)
         )
+        .values(**values)
         .returning(db.Actor)
     )
+    updated_actor = db_session.scalars(update_query).first()
 
-    result: ScalarResult[db.Actor] = db_session.scalars(update_query)
-    db_session.commit()
+    if not updated_actor:
+        name_is_reserved = db_session.scalar(select(name_reserved))
+        db_session.rollback()
+        if name_is_reserved:
+            bound_logger.info("Bad request: Actor name is reserved already.")
+            raise ActorNameReservedException(
+                f"Bad request: The actor name `{actor.name}` is reserved already."
+            )
+        bound_logger.info("Requested actor ID to update does not exist in database.")
+        raise ActorDoesNotExistException
 
-    updated_actor = result.first()
+    db_session.commit()
 
     bound_logger.debug("Successfully updated actor.")
+    _on_committed("actor", "updated", updated_actor)
     return updated_actor
 
 
+def reserve_actor_name(
+    db_session: Session, actor_name: str, ttl: int
+) -> db.ActorNameReservation:
+    """
+    Reserve an actor name for `ttl` seconds, unless an actor has the name or it is
+    reserved already. Both are checked by the INSERT itself, which also replaces an
+    expired reservation of the name, so that of concurrent requests for a name, only one
+    can reserve it.
+    """
+    bound_logger = logger.bind(body={"actor_name": actor_name, "ttl": ttl})
+    bound_logger.info("Reserve actor name in database")
+
+    now = datetime.now(timezone.utc)
+    reservation = select(
+        literal(actor_name, db.ActorNameReservation.name.type),
+        literal(uuid4().hex, db.ActorNameReservation.id.type),
+        literal(now + timedelta(seconds=ttl), db.ActorNameReservation.expires_at.type),
+    ).where(~exists().where(db.Actor.name == actor_name))
+    insert = _dialect_insert(db_session, db.ActorNameReservation).from_select(
+        ["name", "id", "expires_at"], reservation
+    )
+    query = insert.on_conflict_do_update(
+        index_elements=[db.ActorNameReservation.name],
+        set_={"id": insert.excluded.id, "expires_at": insert.excluded.expires_at},
+        where=db.ActorNameReservation.expires_at <= now,
+    ).returning(db.ActorNameReservation)
+    # The replaced reservation may be in the session already, so refresh it from the row
+    db_reservation = db_session.scalars(
+        query, execution_options={"populate_existing": True}
+    ).first()
+
+    if not db_reservation:
+        actor_exists = db_session.scalar(
+            select(exists().where(db.Actor.name == actor_name))
+        )
+        db_session.rollback()
+        if actor_exists:
+            bound_logger.info(
+                "Bad request: An actor with name already exists in database."
+            )
+            raise ActorAlreadyExistsException(
+                f"Bad request: An actor with name: `{actor_name}` already exists in database."
+            )
+        bound_logger.info("Bad request: Actor name is reserved already.")
+        raise ActorNameReservedException(
+            f"Bad request: The actor name `{actor_name}` is reserved already."
+        )
+
+    db_session.commit()
+
+    bound_logger.debug("Successfully reserved actor name.")
+    return db_reservation
+
+
+def release_actor_name(
+    db_session: Session, reservation_id: str
+) -> db.ActorNameReservation:
+    bound_logger = logger.bind(body={"reservation_id": reservation_id})
+    bound_logger.info("Release actor name reservation from database")
+
+    query_delete = (
+        delete(db.ActorNameReservation)
+        .where(db.ActorNameReservation.id == reservation_id)
+        .returning(db.ActorNameReservation)
+    )
+    db_reservation = db_session.scalars(query_delete).first()
+
+    if not db_reservation:
+        db_session.rollback()
+        bound_logger.info(
+            "Requested reservation to release does not exist in database."
+        )
+        raise ReservationDoesNotExistException
+
+    db_session.commit()
+
+    bound_logger.debug("Successfully released actor name.")
+    return db_reservation
+
+
 def get_schemas(
     db_session: Session, skip: int = 0, limit: int = 1000
 ) -> List[db.Schema]:
+    if registry_snapshot.is_ready:
+        snapshot_schemas = registry_snapshot.get_schemas(skip=skip, limit=limit)
+        if snapshot_schemas is not None:
+            logger.debug("Serving all schemas from snapshot (limit = {})", limit)
+            return snapshot_schemas
+
     logger.debug("Query all schemas from database (limit = {})", limit)
     query = select(db.Schema).offset(skip).limit(limit)
     result = db_session.scalars(query).all()
@@ -219,6 +380,12 @@ def get_schema_by_id(db_session: Session, schema_id: str) -> db.Schema:
     bound_logger = logger.bind(body={"schema_id": schema_id})
     bound_logger.info("Querying for schema by ID")
 
+    if registry_snapshot.is_ready:
+        snapshot_schema = registry_snapshot.get_schema_by_id(schema_id)
+        if snapshot_schema:
+            bound_logger.debug("Successfully retrieved schema from snapshot.")
+            return snapshot_schema
+
     query = select(db.Schema).where(db.Schema.id == schema_id)
     result = db_session.scalars(query).first()
 
@@ -231,42 +398,45 @@ def get_schema_by_id(db_session: Session, schema_id: str) -> db.Schema:
 
 def create_schema(db_session: Session, schema: Schema) -> db.Schema:
     bound_logger = logger.bind(body={"schema": schema})
-    bound_logger.info(
-        "Create schema in database. First assert schema ID does not already exist"
-    )
+    bound_logger.info("Create schema in database")
 
-    query = select(db.Schema).where(db.Schema.id == schema.id)
-    db_schema = db_session.scalars(query).one_or_none()
+    db_schema = db_session.scalars(_insert_schema_query(db_session, schema)).first()
 
-    if db_schema:
+    if not db_schema:
+        db_session.rollback()
         bound_logger.info("The requested schema ID already exists in database.")
         raise SchemaAlreadyExistsException
 
-    bound_logger.debug("Adding schema to database")
-
-    db_schema = db.Schema(**schema.model_dump())
-    db_session.add(db_schema)
     db_session.commit()
-    db_session.refresh(db_schema)
 
     bound_logger.debug("Successfully added schema to database.")
+    _on_committed("schema", "created", db_schema)
     return db_schema
 
 
-def update_schema(db_session: Session, schema: Schema, schema_id: str) -> db.Schema:
-    bound_logger = logger.bind(body={"schema": schema, "schema_id": schema_id})
-    bound_logger.info("Update schema in database. First assert schema ID exists")
+def upsert_schema(db_session: Session, schema: Schema) -> db.Schema:
+    """
+    Register a schema if it does not exist yet. Idempotent: as the schema ID determines all
+    other fields, an existing schema with the same ID is returned unchanged, without a write.
+    """
+    bound_logger = logger.bind(body={"schema": schema})
+    bound_logger.info("Upsert schema in database")
 
-    query = select(db.Schema).where(db.Schema.id == schema_id)
-    db_schema = db_session.scalars(query).one_or_none()
+    db_schema = db_session.scalars(_insert_schema_query(db_session, schema)).first()
+    db_session.commit()
 
     if not db_schema:
-        bound_logger.debug(
-            "Requested to update a schema that does not exist in database."
-        )
-        raise SchemaDoesNotExistException
+        bound_logger.debug("Schema already exists in database.")
+        return db.Schema(**schema.model_dump())
+
+    bound_logger.debug("Successfully added schema to database.")
+    _on_committed("schema", "created", db_schema)
+    return db_schema
 
-    bound_logger.debug("Updating schema on database")
+
+def update_schema(db_session: Session, schema: Schema, schema_id: str) -> db.Schema:
+    bound_logger = logger.bind(body={"schema": schema, "schema_id": schema_id})
+    bound_logger.info("Update schema in database")
 
     update_query = (
         update(db.Schema)
@@ -274,35 +444,228 @@ def update_schema(db_session: Session, schema: Schema, schema_id: str) -> db.Sch
         .values(id=schema.id, name=schema.name, version=schema.version, did=schema.did)
         .returning(db.Schema)
     )
+    updated_schema = db_session.scalars(update_query).first()
 
-    result: ScalarResult[db.Schema] = db_session.scalars(update_query)
-    db_session.commit()
+    if not updated_schema:
+        db_session.rollback()
+        bound_logger.debug(
+            "Requested to update a schema that does not exist in database."
+        )
+        raise SchemaDoesNotExistException
 
-    updated_schema = result.first()
+    db_session.commit()
 
     bound_logger.debug("Successfully updated schema on database.")
+    _on_committed("schema", "updated", updated_schema, previous_id=schema_id)
     return updated_schema
 
 
 def delete_schema(db_session: Session, schema_id: str) -> db.Schema:
     bound_logger = logger.bind(body={"schema_id": schema_id})
-    bound_logger.info("Delete schema from database. First assert schema ID exists")
+    bound_logger.info("Delete schema from database")
 
-    query_does_exists = select(db.Schema).where(db.Schema.id == schema_id)
-    db_schema = db_session.scalars(query_does_exists).one_or_none()
+    query_delete = (
+        delete(db.Schema).where(db.Schema.id == schema_id).returning(db.Schema)
+    )
+    bound_logger.debug("Deleting schema from database")
+    db_schema = db_session.scalars(query_delete).first()
 
     if not db_schema:
+        db_session.rollback()
         raise SchemaDoesNotExistException
 
-    query_delete = delete(db.Schema).where(db.Schema.id == schema_id)
-    bound_logger.debug("Deleting schema from database")
-    db_session.execute(query_delete)
     db_session.commit()
 
     bound_logger.debug("Successfully deleted schema from database.")
+    _on_committed("schema", "deleted", db_schema)
     return db_schema
 
 
+def bulk_create_actors(
+    db_session: Session,
+    actors: List[Actor],
+    reservation_ids: Optional[Dict[str, str]] = None,
+) -> Set[str]:
+    """
+    Insert a batch of actors in one statement and transaction, consuming the reservations
+    of their names, by actor ID in `reservation_ids`. Actors that conflict with an
+    existing actor, or with an earlier one in the batch, are skipped, as are actors whose
+    name is reserved under another ID.
+
+    Returns:
+        The IDs of the actors that were created.
+    """
+    logger.info("Bulk inserting {} actors", len(actors))
+    reservation_ids = reservation_ids or {}
+
+    rows = {}
+    for actor in actors:
+        rows.setdefault(actor.id, actor.model_dump())
+
+    query = (
+        _dialect_insert(db_session, db.Actor)
+        .on_conflict_do_nothing()
+        .returning(db.Actor.id)
+    )
+    try:
+        reserved_names = _reserved_names(
+            db_session,
+            {row["name"]: reservation_ids.get(row["id"]) for row in rows.values()},
+        )
+        rows = {
+            actor_id: row
+            for actor_id, row in rows.items()
+            if row["name"] not in reserved_names
+        }
+        created_ids = (
+            set(db_session.scalars(query, list(rows.values())).all()) if rows else set()
+        )
+        if created_ids:
+            db_session.execute(
+                _consume_reservations_query(
+                    {
+                        rows[actor_id]["name"]: reservation_ids.get(actor_id)
+                        for actor_id in created_ids
+                    }
+                )
+            )
+        db_session.commit()
+    except Exception:
+        db_session.rollback()
+        logger.exception("Something went wrong during bulk actor creation.")
+        raise
+
+    logger.debug(
+        "Successfully inserted {} of {} actors.", len(created_ids), len(actors)
+    )
+    for actor_id in created_ids:
+        _on_committed("actor", "created", db.Actor(**rows[actor_id]))
+    return created_ids
+
+
+def bulk_create_schemas(db_session: Session, schemas: List[Schema]) -> Set[str]:
+    """
+    Insert a batch of schemas in one statement and transaction, skipping existing ones.
+
+    Returns:
+        The IDs of the schemas that were created.
+    """
+    logger.info("Bulk inserting {} schemas", len(schemas))
+
+    rows = {}
+    for schema in schemas:
+        rows.setdefault(schema.id, schema.model_dump())
+
+    query = (
+        _dialect_insert(db_session, db.Schema)
+        .on_conflict_do_nothing(index_elements=[db.Schema.id])
+        .returning(db.Schema.id)
+    )
+    try:
+        created_ids = set(db_session.scalars(query, list(rows.values())).all())
+        db_session.commit()
+    except Exception:
+        db_session.rollback()
+        logger.exception("Something went wrong during bulk schema creation.")
+        raise
+
+    logger.debug(
+        "Successfully inserted {} of {} schemas.", len(created_ids), len(schemas)
+    )
+    for schema_id in created_ids:
+        _on_committed("schema", "created", db.Schema(**rows[schema_id]))
+    return created_ids
+
+
+def stream_actors(db_session: Session, batch_size: int = 1000) -> Iterator[db.Actor]:
+    """Iterate over all actors with a server-side cursor, fetching `batch_size` at a time."""
+    logger.info("Streaming all actors from database")
+    query = select(db.Actor).execution_options(yield_per=batch_size)
+    yield from db_session.scalars(query)
+
+
+def stream_schemas(db_session: Session, batch_size: int = 1000) -> Iterator[db.Schema]:
+    """Iterate over all schemas with a server-side cursor, fetching `batch_size` at a time."""
+    logger.info("Streaming all schemas from database")
+    query = select(db.Schema).execution_options(yield_per=batch_size)
+    yield from db_session.scalars(query)
+
+
+def _insert_schema_query(db_session: Session, schema: Schema):
+    """INSERT of the schema that returns nothing, instead of failing, if it exists."""
+    return (
+        _dialect_insert(db_session, db.Schema)
+        .values(**schema.model_dump())
+        .on_conflict_do_nothing(index_elements=[db.Schema.id])
+        .returning(db.Schema)
+    )
+
+
+def _reserved_names(
+    db_session: Session, reservation_ids: Dict[str, Optional[str]]
+) -> Set[str]:
+    """The names that are reserved under another ID than their ID in `reservation_ids`."""
+    query = select(db.ActorNameReservation.name, db.ActorNameReservation.id).where(
+        db.ActorNameReservation.name.in_(reservation_ids),
+        db.ActorNameReservation.expires_at > datetime.now(timezone.utc),
+    )
+    return {
+        name
+        for name, reservation_id in db_session.execute(query).all()
+        if reservation_id != reservation_ids[name]
+    }
+
+
+def _consume_reservations_query(reservation_ids: Dict[str, Optional[str]]):
+    """
+    DELETE of the reservations by name in `reservation_ids` that actors are registered
+    with, and of expired reservations of their names.
+    """
+    names = list(reservation_ids)
+    reservations = [
+        (name, reservation_id)
+        for name, reservation_id in reservation_ids.items()
+        if reservation_id
+    ]
+    query = delete(db.ActorNameReservation)
+    expired = db.ActorNameReservation.name.in_(names) & (
+        db.ActorNameReservation.expires_at <= datetime.now(timezone.utc)
+    )
+    if not reservations:
+        return query.where(expired)
+    return query.where(
+        or_(
+            tuple_(db.ActorNameReservation.name, db.ActorNameReservation.id).in_(
+                reservations
+            ),
+            expired,
+        )
+    )
+
+
+def _dialect_insert(db_session: Session, model: Type[db.Base]):
+    """INSERT construct of the session's dialect, which supports ON CONFLICT clauses."""
+    if db_session.get_bind().dialect.name == "sqlite":
+        return sqlite_insert(model)
+    return postgresql_insert(model)
+
+
+def _on_committed(
+    entity: Literal["actor", "schema"],
+    action: Literal["created", "updated", "deleted"],
+    record: Union[db.Actor, db.Schema],
+    previous_id: Optional[str] = None,
+) -> None:
+    """Propagate a committed write to the in-memory snapshot and the change feed."""
+    record_ids = [record.id] + ([previous_id] if previous_id else [])
+    if entity == "actor":
+        registry_snapshot.mark_written(actor_ids=record_ids)
+    else:
+        registry_snapshot.mark_written(schema_ids=record_ids)
+
+    registry_event_publisher.publish(entity, action, record, previous_id=previous_id)
+
+
 class ActorAlreadyExistsException(Exception):
     """Raised when attempting to create an actor that already exists in the database."""
 
@@ -311,6 +674,14 @@ class ActorDoesNotExistException(Exception):
     """Raised when attempting to delete or update an actor that does not exist in the database."""
 
 
+class ActorNameReservedException(Exception):
+    """Raised when an actor name is reserved already, for another actor."""
+
+
+class ReservationDoesNotExistException(Exception):
+    """Raised when attempting to release an actor name reservation that does not exist."""
+
+
 class SchemaAlreadyExistsException(Exception):
     """Raised when attempting to create a schema that already exists in the database."""
 
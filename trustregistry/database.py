@@ -1,7 +1,11 @@
 import os
+import threading
+from typing import Optional
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import ORMExecuteState, Session, declarative_base, sessionmaker
+
+from shared.util.cache import BoundedCache
 
 POSTGRES_DATABASE_URL = os.getenv(
     "POSTGRES_DATABASE_URL",
@@ -19,6 +23,102 @@ engine = create_engine(
     pool_recycle=POSTGRES_POOL_RECYCLE,
     pool_timeout=POSTGRES_POOL_TIMEOUT,
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Records are not expired on commit, so that returning them doesn't cost another query
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
+
+# Optional read replica, used by the read-only routes
+POSTGRES_READ_DATABASE_URL = os.getenv("POSTGRES_READ_DATABASE_URL")
+POSTGRES_READ_POOL_SIZE = int(
+    os.getenv("POSTGRES_READ_POOL_SIZE", str(POSTGRES_POOL_SIZE))
+)
+POSTGRES_READ_MAX_OVERFLOW = int(
+    os.getenv("POSTGRES_READ_MAX_OVERFLOW", str(POSTGRES_MAX_OVERFLOW))
+)
+POSTGRES_READ_POOL_RECYCLE = int(
+    os.getenv("POSTGRES_READ_POOL_RECYCLE", str(POSTGRES_POOL_RECYCLE))
+)
+POSTGRES_READ_POOL_TIMEOUT = float(
+    os.getenv("POSTGRES_READ_POOL_TIMEOUT", str(POSTGRES_POOL_TIMEOUT))
+)
+# Seconds after a client's write during which its reads stay on the primary, to cover
+# replication lag, and the number of clients tracked. Clients are told apart by the
+# session they send, else by address
+READ_YOUR_WRITES_WINDOW = float(os.getenv("READ_YOUR_WRITES_WINDOW", "5"))
+READ_YOUR_WRITES_CLIENTS = int(os.getenv("READ_YOUR_WRITES_CLIENTS", "10000"))
+
+read_engine = (
+    create_engine(
+        url=POSTGRES_READ_DATABASE_URL,
+        pool_size=POSTGRES_READ_POOL_SIZE,
+        max_overflow=POSTGRES_READ_MAX_OVERFLOW,
+        pool_recycle=POSTGRES_READ_POOL_RECYCLE,
+        pool_timeout=POSTGRES_READ_POOL_TIMEOUT,
+    )
+    if POSTGRES_READ_DATABASE_URL
+    else engine
+)
+ReadSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=read_engine
+)
+
+# Clients that committed a write within the read-your-writes window. Sessions are used
+# from the request handlers' threads, so access is locked
+_recent_writers: BoundedCache[str, bool] = BoundedCache(
+    maxsize=READ_YOUR_WRITES_CLIENTS, ttl=READ_YOUR_WRITES_WINDOW
+)
+_recent_writers_lock = threading.Lock()
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _track_statement_write(orm_execute_state: ORMExecuteState) -> None:
+    # INSERT, UPDATE and DELETE statements bypass the session's unit of work
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(SessionLocal, "before_commit")
+def _track_unit_of_work_write(session: Session) -> None:
+    if session.new or session.dirty or session.deleted:
+        session.info["has_writes"] = True
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _record_write(session: Session) -> None:
+    # Commits without writes, e.g. of read-only transactions, are not recorded
+    if session.info.pop("has_writes", False):
+        client = session.info.get("client")
+        if client is not None:
+            with _recent_writers_lock:
+                _recent_writers.set(client, True)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_writes(session: Session) -> None:
+    session.info.pop("has_writes", None)
+
+
+def new_session(client: Optional[str] = None) -> Session:
+    """Session on the primary, recording the writes it commits for `client`."""
+    return SessionLocal(info={"client": client})
+
+
+def new_read_session(client: Optional[str] = None) -> Session:
+    """
+    Session for read-only queries: on the read replica, if one is configured, unless the
+    client has committed a write within the last `READ_YOUR_WRITES_WINDOW` seconds.
+    """
+    if client is not None:
+        with _recent_writers_lock:
+            has_written = _recent_writers.get(client) is not None
+        if has_written:
+            return SessionLocal()
+    return ReadSessionLocal()
+
 
 Base = declarative_base()
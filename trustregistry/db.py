@@ -1,14 +1,36 @@
+from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import String
+from fastapi import Request
+from sqlalchemy import BigInteger, DateTime, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
-from trustregistry.database import Base, SessionLocal
+from shared.constants import TRUST_REGISTRY_SESSION_HEADER
+from trustregistry.database import Base, new_read_session, new_session
 from trustregistry.list_type import StringList
 
 
-def get_db():
-    db = SessionLocal()
+def request_client(request: Request) -> Optional[str]:
+    """
+    The client that made the request, whose writes its later reads must see: the session
+    it sends in the `TRUST_REGISTRY_SESSION_HEADER` header, else its address.
+    """
+    session = request.headers.get(TRUST_REGISTRY_SESSION_HEADER)
+    if session:
+        return f"session:{session}"
+    return request.client.host if request.client else None
+
+
+def get_db(request: Request):
+    db = new_session(request_client(request))
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db(request: Request):
+    db = new_read_session(request_client(request))
     try:
         yield db
     finally:
@@ -36,6 +58,16 @@ class Actor(Base):
     image_url: Mapped[Optional[str]] = mapped_column(String, index=True)
 
 
+class ActorNameReservation(Base):
+    """Actor name claimed ahead of registering the actor, until `expires_at`."""
+
+    __tablename__ = "actor_name_reservations"
+
+    name: Mapped[str] = mapped_column(String, primary_key=True)
+    id: Mapped[str] = mapped_column(String, unique=True, index=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+
 class Schema(Base):
     __tablename__ = "schemas"
 
@@ -50,3 +82,12 @@ class Schema(Base):
     did: Mapped[str] = mapped_column(String, index=True)
     name: Mapped[str] = mapped_column(String, index=True)
     version: Mapped[str] = mapped_column(String, index=True)
+
+
+class RegistryVersion(Base):
+    """Single row holding the registry's data version, bumped by a trigger on every write."""
+
+    __tablename__ = "registry_version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, default=0)
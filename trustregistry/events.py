@@ -0,0 +1,126 @@
+import asyncio
+from typing import Literal, Optional, Union
+
+from nats.aio.client import Client as NATS
+
+from shared.constants import TRUST_REGISTRY_EVENTS_SUBJECT
+from shared.log_config import get_logger
+from shared.models.trustregistry import TrustRegistryEvent
+from shared.services.nats_jetstream import connect_nats
+from trustregistry import db
+
+logger = get_logger(__name__)
+
+MAX_QUEUED_EVENTS = 10000
+FLUSH_TIMEOUT = 5.0
+
+
+class RegistryEventPublisher:
+    """
+    Publishes actor and schema change events to NATS, for replicas of the app and endorser
+    to evict or refresh their cached registry data.
+
+    Events are queued by the crud functions after each successful commit, and published
+    by a background task, so that a slow or unavailable NATS server never blocks a write.
+    Publishing is a no-op until `start` has been called.
+    """
+
+    def __init__(self, subject: str = TRUST_REGISTRY_EVENTS_SUBJECT) -> None:
+        self.subject = subject
+
+        self._nats_client: Optional[NATS] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        self._nats_client = await connect_nats()
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=MAX_QUEUED_EVENTS)
+        self._task = asyncio.create_task(
+            self._publish_events(), name="Publish registry events"
+        )
+        logger.info("Publishing trust registry events to `{}.>`", self.subject)
+
+    async def stop(self) -> None:
+        if self._task:
+            # Flush what is already queued before stopping the background task
+            await asyncio.sleep(0)  # Let events scheduled by `publish` reach the queue
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=FLUSH_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning("Timed out flushing registry events on shutdown.")
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._nats_client:
+            await self._nats_client.close()
+            self._nats_client = None
+
+        self._loop = None
+        logger.info("Stopped publishing trust registry events.")
+
+    def publish(
+        self,
+        entity: Literal["actor", "schema"],
+        action: Literal["created", "updated", "deleted"],
+        record: Union[db.Actor, db.Schema],
+        previous_id: Optional[str] = None,
+    ) -> None:
+        """
+        Queue a change event for publishing. Safe to call from any thread.
+
+        Args:
+            entity: The kind of record that changed.
+            action: The committed write.
+            record: The record as committed, or as it was before being deleted.
+            previous_id: The id of the record before the write, if it changed.
+        """
+        if not self._loop:
+            return
+
+        event = TrustRegistryEvent(
+            entity=entity,
+            action=action,
+            id=record.id,
+            previous_id=previous_id if previous_id != record.id else None,
+            data={
+                column.name: getattr(record, column.name)
+                for column in record.__table__.columns
+            },
+        )
+        try:
+            self._loop.call_soon_threadsafe(self._enqueue, event)
+        except RuntimeError:
+            logger.warning("Event loop closed; dropping registry event: {}", event)
+
+    def _enqueue(self, event: TrustRegistryEvent) -> None:
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning("Registry event queue is full; dropping event: {}", event)
+
+    async def _publish_events(self) -> None:
+        while True:
+            event: TrustRegistryEvent = await self._queue.get()
+            subject = f"{self.subject}.{event.entity}.{event.action}"
+            try:
+                await self._nats_client.publish(
+                    subject, event.model_dump_json().encode()
+                )
+                logger.trace("Published registry event to `{}`", subject)
+            except Exception:  # pylint: disable=W0718
+                logger.exception("Failed to publish registry event: {}", event)
+            finally:
+                self._queue.task_done()
+
+
+registry_event_publisher = RegistryEventPublisher()
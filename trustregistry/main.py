@@ -1,23 +1,29 @@
 import os
+import time
 from contextlib import asynccontextmanager
+from typing import Optional
 
 from alembic import command
 from alembic.config import Config
 from alembic.migration import MigrationContext
 from alembic.script import ScriptDirectory
-from fastapi import Depends, FastAPI
+from fastapi import Depends, FastAPI, Request, Response
 from scalar_fastapi import get_scalar_api_reference
-from sqlalchemy import inspect
+from sqlalchemy import inspect, text
 from sqlalchemy.engine import Engine
+from sqlalchemy.exc import ProgrammingError
 from sqlalchemy.orm import Session
 
-from shared.constants import PROJECT_VERSION
+from shared.constants import PROJECT_VERSION, PUBLISH_TRUST_REGISTRY_EVENTS
 from shared.log_config import get_logger
 from shared.util.set_event_loop_policy import set_event_loop_policy
 from trustregistry import crud
 from trustregistry.database import engine
-from trustregistry.db import get_db
+from trustregistry.db import get_read_db
+from trustregistry.events import registry_event_publisher
 from trustregistry.registry import registry_actors, registry_schemas
+from trustregistry.registry.etag import check_not_modified
+from trustregistry.snapshot import REGISTRY_SNAPSHOT_MODE, registry_snapshot
 
 set_event_loop_policy()
 
@@ -26,6 +32,12 @@ logger = get_logger(__name__)
 OPENAPI_NAME = os.getenv("OPENAPI_NAME", "Trust Registry")
 ROOT_PATH = os.getenv("ROOT_PATH", "")
 
+# `upgrade` applies pending migrations on every startup. `check` only verifies that the
+# database is at the head revision, with migrations applied by `python -m trustregistry.migrate`
+MIGRATION_MODE = os.getenv("MIGRATION_MODE", "upgrade").lower()
+# Head revision written at image build time, saving a scan of the migration scripts
+ALEMBIC_HEAD_FILE = os.getenv("ALEMBIC_HEAD_FILE", "alembic_head")
+
 
 def check_migrations(db_engine: Engine, alembic_cfg: Config) -> bool:
     # Check if alembic_version table exists
@@ -64,11 +76,8 @@ def check_migrations(db_engine: Engine, alembic_cfg: Config) -> bool:
     return current_rev == head_rev
 
 
-@asynccontextmanager
-async def lifespan(_: FastAPI):
-    alembic_cfg = Config("alembic.ini")
-
-    if not check_migrations(engine, alembic_cfg):
+def run_migrations(db_engine: Engine, alembic_cfg: Config) -> None:
+    if not check_migrations(db_engine, alembic_cfg):
         logger.info("Applying database migrations...")
         try:
             command.upgrade(alembic_cfg, "head")
@@ -79,14 +88,76 @@ async def lifespan(_: FastAPI):
     else:
         logger.info("Database is up to date. No migrations needed.")
 
-    logger.debug("TrustRegistry startup: Validate tables are created")
-    with engine.connect() as connection:
-        inspector = inspect(connection)
-        table_names = inspector.get_table_names()
-        logger.debug("TrustRegistry tables created: `{}`", table_names)
+
+def get_head_revision(alembic_cfg: Config) -> Optional[str]:
+    if os.path.isfile(ALEMBIC_HEAD_FILE):
+        with open(ALEMBIC_HEAD_FILE, encoding="utf-8") as head_file:
+            return head_file.read().strip()
+
+    return ScriptDirectory.from_config(alembic_cfg).get_current_head()
+
+
+def check_head_revision(db_engine: Engine, alembic_cfg: Config) -> None:
+    """
+    Verify, with a single query, that the database is at the head revision.
+
+    Raises:
+        RuntimeError: If the database has not been migrated to the head revision.
+    """
+    head_rev = get_head_revision(alembic_cfg)
+    try:
+        with db_engine.connect() as connection:
+            current_rev = connection.execute(
+                text("SELECT version_num FROM alembic_version")
+            ).scalar()
+    except ProgrammingError:  # alembic_version table doesn't exist
+        current_rev = None
+
+    if current_rev != head_rev:
+        logger.error(
+            "Database is at revision `{}`, but `{}` is required.", current_rev, head_rev
+        )
+        raise RuntimeError(
+            f"Database is at revision `{current_rev}`, but `{head_rev}` is required. "
+            "Apply migrations with `python -m trustregistry.migrate`."
+        )
+    logger.info("Database is at head revision `{}`.", head_rev)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    startup_start = time.perf_counter()
+    alembic_cfg = Config("alembic.ini")
+
+    if MIGRATION_MODE == "check":
+        check_head_revision(engine, alembic_cfg)
+    else:
+        run_migrations(engine, alembic_cfg)
+
+        logger.debug("TrustRegistry startup: Validate tables are created")
+        with engine.connect() as connection:
+            inspector = inspect(connection)
+            table_names = inspector.get_table_names()
+            logger.debug("TrustRegistry tables created: `{}`", table_names)
+
+    if REGISTRY_SNAPSHOT_MODE:
+        await registry_snapshot.start(engine)
+    if PUBLISH_TRUST_REGISTRY_EVENTS:
+        await registry_event_publisher.start()
+
+    startup_seconds = time.perf_counter() - startup_start
+    logger.bind(body={"startup_seconds": round(startup_seconds, 3)}).info(
+        "TrustRegistry started in {:.3f}s (migration mode: {})",
+        startup_seconds,
+        MIGRATION_MODE,
+    )
     # start-up logic is before the yield
     yield
     # shutdown logic after
+    if PUBLISH_TRUST_REGISTRY_EVENTS:
+        await registry_event_publisher.stop()
+    if REGISTRY_SNAPSHOT_MODE:
+        await registry_snapshot.stop()
 
 
 def create_app():
@@ -117,8 +188,14 @@ async def scalar_html():
 
 
 @app.get("/")
-async def root(db_session: Session = Depends(get_db)):
+async def root(
+    request: Request, response: Response, db_session: Session = Depends(get_read_db)
+):
     logger.debug("GET request received: Fetch actors and schemas from registry")
+    not_modified = check_not_modified(request, response, db_session)
+    if not_modified:
+        return not_modified
+
     db_schemas = crud.get_schemas(db_session)
     db_actors = crud.get_actors(db_session)
     schemas_repr = [schema.id for schema in db_schemas]
@@ -127,5 +204,7 @@ async def root(db_session: Session = Depends(get_db)):
 
 
 @app.get("/registry")
-async def registry(db_session: Session = Depends(get_db)):
-    return await root(db_session)
+async def registry(
+    request: Request, response: Response, db_session: Session = Depends(get_read_db)
+):
+    return await root(request, response, db_session)
@@ -0,0 +1,19 @@
+"""
+One-shot entrypoint that applies pending database migrations, to be run as a job or init
+container before trust registry replicas are started with `MIGRATION_MODE=check`:
+
+    python -m trustregistry.migrate
+"""
+
+from alembic.config import Config
+
+from trustregistry.database import engine
+from trustregistry.main import run_migrations
+
+
+def main() -> None:
+    run_migrations(engine, Config("alembic.ini"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Notify registry changes
+
+Revision ID: 7a27ef04eedc
+Revises: 5bcfb2c0bc05
+Create Date: 2026-10-19 09:12:44.512907
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7a27ef04eedc"
+down_revision: Union[str, None] = "5bcfb2c0bc05"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Notifies the ids of changed rows on `trust_registry_changes`, so that registry
+# snapshots held in memory can re-read them. Updates notify both the old and new id.
+NOTIFY_FUNCTION = """
+CREATE OR REPLACE FUNCTION notify_trust_registry_change() RETURNS trigger AS $$
+DECLARE
+    changed_ids json;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        changed_ids := json_build_array(NEW.id);
+    ELSIF TG_OP = 'DELETE' THEN
+        changed_ids := json_build_array(OLD.id);
+    ELSE
+        changed_ids := json_build_array(OLD.id, NEW.id);
+    END IF;
+    PERFORM pg_notify(
+        'trust_registry_changes',
+        json_build_object('table', TG_TABLE_NAME, 'ids', changed_ids)::text
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade() -> None:
+    op.execute(NOTIFY_FUNCTION)
+    for table in ("actors", "schemas"):
+        op.execute(
+            f"CREATE TRIGGER {table}_notify_change "
+            f"AFTER INSERT OR UPDATE OR DELETE ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION notify_trust_registry_change();"
+        )
+
+
+def downgrade() -> None:
+    for table in ("actors", "schemas"):
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_notify_change ON {table};")
+    op.execute("DROP FUNCTION IF EXISTS notify_trust_registry_change();")
@@ -0,0 +1,103 @@
+"""Registry data version
+
+Revision ID: c3f1a9d2b6e4
+Revises: 7a27ef04eedc
+Create Date: 2026-10-19 14:02:31.870214
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3f1a9d2b6e4"
+down_revision: Union[str, None] = "7a27ef04eedc"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Bumps the single-row data version with every changed actor or schema row, in the
+# same transaction as the change. Statements that change no rows leave it untouched.
+BUMP_FUNCTION = """
+CREATE OR REPLACE FUNCTION bump_registry_version() RETURNS trigger AS $$
+BEGIN
+    UPDATE registry_version SET version = version + 1 WHERE id = 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# Adds the data version to the change notifications. `{table}_bump_version` sorts before
+# `{table}_notify_change`, so it fires first and the version includes the change.
+NOTIFY_FUNCTION = """
+CREATE OR REPLACE FUNCTION notify_trust_registry_change() RETURNS trigger AS $$
+DECLARE
+    changed_ids json;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        changed_ids := json_build_array(NEW.id);
+    ELSIF TG_OP = 'DELETE' THEN
+        changed_ids := json_build_array(OLD.id);
+    ELSE
+        changed_ids := json_build_array(OLD.id, NEW.id);
+    END IF;
+    PERFORM pg_notify(
+        'trust_registry_changes',
+        json_build_object(
+            'table', TG_TABLE_NAME,
+            'ids', changed_ids,
+            'version', (SELECT version FROM registry_version WHERE id = 1)
+        )::text
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+PREVIOUS_NOTIFY_FUNCTION = """
+CREATE OR REPLACE FUNCTION notify_trust_registry_change() RETURNS trigger AS $$
+DECLARE
+    changed_ids json;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        changed_ids := json_build_array(NEW.id);
+    ELSIF TG_OP = 'DELETE' THEN
+        changed_ids := json_build_array(OLD.id);
+    ELSE
+        changed_ids := json_build_array(OLD.id, NEW.id);
+    END IF;
+    PERFORM pg_notify(
+        'trust_registry_changes',
+        json_build_object('table', TG_TABLE_NAME, 'ids', changed_ids)::text
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "registry_version",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute("INSERT INTO registry_version (id, version) VALUES (1, 0);")
+    op.execute(BUMP_FUNCTION)
+    for table in ("actors", "schemas"):
+        op.execute(
+            f"CREATE TRIGGER {table}_bump_version "
+            f"AFTER INSERT OR UPDATE OR DELETE ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION bump_registry_version();"
+        )
+    op.execute(NOTIFY_FUNCTION)
+
+
+def downgrade() -> None:
+    op.execute(PREVIOUS_NOTIFY_FUNCTION)
+    for table in ("actors", "schemas"):
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_bump_version ON {table};")
+    op.execute("DROP FUNCTION IF EXISTS bump_registry_version();")
+    op.drop_table("registry_version")
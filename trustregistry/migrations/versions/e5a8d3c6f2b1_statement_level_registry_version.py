@@ -0,0 +1,130 @@
+"""Statement-level registry data version
+
+Revision ID: e5a8d3c6f2b1
+Revises: 9d4e2b7c1f38
+Create Date: 2026-10-19 18:23:52.604117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5a8d3c6f2b1"
+down_revision: Union[str, None] = "9d4e2b7c1f38"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Bumps the data version once per statement that changed rows, rather than once per row,
+# so that a bulk write takes the version row's lock once, at the end of the statement.
+# The new version is notified after the ids of the rows changed by the statement.
+BUMP_FUNCTION = """
+CREATE OR REPLACE FUNCTION bump_registry_version() RETURNS trigger AS $$
+DECLARE
+    new_version bigint;
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM changed_rows) THEN
+        RETURN NULL;
+    END IF;
+    UPDATE registry_version SET version = version + 1 WHERE id = 1
+        RETURNING version INTO new_version;
+    PERFORM pg_notify(
+        'trust_registry_changes',
+        json_build_object('version', new_version)::text
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# The ids of changed rows are notified without the version again
+NOTIFY_FUNCTION = """
+CREATE OR REPLACE FUNCTION notify_trust_registry_change() RETURNS trigger AS $$
+DECLARE
+    changed_ids json;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        changed_ids := json_build_array(NEW.id);
+    ELSIF TG_OP = 'DELETE' THEN
+        changed_ids := json_build_array(OLD.id);
+    ELSE
+        changed_ids := json_build_array(OLD.id, NEW.id);
+    END IF;
+    PERFORM pg_notify(
+        'trust_registry_changes',
+        json_build_object('table', TG_TABLE_NAME, 'ids', changed_ids)::text
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+PREVIOUS_BUMP_FUNCTION = """
+CREATE OR REPLACE FUNCTION bump_registry_version() RETURNS trigger AS $$
+BEGIN
+    UPDATE registry_version SET version = version + 1 WHERE id = 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+PREVIOUS_NOTIFY_FUNCTION = """
+CREATE OR REPLACE FUNCTION notify_trust_registry_change() RETURNS trigger AS $$
+DECLARE
+    changed_ids json;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        changed_ids := json_build_array(NEW.id);
+    ELSIF TG_OP = 'DELETE' THEN
+        changed_ids := json_build_array(OLD.id);
+    ELSE
+        changed_ids := json_build_array(OLD.id, NEW.id);
+    END IF;
+    PERFORM pg_notify(
+        'trust_registry_changes',
+        json_build_object(
+            'table', TG_TABLE_NAME,
+            'ids', changed_ids,
+            'version', (SELECT version FROM registry_version WHERE id = 1)
+        )::text
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# Triggers with transition tables can only be defined for a single event
+TRANSITION_TABLES = {"INSERT": "NEW", "UPDATE": "NEW", "DELETE": "OLD"}
+
+
+def upgrade() -> None:
+    for table in ("actors", "schemas"):
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_bump_version ON {table};")
+    op.execute(BUMP_FUNCTION)
+    for table in ("actors", "schemas"):
+        for event, transition_table in TRANSITION_TABLES.items():
+            op.execute(
+                f"CREATE TRIGGER {table}_bump_version_{event.lower()} "
+                f"AFTER {event} ON {table} "
+                f"REFERENCING {transition_table} TABLE AS changed_rows "
+                "FOR EACH STATEMENT EXECUTE FUNCTION bump_registry_version();"
+            )
+    op.execute(NOTIFY_FUNCTION)
+
+
+def downgrade() -> None:
+    for table in ("actors", "schemas"):
+        for event in TRANSITION_TABLES:
+            op.execute(
+                f"DROP TRIGGER IF EXISTS {table}_bump_version_{event.lower()} "
+                f"ON {table};"
+            )
+    op.execute(PREVIOUS_BUMP_FUNCTION)
+    for table in ("actors", "schemas"):
+        op.execute(
+            f"CREATE TRIGGER {table}_bump_version "
+            f"AFTER INSERT OR UPDATE OR DELETE ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION bump_registry_version();"
+        )
+    op.execute(PREVIOUS_NOTIFY_FUNCTION)
@@ -0,0 +1,156 @@
+import os
+from typing import (
+    AsyncIterator,
+    Callable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import orjson
+from fastapi import Request
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.orm import Session
+
+from shared.exceptions import CloudApiValueError
+from shared.log_config import get_logger
+from trustregistry.database import new_read_session
+
+logger = get_logger(__name__)
+
+# Number of rows inserted per transaction during a bulk import
+BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", "500"))
+# Number of rows fetched per round trip from the server-side cursor during an export
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class BulkRowResult(BaseModel):
+    line: int
+    id: Optional[str] = None
+    status: Literal["created", "conflict", "invalid", "failed"]
+    detail: Optional[str] = None
+
+
+class BulkImportResult(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkRowResult]
+
+
+async def read_ndjson_lines(request: Request) -> AsyncIterator[Tuple[int, bytes]]:
+    """
+    Yield the non-empty lines of an NDJSON request body, with their 1-based line number,
+    as the body is received.
+    """
+    line_number = 0
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line
+    if buffer.strip():
+        yield line_number + 1, buffer
+
+
+async def bulk_import(
+    lines: AsyncIterator[Tuple[int, bytes]],
+    parse: Callable[[bytes], BaseModel],
+    insert_batch: Callable[[List[BaseModel]], Set[str]],
+    batch_size: int = BULK_BATCH_SIZE,
+) -> BulkImportResult:
+    """
+    Parse NDJSON lines into records and insert them in batches of `batch_size`.
+
+    Each batch is committed in its own transaction, so a failed batch does not roll back
+    the batches before it. Lines that cannot be parsed are reported as invalid, and records
+    that already exist (or repeat an earlier line) are reported as conflicts.
+
+    Args:
+        lines: The (line number, line) pairs to import.
+        parse: Converts a line into the record to insert, raising on invalid input.
+        insert_batch: Inserts a batch of records, returning the IDs that were created.
+        batch_size: Maximum number of records per transaction.
+    """
+    results: List[BulkRowResult] = []
+    batch: List[Tuple[int, BaseModel]] = []
+
+    def flush() -> None:
+        records = [record for _, record in batch]
+        try:
+            created_ids = insert_batch(records)
+        except Exception as e:  # pylint: disable=W0718
+            logger.exception("Failed to insert batch of {} records.", len(batch))
+            results.extend(
+                BulkRowResult(line=line, id=record.id, status="failed", detail=str(e))
+                for line, record in batch
+            )
+        else:
+            for line, record in batch:
+                if record.id in created_ids:
+                    # Only the first line with a given ID was created
+                    created_ids.discard(record.id)
+                    results.append(
+                        BulkRowResult(line=line, id=record.id, status="created")
+                    )
+                else:
+                    results.append(
+                        BulkRowResult(
+                            line=line,
+                            id=record.id,
+                            status="conflict",
+                            detail="Record already exists.",
+                        )
+                    )
+        batch.clear()
+
+    async for line_number, line in lines:
+        try:
+            record = parse(line)
+        except (orjson.JSONDecodeError, ValidationError, CloudApiValueError) as e:
+            detail = e.detail if isinstance(e, CloudApiValueError) else str(e)
+            results.append(
+                BulkRowResult(line=line_number, status="invalid", detail=str(detail))
+            )
+            continue
+
+        batch.append((line_number, record))
+        if len(batch) >= batch_size:
+            flush()
+
+    if batch:
+        flush()
+
+    return BulkImportResult(
+        created=sum(result.status == "created" for result in results),
+        failed=sum(result.status != "created" for result in results),
+        results=results,
+    )
+
+
+def export_ndjson(
+    stream_records: Callable[[Session, int], Iterator],
+    session_factory: Callable[[], Session] = new_read_session,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[bytes]:
+    """
+    Serialise every record yielded by `stream_records` as a line of NDJSON.
+
+    The export uses its own session rather than the request's, because the response body
+    is streamed after the request's dependencies have been closed.
+    """
+    with session_factory() as db_session:
+        for record in stream_records(db_session, batch_size):
+            yield orjson.dumps(
+                {
+                    column.name: getattr(record, column.name)
+                    for column in record.__table__.columns
+                }
+            ) + b"\n"
@@ -0,0 +1,44 @@
+from typing import Optional
+
+from fastapi import Request, Response
+from sqlalchemy.orm import Session
+
+from trustregistry import crud
+
+
+def data_version_etag(db_session: Session) -> Optional[str]:
+    """ETag of responses built from the registry's current data, if its version is known."""
+    version = crud.get_data_version(db_session)
+    return f'"{version}"' if version is not None else None
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as proxies may weaken the ETag of compressed responses
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+def check_not_modified(
+    request: Request, response: Response, db_session: Session
+) -> Optional[Response]:
+    """
+    Conditional GET support for responses built from the whole registry.
+
+    Returns a `304 Not Modified` response if the client's `If-None-Match` matches the
+    registry's data version; otherwise sets the `ETag` on the response and returns None.
+    """
+    etag = data_version_etag(db_session)
+    if etag is None:
+        return None
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
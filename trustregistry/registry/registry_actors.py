@@ -1,13 +1,29 @@
+from functools import partial
 from typing import List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from fastapi.exceptions import HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from shared.log_config import get_logger
-from shared.models.trustregistry import Actor
+from shared.models.trustregistry import (
+    Actor,
+    ActorNameReservation,
+    ActorNameReservationRequest,
+    ActorRegistration,
+)
 from trustregistry import crud
-from trustregistry.db import get_db
+from trustregistry.database import new_read_session
+from trustregistry.db import get_db, get_read_db, request_client
+from trustregistry.registry.bulk import (
+    NDJSON_MEDIA_TYPE,
+    BulkImportResult,
+    bulk_import,
+    export_ndjson,
+    read_ndjson_lines,
+)
+from trustregistry.registry.etag import check_not_modified
 
 logger = get_logger(__name__)
 
@@ -15,22 +31,40 @@ router = APIRouter(prefix="/registry/actors", tags=["actor"])
 
 
 @router.get("", response_model=List[Actor])
-async def get_actors(db_session: Session = Depends(get_db)) -> List[Actor]:
+async def get_actors(
+    request: Request, response: Response, db_session: Session = Depends(get_read_db)
+) -> List[Actor]:
     logger.debug("GET request received: Fetch all actors")
+    not_modified = check_not_modified(request, response, db_session)
+    if not_modified:
+        return not_modified
+
     db_actors = crud.get_actors(db_session)
 
     return db_actors
 
 
 @router.post("", response_model=Actor)
-async def register_actor(actor: Actor, db_session: Session = Depends(get_db)) -> Actor:
+async def register_actor(
+    actor: ActorRegistration, db_session: Session = Depends(get_db)
+) -> Actor:
+    """
+    Register an actor, consuming the reservation of its name with `reservation_id`.
+
+    Responds with 409 if the actor exists, or if its name is reserved under another ID.
+    """
     bound_logger = logger.bind(body={"actor": actor})
     bound_logger.debug("POST request received: Register actor")
     try:
-        created_actor = crud.create_actor(db_session, actor=actor)
+        created_actor = crud.create_actor(
+            db_session, actor=actor.to_actor(), reservation_id=actor.reservation_id
+        )
     except crud.ActorAlreadyExistsException as e:
         bound_logger.info("Bad request: Actor already exists.")
         raise HTTPException(status_code=409, detail=str(e)) from e
+    except crud.ActorNameReservedException as e:
+        bound_logger.info("Bad request: Actor name is reserved.")
+        raise HTTPException(status_code=409, detail=str(e)) from e
     except Exception as e:
         bound_logger.error("Something went wrong during actor creation.")
         raise HTTPException(status_code=500, detail=str(e)) from e
@@ -38,6 +72,97 @@ async def register_actor(actor: Actor, db_session: Session = Depends(get_db)) ->
     return created_actor
 
 
+@router.post("/reservations", response_model=ActorNameReservation, status_code=201)
+async def reserve_actor_name(
+    reservation: ActorNameReservationRequest, db_session: Session = Depends(get_db)
+) -> ActorNameReservation:
+    """
+    Reserve an actor name for `ttl` seconds, ahead of registering the actor with it.
+    Until then, only an actor registered with the reservation's ID can have the name,
+    and registering it consumes the reservation.
+
+    Responds with 409 if an actor has the name, or if it is reserved already.
+    """
+    bound_logger = logger.bind(body={"reservation": reservation})
+    bound_logger.debug("POST request received: Reserve actor name")
+    try:
+        db_reservation = crud.reserve_actor_name(
+            db_session, actor_name=reservation.name, ttl=reservation.ttl
+        )
+    except (
+        crud.ActorAlreadyExistsException,
+        crud.ActorNameReservedException,
+    ) as e:
+        bound_logger.info("Bad request: Actor name can't be reserved.")
+        raise HTTPException(status_code=409, detail=str(e)) from e
+
+    return db_reservation
+
+
+@router.delete("/reservations/{reservation_id}", status_code=204)
+async def release_actor_name(
+    reservation_id: str, db_session: Session = Depends(get_db)
+) -> None:
+    bound_logger = logger.bind(body={"reservation_id": reservation_id})
+    bound_logger.debug("DELETE request received: Release actor name reservation")
+    try:
+        crud.release_actor_name(db_session, reservation_id=reservation_id)
+    except crud.ReservationDoesNotExistException as e:
+        bound_logger.info("Bad request: Reservation with id not found.")
+        raise HTTPException(
+            status_code=404, detail=f"Reservation with id {reservation_id} not found."
+        ) from e
+
+
+@router.post("/bulk", response_model=BulkImportResult)
+async def bulk_register_actors(
+    request: Request, db_session: Session = Depends(get_db)
+) -> BulkImportResult:
+    """
+    Register actors from an NDJSON body, one actor per line, in batched transactions.
+    Each line may have the `reservation_id` of the actor's name, as when registering one actor.
+
+    Returns a result for every line: `created`, `conflict` if the actor already exists or
+    its name is reserved under another ID, `invalid` if the line could not be parsed, or
+    `failed` if its batch could not be written.
+    """
+    logger.debug("POST request received: Bulk register actors")
+    result = await bulk_import(
+        read_ndjson_lines(request),
+        parse=ActorRegistration.model_validate_json,
+        insert_batch=lambda registrations: crud.bulk_create_actors(
+            db_session,
+            actors=[registration.to_actor() for registration in registrations],
+            reservation_ids={
+                registration.id: registration.reservation_id
+                for registration in registrations
+                if registration.reservation_id
+            },
+        ),
+    )
+    logger.info(
+        "Bulk registered {} actors; {} lines not created.",
+        result.created,
+        result.failed,
+    )
+
+    return result
+
+
+@router.get("/export")
+async def export_actors(request: Request) -> StreamingResponse:
+    """
+    Stream all actors as NDJSON, one actor per line.
+    """
+    logger.debug("GET request received: Export all actors")
+    return StreamingResponse(
+        export_ndjson(
+            crud.stream_actors, partial(new_read_session, request_client(request))
+        ),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
 @router.put("/{actor_id}", response_model=Actor)
 async def update_actor(
     actor_id: str, actor: Actor, db_session: Session = Depends(get_db)
@@ -61,13 +186,16 @@ async def update_actor(
         raise HTTPException(
             status_code=404, detail=f"Actor with id {actor_id} not found."
         ) from e
+    except crud.ActorNameReservedException as e:
+        bound_logger.info("Bad request: Actor name is reserved.")
+        raise HTTPException(status_code=409, detail=str(e)) from e
 
     return update_actor_result
 
 
 @router.get("/did/{actor_did}", response_model=Actor)
 async def get_actor_by_did(
-    actor_did: str, db_session: Session = Depends(get_db)
+    actor_did: str, db_session: Session = Depends(get_read_db)
 ) -> Actor:
     bound_logger = logger.bind(body={"actor_did": actor_did})
     bound_logger.debug("GET request received: Get actor by DID")
@@ -84,7 +212,7 @@ async def get_actor_by_did(
 
 @router.get("/{actor_id}", response_model=Actor)
 async def get_actor_by_id(
-    actor_id: str, db_session: Session = Depends(get_db)
+    actor_id: str, db_session: Session = Depends(get_read_db)
 ) -> Actor:
     bound_logger = logger.bind(body={"actor_id": actor_id})
     bound_logger.debug("GET request received: Get actor by ID")
@@ -101,7 +229,7 @@ async def get_actor_by_id(
 
 @router.get("/name/{actor_name}", response_model=Actor)
 async def get_actor_by_name(
-    actor_name: str, db_session: Session = Depends(get_db)
+    actor_name: str, db_session: Session = Depends(get_read_db)
 ) -> Actor:
     bound_logger = logger.bind(body={"actor_name": actor_name})
     bound_logger.debug("GET request received: Get actor by name")
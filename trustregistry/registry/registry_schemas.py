@@ -1,14 +1,26 @@
+from functools import partial
 from typing import List
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from fastapi.params import Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
+from shared.exceptions import CloudApiValueError
 from shared.log_config import get_logger
 from shared.models.trustregistry import Schema
 from trustregistry import crud
-from trustregistry.db import get_db
+from trustregistry.database import new_read_session
+from trustregistry.db import get_db, get_read_db, request_client
+from trustregistry.registry.bulk import (
+    NDJSON_MEDIA_TYPE,
+    BulkImportResult,
+    bulk_import,
+    export_ndjson,
+    read_ndjson_lines,
+)
+from trustregistry.registry.etag import check_not_modified
 
 logger = get_logger(__name__)
 
@@ -20,8 +32,14 @@ class SchemaID(BaseModel):
 
 
 @router.get("", response_model=List[Schema])
-async def get_schemas(db_session: Session = Depends(get_db)) -> List[Schema]:
+async def get_schemas(
+    request: Request, response: Response, db_session: Session = Depends(get_read_db)
+) -> List[Schema]:
     logger.debug("GET request received: Fetch all schemas")
+    not_modified = check_not_modified(request, response, db_session)
+    if not_modified:
+        return not_modified
+
     db_schemas = crud.get_schemas(db_session)
 
     return db_schemas
@@ -51,6 +69,72 @@ async def register_schema(
     return create_schema_res
 
 
+@router.put("", response_model=Schema)
+async def upsert_schema(
+    schema_id: SchemaID, db_session: Session = Depends(get_db)
+) -> Schema:
+    """
+    Idempotently register a schema: creates it if needed, else returns the existing one.
+    """
+    bound_logger = logger.bind(body={"schema_id": schema_id})
+    bound_logger.debug("PUT request received: Upsert schema")
+    schema_attrs_list = _get_schema_attrs(schema_id)
+
+    upsert_schema_res = crud.upsert_schema(
+        db_session,
+        schema=Schema(
+            did=schema_attrs_list[0],
+            name=schema_attrs_list[2],
+            version=schema_attrs_list[3],
+            id=schema_id.schema_id,
+        ),
+    )
+
+    return upsert_schema_res
+
+
+@router.post("/bulk", response_model=BulkImportResult)
+async def bulk_register_schemas(
+    request: Request, db_session: Session = Depends(get_db)
+) -> BulkImportResult:
+    """
+    Register schemas from an NDJSON body, one `{"schema_id": ...}` per line, in batched
+    transactions.
+
+    Returns a result for every line: `created`, `conflict` if the schema already exists,
+    `invalid` if the line could not be parsed, or `failed` if its batch could not be written.
+    """
+    logger.debug("POST request received: Bulk register schemas")
+    result = await bulk_import(
+        read_ndjson_lines(request),
+        parse=_parse_schema_line,
+        insert_batch=lambda schemas: crud.bulk_create_schemas(
+            db_session, schemas=schemas
+        ),
+    )
+    logger.info(
+        "Bulk registered {} schemas; {} lines not created.",
+        result.created,
+        result.failed,
+    )
+
+    return result
+
+
+@router.get("/export")
+async def export_schemas(request: Request) -> StreamingResponse:
+    """
+    Stream all schemas as NDJSON, one schema per line.
+    """
+    logger.debug("GET request received: Export all schemas")
+    return StreamingResponse(
+        export_ndjson(
+            crud.stream_schemas, partial(new_read_session, request_client(request))
+        ),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
 @router.put("/{schema_id}", response_model=Schema)
 async def update_schema(
     schema_id: str, new_schema_id: SchemaID, db_session: Session = Depends(get_db)
@@ -93,7 +177,9 @@ async def update_schema(
 
 
 @router.get("/{schema_id}", response_model=Schema)
-async def get_schema(schema_id: str, db_session: Session = Depends(get_db)) -> Schema:
+async def get_schema(
+    schema_id: str, db_session: Session = Depends(get_read_db)
+) -> Schema:
     bound_logger = logger.bind(body={"schema_id": schema_id})
     bound_logger.debug("GET request received: Fetch schema")
     try:
@@ -122,6 +208,21 @@ async def remove_schema(schema_id: str, db_session: Session = Depends(get_db)) -
         ) from e
 
 
+def _parse_schema_line(line: bytes) -> Schema:
+    schema_id = SchemaID.model_validate_json(line)
+    schema_attrs_list = _get_schema_attrs(schema_id)
+    if len(schema_attrs_list) != 4:
+        raise CloudApiValueError(
+            f"Schema ID '{schema_id.schema_id}' does not match the expected format."
+        )
+    return Schema(
+        did=schema_attrs_list[0],
+        name=schema_attrs_list[2],
+        version=schema_attrs_list[3],
+        id=schema_id.schema_id,
+    )
+
+
 def _get_schema_attrs(schema_id: SchemaID) -> List[str]:
     # Split from the back because DID may contain a colon
     return schema_id.schema_id.split(":", 3)
@@ -0,0 +1,401 @@
+import asyncio
+import os
+import threading
+from collections import Counter
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import orjson
+from psycopg2.extensions import connection as PgConnection
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from shared.log_config import get_logger
+from shared.models.trustregistry import Actor, Schema
+from trustregistry import db
+
+logger = get_logger(__name__)
+
+REGISTRY_SNAPSHOT_MODE = os.getenv("REGISTRY_SNAPSHOT_MODE", "false").upper() == "TRUE"
+
+# Channel notified by the triggers on the actors and schemas tables
+NOTIFY_CHANNEL = "trust_registry_changes"
+RELOAD_MAX_WAIT = 16.0
+
+
+def _to_actor(db_actor: db.Actor) -> Actor:
+    return Actor.model_construct(
+        id=db_actor.id,
+        name=db_actor.name,
+        roles=db_actor.roles,
+        did=db_actor.did,
+        didcomm_invitation=db_actor.didcomm_invitation,
+        image_url=db_actor.image_url,
+    )
+
+
+def _to_schema(db_schema: db.Schema) -> Schema:
+    return Schema.model_construct(
+        id=db_schema.id,
+        did=db_schema.did,
+        name=db_schema.name,
+        version=db_schema.version,
+    )
+
+
+class RegistrySnapshot:
+    """
+    In-memory copy of all actors and schemas, indexed for the registry's lookups.
+
+    The snapshot is loaded once at startup and kept fresh with Postgres `LISTEN/NOTIFY`:
+    triggers on the actors and schemas tables notify the ids of changed rows, which are
+    then re-read from the database. Database reads run in a worker thread, and all updates
+    to the indexes are applied in order by a single task on the event loop.
+
+    Rows written by this process are marked until they have been re-read, and lookups that
+    could return them miss in the meantime, so that a read following a write is never
+    served stale data. Lookups return None on a miss, and callers fall back to the database.
+    """
+
+    def __init__(self) -> None:
+        self.actors_by_id: Dict[str, Actor] = {}
+        self.actors_by_did: Dict[str, Actor] = {}
+        self.actors_by_name: Dict[str, Actor] = {}
+        self.schemas_by_id: Dict[str, Schema] = {}
+
+        # Data version the snapshot is at
+        self.version: Optional[int] = None
+        self.is_ready = False
+
+        self._db_engine: Optional[Engine] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listen_connection: Optional[PgConnection] = None
+        self._sync_task: Optional[asyncio.Task] = None
+        self._sync_requested: Optional[asyncio.Event] = None
+
+        # Changes still to be applied, guarded by the lock as writes are marked from the
+        # request handlers' threads
+        self._lock = threading.Lock()
+        self._reload_requested = False
+        self._pending_actor_ids: Set[str] = set()
+        self._pending_schema_ids: Set[str] = set()
+        self._pending_version: Optional[int] = None
+        self._pending_actor_writes: Counter[str] = Counter()
+        self._pending_schema_writes: Counter[str] = Counter()
+
+        # Rows written by this process that have not been re-read yet
+        self._written_actor_ids: Counter[str] = Counter()
+        self._written_schema_ids: Counter[str] = Counter()
+
+    # Lookups
+    def get_actors(self, skip: int = 0, limit: int = 1000) -> Optional[List[Actor]]:
+        if self._written_actor_ids:
+            return None
+        return list(islice(self.actors_by_id.values(), skip, skip + limit))
+
+    def get_actor_by_id(self, actor_id: str) -> Optional[Actor]:
+        if actor_id in self._written_actor_ids:
+            return None
+        return self.actors_by_id.get(actor_id)
+
+    def get_actor_by_did(self, actor_did: str) -> Optional[Actor]:
+        # A written actor may have taken or given up any DID or name
+        if self._written_actor_ids:
+            return None
+        return self.actors_by_did.get(actor_did)
+
+    def get_actor_by_name(self, actor_name: str) -> Optional[Actor]:
+        if self._written_actor_ids:
+            return None
+        return self.actors_by_name.get(actor_name)
+
+    def get_schemas(self, skip: int = 0, limit: int = 1000) -> Optional[List[Schema]]:
+        if self._written_schema_ids:
+            return None
+        return list(islice(self.schemas_by_id.values(), skip, skip + limit))
+
+    def get_schema_by_id(self, schema_id: str) -> Optional[Schema]:
+        if schema_id in self._written_schema_ids:
+            return None
+        return self.schemas_by_id.get(schema_id)
+
+    def get_version(self) -> Optional[int]:
+        """The data version, or None while writes of this process are not yet re-read."""
+        if self._written_actor_ids or self._written_schema_ids:
+            return None
+        return self.version
+
+    # Updates
+    def load(self, actors: Iterable[db.Actor], schemas: Iterable[db.Schema]) -> None:
+        actors_by_id = {actor.id: _to_actor(actor) for actor in actors}
+        schemas_by_id = {schema.id: _to_schema(schema) for schema in schemas}
+
+        # Swap in complete indexes, so lookups never see a partially loaded snapshot
+        self.actors_by_id = actors_by_id
+        self.actors_by_did = {actor.did: actor for actor in actors_by_id.values()}
+        self.actors_by_name = {actor.name: actor for actor in actors_by_id.values()}
+        self.schemas_by_id = schemas_by_id
+
+    def put_actor(self, db_actor: db.Actor) -> None:
+        self.remove_actor(db_actor.id)
+        actor = _to_actor(db_actor)
+        self.actors_by_id[actor.id] = actor
+        self.actors_by_did[actor.did] = actor
+        self.actors_by_name[actor.name] = actor
+
+    def remove_actor(self, actor_id: str) -> None:
+        actor = self.actors_by_id.pop(actor_id, None)
+        if actor:
+            self.actors_by_did.pop(actor.did, None)
+            self.actors_by_name.pop(actor.name, None)
+
+    def put_schema(self, db_schema: db.Schema) -> None:
+        self.schemas_by_id[db_schema.id] = _to_schema(db_schema)
+
+    def remove_schema(self, schema_id: str) -> None:
+        self.schemas_by_id.pop(schema_id, None)
+
+    def mark_written(
+        self, actor_ids: Iterable[str] = (), schema_ids: Iterable[str] = ()
+    ) -> None:
+        """
+        Mark rows committed by this process, and have them re-read. Thread-safe.
+
+        Args:
+            actor_ids: The actors written.
+            schema_ids: The schemas written.
+        """
+        if not self._loop:
+            return
+
+        with self._lock:
+            self._written_actor_ids.update(actor_ids)
+            self._written_schema_ids.update(schema_ids)
+            self._pending_actor_writes.update(actor_ids)
+            self._pending_schema_writes.update(schema_ids)
+        self._loop.call_soon_threadsafe(self._sync_requested.set)
+
+    # Database synchronisation
+    async def start(self, db_engine: Engine) -> None:
+        self._db_engine = db_engine
+        self._loop = asyncio.get_running_loop()
+        self._sync_requested = asyncio.Event()
+
+        # Listen before loading, so that no change committed during the load is missed
+        self._listen()
+        await self.reload()
+        self.is_ready = True
+
+        self._sync_task = asyncio.create_task(
+            self._sync(), name="Sync registry snapshot"
+        )
+
+    async def stop(self) -> None:
+        self.is_ready = False
+
+        if self._sync_task:
+            self._sync_task.cancel()
+            try:
+                await self._sync_task
+            except asyncio.CancelledError:
+                pass
+            self._sync_task = None
+
+        self._unlisten()
+        self._loop = None
+        logger.info("Registry snapshot stopped.")
+
+    async def reload(self) -> None:
+        logger.info("Loading registry snapshot from database ...")
+        version, db_actors, db_schemas = await asyncio.to_thread(self._read_all)
+        self.load(db_actors, db_schemas)
+        self.version = version
+        logger.info(
+            "Loaded registry snapshot: {} actors and {} schemas.",
+            len(self.actors_by_id),
+            len(self.schemas_by_id),
+        )
+
+    async def refresh(
+        self, actor_ids: Set[str], schema_ids: Set[str], version: Optional[int] = None
+    ) -> None:
+        """
+        Re-read the given rows from the database. Rows that no longer exist are removed.
+
+        Args:
+            actor_ids: The actors to re-read.
+            schema_ids: The schemas to re-read.
+            version: The data version that includes the changes to these rows.
+        """
+        db_actors, db_schemas = await asyncio.to_thread(
+            self._read_rows, actor_ids, schema_ids
+        )
+
+        for actor_id in actor_ids - {actor.id for actor in db_actors}:
+            self.remove_actor(actor_id)
+        for db_actor in db_actors:
+            self.put_actor(db_actor)
+
+        for schema_id in schema_ids - {schema.id for schema in db_schemas}:
+            self.remove_schema(schema_id)
+        for db_schema in db_schemas:
+            self.put_schema(db_schema)
+
+        if version is not None:
+            # Notifies committed before a reload may be processed after it
+            self.version = max(self.version or 0, version)
+
+    def _read_all(self) -> Tuple[int, List[db.Actor], List[db.Schema]]:
+        with Session(self._db_engine) as db_session:
+            # Read the version first: data read after it can only be newer
+            version = self._read_version(db_session)
+            db_actors = db_session.scalars(select(db.Actor)).all()
+            db_schemas = db_session.scalars(select(db.Schema)).all()
+        return version, list(db_actors), list(db_schemas)
+
+    def _read_rows(
+        self, actor_ids: Set[str], schema_ids: Set[str]
+    ) -> Tuple[List[db.Actor], List[db.Schema]]:
+        db_actors: List[db.Actor] = []
+        db_schemas: List[db.Schema] = []
+        with Session(self._db_engine) as db_session:
+            if actor_ids:
+                db_actors = list(
+                    db_session.scalars(
+                        select(db.Actor).where(db.Actor.id.in_(actor_ids))
+                    )
+                )
+            if schema_ids:
+                db_schemas = list(
+                    db_session.scalars(
+                        select(db.Schema).where(db.Schema.id.in_(schema_ids))
+                    )
+                )
+        return db_actors, db_schemas
+
+    @staticmethod
+    def _read_version(db_session: Session) -> int:
+        query = select(db.RegistryVersion.version).where(db.RegistryVersion.id == 1)
+        return db_session.scalar(query) or 0
+
+    def _listen(self) -> None:
+        raw_connection = self._db_engine.raw_connection()
+        raw_connection.detach()  # Dedicated connection; never returned to the pool
+        pg_connection: PgConnection = raw_connection.driver_connection
+        pg_connection.autocommit = True
+        with pg_connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {NOTIFY_CHANNEL};")
+
+        self._listen_connection = pg_connection
+        asyncio.get_running_loop().add_reader(pg_connection.fileno(), self._on_notify)
+        logger.info("Listening for registry changes on `{}`", NOTIFY_CHANNEL)
+
+    def _unlisten(self) -> None:
+        if not self._listen_connection:
+            return
+
+        try:
+            asyncio.get_running_loop().remove_reader(self._listen_connection.fileno())
+            self._listen_connection.close()
+        except Exception:  # pylint: disable=W0718
+            logger.warning("Error closing registry snapshot listen connection")
+        self._listen_connection = None
+
+    def _on_notify(self) -> None:
+        try:
+            self._listen_connection.poll()
+        except Exception:  # pylint: disable=W0718
+            logger.exception("Lost registry snapshot listen connection")
+            self._request_reload()
+            return
+
+        actor_ids: Set[str] = set()
+        schema_ids: Set[str] = set()
+        version: Optional[int] = None
+        while self._listen_connection.notifies:
+            notify = self._listen_connection.notifies.pop(0)
+            try:
+                payload = orjson.loads(notify.payload)
+                # Rows changed by a statement are notified before the version it bumped
+                if "ids" in payload:
+                    ids = actor_ids if payload["table"] == "actors" else schema_ids
+                    ids.update(payload["ids"])
+                if payload.get("version") is not None:
+                    version = max(version or 0, payload["version"])
+            except (orjson.JSONDecodeError, AttributeError, KeyError, TypeError):
+                logger.warning("Ignoring malformed registry notify: {}", notify.payload)
+
+        if actor_ids or schema_ids or version is not None:
+            logger.debug(
+                "Refreshing registry snapshot for actors {} and schemas {}",
+                actor_ids,
+                schema_ids,
+            )
+            with self._lock:
+                self._pending_actor_ids.update(actor_ids)
+                self._pending_schema_ids.update(schema_ids)
+                if version is not None:
+                    self._pending_version = max(self._pending_version or 0, version)
+            self._sync_requested.set()
+
+    def _request_reload(self) -> None:
+        # Changes may have been missed, so serve from the database until reloaded
+        self.is_ready = False
+        self._unlisten()
+        with self._lock:
+            self._reload_requested = True
+        self._sync_requested.set()
+
+    async def _sync(self) -> None:
+        """Apply pending changes, one batch at a time, so that none is applied out of order."""
+        wait = 0.5
+        while True:
+            await self._sync_requested.wait()
+            self._sync_requested.clear()
+
+            with self._lock:
+                reload, self._reload_requested = self._reload_requested, False
+                actor_ids, self._pending_actor_ids = self._pending_actor_ids, set()
+                schema_ids, self._pending_schema_ids = self._pending_schema_ids, set()
+                version, self._pending_version = self._pending_version, None
+                actor_writes = self._pending_actor_writes
+                schema_writes = self._pending_schema_writes
+                self._pending_actor_writes = Counter()
+                self._pending_schema_writes = Counter()
+
+            try:
+                if reload:
+                    self._listen()
+                    await self.reload()
+                    self.is_ready = True
+                elif (
+                    actor_ids
+                    or schema_ids
+                    or actor_writes
+                    or schema_writes
+                    or version is not None
+                ):
+                    await self.refresh(
+                        actor_ids | actor_writes.keys(),
+                        schema_ids | schema_writes.keys(),
+                        version,
+                    )
+            except Exception:  # pylint: disable=W0718
+                logger.exception("Failed to sync registry snapshot. Reloading ...")
+                with self._lock:
+                    # The reload re-reads these writes, as it only starts after them
+                    self._pending_actor_writes.update(actor_writes)
+                    self._pending_schema_writes.update(schema_writes)
+                self._request_reload()
+                await asyncio.sleep(wait)
+                wait = min(wait * 2, RELOAD_MAX_WAIT)
+                continue
+
+            wait = 0.5
+            with self._lock:
+                self._written_actor_ids -= actor_writes
+                self._written_schema_ids -= schema_writes
+
+
+registry_snapshot = RegistrySnapshot()
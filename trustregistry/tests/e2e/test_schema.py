@@ -15,7 +15,15 @@ updated_schema_id = "string_updated:2:string_updated:string_updated"
 async def test_get_schemas():
     async with RichAsyncClient() as client:
         response = await client.get(f"{TRUST_REGISTRY_URL}/registry/schemas")
-    assert response.status_code == 200
+        assert response.status_code == 200
+
+        # Revalidating with the returned ETag doesn't resend the unchanged list
+        etag = response.headers["ETag"]
+        not_modified_response = await client.get(
+            f"{TRUST_REGISTRY_URL}/registry/schemas", headers={"If-None-Match": etag}
+        )
+    assert not_modified_response.status_code == 304
+    assert not_modified_response.headers["ETag"] == etag
 
 
 @pytest.mark.anyio
@@ -51,6 +59,14 @@ async def test_register_schema():
         assert response.status_code == 409
         assert "Schema already exists" in response.json()["detail"]
 
+        # Upserting an existing schema is idempotent
+        response = await client.put(
+            f"{TRUST_REGISTRY_URL}/registry/schemas",
+            json=payload,
+        )
+        assert response.status_code == 200
+        assert response.json() == schema_dict
+
 
 @pytest.mark.anyio
 async def test_get_schema_by_id():
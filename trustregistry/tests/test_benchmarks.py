@@ -0,0 +1,32 @@
+import pytest
+
+from trustregistry.benchmarks import bench_api, bench_snapshot
+
+
+@pytest.mark.anyio
+async def test_bench_api(capsys):
+    await bench_api.run(
+        "sqlite://", num_actors=50, num_schemas=20, num_requests=20, concurrency=4
+    )
+
+    rows = capsys.readouterr().out.splitlines()[2:]
+    assert [row[:22].strip() for row in rows] == [
+        "actor by id",
+        "actor by did",
+        "actor by name",
+        "schema by id",
+        "list actors",
+        "list schemas",
+        "registry",
+        "list actors (304)",
+        "list schemas (304)",
+        "register actor",
+    ]
+    # No request failed
+    assert all(row.split()[-1] == "0" for row in rows)
+
+
+def test_bench_snapshot(capsys):
+    bench_snapshot.run("sqlite://", num_actors=50, num_schemas=20, num_lookups=20)
+
+    assert "schema by id    snapshot" in capsys.readouterr().out
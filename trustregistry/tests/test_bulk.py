@@ -0,0 +1,102 @@
+from unittest.mock import Mock
+
+import orjson
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from shared.models.trustregistry import Actor
+from trustregistry import crud
+from trustregistry.database import Base
+from trustregistry.registry.bulk import bulk_import, export_ndjson, read_ndjson_lines
+
+alice = {"id": "1", "name": "Alice", "roles": ["issuer"], "did": "did:sov:1"}
+bob = {"id": "2", "name": "Bob", "roles": ["verifier"], "did": "did:sov:2"}
+
+
+async def _lines(*lines: bytes):
+    for line_number, line in enumerate(lines, start=1):
+        yield line_number, line
+
+
+@pytest.mark.anyio
+async def test_read_ndjson_lines():
+    async def stream():
+        for chunk in [b'{"a": 1}\n{"b"', b": 2}\n\n", b'{"c": 3}']:
+            yield chunk
+
+    request = Mock()
+    request.stream = stream
+
+    lines = [line async for line in read_ndjson_lines(request)]
+
+    assert lines == [(1, b'{"a": 1}'), (2, b'{"b": 2}'), (4, b'{"c": 3}')]
+
+
+@pytest.mark.anyio
+async def test_bulk_import():
+    insert_batch = Mock(side_effect=[{"1"}, set()])
+
+    result = await bulk_import(
+        _lines(
+            orjson.dumps(alice),
+            b"not json",
+            orjson.dumps({**alice, "did": "sov:1"}),
+            orjson.dumps(alice),
+            orjson.dumps(bob),
+        ),
+        parse=Actor.model_validate_json,
+        insert_batch=insert_batch,
+        batch_size=2,
+    )
+
+    assert insert_batch.call_count == 2
+    assert [len(call.args[0]) for call in insert_batch.call_args_list] == [2, 1]
+    assert [(row.line, row.status) for row in result.results] == [
+        (2, "invalid"),
+        (3, "invalid"),
+        (1, "created"),
+        (4, "conflict"),
+        (5, "conflict"),
+    ]
+    assert result.results[1].detail == "Only fully qualified DIDs allowed."
+    assert (result.created, result.failed) == (1, 4)
+
+
+@pytest.mark.anyio
+async def test_bulk_import_failed_batch():
+    insert_batch = Mock(side_effect=[Exception("Database unavailable"), {"2"}])
+
+    result = await bulk_import(
+        _lines(orjson.dumps(alice), orjson.dumps(bob)),
+        parse=Actor.model_validate_json,
+        insert_batch=insert_batch,
+        batch_size=1,
+    )
+
+    # A failed batch doesn't stop later batches
+    assert [(row.id, row.status) for row in result.results] == [
+        ("1", "failed"),
+        ("2", "created"),
+    ]
+    assert result.results[0].detail == "Database unavailable"
+
+
+def test_export_ndjson():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as db_session:
+        crud.bulk_create_actors(db_session, [Actor(**alice), Actor(**bob)])
+
+    lines = list(export_ndjson(crud.stream_actors, session_factory, batch_size=1))
+
+    assert [orjson.loads(line) for line in lines] == [
+        {**alice, "didcomm_invitation": None, "image_url": None},
+        {**bob, "didcomm_invitation": None, "image_url": None},
+    ]
+    assert all(line.endswith(b"\n") for line in lines)
+    engine.dispose()
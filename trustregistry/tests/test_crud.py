@@ -1,17 +1,23 @@
+from datetime import timedelta
 from unittest.mock import Mock, patch
 
 import pytest
+from sqlalchemy import create_engine, event, update
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from shared.models.trustregistry import Actor, Schema
 from trustregistry import crud, db
 from trustregistry.crud import (
     ActorAlreadyExistsException,
     ActorDoesNotExistException,
+    ActorNameReservedException,
+    ReservationDoesNotExistException,
     SchemaAlreadyExistsException,
     SchemaDoesNotExistException,
 )
+from trustregistry.database import Base
 
 # pylint: disable=redefined-outer-name
 
@@ -19,6 +25,9 @@ from trustregistry.crud import (
 @pytest.fixture
 def db_session_mock():
     session = Mock(spec=Session)
+    # No name is reserved
+    session.execute.return_value.all.return_value = []
+    session.scalar.return_value = None
     return session
 
 
@@ -156,23 +165,18 @@ def test_create_actor_exception(db_session_mock: Session):
         crud.create_actor(db_session_mock, actor1)
 
 
-@pytest.mark.parametrize("actor, actor_id", [(actor1, "1"), (None, "NotInDB")])
+@pytest.mark.parametrize("actor, actor_id", [(db_actor1, "1"), (None, "NotInDB")])
 def test_delete_actor(db_session_mock: Session, actor, actor_id):
-    db_session_mock.scalars.return_value.one_or_none.return_value = actor
-    with patch("trustregistry.crud.select") as select_mock, patch(
-        "trustregistry.crud.delete"
-    ) as delete_mock:
-
+    db_session_mock.scalars.return_value.first.return_value = actor
+    with patch("trustregistry.crud.delete") as delete_mock:
         if actor:
             result = crud.delete_actor(db_session_mock, actor_id=actor_id)
 
-            select_mock.assert_called_once_with(db.Actor)
-            select_mock(db.Actor).where.assert_called_once()
-
             delete_mock.assert_called_once_with(db.Actor)
             delete_mock(db.Actor).where.assert_called_once()
+            delete_mock(db.Actor).where().returning.assert_called_once_with(db.Actor)
 
-            db_session_mock.execute.assert_called_once()
+            db_session_mock.scalars.assert_called_once()
             db_session_mock.commit.assert_called_once()
 
             assert result == actor
@@ -180,23 +184,38 @@ def test_delete_actor(db_session_mock: Session, actor, actor_id):
             with pytest.raises(ActorDoesNotExistException):
                 crud.delete_actor(db_session_mock, actor_id=actor_id)
 
+            db_session_mock.rollback.assert_called_once()
+            db_session_mock.commit.assert_not_called()
 
-@pytest.mark.parametrize("new_actor, old_actor ", [(actor1, db_actor1), (actor1, None)])
-def test_update_actor(db_session_mock: Session, new_actor: Actor, old_actor: db.Actor):
-    db_session_mock.scalars.return_value.one_or_none.return_value = old_actor
 
-    if not old_actor:
-        with pytest.raises(ActorDoesNotExistException):
-            crud.update_actor(db_session_mock, new_actor)
-    else:
-        with patch("trustregistry.crud.update") as update_mock:
-            crud.update_actor(db_session_mock, new_actor)
+@pytest.mark.parametrize(
+    "new_actor, updated_actor", [(actor1, db_actor1), (actor1, None)]
+)
+def test_update_actor(
+    db_session_mock: Session, new_actor: Actor, updated_actor: db.Actor
+):
+    db_session_mock.scalars.return_value.first.return_value = updated_actor
+
+    with patch("trustregistry.crud.update") as update_mock:
+        if not updated_actor:
+            with pytest.raises(ActorDoesNotExistException):
+                crud.update_actor(db_session_mock, new_actor)
+
+            db_session_mock.rollback.assert_called_once()
+            db_session_mock.commit.assert_not_called()
+        else:
+            result = crud.update_actor(db_session_mock, new_actor)
 
             update_mock.assert_called_once_with(db.Actor)
             update_mock(db.Actor).where.assert_called_once()
             update_mock(db.Actor).where().values.assert_called_once()
+            assert (
+                "image_url" not in update_mock(db.Actor).where().values.call_args.kwargs
+            )
 
+            db_session_mock.scalars.assert_called_once()
             db_session_mock.commit.assert_called_once()
+            assert result == updated_actor
 
 
 @pytest.mark.parametrize(
@@ -244,20 +263,22 @@ def test_get_schema_by_id(db_session_mock: Session, expected, schema_id):
         select_mock(db.Schema).where.assert_called_once()
 
 
-@pytest.mark.parametrize(
-    "old_schema, new_schema", [(None, schema1), (db_schema1, schema1)]
-)
-def test_create_schema(db_session_mock: Session, old_schema, new_schema):
-    schema = db.Schema(**new_schema.model_dump())
-    db_session_mock.scalars.return_value.one_or_none.return_value = old_schema
-    if old_schema:
+@pytest.mark.parametrize("inserted", [True, False])
+def test_create_schema(db_session_mock: Session, inserted: bool):
+    schema = db.Schema(**schema1.model_dump())
+    db_session_mock.scalars.return_value.first.return_value = (
+        schema if inserted else None
+    )
+    if not inserted:
         with pytest.raises(SchemaAlreadyExistsException):
-            crud.create_schema(db_session_mock, new_schema)
+            crud.create_schema(db_session_mock, schema1)
+
+        db_session_mock.rollback.assert_called_once()
+        db_session_mock.commit.assert_not_called()
     else:
-        result = crud.create_schema(db_session_mock, new_schema)
-        db_session_mock.add.assert_called_once()
+        result = crud.create_schema(db_session_mock, schema1)
+        db_session_mock.scalars.assert_called_once()
         db_session_mock.commit.assert_called_once()
-        db_session_mock.refresh.assert_called_once()
 
         assert result.id == schema.id
         assert result.did == schema.did
@@ -265,8 +286,25 @@ def test_create_schema(db_session_mock: Session, old_schema, new_schema):
         assert result.version == schema.version
 
 
+@pytest.mark.parametrize("inserted", [True, False])
+def test_upsert_schema(db_session_mock: Session, inserted: bool):
+    schema = db.Schema(**schema1.model_dump())
+    db_session_mock.scalars.return_value.first.return_value = (
+        schema if inserted else None
+    )
+
+    result = crud.upsert_schema(db_session_mock, schema1)
+
+    db_session_mock.scalars.assert_called_once()
+    db_session_mock.commit.assert_called_once()
+    assert result.id == schema1.id
+    assert result.did == schema1.did
+    assert result.name == schema1.name
+    assert result.version == schema1.version
+
+
 @pytest.mark.parametrize(
-    "new_schema, old_schema",
+    "new_schema, updated_schema",
     [
         (
             Schema(
@@ -280,43 +318,226 @@ def test_create_schema(db_session_mock: Session, old_schema, new_schema):
         (schema1, None),
     ],
 )
-def test_update_schema(db_session_mock: Session, new_schema, old_schema):
-    db_session_mock.scalars.return_value.one_or_none.return_value = old_schema
-    if not old_schema:
-        with pytest.raises(SchemaDoesNotExistException):
-            crud.update_schema(db_session_mock, new_schema, new_schema.id)
-    else:
-        with patch("trustregistry.crud.update") as update_mock:
-            crud.update_schema(db_session_mock, new_schema, new_schema.id)
+def test_update_schema(db_session_mock: Session, new_schema, updated_schema):
+    db_session_mock.scalars.return_value.first.return_value = updated_schema
+    with patch("trustregistry.crud.update") as update_mock:
+        if not updated_schema:
+            with pytest.raises(SchemaDoesNotExistException):
+                crud.update_schema(db_session_mock, new_schema, new_schema.id)
+
+            db_session_mock.rollback.assert_called_once()
+            db_session_mock.commit.assert_not_called()
+        else:
+            result = crud.update_schema(db_session_mock, new_schema, new_schema.id)
 
             update_mock.assert_called_once_with(db.Schema)
             update_mock(db.Schema).where.assert_called_once()
             update_mock(db.Schema).where().values.assert_called_once()
 
+            db_session_mock.scalars.assert_called_once()
             db_session_mock.commit.assert_called_once()
+            assert result == updated_schema
 
 
 @pytest.mark.parametrize(
     "schema, schema_id", [(db_schema1, "did123:2:schema1:1.0"), (None, "not_in_db")]
 )
 def test_delete_schema(db_session_mock: Session, schema, schema_id):
-    db_session_mock.scalars.return_value.one_or_none.return_value = schema
-    with patch("trustregistry.crud.select") as select_mock, patch(
-        "trustregistry.crud.delete"
-    ) as delete_mock:
+    db_session_mock.scalars.return_value.first.return_value = schema
+    with patch("trustregistry.crud.delete") as delete_mock:
         if schema:
             result = crud.delete_schema(db_session_mock, schema_id)
 
-            select_mock.assert_called_once_with(db.Schema)
-            select_mock(db.Schema).where.assert_called_once()
-
             delete_mock.assert_called_once_with(db.Schema)
             delete_mock(db.Schema).where.assert_called_once()
+            delete_mock(db.Schema).where().returning.assert_called_once_with(db.Schema)
 
-            db_session_mock.execute.assert_called_once()
+            db_session_mock.scalars.assert_called_once()
             db_session_mock.commit.assert_called_once()
 
             assert result == schema
         else:
             with pytest.raises(SchemaDoesNotExistException):
                 crud.delete_schema(db_session_mock, schema_id)
+
+            db_session_mock.rollback.assert_called_once()
+
+
+@pytest.fixture
+def sqlite_session():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda _conn, _cursor, statement, *_: statements.append(statement.split()[0]),
+    )
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    session.statements = statements
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def test_writes_use_a_single_statement(sqlite_session):
+    crud.create_actor(sqlite_session, actor1.model_copy(update={"image_url": "img"}))
+    sqlite_session.statements.clear()
+
+    updated_actor = crud.update_actor(
+        sqlite_session, actor1.model_copy(update={"name": "Alice v2"})
+    )
+    assert updated_actor.name == "Alice v2"
+    assert updated_actor.image_url == "img"  # Kept when not provided
+
+    schema = Schema(did="did123", name="schema", version="1.0")
+    assert crud.create_schema(sqlite_session, schema).id == schema.id
+    with pytest.raises(SchemaAlreadyExistsException):
+        crud.create_schema(sqlite_session, schema)
+    assert crud.upsert_schema(sqlite_session, schema).id == schema.id
+
+    new_schema = Schema(did="did123", name="schema", version="2.0")
+    assert crud.update_schema(sqlite_session, new_schema, schema.id).id == new_schema.id
+    assert crud.delete_schema(sqlite_session, new_schema.id).version == "2.0"
+    assert crud.delete_actor(sqlite_session, actor1.id).name == "Alice v2"
+
+    with pytest.raises(ActorDoesNotExistException):
+        crud.update_actor(sqlite_session, actor1)
+    with pytest.raises(ActorDoesNotExistException):
+        crud.delete_actor(sqlite_session, actor1.id)
+    with pytest.raises(SchemaDoesNotExistException):
+        crud.update_schema(sqlite_session, new_schema, schema.id)
+    with pytest.raises(SchemaDoesNotExistException):
+        crud.delete_schema(sqlite_session, schema.id)
+
+    # One statement per operation, with no existence check or refresh
+    assert sqlite_session.statements == [
+        "UPDATE",
+        "INSERT",
+        "INSERT",
+        "INSERT",
+        "UPDATE",
+        "DELETE",
+        "DELETE",
+        "UPDATE",
+        "SELECT",  # Whether the name is reserved, as the update failed
+        "DELETE",
+        "UPDATE",
+        "DELETE",
+    ]
+
+
+def test_bulk_create_actors(sqlite_session):
+    crud.create_actor(sqlite_session, actor1)
+    sqlite_session.statements.clear()
+
+    bob_again = actor2.model_copy(update={"name": "Bob again"})
+    alice_renamed = Actor(id="3", name="Alice", roles=["verifier"], did="did:789")
+    with patch("trustregistry.crud._on_committed") as on_committed:
+        created_ids = crud.bulk_create_actors(
+            sqlite_session, [actor1, actor2, bob_again, alice_renamed]
+        )
+
+    # Existing IDs, repeated IDs and taken names are all skipped, and the reservations
+    # of the created actors' names are consumed
+    assert created_ids == {"2"}
+    assert sqlite_session.statements == ["SELECT", "INSERT", "DELETE"]
+    on_committed.assert_called_once()
+    assert on_committed.call_args.args[2].name == "Bob"
+    assert [actor.id for actor in crud.stream_actors(sqlite_session, 1)] == ["1", "2"]
+
+
+def test_bulk_create_schemas(sqlite_session):
+    crud.create_schema(sqlite_session, schema1)
+    schema2 = Schema(did="did123", name="schema2", version="1.0")
+
+    created_ids = crud.bulk_create_schemas(sqlite_session, [schema1, schema2])
+
+    assert created_ids == {schema2.id}
+    assert [schema.id for schema in crud.stream_schemas(sqlite_session)] == [
+        schema1.id,
+        schema2.id,
+    ]
+
+
+def test_bulk_create_actors_x(db_session_mock: Session):
+    db_session_mock.get_bind.return_value.dialect.name = "postgresql"
+    db_session_mock.scalars.side_effect = IntegrityError("", "", "")
+
+    with pytest.raises(IntegrityError):
+        crud.bulk_create_actors(db_session_mock, [actor1])
+
+    db_session_mock.rollback.assert_called_once()
+    db_session_mock.commit.assert_not_called()
+
+
+def test_get_data_version(sqlite_session):
+    assert crud.get_data_version(sqlite_session) == 0
+
+    sqlite_session.add(db.RegistryVersion(id=1, version=42))
+    sqlite_session.commit()
+
+    assert crud.get_data_version(sqlite_session) == 42
+
+
+def test_reserve_actor_name(sqlite_session):
+    crud.create_actor(sqlite_session, actor1)
+
+    with pytest.raises(ActorAlreadyExistsException):
+        crud.reserve_actor_name(sqlite_session, actor_name="Alice", ttl=60)
+
+    reservation = crud.reserve_actor_name(sqlite_session, actor_name="Bob", ttl=60)
+    reservation_id = reservation.id
+    assert reservation.name == "Bob"
+    with pytest.raises(ActorNameReservedException):
+        crud.reserve_actor_name(sqlite_session, actor_name="Bob", ttl=60)
+
+    # An expired reservation is replaced
+    sqlite_session.execute(
+        update(db.ActorNameReservation).values(
+            expires_at=reservation.expires_at - timedelta(seconds=61)
+        )
+    )
+    sqlite_session.commit()
+    new_reservation = crud.reserve_actor_name(sqlite_session, "Bob", ttl=60)
+    assert new_reservation.id != reservation_id
+
+    # Only the holder of the reservation can register or rename an actor with the name
+    with pytest.raises(ActorNameReservedException):
+        crud.create_actor(sqlite_session, actor2)
+    with pytest.raises(ActorNameReservedException):
+        crud.create_actor(sqlite_session, actor2, reservation_id=reservation_id)
+    assert not crud.bulk_create_actors(sqlite_session, [actor2])
+    with pytest.raises(ActorNameReservedException):
+        crud.update_actor(sqlite_session, actor1.model_copy(update={"name": "Bob"}))
+
+    # Registering the actor consumes the reservation
+    crud.create_actor(sqlite_session, actor2, reservation_id=new_reservation.id)
+    with pytest.raises(ReservationDoesNotExistException):
+        crud.release_actor_name(sqlite_session, new_reservation.id)
+
+
+def test_bulk_create_actors_consumes_reservations(sqlite_session):
+    alice = crud.reserve_actor_name(sqlite_session, actor_name="Alice", ttl=60)
+    bob = crud.reserve_actor_name(sqlite_session, actor_name="Bob", ttl=60)
+
+    created_ids = crud.bulk_create_actors(
+        sqlite_session, [actor1, actor2], reservation_ids={"2": bob.id}
+    )
+
+    # Alice is reserved under an ID that was not given, so only Bob is registered
+    assert created_ids == {"2"}
+    with pytest.raises(ReservationDoesNotExistException):
+        crud.release_actor_name(sqlite_session, bob.id)
+    assert crud.release_actor_name(sqlite_session, alice.id).name == "Alice"
+
+
+def test_release_actor_name(sqlite_session):
+    reservation = crud.reserve_actor_name(sqlite_session, actor_name="Bob", ttl=60)
+
+    assert crud.release_actor_name(sqlite_session, reservation.id).name == "Bob"
+    assert crud.reserve_actor_name(sqlite_session, actor_name="Bob", ttl=60)
+    with pytest.raises(ReservationDoesNotExistException):
+        crud.release_actor_name(sqlite_session, reservation.id)
@@ -1,8 +1,14 @@
 from unittest.mock import MagicMock, patch
 
 import pytest
+from sqlalchemy import create_engine, delete, select
+from sqlalchemy.pool import StaticPool
 
-from trustregistry.db import get_db, schema_id_gen
+from shared.constants import TRUST_REGISTRY_SESSION_HEADER
+from shared.util.cache import BoundedCache
+from trustregistry import database, db
+from trustregistry.database import Base
+from trustregistry.db import get_db, get_read_db, request_client, schema_id_gen
 
 
 def test_schema_id_gen():
@@ -16,14 +22,117 @@ def test_schema_id_gen():
 
 
 def test_get_db():
-    with patch("trustregistry.db.SessionLocal", autospec=True) as mock_session_local:
+    request = MagicMock()
+    request.headers = {}
+    request.client.host = "10.0.0.1"
+    with patch("trustregistry.db.new_session", autospec=True) as mock_new_session:
         mock_session = MagicMock()
-        mock_session_local.return_value = mock_session
-        db_gen = get_db()
+        mock_new_session.return_value = mock_session
+        db_gen = get_db(request)
 
         db_session = next(db_gen)
         assert db_session is mock_session
+        mock_new_session.assert_called_once_with("10.0.0.1")
         with pytest.raises(StopIteration):
             next(db_gen)
 
         mock_session.close.assert_called_once()
+
+
+def test_get_read_db():
+    request = MagicMock()
+    request.headers = {}
+    request.client = None
+    with patch("trustregistry.db.new_read_session") as mock_new_read_session:
+        mock_session = MagicMock()
+        mock_new_read_session.return_value = mock_session
+        db_gen = get_read_db(request)
+
+        db_session = next(db_gen)
+        assert db_session is mock_session
+        mock_new_read_session.assert_called_once_with(None)
+        with pytest.raises(StopIteration):
+            next(db_gen)
+
+        mock_session.close.assert_called_once()
+
+
+def test_request_client():
+    request = MagicMock()
+    request.headers = {TRUST_REGISTRY_SESSION_HEADER: "cloudapi"}
+    request.client.host = "10.0.0.1"
+    # The session is shared by the caller's replicas, unlike their address
+    assert request_client(request) == "session:cloudapi"
+
+    request.headers = {}
+    assert request_client(request) == "10.0.0.1"
+
+
+@pytest.fixture
+def recent_writers():
+    writers = BoundedCache(maxsize=10, ttl=database.READ_YOUR_WRITES_WINDOW)
+    with patch.object(database, "_recent_writers", writers):
+        yield writers
+
+
+@pytest.fixture
+def sqlite_engine():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_new_read_session_read_your_writes(
+    recent_writers,  # pylint: disable=redefined-outer-name
+):
+    with patch.object(database, "SessionLocal") as mock_session_local, patch.object(
+        database, "ReadSessionLocal"
+    ) as mock_read_session_local:
+        assert (
+            database.new_read_session("writer") is mock_read_session_local.return_value
+        )
+
+        # A committed write keeps the client's reads on the primary, but not others'
+        recent_writers.set("writer", True)
+        assert database.new_read_session("writer") is mock_session_local.return_value
+        assert (
+            database.new_read_session("reader") is mock_read_session_local.return_value
+        )
+        assert database.new_read_session() is mock_read_session_local.return_value
+
+
+@pytest.mark.parametrize(
+    "write",
+    [
+        lambda session: session.add(db.RegistryVersion(id=1, version=0)),
+        lambda session: session.execute(delete(db.Schema)),
+    ],
+)
+def test_commit_records_write(
+    sqlite_engine, recent_writers, write  # pylint: disable=redefined-outer-name
+):
+    with database.SessionLocal(
+        bind=sqlite_engine, info={"client": "writer"}
+    ) as session:
+        write(session)
+        session.commit()
+
+    assert recent_writers.get("writer")
+
+
+def test_commit_without_write_not_recorded(
+    sqlite_engine, recent_writers  # pylint: disable=redefined-outer-name
+):
+    with database.SessionLocal(
+        bind=sqlite_engine, info={"client": "reader"}
+    ) as session:
+        session.scalars(select(db.Schema)).all()
+        session.commit()
+
+        # A rolled back write is not recorded by a later commit either
+        session.execute(delete(db.Schema))
+        session.rollback()
+        session.commit()
+
+    assert not recent_writers.get("reader")
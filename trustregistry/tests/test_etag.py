@@ -0,0 +1,51 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi import Response
+
+from trustregistry.registry.etag import check_not_modified, etag_matches
+
+
+@pytest.mark.parametrize(
+    "if_none_match, expected",
+    [
+        (None, False),
+        ('"4"', False),
+        ('"3"', True),
+        ('W/"3"', True),
+        ('"1", "3"', True),
+        ("*", True),
+    ],
+)
+def test_etag_matches(if_none_match, expected):
+    headers = {"If-None-Match": if_none_match} if if_none_match else {}
+
+    assert etag_matches(Mock(headers=headers), '"3"') is expected
+
+
+@pytest.mark.parametrize("if_none_match", [None, '"3"'])
+def test_check_not_modified(if_none_match):
+    headers = {"If-None-Match": if_none_match} if if_none_match else {}
+    response = Response()
+    with patch("trustregistry.registry.etag.crud.get_data_version", return_value=3):
+        not_modified = check_not_modified(Mock(headers=headers), response, Mock())
+
+    if if_none_match:
+        assert not_modified.status_code == 304
+        assert not_modified.headers["ETag"] == '"3"'
+    else:
+        assert not_modified is None
+        assert response.headers["ETag"] == '"3"'
+        assert response.headers["Cache-Control"] == "no-cache"
+
+
+def test_check_not_modified_unknown_version():
+    response = Response()
+    with patch("trustregistry.registry.etag.crud.get_data_version", return_value=None):
+        not_modified = check_not_modified(
+            Mock(headers={"If-None-Match": "*"}), response, Mock()
+        )
+
+    # Without a known version, the full response is sent without an ETag
+    assert not_modified is None
+    assert "ETag" not in response.headers
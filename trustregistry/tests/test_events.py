@@ -0,0 +1,73 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from nats.aio.client import Client as NATS
+
+from shared.models.trustregistry import TrustRegistryEvent
+from trustregistry import db
+from trustregistry.events import RegistryEventPublisher
+
+db_actor = db.Actor(id="1", name="Alice", roles=["issuer"], did="did:sov:123")
+db_schema = db.Schema(id="123:2:schema:1.0", did="123", name="schema", version="1.0")
+
+
+def test_publish_before_start_is_noop():
+    publisher = RegistryEventPublisher()
+    publisher.publish("actor", "created", db_actor)
+
+    assert not publisher.is_running
+
+
+@pytest.mark.anyio
+async def test_publish_events():
+    mock_nats = AsyncMock(spec=NATS)
+    publisher = RegistryEventPublisher(subject="registry")
+
+    with patch("trustregistry.events.connect_nats", return_value=mock_nats):
+        await publisher.start()
+        assert publisher.is_running
+
+        publisher.publish("actor", "created", db_actor)
+        publisher.publish(
+            "schema", "updated", db_schema, previous_id="123:2:schema:0.1"
+        )
+        await publisher.stop()
+
+    assert not publisher.is_running
+    mock_nats.close.assert_awaited_once()
+
+    assert mock_nats.publish.await_count == 2
+    (actor_subject, actor_payload), (schema_subject, schema_payload) = [
+        call.args for call in mock_nats.publish.await_args_list
+    ]
+
+    assert actor_subject == "registry.actor.created"
+    actor_event = TrustRegistryEvent.model_validate_json(actor_payload)
+    assert actor_event.id == "1"
+    assert actor_event.previous_id is None
+    assert actor_event.data["name"] == "Alice"
+    assert actor_event.data["roles"] == ["issuer"]
+
+    assert schema_subject == "registry.schema.updated"
+    schema_event = TrustRegistryEvent.model_validate_json(schema_payload)
+    assert schema_event.id == "123:2:schema:1.0"
+    assert schema_event.previous_id == "123:2:schema:0.1"
+
+
+@pytest.mark.anyio
+async def test_publish_error_does_not_stop_publisher():
+    mock_nats = AsyncMock(spec=NATS)
+    mock_nats.publish.side_effect = [Exception("NATS unavailable"), None]
+    publisher = RegistryEventPublisher()
+
+    with patch("trustregistry.events.connect_nats", return_value=mock_nats):
+        await publisher.start()
+        publisher.publish("actor", "deleted", db_actor)
+        publisher.publish("actor", "created", db_actor)
+        await asyncio.sleep(0.05)
+
+        assert publisher.is_running
+        await publisher.stop()
+
+    assert mock_nats.publish.await_count == 2
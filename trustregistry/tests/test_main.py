@@ -1,11 +1,21 @@
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from sqlalchemy import create_engine
+from sqlalchemy.exc import ProgrammingError
 from sqlalchemy.orm import Session
 
 from trustregistry import db
-from trustregistry.main import app, check_migrations, lifespan, registry, root
+from trustregistry.main import (
+    app,
+    check_head_revision,
+    check_migrations,
+    get_head_revision,
+    lifespan,
+    registry,
+    root,
+)
 
 
 @pytest.fixture
@@ -132,6 +142,74 @@ async def test_lifespan_no_migrations_needed(
     )
 
 
+@pytest.mark.anyio
+@patch("trustregistry.main.MIGRATION_MODE", "check")
+@patch("trustregistry.main.engine")
+@patch("trustregistry.main.check_head_revision")
+@patch("trustregistry.main.run_migrations")
+@patch("trustregistry.main.Config")
+@patch("trustregistry.main.inspect")
+async def test_lifespan_check_mode(
+    mock_inspect,
+    mock_config,
+    mock_run_migrations,
+    mock_check_head_revision,
+    mock_engine,
+):
+    async with lifespan(FastAPI()):
+        pass
+
+    mock_check_head_revision.assert_called_once_with(
+        mock_engine, mock_config.return_value
+    )
+    mock_run_migrations.assert_not_called()
+    mock_inspect.assert_not_called()
+
+
+def test_get_head_revision(tmp_path):
+    head_file = tmp_path / "alembic_head"
+    with patch("trustregistry.main.ALEMBIC_HEAD_FILE", str(head_file)), patch(
+        "trustregistry.main.ScriptDirectory"
+    ) as mock_script_directory:
+        mock_script_directory.from_config.return_value.get_current_head.return_value = (
+            "scripts_head"
+        )
+        assert get_head_revision(MagicMock()) == "scripts_head"
+
+        head_file.write_text("baked_head\n")
+        assert get_head_revision(MagicMock()) == "baked_head"
+
+
+@pytest.mark.parametrize(
+    "current_rev, head_rev, raises",
+    [("same_rev", "same_rev", False), ("old_rev", "head_rev", True)],
+)
+def test_check_head_revision(current_rev, head_rev, raises):
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.exec_driver_sql("CREATE TABLE alembic_version (version_num TEXT)")
+        connection.exec_driver_sql(
+            f"INSERT INTO alembic_version VALUES ('{current_rev}')"
+        )
+
+    with patch("trustregistry.main.get_head_revision", return_value=head_rev):
+        if raises:
+            with pytest.raises(RuntimeError, match="old_rev"):
+                check_head_revision(engine, MagicMock())
+        else:
+            check_head_revision(engine, MagicMock())
+
+
+def test_check_head_revision_no_version_table():
+    mock_engine = MagicMock()
+    mock_connection = mock_engine.connect.return_value.__enter__.return_value
+    mock_connection.execute.side_effect = ProgrammingError("", "", "")
+
+    with patch("trustregistry.main.get_head_revision", return_value="head_rev"):
+        with pytest.raises(RuntimeError, match="`None`"):
+            check_head_revision(mock_engine, MagicMock())
+
+
 # Test 1: alembic_version missing, actors exists
 # Test 2: both alembic_version and actors missing
 # Test 3: alembic_version exists, revisions don't match
@@ -223,15 +301,19 @@ async def test_root(db_session_mock):  # pylint: disable=redefined-outer-name
         db.Schema(id="456", did="did:123", name="schema2", version="1.0"),
     ]
     actors = [db.Actor(id="1", name="Alice"), db.Actor(id="2", name="Bob")]
+    response = Response()
     with patch("trustregistry.main.crud.get_schemas") as mock_get_schemas, patch(
         "trustregistry.main.crud.get_actors"
-    ) as mock_get_actors:
+    ) as mock_get_actors, patch(
+        "trustregistry.registry.etag.crud.get_data_version", return_value=3
+    ):
         mock_get_schemas.return_value = schemas
         mock_get_actors.return_value = actors
 
-        response = await root(db_session_mock)
+        result = await root(Mock(headers={}), response, db_session_mock)
 
-        assert response == {"actors": actors, "schemas": ["123", "456"]}
+        assert result == {"actors": actors, "schemas": ["123", "456"]}
+        assert response.headers["ETag"] == '"3"'
 
         mock_get_schemas.assert_called_once_with(db_session_mock)
         mock_get_actors.assert_called_once_with(db_session_mock)
@@ -242,8 +324,25 @@ async def test_registry(db_session_mock):  # pylint: disable=redefined-outer-nam
     with patch("trustregistry.main.root") as mock_root:
         mock_root.return_value = {"actors": "actors", "schemas": "schemas"}
 
-        response = await registry(db_session_mock)
+        request, response = Mock(), Mock()
+        result = await registry(request, response, db_session_mock)
+
+        assert result == {"actors": "actors", "schemas": "schemas"}
 
-        assert response == {"actors": "actors", "schemas": "schemas"}
+        mock_root.assert_called_once_with(request, response, db_session_mock)
 
-        mock_root.assert_called_once_with(db_session_mock)
+
+@pytest.mark.anyio
+async def test_root_not_modified(
+    db_session_mock,
+):  # pylint: disable=redefined-outer-name
+    with patch("trustregistry.main.crud.get_schemas") as mock_get_schemas, patch(
+        "trustregistry.registry.etag.crud.get_data_version", return_value=3
+    ):
+        result = await root(
+            Mock(headers={"If-None-Match": '"3"'}), Response(), db_session_mock
+        )
+
+        assert result.status_code == 304
+        assert result.headers["ETag"] == '"3"'
+        mock_get_schemas.assert_not_called()
@@ -1,10 +1,20 @@
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import pytest
 from fastapi.exceptions import HTTPException
 
-from shared.models.trustregistry import Actor
-from trustregistry.crud import ActorAlreadyExistsException, ActorDoesNotExistException
+from shared.models.trustregistry import (
+    Actor,
+    ActorNameReservation,
+    ActorNameReservationRequest,
+    ActorRegistration,
+)
+from trustregistry.crud import (
+    ActorAlreadyExistsException,
+    ActorDoesNotExistException,
+    ActorNameReservedException,
+    ReservationDoesNotExistException,
+)
 from trustregistry.registry import registry_actors
 
 
@@ -13,7 +23,11 @@ async def test_get_actors():
     with patch("trustregistry.registry.registry_actors.crud.get_actors") as mock_crud:
         actor = Actor(id="1", name="Alice", roles=["issuer"], did="did:sov:1234")
         mock_crud.return_value = [actor]
-        result = await registry_actors.get_actors()
+        with patch(
+            "trustregistry.registry.registry_actors.check_not_modified",
+            return_value=None,
+        ):
+            result = await registry_actors.get_actors(Mock(), Mock())
         mock_crud.assert_called_once()
         assert result == [actor]
 
@@ -23,19 +37,30 @@ async def test_register_actor():
     with patch("trustregistry.registry.registry_actors.crud.create_actor") as mock_crud:
         actor = Actor(id="1", name="Alice", roles=["issuer"], did="did:sov:1234")
         mock_crud.return_value = actor
-        result = await registry_actors.register_actor(actor)
-        mock_crud.assert_called_once()
+        result = await registry_actors.register_actor(
+            ActorRegistration(**actor.model_dump(), reservation_id="reservation")
+        )
+        mock_crud.assert_called_once_with(
+            mock_crud.call_args.args[0], actor=actor, reservation_id="reservation"
+        )
         assert result == actor
 
 
 @pytest.mark.anyio
 @pytest.mark.parametrize(
-    "exception, status_code", [(ActorAlreadyExistsException, 409), (Exception, 500)]
+    "exception, status_code",
+    [
+        (ActorAlreadyExistsException, 409),
+        (ActorNameReservedException, 409),
+        (Exception, 500),
+    ],
 )
 async def test_register_actor_x(exception, status_code):
 
     with patch("trustregistry.registry.registry_actors.crud.create_actor") as mock_crud:
-        actor = Actor(id="1", name="Alice", roles=["verifier"], did="did:sov:1234")
+        actor = ActorRegistration(
+            id="1", name="Alice", roles=["verifier"], did="did:sov:1234"
+        )
         mock_crud.side_effect = exception()
         with pytest.raises(HTTPException) as ex:
             await registry_actors.register_actor(actor)
@@ -71,15 +96,19 @@ async def test_update_actor(actor_id: str, actor: Actor):
 
 
 @pytest.mark.anyio
-async def test_update_actor_x():
+@pytest.mark.parametrize(
+    "exception, status_code",
+    [(ActorDoesNotExistException, 404), (ActorNameReservedException, 409)],
+)
+async def test_update_actor_x(exception, status_code):
     with patch("trustregistry.registry.registry_actors.crud.update_actor") as mock_crud:
         actor = Actor(id="1", name="Alice", roles=["issuer"], did="did:sov:1234")
-        mock_crud.side_effect = ActorDoesNotExistException()
+        mock_crud.side_effect = exception()
         with pytest.raises(HTTPException) as ex:
             await registry_actors.update_actor("1", actor)
 
         mock_crud.assert_called_once()
-        assert ex.value.status_code == 404
+        assert ex.value.status_code == status_code
 
 
 @pytest.mark.anyio
@@ -175,3 +204,91 @@ async def test_delete_actor_x():
 
         mock_crud.assert_called_once()
         assert ex.value.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_reserve_actor_name():
+    with patch(
+        "trustregistry.registry.registry_actors.crud.reserve_actor_name"
+    ) as mock_crud:
+        reservation = ActorNameReservation(
+            id="abc", name="Alice", expires_at="2026-10-19T10:00:00Z"
+        )
+        mock_crud.return_value = reservation
+        result = await registry_actors.reserve_actor_name(
+            ActorNameReservationRequest(name="Alice", ttl=60)
+        )
+
+    assert mock_crud.call_args.kwargs == {"actor_name": "Alice", "ttl": 60}
+    assert result == reservation
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "exception", [ActorAlreadyExistsException, ActorNameReservedException]
+)
+async def test_reserve_actor_name_x(exception):
+    with patch(
+        "trustregistry.registry.registry_actors.crud.reserve_actor_name"
+    ) as mock_crud:
+        mock_crud.side_effect = exception()
+        with pytest.raises(HTTPException) as ex:
+            await registry_actors.reserve_actor_name(
+                ActorNameReservationRequest(name="Alice")
+            )
+
+        assert ex.value.status_code == 409
+
+
+@pytest.mark.anyio
+async def test_release_actor_name():
+    with patch(
+        "trustregistry.registry.registry_actors.crud.release_actor_name"
+    ) as mock_crud:
+        result = await registry_actors.release_actor_name("abc")
+        mock_crud.assert_called_once()
+        assert result is None
+
+
+@pytest.mark.anyio
+async def test_release_actor_name_x():
+    with patch(
+        "trustregistry.registry.registry_actors.crud.release_actor_name"
+    ) as mock_crud:
+        mock_crud.side_effect = ReservationDoesNotExistException()
+        with pytest.raises(HTTPException) as ex:
+            await registry_actors.release_actor_name("abc")
+
+        assert ex.value.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_bulk_register_actors():
+    async def stream():
+        yield b'{"id": "1", "name": "Alice", "roles": ["issuer"], "did": "did:sov:1",'
+        yield b' "reservation_id": "reservation"}\n{"id": "2"}\n'
+
+    request = Mock()
+    request.stream = stream
+    with patch(
+        "trustregistry.registry.registry_actors.crud.bulk_create_actors"
+    ) as mock_crud:
+        mock_crud.return_value = {"1"}
+        result = await registry_actors.bulk_register_actors(request)
+
+    mock_crud.assert_called_once()
+    assert mock_crud.call_args.kwargs["actors"] == [
+        Actor(id="1", name="Alice", roles=["issuer"], did="did:sov:1")
+    ]
+    assert mock_crud.call_args.kwargs["reservation_ids"] == {"1": "reservation"}
+    assert [(row.id, row.status) for row in result.results] == [
+        (None, "invalid"),
+        ("1", "created"),
+    ]
+
+
+@pytest.mark.anyio
+async def test_export_actors():
+    result = await registry_actors.export_actors(Mock())
+
+    assert result.media_type == "application/x-ndjson"
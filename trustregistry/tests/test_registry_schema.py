@@ -1,4 +1,4 @@
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import pytest
 from fastapi.exceptions import HTTPException
@@ -18,7 +18,11 @@ async def test_get_schemas():
             id="WgWxqztrNooG92RXvxSTWv:2:schema_name:1.0",
         )
         mock_crud.return_value = [schema]
-        result = await registry_schemas.get_schemas()
+        with patch(
+            "trustregistry.registry.registry_schemas.check_not_modified",
+            return_value=None,
+        ):
+            result = await registry_schemas.get_schemas(Mock(), Mock())
         mock_crud.assert_called_once()
         assert result == [schema]
 
@@ -60,6 +64,28 @@ async def test_register_schema_x():
         assert ex.value.status_code == 409
 
 
+@pytest.mark.anyio
+async def test_upsert_schema():
+    with patch(
+        "trustregistry.registry.registry_schemas.crud.upsert_schema"
+    ) as mock_crud:
+        schema_id = registry_schemas.SchemaID(
+            schema_id="WgWxqztrNooG92RXvxSTWv:2:schema_name:1.0"
+        )
+        schema = Schema(
+            did="WgWxqztrNooG92RXvxSTWv",
+            name="schema_name",
+            version="1.0",
+            id="WgWxqztrNooG92RXvxSTWv:2:schema_name:1.0",
+        )
+        mock_crud.return_value = schema
+
+        result = await registry_schemas.upsert_schema(schema_id)
+        mock_crud.assert_called_once()
+        assert mock_crud.call_args.kwargs["schema"] == schema
+        assert result == schema
+
+
 @pytest.mark.anyio
 @pytest.mark.parametrize(
     "schema_id, new_schema_id",
@@ -184,3 +210,30 @@ async def test_remove_schema_x():
 
         mock_crud.assert_called_once()
         assert ex.value.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_bulk_register_schemas():
+    async def stream():
+        yield b'{"schema_id": "WgWxqztrNooG92RXvxSTWv:2:schema_name:1.0"}\n'
+        yield b'{"schema_id": "WgWxqztrNooG92RXvxSTWv:2:schema_name:1.0"}\n'
+        yield b'{"schema_id": "WgWxqztrNooG92RXvxSTWv:schema_name"}\n'
+
+    request = Mock()
+    request.stream = stream
+    with patch(
+        "trustregistry.registry.registry_schemas.crud.bulk_create_schemas"
+    ) as mock_crud:
+        mock_crud.return_value = {"WgWxqztrNooG92RXvxSTWv:2:schema_name:1.0"}
+        result = await registry_schemas.bulk_register_schemas(request)
+
+    mock_crud.assert_called_once()
+    assert mock_crud.call_args.kwargs["schemas"][0].name == "schema_name"
+    assert [row.status for row in result.results] == ["invalid", "created", "conflict"]
+
+
+@pytest.mark.anyio
+async def test_export_schemas():
+    result = await registry_schemas.export_schemas(Mock())
+
+    assert result.media_type == "application/x-ndjson"
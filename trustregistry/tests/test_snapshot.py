@@ -0,0 +1,248 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from shared.models.trustregistry import Actor
+from trustregistry import crud, db
+from trustregistry.database import Base
+from trustregistry.snapshot import RegistrySnapshot
+
+# pylint: disable=protected-access,redefined-outer-name
+
+alice = db.Actor(id="1", name="Alice", roles=["issuer"], did="did:sov:alice")
+bob = db.Actor(id="2", name="Bob", roles=["verifier"], did="did:sov:bob")
+schema = db.Schema(id="alice:2:schema:1.0", did="alice", name="schema", version="1.0")
+
+
+@pytest.fixture
+def sqlite_engine():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all(
+            [
+                db.Actor(id="1", name="Alice", roles=["issuer"], did="did:sov:alice"),
+                db.Actor(id="2", name="Bob", roles=["verifier"], did="did:sov:bob"),
+                db.Schema(did="alice", name="schema", version="1.0"),
+            ]
+        )
+        session.commit()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def snapshot():
+    snapshot = RegistrySnapshot()
+    snapshot.load([alice, bob], [schema])
+    snapshot.is_ready = True
+    return snapshot
+
+
+def test_load_and_lookups(snapshot: RegistrySnapshot):
+    assert snapshot.get_actor_by_id("1").name == "Alice"
+    assert snapshot.get_actor_by_did("did:sov:bob").id == "2"
+    assert snapshot.get_actor_by_name("Alice").did == "did:sov:alice"
+    assert snapshot.get_actor_by_id("unknown") is None
+    assert snapshot.get_schema_by_id(schema.id).name == "schema"
+    assert [actor.id for actor in snapshot.get_actors()] == ["1", "2"]
+    assert [actor.id for actor in snapshot.get_actors(skip=1, limit=1)] == ["2"]
+    assert len(snapshot.get_schemas(limit=0)) == 0
+
+
+def test_put_actor_replaces_stale_index_entries(snapshot: RegistrySnapshot):
+    snapshot.put_actor(
+        db.Actor(id="1", name="Alice v2", roles=["issuer"], did="did:sov:alice2")
+    )
+
+    assert snapshot.get_actor_by_id("1").name == "Alice v2"
+    assert snapshot.get_actor_by_name("Alice v2").id == "1"
+    assert snapshot.get_actor_by_did("did:sov:alice2").id == "1"
+    assert snapshot.get_actor_by_name("Alice") is None
+    assert snapshot.get_actor_by_did("did:sov:alice") is None
+
+
+def test_remove(snapshot: RegistrySnapshot):
+    snapshot.remove_actor("1")
+    snapshot.remove_schema(schema.id)
+    snapshot.remove_actor("unknown")
+
+    assert snapshot.get_actor_by_id("1") is None
+    assert snapshot.get_actor_by_name("Alice") is None
+    assert snapshot.get_actor_by_did("did:sov:alice") is None
+    assert snapshot.get_schema_by_id(schema.id) is None
+
+
+@pytest.mark.anyio
+async def test_reload_and_refresh(sqlite_engine):
+    snapshot = RegistrySnapshot()
+    snapshot._db_engine = sqlite_engine
+    with Session(sqlite_engine) as session:
+        session.add(db.RegistryVersion(id=1, version=7))
+        session.commit()
+    await snapshot.reload()
+
+    assert snapshot.version == 7
+    assert len(snapshot.actors_by_id) == 2
+    assert snapshot.get_schema_by_id("alice:2:schema:1.0")
+
+    with Session(sqlite_engine) as session:
+        session.get(db.Actor, "1").name = "Alice v2"
+        session.delete(session.get(db.Actor, "2"))
+        session.add(db.Schema(did="bob", name="schema", version="2.0"))
+        session.commit()
+
+    await snapshot.refresh({"1", "2"}, {"bob:2:schema:2.0"}, version=10)
+
+    assert snapshot.version == 10
+    assert snapshot.get_actor_by_name("Alice v2").id == "1"
+    assert snapshot.get_actor_by_id("2") is None
+    assert snapshot.get_schema_by_id("bob:2:schema:2.0")
+
+    # A notify committed before the reload does not take the version back
+    await snapshot.refresh(set(), set(), version=8)
+    assert snapshot.version == 10
+
+
+@pytest.mark.anyio
+async def test_on_notify(snapshot: RegistrySnapshot):
+    connection = MagicMock()
+    connection.notifies = [
+        SimpleNamespace(payload='{"table": "actors", "ids": ["1", "3"]}'),
+        SimpleNamespace(payload='{"version": 4}'),
+        SimpleNamespace(payload='{"table": "schemas", "ids": ["s1"]}'),
+        SimpleNamespace(payload='{"version": 5}'),
+        SimpleNamespace(payload="not json"),
+        SimpleNamespace(payload='{"ids": ["2"]}'),
+    ]
+    snapshot._listen_connection = connection
+    snapshot._sync_requested = asyncio.Event()
+
+    snapshot._on_notify()
+
+    connection.poll.assert_called_once()
+    assert not connection.notifies
+    assert snapshot._pending_actor_ids == {"1", "3"}
+    assert snapshot._pending_schema_ids == {"s1"}
+    assert snapshot._pending_version == 5
+    assert snapshot._sync_requested.is_set()
+
+
+@pytest.mark.anyio
+async def test_sync_applies_notified_changes(sqlite_engine):
+    snapshot = RegistrySnapshot()
+    with patch.object(snapshot, "_listen"):
+        await snapshot.start(sqlite_engine)
+
+    with Session(sqlite_engine) as session:
+        session.delete(session.get(db.Actor, "2"))
+        session.commit()
+    snapshot._pending_actor_ids = {"2"}
+    snapshot._pending_version = 3
+    snapshot._sync_requested.set()
+    await asyncio.sleep(0.2)
+
+    assert snapshot.get_actor_by_id("2") is None
+    assert snapshot.version == 3
+
+    await snapshot.stop()
+    assert snapshot._sync_task is None
+
+
+@pytest.mark.anyio
+async def test_on_notify_connection_lost(sqlite_engine):
+    snapshot = RegistrySnapshot()
+    with patch.object(snapshot, "_listen") as mock_listen:
+        await snapshot.start(sqlite_engine)
+
+        connection = MagicMock()
+        connection.poll.side_effect = Exception("connection lost")
+        snapshot._listen_connection = connection
+        snapshot._on_notify()
+        assert not snapshot.is_ready
+
+        await asyncio.sleep(0.2)
+
+    assert mock_listen.call_count == 2
+    assert snapshot.is_ready
+    await snapshot.stop()
+
+
+@pytest.mark.anyio
+async def test_sync_failure_reloads(sqlite_engine):
+    snapshot = RegistrySnapshot()
+    with patch.object(snapshot, "_listen"):
+        await snapshot.start(sqlite_engine)
+
+        with patch.object(
+            snapshot, "_read_rows", side_effect=Exception("connection lost")
+        ):
+            snapshot.mark_written(actor_ids=["1"])
+            await asyncio.sleep(0.1)
+            assert not snapshot.is_ready
+
+        # Retried after backing off
+        await asyncio.sleep(0.6)
+
+    # The reload re-read the write of the failed refresh
+    assert snapshot.is_ready
+    assert not snapshot._written_actor_ids
+    assert snapshot.get_actor_by_id("1").name == "Alice"
+    await snapshot.stop()
+
+
+def test_crud_serves_from_snapshot(snapshot: RegistrySnapshot):
+    db_session = Mock(spec=Session)
+
+    with patch("trustregistry.crud.registry_snapshot", snapshot):
+        assert crud.get_actor_by_did(db_session, "did:sov:alice").id == "1"
+        assert crud.get_actor_by_name(db_session, "Bob").id == "2"
+        assert crud.get_schema_by_id(db_session, schema.id).id == schema.id
+        assert len(crud.get_actors(db_session)) == 2
+        db_session.scalars.assert_not_called()
+
+        # Snapshot miss falls back to the database
+        db_session.scalars.return_value.first.return_value = None
+        with pytest.raises(crud.ActorDoesNotExistException):
+            crud.get_actor_by_id(db_session, "unknown")
+        db_session.scalars.assert_called_once()
+
+
+@pytest.mark.anyio
+async def test_crud_writes_are_read_from_database(sqlite_engine):
+    snapshot = RegistrySnapshot()
+    with patch.object(snapshot, "_listen"):
+        await snapshot.start(sqlite_engine)
+
+    with patch("trustregistry.crud.registry_snapshot", snapshot), patch.object(
+        snapshot, "refresh", wraps=snapshot.refresh
+    ) as mock_refresh, Session(sqlite_engine) as db_session:
+        assert crud.get_data_version(db_session) == 0
+        await asyncio.to_thread(
+            crud.update_actor,
+            db_session,
+            Actor(id="1", name="Alice v2", roles=["issuer"], did="did:sov:alice"),
+        )
+
+        # Until the write is re-read, lookups it could affect go to the database
+        assert snapshot.get_actor_by_id("1") is None
+        assert snapshot.get_actor_by_name("Bob") is None
+        assert snapshot.get_actors() is None
+        assert snapshot.get_version() is None
+        assert crud.get_actor_by_id(db_session, "1").name == "Alice v2"
+        assert crud.get_data_version(db_session) == 0
+
+        await asyncio.sleep(0.2)
+        mock_refresh.assert_awaited_once_with({"1"}, set(), None)
+
+    assert snapshot.get_actor_by_id("1").name == "Alice v2"
+    assert snapshot.get_actor_by_name("Bob").id == "2"
+    assert snapshot.get_version() == 0
+    await snapshot.stop()
@@ -8,10 +8,10 @@ from scalar_fastapi import get_scalar_api_reference
 
 from shared.constants import PROJECT_VERSION
 from shared.log_config import get_logger
+from shared.services.health_sampler import HealthSampler
 from shared.util.set_event_loop_policy import set_event_loop_policy
 from waypoint.routers import sse
 from waypoint.services.dependency_injection.container import Container
-from waypoint.services.nats_service import NatsEventsProcessor
 
 set_event_loop_policy()
 
@@ -78,26 +78,31 @@ async def health_live():
 @app.get("/health/ready")
 @inject
 async def health_ready(
-    nats_processor: NatsEventsProcessor = Depends(
-        Provide[Container.nats_events_processor]
-    ),
+    health_sampler: HealthSampler = Depends(Provide[Container.health_sampler]),
 ):
-    try:
-        jetstream_status = await asyncio.wait_for(
-            nats_processor.check_jetstream(), timeout=5.0
+    sample = health_sampler.get("jetstream")
+    if sample is None:
+        raise HTTPException(
+            status_code=503,
+            detail={"status": "not ready", "error": "JetStream health not yet checked"},
+        )
+    if health_sampler.is_stale(sample):
+        raise HTTPException(
+            status_code=503,
+            detail={"status": "not ready", "error": "JetStream health check is stale"},
         )
-    except asyncio.TimeoutError:
+    if isinstance(sample.error, asyncio.TimeoutError):
         raise HTTPException(
             status_code=503,
             detail={"status": "not ready", "error": "JetStream health check timed out"},
         )
-    except Exception as e:  # pylint: disable=W0718
+    if sample.error:
         raise HTTPException(
-            status_code=500, detail={"status": "error", "error": str(e)}
+            status_code=500, detail={"status": "error", "error": str(sample.error)}
         )
 
-    if jetstream_status["is_working"]:
-        return {"status": "ready", "jetstream": jetstream_status}
+    if sample.status["is_working"]:
+        return {"status": "ready", "jetstream": sample.status}
     else:
         raise HTTPException(
             status_code=503,
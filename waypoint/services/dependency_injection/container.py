@@ -1,5 +1,6 @@
 from dependency_injector import containers, providers
 
+from shared.services.health_sampler import init_health_sampler
 from shared.services.nats_jetstream import init_nats_client
 from waypoint.services.nats_service import NatsEventsProcessor
 
@@ -15,3 +16,9 @@ class Container(containers.DeclarativeContainer):
         NatsEventsProcessor,
         jetstream=jetstream,
     )
+
+    # Samples JetStream status in the background, for health probes
+    health_sampler = providers.Resource(
+        init_health_sampler,
+        checks=providers.Dict(jetstream=nats_events_processor.provided.check_jetstream),
+    )
@@ -4,6 +4,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from fastapi import FastAPI, HTTPException
 
+from shared.services.health_sampler import HealthSampler
 from waypoint.main import app, app_lifespan, health_live, health_ready
 from waypoint.routers import sse
 from waypoint.services.nats_service import NatsEventsProcessor
@@ -54,17 +55,25 @@ async def test_health_live():
     assert response == {"status": "live"}
 
 
+async def sampled(**checks) -> HealthSampler:
+    health_sampler = HealthSampler(checks)
+    await health_sampler.sample()
+    return health_sampler
+
+
 @pytest.mark.anyio
-async def test_health_ready_success(
-    nats_events_processor_mock,  # pylint: disable=redefined-outer-name
-):
-    nats_events_processor_mock.check_jetstream.return_value = {
-        "is_working": True,
-        "streams_count": 1,
-        "consumers_count": 1,
-    }
+async def test_health_ready_success():
+    health_sampler = await sampled(
+        jetstream=AsyncMock(
+            return_value={
+                "is_working": True,
+                "streams_count": 1,
+                "consumers_count": 1,
+            }
+        )
+    )
 
-    response = await health_ready(nats_processor=nats_events_processor_mock)
+    response = await health_ready(health_sampler=health_sampler)
 
     assert response == {
         "status": "ready",
@@ -73,16 +82,15 @@ async def test_health_ready_success(
 
 
 @pytest.mark.anyio
-async def test_health_ready_jetstream_not_working(
-    nats_events_processor_mock,  # pylint: disable=redefined-outer-name
-):
-    nats_events_processor_mock.check_jetstream.return_value = {
-        "is_working": False,
-        "error": "No streams available",
-    }
+async def test_health_ready_jetstream_not_working():
+    health_sampler = await sampled(
+        jetstream=AsyncMock(
+            return_value={"is_working": False, "error": "No streams available"}
+        )
+    )
 
     with pytest.raises(HTTPException) as exc_info:
-        await health_ready(nats_processor=nats_events_processor_mock)
+        await health_ready(health_sampler=health_sampler)
 
     assert exc_info.value.status_code == 503
     assert exc_info.value.detail == {
@@ -92,13 +100,13 @@ async def test_health_ready_jetstream_not_working(
 
 
 @pytest.mark.anyio
-async def test_health_ready_timeout(
-    nats_events_processor_mock,  # pylint: disable=redefined-outer-name
-):
-    nats_events_processor_mock.check_jetstream.side_effect = asyncio.TimeoutError()
+async def test_health_ready_timeout():
+    health_sampler = await sampled(
+        jetstream=AsyncMock(side_effect=asyncio.TimeoutError())
+    )
 
     with pytest.raises(HTTPException) as exc_info:
-        await health_ready(nats_processor=nats_events_processor_mock)
+        await health_ready(health_sampler=health_sampler)
 
     assert exc_info.value.status_code == 503
     assert exc_info.value.detail == {
@@ -108,33 +116,44 @@ async def test_health_ready_timeout(
 
 
 @pytest.mark.anyio
-async def test_health_ready_unexpected_error(
-    nats_events_processor_mock,  # pylint: disable=redefined-outer-name
-):
-    nats_events_processor_mock.check_jetstream.side_effect = Exception(
-        "Unexpected error"
+async def test_health_ready_unexpected_error():
+    health_sampler = await sampled(
+        jetstream=AsyncMock(side_effect=Exception("Unexpected error"))
     )
 
     with pytest.raises(HTTPException) as exc_info:
-        await health_ready(nats_processor=nats_events_processor_mock)
+        await health_ready(health_sampler=health_sampler)
 
     assert exc_info.value.status_code == 500
     assert exc_info.value.detail == {"status": "error", "error": "Unexpected error"}
 
 
 @pytest.mark.anyio
-async def test_health_ready_with_timeout(
-    nats_events_processor_mock,  # pylint: disable=redefined-outer-name
-):
-    nats_events_processor_mock.check_jetstream.side_effect = (
-        asyncio.TimeoutError
-    )  # Simulate a slow response
+async def test_health_ready_not_sampled():
+    health_sampler = HealthSampler({"jetstream": AsyncMock()})
 
     with pytest.raises(HTTPException) as exc_info:
-        await health_ready(nats_processor=nats_events_processor_mock)
+        await health_ready(health_sampler=health_sampler)
 
     assert exc_info.value.status_code == 503
     assert exc_info.value.detail == {
         "status": "not ready",
-        "error": "JetStream health check timed out",
+        "error": "JetStream health not yet checked",
+    }
+
+
+@pytest.mark.anyio
+async def test_health_ready_stale():
+    health_sampler = await sampled(
+        jetstream=AsyncMock(return_value={"is_working": True})
+    )
+    health_sampler.max_age = 0
+
+    with pytest.raises(HTTPException) as exc_info:
+        await health_ready(health_sampler=health_sampler)
+
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.detail == {
+        "status": "not ready",
+        "error": "JetStream health check is stale",
     }